@@ -0,0 +1,333 @@
+"""
+Import as:
+
+import core.key_sorted_array_store as cksoarst
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+import numpy as np
+import pandas as pd
+
+import helpers.hdbg as hdbg
+import helpers.hobject as hobject
+
+_LOG = logging.getLogger(__name__)
+
+
+class KeySortedArrayStore(hobject.PrintableMixin):
+    """
+    Key-value pairs where insertion order respects key order, storing each
+    value (a `pd.Series` or a number) as a row of a 2D array.
+
+    This has the same interface as `KeySortedOrderedDict`, but instead of
+    keeping one object per key:
+    - the values are stored in a dense float array with a column for each label
+      (e.g., asset id) seen so far
+    - the array is preallocated and grows in chunks of rows
+    - the last values can be retrieved as a df built on top of the array,
+      without building a df from many series
+
+    E.g., with 3 series indexed by asset id:
+    ```
+    key    values            index
+    09:35  [100.0, 200.0]    [101, 202]
+    09:40  [110.0, 210.0]    [101, 202]
+    09:45  [ 90.0,   nan]    [101]
+    ```
+    """
+
+    def __init__(
+        self,
+        key_type: Type,
+        max_keys: Optional[int] = None,
+        *,
+        chunk_size: int = 256,
+    ):
+        """
+        Constructor.
+
+        :param key_type: type of the keys
+        :param max_keys: max number of keys to store, evicting the oldest ones;
+            `None` means no limit
+        :param chunk_size: number of rows to allocate every time the array is
+            full
+        """
+        self._key_type = key_type
+        if max_keys is not None:
+            hdbg.dassert_lte(1, max_keys)
+        self._max_keys = max_keys
+        hdbg.dassert_lte(1, chunk_size)
+        self._chunk_size = chunk_size
+        # Whether the values are numbers instead of series.
+        self._is_scalar: Optional[bool] = None
+        # The array with the values, with a row for each key. The cells of the
+        # labels missing from a value are NaN.
+        self._values = np.full((chunk_size, 0), np.nan)
+        # The label of each column of the array.
+        self._labels: List[Any] = []
+        self._label_to_col: Dict[Any, int] = {}
+        # The key, the index, the name and the dtype of the value in each row,
+        # to rebuild the value. The rows in `[self._start, len(self._keys))`
+        # are valid, while the previous ones have been evicted.
+        self._keys: List[Any] = []
+        self._indices: List[Optional[pd.Index]] = []
+        self._names: List[Any] = []
+        self._dtypes: List[Any] = []
+        self._start = 0
+        self._key_to_row: Dict[Any, int] = {}
+        # The last index and its columns. Typically the values share the same
+        # index object across keys, so this avoids looking up the labels.
+        self._last_index: Optional[pd.Index] = None
+        self._last_cols: Union[List[int], slice] = []
+
+    def __len__(self) -> int:
+        return len(self._keys) - self._start
+
+    def __contains__(self, key: Any) -> bool:
+        hdbg.dassert_isinstance(key, self._key_type)
+        return key in self._key_to_row
+
+    def __getitem__(self, key: Any) -> Union[pd.Series, float]:
+        hdbg.dassert_isinstance(key, self._key_type)
+        row = self._key_to_row[key]
+        return self._get_value(row)
+
+    def __setitem__(self, key: Any, value: Union[pd.Series, float]) -> None:
+        is_scalar = not isinstance(value, pd.Series)
+        if is_scalar:
+            values = np.array([value], dtype=float)
+            self._append(key, values, None, None, None, is_scalar=True)
+        else:
+            values = value.to_numpy(dtype=float, na_value=np.nan)
+            self._append(
+                key, values, value.index, value.name, value.dtype, is_scalar=False
+            )
+
+    def set_values(self, key: Any, values: np.ndarray, index: pd.Index) -> None:
+        """
+        Store the values of a float series without building it.
+
+        This is equivalent to `self[key] = pd.Series(values, index=index)`.
+        Passing the same `index` object for all the keys avoids comparing the
+        indices in `get_df()`.
+        """
+        hdbg.dassert_isinstance(index, pd.Index)
+        hdbg.dassert_eq(len(values), len(index))
+        self._append(key, values, index, None, np.dtype(float), is_scalar=False)
+
+    def get_values(self, key: Any) -> np.ndarray:
+        """
+        Get the values of a series as an array, without building the series.
+
+        The values are in the order of the index of the series, which can be
+        retrieved with `get_index()`. The returned array is read-only, since it
+        can share the memory with the store.
+        """
+        hdbg.dassert(not self._is_scalar, "Use `self[key]` for numbers")
+        hdbg.dassert_isinstance(key, self._key_type)
+        row = self._key_to_row[key]
+        cols = self._get_cols(self._indices[row])
+        values = self._values[row, cols]
+        values.flags.writeable = False
+        return values
+
+    def get_index(self, key: Any) -> pd.Index:
+        """
+        Get the index of a series, without building the series.
+        """
+        hdbg.dassert(not self._is_scalar, "Use `self[key]` for numbers")
+        hdbg.dassert_isinstance(key, self._key_type)
+        row = self._key_to_row[key]
+        return self._indices[row]
+
+    def peek(self) -> Tuple[Any, Union[pd.Series, float]]:
+        """
+        Get but do not remove last key, value pair.
+        """
+        hdbg.dassert_lt(0, len(self), "The store is empty")
+        row = len(self._keys) - 1
+        return self._keys[row], self._get_value(row)
+
+    def get_df(self, num_keys: Optional[int] = None) -> pd.DataFrame:
+        """
+        Get the `num_keys` most recent values as a df indexed by key.
+
+        The df is the same as `pd.DataFrame(odict).transpose()` for the
+        corresponding `OrderedDict` of series, i.e., the columns are the union
+        of the indices of the series (sorted, if the indices differ) and the
+        missing values are NaN.
+
+        The df shares the memory with the store, when possible, so it should
+        not be modified in place.
+        """
+        hdbg.dassert(not self._is_scalar, "Use `get_srs()` for numbers")
+        start = self._get_start_row(num_keys)
+        end = len(self._keys)
+        keys = self._keys[start:end]
+        if not keys:
+            return pd.DataFrame()
+        columns = self._get_columns(self._indices[start:end])
+        cols = self._get_cols(columns)
+        if isinstance(cols, slice):
+            # The columns are the first ones of the array, so we can take a
+            # view.
+            values = self._values[start:end, cols]
+        else:
+            values = self._values[start:end].take(cols, axis=1)
+        df = pd.DataFrame(values, index=keys, columns=columns, copy=False)
+        return df
+
+    def get_srs(self, num_keys: Optional[int] = None) -> pd.Series:
+        """
+        Get the `num_keys` most recent numbers as a series indexed by key.
+        """
+        hdbg.dassert(self._is_scalar, "Use `get_df()` for series")
+        start = self._get_start_row(num_keys)
+        end = len(self._keys)
+        srs = pd.Series(self._values[start:end, 0], index=self._keys[start:end])
+        return srs
+
+    # /////////////////////////////////////////////////////////////////////////
+
+    def _append(
+        self,
+        key: Any,
+        values: np.ndarray,
+        index: Optional[pd.Index],
+        name: Any,
+        dtype: Any,
+        *,
+        is_scalar: bool,
+    ) -> None:
+        """
+        Add a row with the values of a series or a number.
+        """
+        hdbg.dassert_isinstance(key, self._key_type)
+        if len(self) > 0:
+            last_key = self._keys[-1]
+            hdbg.dassert_lt(last_key, key)
+        if self._is_scalar is None:
+            self._is_scalar = is_scalar
+        hdbg.dassert_eq(
+            self._is_scalar, is_scalar, "The values must be all series or numbers"
+        )
+        if is_scalar:
+            labels = [None]
+        else:
+            hdbg.dassert(not index.has_duplicates)
+            labels = index
+        # Add the columns for the new labels.
+        new_labels = [
+            label for label in labels if label not in self._label_to_col
+        ]
+        if new_labels:
+            self._add_columns(new_labels)
+        # Add the row.
+        if len(self._keys) == self._values.shape[0]:
+            self._add_rows()
+        row = len(self._keys)
+        cols = self._get_cols(labels)
+        self._values[row, cols] = values
+        self._keys.append(key)
+        self._indices.append(index)
+        self._names.append(name)
+        self._dtypes.append(dtype)
+        self._key_to_row[key] = row
+        # Evict the oldest key, if needed.
+        if self._max_keys is not None and len(self) > self._max_keys:
+            del self._key_to_row[self._keys[self._start]]
+            self._start += 1
+
+    def _get_cols(self, labels: Any) -> Union[List[int], slice]:
+        """
+        Get the columns of the array storing `labels`.
+
+        Use a slice when the columns are the first ones of the array in order,
+        so that indexing the array doesn't need to gather the values.
+        """
+        # The columns of a label don't change when adding columns, so the
+        # cached columns are always valid.
+        if labels is self._last_index:
+            return self._last_cols
+        cols = [self._label_to_col[label] for label in labels]
+        if cols == list(range(len(cols))):
+            cols = slice(0, len(cols))
+        if isinstance(labels, pd.Index):
+            self._last_index = labels
+            self._last_cols = cols
+        return cols
+
+    @staticmethod
+    def _get_columns(indices: List[pd.Index]) -> pd.Index:
+        """
+        Get the union of the indices of the series like Pandas does.
+        """
+        first = indices[0]
+        # Pandas ignores the empty indices when computing the union.
+        non_empty_indices = [index for index in indices if len(index) > 0]
+        if not non_empty_indices:
+            return first
+        first = non_empty_indices[0]
+        indices = non_empty_indices
+        if all(index is first or index.equals(first) for index in indices):
+            return first
+        labels = np.concatenate([index.to_numpy() for index in indices])
+        labels = np.unique(labels)
+        names = {index.name for index in indices}
+        name = names.pop() if len(names) == 1 else None
+        return pd.Index(labels, name=name)
+
+    def _get_start_row(self, num_keys: Optional[int]) -> int:
+        start = self._start
+        if num_keys is not None:
+            start = max(start, len(self._keys) - num_keys)
+        return start
+
+    def _get_value(self, row: int) -> Union[pd.Series, float]:
+        """
+        Rebuild the value stored in a row.
+        """
+        if self._is_scalar:
+            return float(self._values[row, 0])
+        index = self._indices[row]
+        # Copy the values, so that the series can be modified.
+        values = self._values[row, self._get_cols(index)].copy()
+        srs = pd.Series(values, index=index, name=self._names[row])
+        dtype = self._dtypes[row]
+        if dtype != srs.dtype:
+            srs = srs.astype(dtype)
+        return srs
+
+    def _add_columns(self, labels: List[Any]) -> None:
+        """
+        Add columns for new labels, reallocating the array.
+        """
+        num_cols = self._values.shape[1]
+        values = np.full((self._values.shape[0], num_cols + len(labels)), np.nan)
+        values[:, :num_cols] = self._values
+        # Don't modify the array in place since it can be shared with the dfs
+        # returned by `get_df()`.
+        self._values = values
+        for label in labels:
+            self._label_to_col[label] = len(self._labels)
+            self._labels.append(label)
+
+    def _add_rows(self) -> None:
+        """
+        Make room for a new row, dropping the evicted rows and growing the
+        array, if needed.
+        """
+        num_rows = len(self._keys) - self._start
+        num_alloc_rows = num_rows + self._chunk_size
+        values = np.full((num_alloc_rows, self._values.shape[1]), np.nan)
+        values[:num_rows] = self._values[self._start :]
+        self._values = values
+        if self._start > 0:
+            self._keys = self._keys[self._start :]
+            self._indices = self._indices[self._start :]
+            self._names = self._names[self._start :]
+            self._dtypes = self._dtypes[self._start :]
+            self._key_to_row = {key: row for row, key in enumerate(self._keys)}
+            self._start = 0
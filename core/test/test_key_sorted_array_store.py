@@ -0,0 +1,147 @@
+import collections
+import logging
+
+import numpy as np
+import pandas as pd
+
+import core.key_sorted_array_store as cksoarst
+import helpers.hunit_test as hunitest
+
+_LOG = logging.getLogger(__name__)
+
+
+def _get_series() -> collections.OrderedDict:
+    """
+    Create series indexed by asset id with assets entering and exiting.
+    """
+    timestamps = pd.date_range(
+        "2022-01-03 09:35", periods=4, freq="5T", tz="America/New_York"
+    )
+    odict = collections.OrderedDict()
+    odict[timestamps[0]] = pd.Series([100, 200], index=[101, 202])
+    odict[timestamps[1]] = pd.Series([110.0, np.nan], index=[101, 202])
+    odict[timestamps[2]] = pd.Series([90.0, 10.0], index=[303, 101])
+    odict[timestamps[3]] = pd.Series([], dtype="float64")
+    return odict
+
+
+# #############################################################################
+# TestKeySortedArrayStore1
+# #############################################################################
+
+
+class TestKeySortedArrayStore1(hunitest.TestCase):
+    def test_getitem1(self) -> None:
+        """
+        Check that the stored series are returned unchanged.
+        """
+        odict = _get_series()
+        store = self._get_store(odict)
+        self.assertEqual(len(store), len(odict))
+        for key, value in odict.items():
+            self.assertIn(key, store)
+            pd.testing.assert_series_equal(store[key], value)
+        key, value = store.peek()
+        self.assertEqual(key, list(odict.keys())[-1])
+        pd.testing.assert_series_equal(value, list(odict.values())[-1])
+
+    def test_get_df1(self) -> None:
+        """
+        Check that the df is the same as the one built from the series.
+        """
+        odict = _get_series()
+        store = self._get_store(odict)
+        for num_keys in [None, 1, 2, 3]:
+            actual = store.get_df(num_keys).astype("float")
+            keys = list(odict.keys())
+            if num_keys is not None:
+                keys = keys[-num_keys:]
+            expected = pd.DataFrame(
+                collections.OrderedDict((key, odict[key]) for key in keys)
+            ).transpose()
+            expected = expected.astype("float")
+            pd.testing.assert_frame_equal(
+                actual, expected, check_index_type=False
+            )
+
+    def test_get_srs1(self) -> None:
+        """
+        Check storing numbers.
+        """
+        timestamps = pd.date_range("2022-01-03 09:35", periods=3, freq="5T")
+        store = cksoarst.KeySortedArrayStore(pd.Timestamp)
+        for idx, timestamp in enumerate(timestamps):
+            store[timestamp] = 1000.0 - idx
+        self.assertEqual(store[timestamps[1]], 999.0)
+        actual = store.get_srs(2)
+        expected = pd.Series([999.0, 998.0], index=timestamps[1:])
+        pd.testing.assert_series_equal(actual, expected, check_freq=False)
+
+    def test_max_keys1(self) -> None:
+        """
+        Check that the oldest keys are evicted while the array grows.
+        """
+        timestamps = pd.date_range("2022-01-03 09:35", periods=10, freq="5T")
+        store = cksoarst.KeySortedArrayStore(pd.Timestamp, 3, chunk_size=2)
+        for idx, timestamp in enumerate(timestamps):
+            store[timestamp] = pd.Series([idx, 2 * idx], index=[101, 202])
+        self.assertEqual(len(store), 3)
+        self.assertNotIn(timestamps[6], store)
+        actual = store.get_df()
+        expected = pd.DataFrame(
+            [[7.0, 14.0], [8.0, 16.0], [9.0, 18.0]],
+            index=timestamps[7:],
+            columns=[101, 202],
+        )
+        pd.testing.assert_frame_equal(actual, expected, check_freq=False)
+
+    def test_set_values1(self) -> None:
+        """
+        Check storing and retrieving arrays instead of series.
+        """
+        timestamps = pd.date_range("2022-01-03 09:35", periods=2, freq="5T")
+        index = pd.Index([202, 101])
+        store = cksoarst.KeySortedArrayStore(pd.Timestamp)
+        store[timestamps[0]] = pd.Series([1.0, 2.0], index=[101, 303])
+        store.set_values(timestamps[1], np.array([3.0, 4.0]), index)
+        self.assertIs(store.get_index(timestamps[1]), index)
+        actual = store.get_values(timestamps[1])
+        np.testing.assert_array_equal(actual, np.array([3.0, 4.0]))
+        # The array is read-only.
+        self.assertFalse(actual.flags.writeable)
+        pd.testing.assert_series_equal(
+            store[timestamps[1]], pd.Series([3.0, 4.0], index=index)
+        )
+
+    def test_keys_order1(self) -> None:
+        """
+        Check that keys must be inserted in increasing order.
+        """
+        timestamps = pd.date_range("2022-01-03 09:35", periods=2, freq="5T")
+        store = cksoarst.KeySortedArrayStore(pd.Timestamp)
+        store[timestamps[1]] = 1.0
+        with self.assertRaises(AssertionError):
+            store[timestamps[0]] = 2.0
+
+    def test_df_is_not_modified1(self) -> None:
+        """
+        Check that a returned df doesn't change when new values are added.
+        """
+        odict = _get_series()
+        store = cksoarst.KeySortedArrayStore(pd.Timestamp, chunk_size=1)
+        items = list(odict.items())
+        store[items[0][0]] = items[0][1]
+        df = store.get_df()
+        expected = df.copy()
+        for key, value in items[1:]:
+            store[key] = value
+        pd.testing.assert_frame_equal(df, expected)
+
+    @staticmethod
+    def _get_store(
+        odict: collections.OrderedDict,
+    ) -> cksoarst.KeySortedArrayStore:
+        store = cksoarst.KeySortedArrayStore(pd.Timestamp, chunk_size=2)
+        for key, value in odict.items():
+            store[key] = value
+        return store
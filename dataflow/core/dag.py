@@ -4,6 +4,7 @@ Import as:
 import dataflow.core.dag as dtfcordag
 """
 
+import concurrent.futures
 import itertools
 import json
 import logging
@@ -12,9 +13,13 @@ from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
 
 import networkx as networ
 import pandas as pd
+import pyarrow as pa
 from tqdm.autonotebook import tqdm
 
 import dataflow.core.node as dtfcornode
+import dataflow.core.node_output_cache as dtfcnoouca
+import dataflow.core.node_profiler as dtfcnoprof
+import helpers.harrow as harrow
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hio as hio
@@ -90,6 +95,15 @@ class DAG(hobject.PrintableMixin):
         self.set_debug_mode(
             self._save_node_io, self._profile_execution, self._dst_dir
         )
+        # Set default execution parameters.
+        self._execution_mode = "serial"
+        self._num_workers = 1
+        # Nodes whose outputs are never freed by `force_free_nodes`.
+        self._pinned_nids: List[dtfcornode.NodeId] = []
+        # Cache storing the outputs of the nodes across runs.
+        self._node_output_cache: Optional[dtfcnoouca.NodeOutputCache] = None
+        # Dir storing the outputs of the nodes as memory-mapped files.
+        self._output_spill_dir: Optional[str] = None
 
     def __repr__(self) -> str:
         """
@@ -147,13 +161,23 @@ class DAG(hobject.PrintableMixin):
             - `df_as_csv`: save the full content of the node interface, using CSV for
               dataframes
             - `df_as_parquet`: like `df_as_csv` but using Parquet for dataframes
+            - `df_as_feather`: like `df_as_csv` but using Feather for dataframes,
+              which can be loaded memory-mapped with `harrow.from_feather()`
         :param profile_execution: if not `None`, store information about the
-            execution of the nodes
+            execution of the nodes, both as text files and as profiling records
+            (see `dtfcnoprof.load_node_profiling_stats_from_dst_dir()`)
         :param dst_dir: directory to save node interface and execution profiling info
         """
         hdbg.dassert_in(
             save_node_io,
-            ("", "stats", "df_as_csv", "df_as_pq", "df_as_csv_and_pq"),
+            (
+                "",
+                "stats",
+                "df_as_csv",
+                "df_as_pq",
+                "df_as_csv_and_pq",
+                "df_as_feather",
+            ),
         )
         _LOG.debug(hprint.to_str("save_node_io profile_execution dst_dir"))
         self._save_node_io = save_node_io
@@ -174,6 +198,72 @@ class DAG(hobject.PrintableMixin):
                 dst_dir, None, "Need to specify a directory to save the data"
             )
 
+    def set_execution_mode(
+        self,
+        execution_mode: str,
+        *,
+        num_workers: Optional[int] = None,
+    ) -> None:
+        """
+        Set how the nodes of the DAG are scheduled for execution.
+
+        In the parallel modes a node is submitted for execution as soon as all
+        its predecessors have run, so that independent branches of the DAG
+        (e.g., different features computed from the same data) are executed
+        concurrently. The outputs are the same as in the serial mode, since each
+        node still sees the outputs of all its predecessors.
+
+        :param execution_mode: how to execute the nodes
+            - "serial": run one node at a time following a topological sort
+            - "thread": run the ready nodes in a pool of threads
+            - "process": run the ready nodes in a pool of processes. Nodes,
+              their inputs, and their outputs need to be pickleable, and the
+              state of a node (e.g., a fit model) is copied back in the DAG
+              after execution
+        :param num_workers: max number of nodes executed at the same time. `None`
+            means the number of CPUs of the machine
+        """
+        _LOG.debug(hprint.to_str("execution_mode num_workers"))
+        hdbg.dassert_in(execution_mode, ("serial", "thread", "process"))
+        if num_workers is None:
+            num_workers = 1 if execution_mode == "serial" else os.cpu_count()
+        hdbg.dassert_lte(1, num_workers)
+        self._execution_mode = execution_mode
+        self._num_workers = num_workers
+
+    def set_node_output_cache(
+        self, node_output_cache: Optional[dtfcnoouca.NodeOutputCache]
+    ) -> None:
+        """
+        Reuse the outputs of nodes computed in previous runs.
+
+        Before executing a node method, the DAG looks up the outputs in
+        `node_output_cache` using a key based on the node and its inputs, and
+        executes the method only if the outputs are not cached.
+
+        :param node_output_cache: cache to use. `None` disables caching
+        """
+        if node_output_cache is not None:
+            hdbg.dassert_isinstance(node_output_cache, dtfcnoouca.NodeOutputCache)
+        self._node_output_cache = node_output_cache
+
+    def set_output_spill_dir(self, output_spill_dir: Optional[str]) -> None:
+        """
+        Store the df outputs of the nodes in memory-mapped Feather files.
+
+        Each df output is saved under `output_spill_dir` and replaced by a df
+        pointing to the mapped file, without copying the data. This allows the
+        OS to reclaim the memory of the outputs, which are read back from disk
+        when needed. The spilled outputs are read-only, thus the nodes can't
+        modify their inputs in place.
+
+        :param output_spill_dir: dir to store the outputs. `None` disables
+            spilling
+        """
+        if output_spill_dir is not None:
+            hio.create_dir(output_spill_dir, incremental=True)
+        self._output_spill_dir = output_spill_dir
+
     @property
     def nx_dag(self) -> networ.DiGraph:
         return self._nx_dag
@@ -257,6 +347,20 @@ class DAG(hobject.PrintableMixin):
         hdbg.dassert_isinstance(nid, dtfcornode.NodeId)
         hdbg.dassert(self._nx_dag.has_node(nid), "Node `%s` is not in DAG", nid)
         self._nx_dag.remove_node(nid)
+        if nid in self._pinned_nids:
+            self._pinned_nids.remove(nid)
+
+    def pin_node(self, nid: dtfcornode.NodeId) -> None:
+        """
+        Keep the outputs of node `nid` after execution even if
+        `force_free_nodes` is set.
+
+        This is useful to inspect the output of intermediate nodes after running
+        a DAG.
+        """
+        hdbg.dassert(self._nx_dag.has_node(nid), "Node `%s` is not in DAG", nid)
+        if nid not in self._pinned_nids:
+            self._pinned_nids.append(nid)
 
     def connect(
         self,
@@ -460,8 +564,8 @@ class DAG(hobject.PrintableMixin):
             `get_outputs(method)`
         """
         sinks = self.get_sinks()
-        for id_, nid in enumerate(networ.topological_sort(self._nx_dag)):
-            self._run_node(id_, nid, method)
+        nids = list(networ.topological_sort(self._nx_dag))
+        self._run_nodes(nids, method)
         return {sink: self.get_node(sink).get_outputs(method) for sink in sinks}
 
     def run_leq_node(
@@ -490,13 +594,9 @@ class DAG(hobject.PrintableMixin):
         )
         # The `ancestors` filter only returns nodes strictly less than `nid`,
         # and so we need to add `nid` back.
-        nids = itertools.chain(ancestors, [nid])
+        nids = list(itertools.chain(ancestors, [nid]))
         # Execute all the ancestors of `nid`.
-        if progress_bar:
-            nids = tqdm(list(nids), desc="run_leq_node")
-        for id_, pred_nid in enumerate(nids):
-            _LOG.debug("Executing node '%s'", pred_nid)
-            self._run_node(id_, pred_nid, method)
+        self._run_nodes(nids, method, progress_bar=progress_bar)
         # Retrieve the output the node.
         node = self.get_node(nid)
         node_output = node.get_outputs(method)
@@ -647,6 +747,9 @@ class DAG(hobject.PrintableMixin):
                 df.to_csv(csv_file_name, compression="gzip")
                 parquet_file_name = f"{file_name}.parquet"
                 hparque.to_parquet(df, parquet_file_name)
+            elif self._save_node_io == "df_as_feather":
+                feather_file_name = f"{file_name}.feather"
+                harrow.to_feather(df, feather_file_name)
             else:
                 raise ValueError(f"Invalid save_node_io='{self._save_node_io}'")
             _LOG.debug("Saved log dir in '%s'", file_name)
@@ -657,16 +760,238 @@ class DAG(hobject.PrintableMixin):
                 obj,
             )
 
+    def _run_nodes(
+        self,
+        nids: List[dtfcornode.NodeId],
+        method: dtfcornode.Method,
+        *,
+        progress_bar: bool = False,
+    ) -> None:
+        """
+        Run the requested `method` on the nodes `nids`.
+
+        If `force_free_nodes` is set, the output of a node is freed as soon as
+        all the nodes in `nids` consuming it have run. The outputs of the nodes
+        without consumers (e.g., the sinks) and of the pinned nodes are kept.
+
+        If `profile_execution` is set, a profiling record for each node is saved
+        in a single Parquet file per call (see `dtfcnoprof`).
+
+        :param nids: nodes to run, sorted topologically. The predecessors of each
+            node need to be part of `nids`
+        """
+        profiling_records = [] if self._profile_execution else None
+        if self.force_free_nodes:
+            num_pending_consumers = self._get_num_consumers(nids)
+        else:
+            num_pending_consumers = None
+        if progress_bar:
+            pbar = tqdm(total=len(nids), desc="run_leq_node")
+        if self._execution_mode == "serial":
+            for topological_id, nid in enumerate(nids):
+                _LOG.debug("Executing node '%s'", nid)
+                self._run_node(
+                    topological_id,
+                    nid,
+                    method,
+                    profiling_records=profiling_records,
+                )
+                if num_pending_consumers is not None:
+                    self._free_consumed_outputs(
+                        nid, method, num_pending_consumers
+                    )
+                if progress_bar:
+                    pbar.update(1)
+        else:
+            process_pool = None
+            if self._execution_mode == "process":
+                process_pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self._num_workers
+                )
+            # The nodes are always orchestrated by threads of the main process,
+            # since they update the DAG. In "process" mode each thread offloads
+            # the execution of the node method to `process_pool`.
+            thread_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._num_workers
+            )
+            try:
+                self._run_nodes_in_pool(
+                    nids,
+                    method,
+                    thread_pool,
+                    process_pool,
+                    num_pending_consumers,
+                    pbar if progress_bar else None,
+                    profiling_records,
+                )
+            finally:
+                thread_pool.shutdown(wait=True)
+                if process_pool is not None:
+                    process_pool.shutdown(wait=True)
+        if progress_bar:
+            pbar.close()
+        if profiling_records:
+            dst_dir = cast(str, self._dst_dir)
+            dtfcnoprof.save_node_profiling_stats_to_dst_dir(
+                profiling_records, dst_dir, method
+            )
+
+    def _run_nodes_in_pool(
+        self,
+        nids: List[dtfcornode.NodeId],
+        method: dtfcornode.Method,
+        thread_pool: concurrent.futures.Executor,
+        process_pool: Optional[concurrent.futures.Executor],
+        num_pending_consumers: Optional[Dict[dtfcornode.NodeId, int]],
+        pbar: Optional[tqdm],
+        profiling_records: Optional[List[Dict[str, Any]]],
+    ) -> None:
+        """
+        Run the nodes `nids` as soon as all their predecessors have run.
+
+        The nodes that become ready at the same time are submitted in
+        topological order, so that the scheduling is deterministic for a given
+        sequence of completions.
+        """
+        topological_ids = {nid: id_ for id_, nid in enumerate(nids)}
+        # Count the predecessors of each node that still need to be executed.
+        num_pending_preds = {}
+        for nid in nids:
+            preds = list(self._nx_dag.predecessors(nid))
+            for pred_nid in preds:
+                hdbg.dassert_in(
+                    pred_nid,
+                    topological_ids,
+                    "Predecessor of '%s' is not scheduled for execution",
+                    nid,
+                )
+            num_pending_preds[nid] = len(preds)
+        ready_nids = [nid for nid in nids if num_pending_preds[nid] == 0]
+        futures: Dict[concurrent.futures.Future, dtfcornode.NodeId] = {}
+        while ready_nids or futures:
+            # Submit all the nodes that are ready.
+            for nid in ready_nids:
+                _LOG.debug("Submitting node '%s'", nid)
+                future = thread_pool.submit(
+                    self._run_node,
+                    topological_ids[nid],
+                    nid,
+                    method,
+                    process_pool=process_pool,
+                    profiling_records=profiling_records,
+                )
+                futures[future] = nid
+            ready_nids = []
+            # Wait for at least one node to complete.
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in sorted(done, key=lambda x: topological_ids[futures[x]]):
+                nid = futures.pop(future)
+                # Propagate the exception, if any.
+                future.result()
+                _LOG.debug("Node '%s' completed", nid)
+                if num_pending_consumers is not None:
+                    self._free_consumed_outputs(
+                        nid, method, num_pending_consumers
+                    )
+                if pbar is not None:
+                    pbar.update(1)
+                # Mark the successors whose predecessors have all run as ready.
+                for succ_nid in self._nx_dag.successors(nid):
+                    if succ_nid not in num_pending_preds:
+                        continue
+                    num_pending_preds[succ_nid] -= 1
+                    if num_pending_preds[succ_nid] == 0:
+                        ready_nids.append(succ_nid)
+            ready_nids = sorted(ready_nids, key=lambda x: topological_ids[x])
+
+    def _get_num_consumers(
+        self, nids: List[dtfcornode.NodeId]
+    ) -> Dict[dtfcornode.NodeId, int]:
+        """
+        Count how many nodes in `nids` read the outputs of each node in `nids`.
+        """
+        nids_set = set(nids)
+        num_consumers = {}
+        for nid in nids:
+            successors = self._nx_dag.successors(nid)
+            num_consumers[nid] = len([x for x in successors if x in nids_set])
+        return num_consumers
+
+    def _free_consumed_outputs(
+        self,
+        nid: dtfcornode.NodeId,
+        method: dtfcornode.Method,
+        num_pending_consumers: Dict[dtfcornode.NodeId, int],
+    ) -> None:
+        """
+        Free the outputs of the predecessors of `nid` that have no more
+        consumers to run.
+
+        :param nid: node that has just run
+        :param num_pending_consumers: number of consumers of each node that
+            still need to run, updated in place
+        """
+        for pred_nid in self._nx_dag.predecessors(nid):
+            num_pending_consumers[pred_nid] -= 1
+            hdbg.dassert_lte(0, num_pending_consumers[pred_nid])
+            if num_pending_consumers[pred_nid] > 0:
+                continue
+            if pred_nid in self._pinned_nids:
+                _LOG.debug("Skipping deallocation of pinned node '%s'", pred_nid)
+                continue
+            _LOG.debug("Deallocating outputs of node '%s'", pred_nid)
+            self.get_node(pred_nid).free(method=method)
+
+    def _spill_output(
+        self,
+        nid: dtfcornode.NodeId,
+        method: dtfcornode.Method,
+        output_name: str,
+        value: Any,
+    ) -> Any:
+        """
+        Save a df output to a file and return the df mapping the file.
+
+        The values that are not dfs, or that can't be saved as Feather (e.g.,
+        with duplicated column names), are returned unchanged.
+        """
+        if not isinstance(value, pd.DataFrame):
+            return value
+        output_spill_dir = cast(str, self._output_spill_dir)
+        file_name = os.path.join(
+            output_spill_dir, f"{method}.{nid}.{output_name}.feather"
+        )
+        try:
+            harrow.to_feather(value, file_name)
+        except (pa.ArrowException, ValueError) as e:
+            _LOG.warning(
+                "Can't spill output '%s' of node '%s': %s", output_name, nid, e
+            )
+            return value
+        value = harrow.from_feather(file_name, memory_map=True)
+        return value
+
     def _run_node(
         self,
         topological_id: int,
         nid: dtfcornode.NodeId,
         method: dtfcornode.Method,
+        *,
+        process_pool: Optional[concurrent.futures.Executor] = None,
+        profiling_records: Optional[List[Dict[str, Any]]] = None,
     ) -> None:
         """
         Run the requested `method` on a single node.
 
         This method DOES NOT run (or re-run) ancestors of `nid`.
+
+        :param process_pool: if not `None`, execute the node method in a
+            separate process and update the node in the DAG with the executed
+            one
+        :param profiling_records: if not `None`, append the profiling record
+            of the execution of the node
         """
         _LOG.debug(
             "\n%s",
@@ -692,28 +1017,51 @@ class DAG(hobject.PrintableMixin):
             for input_name, value in kvs.items():
                 # Retrieve output from store.
                 kwargs[input_name] = pred_node.get_output(method, value)
-                if self.force_free_nodes:
-                    _LOG.warning(
-                        "Forcing deallocation of pred_node=%s", pred_node
-                    )
-                    # TODO(gp): We should move this after using the data deallocating
-                    # all the nodes whose output has been used. For linear pipelines,
-                    # this check is not needed.
-                    pred_node.free()
             # TODO(gp): Save info for inputs, if needed.
         _LOG.debug("kwargs are %s", kwargs)
+        if profiling_records is not None:
+            node_profiler = dtfcnoprof.NodeProfiler(topological_id, nid, method)
+            node_profiler.start()
         # Execute `node.method()`.
         with htimer.TimedScope(logging.DEBUG, "node_execution") as ts:
             node = self.get_node(nid)
-            try:
-                output = getattr(node, method)(**kwargs)
-            except AttributeError as e:
-                raise AttributeError(
-                    f"An exception occurred in node '{nid}'\n{str(e)}"
-                ) from e
+            # Look up the outputs in the cache, if needed.
+            cache_key = None
+            output = None
+            if self._node_output_cache is not None:
+                cache_key = self._node_output_cache.get_key(node, method, kwargs)
+                if cache_key is not None:
+                    output = self._node_output_cache.get(cache_key, node, method)
+            cache_hit = output is not None
+            if output is None:
+                try:
+                    if process_pool is None:
+                        output = getattr(node, method)(**kwargs)
+                    else:
+                        future = process_pool.submit(
+                            _execute_node_method, node, method, kwargs
+                        )
+                        node, output = future.result()
+                        # Replace the node with the executed copy to keep the
+                        # state of the node (e.g., the fit state) computed by
+                        # the worker.
+                        self._nx_dag.nodes[nid]["stage"] = node
+                except AttributeError as e:
+                    raise AttributeError(
+                        f"An exception occurred in node '{nid}'\n{str(e)}"
+                    ) from e
+                if cache_key is not None:
+                    self._node_output_cache.put(cache_key, node, method, output)
+        if profiling_records is not None:
+            node_profiler.stop()
+            record = node_profiler.get_record(kwargs, output, cache_hit=cache_hit)
+            # Appending to a list is thread-safe.
+            profiling_records.append(record)
         # Update the node.
         for output_name in node.output_names:
             value = output[output_name]
+            if self._output_spill_dir is not None:
+                value = self._spill_output(nid, method, output_name, value)
             node._store_output(  # pylint: disable=protected-access
                 method, output_name, value
             )
@@ -739,6 +1087,22 @@ class DAG(hobject.PrintableMixin):
             )
 
 
+def _execute_node_method(
+    node: dtfcornode.Node,
+    method: dtfcornode.Method,
+    kwargs: Dict[str, Any],
+) -> Tuple[dtfcornode.Node, Dict[str, Any]]:
+    """
+    Execute `node.method(**kwargs)`.
+
+    This is a module function so that it can be run in a worker process.
+
+    :return: the executed node and the output of the method
+    """
+    output = getattr(node, method)(**kwargs)
+    return node, output
+
+
 # TODO(Grisha): consider creating a class `DagStatsComputer` and moving the
 # function (together with `DAG._write_prof_stats_to_dst_dir()`) there.
 def load_prof_stats_from_dst_dir(
@@ -5,7 +5,12 @@ import dataflow.core.dag_runner as dtfcodarun
 """
 
 import abc
+import collections
+import concurrent.futures
+import copy
+import itertools
 import logging
+import multiprocessing
 from typing import Generator, List, Optional, Tuple
 
 import pandas as pd
@@ -279,6 +284,8 @@ class RollingFitPredictDagRunner(DagRunner):
         predict_end_timestamp: pd.Timestamp,
         retraining_freq: str,
         retraining_lookback: int,
+        *,
+        num_workers: int = 1,
     ) -> None:
         """
         Constructor.
@@ -293,6 +300,10 @@ class RollingFitPredictDagRunner(DagRunner):
             sampling from predict_start_timestamp, while "1W" aligns on Sundays
         :param retraining_lookback: number of periods of past data to include
             in retraining, expressed in integral units of `retraining_freq`
+        :param num_workers: number of processes fitting and predicting the
+            retraining windows in parallel. With more than one worker each
+            window is run on a copy of the DAG, so the DAG passed to the
+            constructor is not modified
         """
         super().__init__(dag)
         # Save input parameters.
@@ -305,6 +316,8 @@ class RollingFitPredictDagRunner(DagRunner):
         self._retraining_freq = retraining_freq
         hdbg.dassert_isinstance(retraining_lookback, int)
         self._retraining_lookback = retraining_lookback
+        hdbg.dassert_lte(1, num_workers)
+        self._num_workers = num_workers
         # Generate retraining dates.
         self._retraining_datetimes = self.generate_retraining_datetimes(
             predict_start_timestamp=self._predict_start_timestamp,
@@ -418,28 +431,21 @@ class RollingFitPredictDagRunner(DagRunner):
         """
         Fit at each retraining date and predict until next retraining date.
 
+        The fit of each retraining window depends only on its training data, so
+        with `num_workers > 1` the windows are run in parallel, while the
+        results are still returned in chronological order.
+
         :return: the training time, fit `ResultBundle`, predict `ResultBundle`
         """
         _LOG.debug(
             "retraining_datetimes=%s",
             hpandas.df_to_str(self._retraining_datetimes),
         )
-        for row in self._retraining_datetimes.iterrows():
-            _LOG.debug("row=%s", row)
-            _LOG.debug("fit/predict cycle=%d", row[0])
-            #
-            fit_start = row[1].fit_start
-            fit_end = row[1].fit_end
-            fit_interval = (fit_start, fit_end)
-            fit_result_bundle = self._fit(fit_interval)
-            #
-            predict_start = row[1].predict_start
-            predict_end = row[1].predict_end
-            predict_interval = (fit_start, predict_end)
-            predict_result_bundle = self._predict(predict_interval, predict_start)
-            # TODO(gp): Better to return a pd.Timestamp rather than its representation.
-            training_datetime_str = fit_start.strftime("%Y%m%d_%H%M%S")
-            yield training_datetime_str, fit_result_bundle, predict_result_bundle
+        if self._num_workers == 1:
+            for row in self._retraining_datetimes.iterrows():
+                yield self._fit_predict_window(row)
+        else:
+            yield from self._fit_predict_in_parallel()
 
     @staticmethod
     def _left_align_timestamp_on_grid(
@@ -465,6 +471,60 @@ class RollingFitPredictDagRunner(DagRunner):
         )
         return left_aligned_timestamp
 
+    def _fit_predict_window(
+        self, row: Tuple[int, pd.Series]
+    ) -> Tuple[str, dtfcorebun.ResultBundle, dtfcorebun.ResultBundle]:
+        """
+        Fit and predict on a retraining window.
+
+        :param row: row of `_retraining_datetimes`, as returned by `iterrows()`
+        :return: the training time, fit `ResultBundle`, predict `ResultBundle`
+        """
+        _LOG.debug("row=%s", row)
+        _LOG.debug("fit/predict cycle=%d", row[0])
+        #
+        fit_start = row[1].fit_start
+        fit_end = row[1].fit_end
+        fit_interval = (fit_start, fit_end)
+        fit_result_bundle = self._fit(fit_interval)
+        #
+        predict_start = row[1].predict_start
+        predict_end = row[1].predict_end
+        predict_interval = (fit_start, predict_end)
+        predict_result_bundle = self._predict(predict_interval, predict_start)
+        # TODO(gp): Better to return a pd.Timestamp rather than its representation.
+        training_datetime_str = fit_start.strftime("%Y%m%d_%H%M%S")
+        return training_datetime_str, fit_result_bundle, predict_result_bundle
+
+    def _fit_predict_in_parallel(self) -> Generator:
+        """
+        Run the retraining windows in a pool of processes.
+        """
+        # Use `fork` so that the workers inherit this object instead of
+        # receiving it pickled, since DAGs typically contain lambdas.
+        mp_context = multiprocessing.get_context("fork")
+        rows = self._retraining_datetimes.iterrows()
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self._num_workers,
+            mp_context=mp_context,
+            initializer=_init_rolling_fit_predict_worker,
+            initargs=(self,),
+        ) as executor:
+            # Bound the number of windows in flight so that the results
+            # computed ahead of the consumer don't accumulate in memory.
+            max_num_pending = 2 * self._num_workers
+            futures: collections.deque = collections.deque(
+                executor.submit(_fit_predict_window_in_worker, row)
+                for row in itertools.islice(rows, max_num_pending)
+            )
+            while futures:
+                result = futures.popleft().result()
+                for row in itertools.islice(rows, 1):
+                    futures.append(
+                        executor.submit(_fit_predict_window_in_worker, row)
+                    )
+                yield result
+
     def _fit(
         self,
         interval: dtfcorutil.Intervals,
@@ -502,6 +562,30 @@ class RollingFitPredictDagRunner(DagRunner):
         return self._to_result_bundle(method, df_out, info)
 
 
+# `RollingFitPredictDagRunner` inherited by a worker process.
+_ROLLING_FIT_PREDICT_DAG_RUNNER: Optional[RollingFitPredictDagRunner] = None
+
+
+def _init_rolling_fit_predict_worker(
+    dag_runner: RollingFitPredictDagRunner,
+) -> None:
+    global _ROLLING_FIT_PREDICT_DAG_RUNNER
+    _ROLLING_FIT_PREDICT_DAG_RUNNER = dag_runner
+
+
+def _fit_predict_window_in_worker(
+    row: Tuple[int, pd.Series]
+) -> Tuple[str, dtfcorebun.ResultBundle, dtfcorebun.ResultBundle]:
+    """
+    Fit and predict a retraining window in a worker process.
+    """
+    hdbg.dassert_is_not(_ROLLING_FIT_PREDICT_DAG_RUNNER, None)
+    # Run each window on a fresh copy of the DAG, so that the results don't
+    # depend on which windows were run before by the same worker.
+    dag_runner = copy.deepcopy(_ROLLING_FIT_PREDICT_DAG_RUNNER)
+    return dag_runner._fit_predict_window(row)  # pylint: disable=protected-access
+
+
 # #############################################################################
 # IncrementalDagRunner
 # #############################################################################
@@ -148,12 +148,19 @@ class Node(_Node):
         hdbg.dassert_in(method, self._output_vals.keys())
         return self._output_vals[method]
 
-    def free(self, *, only_warning: bool = True) -> None:
+    def free(
+        self,
+        *,
+        method: Optional[Method] = None,
+        only_warning: bool = True,
+    ) -> None:
         """
-        Deallocate all the data stored inside the node.
+        Deallocate the data stored inside the node.
 
-        Note that this should be called only after the node is not needed anymore.
+        Note that this should be called only after the data is not needed anymore.
 
+        :param method: deallocate only the outputs of `method`. `None` means all
+            the outputs of the node
         :param only_warning=True: raise an assertion or a warning if
             the memory is not actually reported as deallocated.
         """
@@ -176,28 +183,31 @@ class Node(_Node):
         memory_as_str = str(hloggin.get_memory_usage_as_str(process=None))
         msg = "nid='%s', before free: memory=%s" % (self._nid, memory_as_str)
         _log(msg)
+        if method is None:
+            methods = list(self._output_vals.keys())
+        else:
+            methods = [method] if method in self._output_vals else []
         # Traverse the data structure accumulating used memory.
         rss_used_mem_in_gb = 0.0
-        for method, node_output in self._output_vals.items():
+        for method_ in methods:
+            node_output = self._output_vals[method_]
             for name in node_output:
                 obj = node_output[name]
                 used_mem_tmp = obj.memory_usage(deep=True).sum()
                 _LOG.debug(
                     "Removing %s:%s -> type=%s, mem=%s refs=%s",
-                    method,
+                    method_,
                     name,
                     type(obj),
                     hintros.format_size(used_mem_tmp),
                     gc.get_referrers(obj),
                 )
                 rss_used_mem_in_gb += used_mem_tmp / (1024**3)
-        # Remove all the outstanding references to the objects.
-        del obj
-        del self._output_vals
+                # Remove all the outstanding references to the object.
+                del obj
+            del self._output_vals[method_]
         # Force garbage collection.
         gc.collect()
-        # Recreate an empty data structure for the next DAG execution.
-        self._output_vals: Dict[Method, NodeOutput] = {}  # type: ignore[no-redef]
         #
         rss_mem_after_in_gb = hloggin.get_memory_usage(process=None)[0]
         memory_as_str = str(hloggin.get_memory_usage_as_str(process=None))
@@ -0,0 +1,647 @@
+"""
+Import as:
+
+import dataflow.core.node_output_cache as dtfcnoouca
+"""
+
+import collections
+import datetime
+import enum
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+import sys
+import threading
+import types
+import uuid
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import dataflow.core.node as dtfcornode
+import dataflow.core.nodes.base as dtfconobas
+import helpers.hdbg as hdbg
+import helpers.hio as hio
+import helpers.hpickle as hpickle
+import helpers.hprint as hprint
+
+_LOG = logging.getLogger(__name__)
+
+# Bump this value to invalidate all the cached entries when the format of the
+# keys or of the stored data changes.
+_CACHE_FORMAT_VERSION = 3
+
+# Attributes of a node that don't affect the outputs of a method (e.g., the
+# outputs themselves or the node id, since the same node in different DAGs
+# produces the same outputs).
+_NODE_ATTRIBUTES_TO_SKIP = (
+    "_nid",
+    "_output_vals",
+    "_info",
+    "_incremental_predict_state",
+)
+
+
+# #############################################################################
+# Fingerprinting
+# #############################################################################
+
+
+class _UnsupportedObjectError(Exception):
+    """
+    Raised when an object can't be fingerprinted.
+    """
+
+
+def _get_fingerprint(obj: Any, visited: Set[int]) -> Any:
+    """
+    Return a representation of `obj` that changes when `obj` changes.
+
+    The representation is built out of builtin types, so that it can be
+    serialized deterministically with `repr()`.
+
+    :raises _UnsupportedObjectError: if `obj` is not supported, e.g., an object
+        with state that is not visible (e.g., a connection to a DB)
+    """
+    if obj is None or isinstance(obj, (bool, int, float, str, bytes)):
+        return (type(obj).__name__, obj)
+    if isinstance(obj, enum.Enum):
+        return ("enum", _get_type_name(type(obj)), obj.name)
+    if isinstance(
+        obj,
+        (
+            datetime.date,
+            datetime.time,
+            datetime.timedelta,
+            pd.Timestamp,
+            pd.Timedelta,
+            pd.DateOffset,
+            np.generic,
+            np.dtype,
+        ),
+    ):
+        return (_get_type_name(type(obj)), repr(obj))
+    if isinstance(obj, type):
+        return (
+            "type",
+            _get_type_name(obj),
+            _get_module_fingerprint(obj.__module__),
+        )
+    # Avoid infinite recursion on containers and functions referring to
+    # themselves.
+    if id(obj) in visited:
+        raise _UnsupportedObjectError(f"Cycle detected for {type(obj)}")
+    visited = visited | {id(obj)}
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        return ("pandas", _get_pandas_fingerprint(obj))
+    if isinstance(obj, np.ndarray):
+        hasher = hashlib.sha256(np.ascontiguousarray(obj).view(np.uint8))
+        return ("ndarray", str(obj.dtype), obj.shape, hasher.hexdigest())
+    if isinstance(obj, (list, tuple)):
+        return (
+            type(obj).__name__,
+            tuple(_get_fingerprint(v, visited) for v in obj),
+        )
+    if isinstance(obj, (set, frozenset)):
+        return (
+            type(obj).__name__,
+            tuple(sorted(repr(_get_fingerprint(v, visited)) for v in obj)),
+        )
+    if isinstance(obj, dict):
+        # Preserve the order of the keys since it can affect the results (e.g.,
+        # the order of the columns).
+        return (
+            "dict",
+            tuple(
+                (_get_fingerprint(k, visited), _get_fingerprint(v, visited))
+                for k, v in obj.items()
+            ),
+        )
+    if isinstance(obj, functools.partial):
+        return (
+            "partial",
+            _get_fingerprint(obj.func, visited),
+            _get_fingerprint(obj.args, visited),
+            _get_fingerprint(obj.keywords, visited),
+        )
+    if isinstance(obj, types.FunctionType):
+        return ("function", _get_function_fingerprint(obj, visited))
+    if isinstance(obj, (types.BuiltinFunctionType, np.ufunc)):
+        module = getattr(obj, "__module__", None)
+        return ("builtin", module, obj.__name__)
+    raise _UnsupportedObjectError(f"Unsupported type {type(obj)}")
+
+
+def _get_type_name(type_: type) -> str:
+    return f"{type_.__module__}.{type_.__qualname__}"
+
+
+@functools.lru_cache(maxsize=None)
+def _get_module_fingerprint(module_name: str) -> Optional[str]:
+    """
+    Return a hash of the source file of a module.
+
+    The hash is computed once per process, since the code of a module doesn't
+    change after it is imported.
+
+    :return: hash or `None` if the module doesn't have a source file (e.g., a
+        builtin module)
+    """
+    module = sys.modules.get(module_name)
+    file_name = getattr(module, "__file__", None)
+    if file_name is None or not os.path.isfile(file_name):
+        return None
+    with open(file_name, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_module_dependencies_fingerprint(
+    module_name: str,
+) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """
+    Return the hashes of a module and of the modules it imports directly.
+
+    A module imports another module either as a module (e.g., `import
+    core.signal_processing as csigproc`) or importing objects from it (e.g.,
+    `from core.finance import compute_returns`). The modules imported
+    indirectly (i.e., by the imported modules) are not considered.
+    """
+    module_names = {module_name}
+    module = sys.modules.get(module_name)
+    module_objs = list(vars(module).values()) if module is not None else []
+    for obj in module_objs:
+        if isinstance(obj, types.ModuleType):
+            module_names.add(obj.__name__)
+        elif isinstance(obj, (type, types.FunctionType)):
+            obj_module_name = getattr(obj, "__module__", None)
+            if isinstance(obj_module_name, str):
+                module_names.add(obj_module_name)
+    fingerprint = tuple(
+        (name, _get_module_fingerprint(name)) for name in sorted(module_names)
+    )
+    return fingerprint
+
+
+def _get_pandas_fingerprint(obj: Any) -> Tuple[str, ...]:
+    """
+    Hash the values, the index, and the metadata of a pandas object.
+    """
+    try:
+        hashes = pd.util.hash_pandas_object(obj, index=True).values
+    except TypeError as e:
+        # E.g., columns with unhashable objects.
+        raise _UnsupportedObjectError(str(e)) from e
+    hasher = hashlib.sha256(hashes.tobytes())
+    # Hash also the metadata that is not reflected in the values (e.g., the
+    # column names, the types, the timezone and the frequency of the index).
+    index = obj if isinstance(obj, pd.Index) else obj.index
+    index_metadata = (index.names, index.dtype, getattr(index, "freqstr", None))
+    if isinstance(obj, pd.DataFrame):
+        metadata = (obj.columns.tolist(), obj.dtypes.tolist(), index_metadata)
+    else:
+        metadata = (obj.name, obj.dtype, index_metadata)
+    hasher.update(repr(metadata).encode())
+    return (type(obj).__name__, hasher.hexdigest())
+
+
+def _get_function_fingerprint(
+    func: types.FunctionType, visited: Set[int]
+) -> Tuple[Any, ...]:
+    """
+    Fingerprint a function from its code and the values it refers to.
+
+    Since lambdas have all the same name, we can't rely only on the name of the
+    function.
+    """
+    closure = tuple(
+        _get_fingerprint(cell.cell_contents, visited)
+        for cell in func.__closure__ or ()
+    )
+    defaults = _get_fingerprint(func.__defaults__, visited)
+    kwdefaults = _get_fingerprint(func.__kwdefaults__, visited)
+    # The globals the function refers to (e.g., a helper function or a
+    # constant) can change without changing the code of the function.
+    global_names = sorted(set(_get_global_names(func.__code__)))
+    globals_ = tuple(
+        (name, _get_global_fingerprint(func.__globals__[name], visited))
+        for name in global_names
+        if name in func.__globals__
+    )
+    return (
+        func.__module__,
+        func.__qualname__,
+        _get_code_fingerprint(func.__code__),
+        closure,
+        defaults,
+        kwdefaults,
+        globals_,
+    )
+
+
+def _get_global_names(code: types.CodeType) -> List[str]:
+    """
+    Return the names used by a code object and by the code nested in it.
+
+    The names include the globals, but also the attributes (e.g., `abs` in
+    `df.abs()`).
+    """
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.extend(_get_global_names(const))
+    return names
+
+
+def _get_global_fingerprint(obj: Any, visited: Set[int]) -> Any:
+    """
+    Fingerprint a global referred to by a function.
+    """
+    if isinstance(obj, types.ModuleType):
+        return ("module", obj.__name__, _get_module_fingerprint(obj.__name__))
+    if id(obj) in visited:
+        # E.g., a recursive function.
+        return ("visited", _get_type_name(type(obj)))
+    try:
+        fingerprint = _get_fingerprint(obj, visited)
+    except _UnsupportedObjectError:
+        # Assume that the globals that can't be fingerprinted (e.g., a logger)
+        # don't affect the results.
+        fingerprint = ("unsupported", _get_type_name(type(obj)))
+    return fingerprint
+
+
+def _get_code_fingerprint(code: types.CodeType) -> Tuple[Any, ...]:
+    consts = []
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            # E.g., a lambda defined inside the function.
+            const = _get_code_fingerprint(const)
+        elif isinstance(const, frozenset):
+            # The order of the elements of a set depends on the hash seed.
+            const = sorted(repr(v) for v in const)
+        consts.append(repr(const))
+    return (code.co_code, tuple(consts), code.co_names)
+
+
+def get_node_fingerprint(node: dtfcornode.Node) -> Optional[str]:
+    """
+    Return a hash of the class and of the state of a node.
+
+    The hash of the class includes the source of the modules defining the class
+    and its bases, and of the modules they import directly, so that the cached
+    outputs are invalidated when the implementation of the node changes.
+
+    :return: hash or `None` if the node contains state that can't be
+        fingerprinted, e.g., a client reading data from an external source
+    """
+    attributes = collections.OrderedDict(
+        (k, v)
+        for k, v in sorted(vars(node).items())
+        if k not in _NODE_ATTRIBUTES_TO_SKIP
+    )
+    classes = tuple(
+        (
+            _get_type_name(cls),
+            _get_module_dependencies_fingerprint(cls.__module__),
+        )
+        for cls in type(node).__mro__
+        if cls is not object
+    )
+    try:
+        fingerprint = (
+            classes,
+            _get_fingerprint(attributes, set()),
+        )
+    except _UnsupportedObjectError as e:
+        _LOG.debug("Can't fingerprint node nid='%s': %s", node.nid, str(e))
+        return None
+    return hashlib.sha256(repr(fingerprint).encode()).hexdigest()
+
+
+# #############################################################################
+# NodeOutputCache
+# #############################################################################
+
+
+class NodeOutputCache:
+    """
+    Store the outputs of DAG nodes on disk, keyed by the content of the node
+    and of its inputs.
+
+    The key of a node execution is a hash of:
+    - the version of the cache, set by the user
+    - the class and the state of the node (e.g., its parameters, fit state,
+      fit / predict intervals), including the source of the modules defining
+      the class of the node and of the modules they import directly, and the
+      globals referred to by its functions
+    - the method executed (e.g., `fit`, `predict`)
+    - the inputs of the method
+
+    Thus a node with the same configuration and the same inputs can reuse the
+    outputs computed in a previous run, e.g., when running many configs that
+    share the upstream part of the DAG and differ only in some downstream
+    node.
+
+    The key doesn't cover code that the node reaches only indirectly, e.g., a
+    helper in a module imported by a module that the node imports, or data
+    read from outside the DAG. A change in that code still returns the
+    previously cached outputs, so the user should change `version` (or clear
+    the cache) when changing it.
+
+    Each entry is stored in a directory `{dir_name}/{key}` with:
+    - a Parquet file for each output
+    - a pickle file with the state of the node after the execution (e.g., the
+      fit state and the info)
+
+    The least recently used entries are evicted when the size of the cache
+    exceeds `max_size_in_bytes`.
+    """
+
+    def __init__(
+        self,
+        dir_name: str,
+        *,
+        max_size_in_bytes: Optional[int] = None,
+        version: str = "",
+    ) -> None:
+        """
+        Constructor.
+
+        :param dir_name: directory storing the cache. It can be shared by
+            different processes
+        :param max_size_in_bytes: max size of the data on disk. `None` means
+            no limit
+        :param version: string added to all the keys, to invalidate the
+            entries computed with a different version of code that the key
+            doesn't cover (e.g., "v2" or a git hash)
+        """
+        _LOG.debug(hprint.to_str("dir_name max_size_in_bytes version"))
+        hdbg.dassert_isinstance(dir_name, str)
+        if max_size_in_bytes is not None:
+            hdbg.dassert_lte(0, max_size_in_bytes)
+        hdbg.dassert_isinstance(version, str)
+        self._dir_name = dir_name
+        self._max_size_in_bytes = max_size_in_bytes
+        self._version = version
+        hio.create_dir(self._dir_name, incremental=True)
+        # Statistics about the cache usage. The lock protects them when the
+        # DAG runs nodes in multiple threads.
+        self._stats: Dict[str, int] = collections.OrderedDict(
+            [("hits", 0), ("misses", 0), ("writes", 0), ("evictions", 0)]
+        )
+        self._stats_lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        txt = (
+            f"{self.__class__.__name__}(dir_name='{self._dir_name}', "
+            f"max_size_in_bytes={self._max_size_in_bytes}, "
+            f"version='{self._version}')"
+        )
+        return txt
+
+    @property
+    def dir_name(self) -> str:
+        return self._dir_name
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return the number of hits, misses, writes, and evictions.
+        """
+        with self._stats_lock:
+            stats = self._stats.copy()
+        return stats
+
+    def get_key(
+        self,
+        node: dtfcornode.Node,
+        method: dtfcornode.Method,
+        inputs: Dict[str, Any],
+    ) -> Optional[str]:
+        """
+        Compute the key for the execution of `node.method(**inputs)`.
+
+        :return: key or `None` if the execution can't be cached
+        """
+        node_fingerprint = get_node_fingerprint(node)
+        if node_fingerprint is None:
+            return None
+        try:
+            inputs_fingerprint = _get_fingerprint(
+                collections.OrderedDict(sorted(inputs.items())), set()
+            )
+        except _UnsupportedObjectError as e:
+            _LOG.debug("Can't fingerprint inputs of nid='%s': %s", node.nid, e)
+            return None
+        fingerprint = (
+            _CACHE_FORMAT_VERSION,
+            self._version,
+            node_fingerprint,
+            method,
+            inputs_fingerprint,
+        )
+        key = hashlib.sha256(repr(fingerprint).encode()).hexdigest()
+        return key
+
+    def get(
+        self, key: str, node: dtfcornode.Node, method: dtfcornode.Method
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the outputs for `key` and restore the state of `node`.
+
+        :return: outputs of the node method, or `None` if `key` is not cached
+        """
+        entry_dir = self._get_entry_dir(key)
+        if not os.path.exists(os.path.join(entry_dir, "state.pkl")):
+            self._increment_stat("misses")
+            return None
+        try:
+            state = hpickle.from_pickle(os.path.join(entry_dir, "state.pkl"))
+            output = collections.OrderedDict()
+            for idx, output_name in enumerate(state["output_names"]):
+                file_name = os.path.join(entry_dir, f"output.{idx}.parquet")
+                output[output_name] = _read_df(file_name)
+        except (OSError, EOFError, pickle.UnpicklingError, pa.ArrowException):
+            # The entry might have been evicted by another process.
+            _LOG.warning("Can't read cached entry '%s'", entry_dir)
+            self._increment_stat("misses")
+            return None
+        # Restore the state of the node.
+        if isinstance(node, dtfconobas.FitPredictNode):
+            if state["fit_state"] is not None:
+                node.set_fit_state(state["fit_state"])
+            if state["info"] is not None:
+                # pylint: disable=protected-access
+                node._info[method] = state["info"]
+        # Mark the entry as recently used.
+        os.utime(entry_dir)
+        self._increment_stat("hits")
+        _LOG.debug("Cache hit for nid='%s' method='%s'", node.nid, method)
+        return output
+
+    def put(
+        self,
+        key: str,
+        node: dtfcornode.Node,
+        method: dtfcornode.Method,
+        output: Dict[str, Any],
+    ) -> None:
+        """
+        Store the outputs of the execution of `node.method()` under `key`.
+
+        Outputs that are not dataframes or can't be stored in Parquet are not
+        cached.
+        """
+        entry_dir = self._get_entry_dir(key)
+        if os.path.exists(entry_dir):
+            return
+        if not all(isinstance(v, pd.DataFrame) for v in output.values()):
+            _LOG.debug("Can't cache non-dataframe outputs of nid='%s'", node.nid)
+            return
+        state = {
+            "output_names": list(output.keys()),
+            "fit_state": None,
+            "info": None,
+        }
+        if isinstance(node, dtfconobas.FitPredictNode):
+            if method == "fit":
+                state["fit_state"] = node.get_fit_state()
+            state["info"] = node._info.get(  # pylint: disable=protected-access
+                method
+            )
+        # Write into a temporary directory and then rename it so that other
+        # processes never see a partially written entry.
+        tmp_dir = os.path.join(self._dir_name, f"tmp.{key}.{uuid.uuid4().hex}")
+        hio.create_dir(tmp_dir, incremental=False)
+        try:
+            for idx, df in enumerate(output.values()):
+                file_name = os.path.join(tmp_dir, f"output.{idx}.parquet")
+                _write_df(df, file_name)
+                # Make sure that the data is read back unchanged (e.g., some
+                # types of columns don't round-trip through Parquet).
+                df_tmp = _read_df(file_name)
+                if not (
+                    df.equals(df_tmp)
+                    and df.columns.equals(df_tmp.columns)
+                    and df.index.equals(df_tmp.index)
+                ):
+                    raise ValueError("Data doesn't round-trip through Parquet")
+            hpickle.to_pickle(state, os.path.join(tmp_dir, "state.pkl"))
+        except (
+            ValueError,
+            TypeError,
+            AttributeError,
+            pickle.PicklingError,
+            pa.ArrowException,
+        ) as e:
+            _LOG.debug("Can't cache outputs of nid='%s': %s", node.nid, str(e))
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Another process stored the same entry in the meantime.
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        self._increment_stat("writes")
+        self._evict()
+
+    def clear(self) -> None:
+        """
+        Delete all the cached entries.
+        """
+        for entry_dir in self._get_entry_dirs():
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+    def get_size_in_bytes(self) -> int:
+        """
+        Return the size on disk of the cached entries.
+        """
+        size = sum(_get_dir_size(d) for d in self._get_entry_dirs())
+        return size
+
+    def _increment_stat(self, stat: str) -> None:
+        with self._stats_lock:
+            self._stats[stat] += 1
+
+    def _get_entry_dir(self, key: str) -> str:
+        return os.path.join(self._dir_name, key)
+
+    def _get_entry_dirs(self) -> List[str]:
+        entry_dirs = [
+            os.path.join(self._dir_name, name)
+            for name in os.listdir(self._dir_name)
+            if not name.startswith("tmp.")
+        ]
+        return entry_dirs
+
+    def _evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache fits its size.
+        """
+        if self._max_size_in_bytes is None:
+            return
+        entries = []
+        for entry_dir in self._get_entry_dirs():
+            try:
+                entries.append(
+                    (
+                        os.path.getmtime(entry_dir),
+                        entry_dir,
+                        _get_dir_size(entry_dir),
+                    )
+                )
+            except OSError:
+                # The entry was evicted by another process.
+                continue
+        size = sum(entry[2] for entry in entries)
+        for _, entry_dir, entry_size in sorted(entries):
+            if size <= self._max_size_in_bytes:
+                break
+            _LOG.debug("Evicting '%s'", entry_dir)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            size -= entry_size
+            self._increment_stat("evictions")
+
+
+def _get_dir_size(dir_name: str) -> int:
+    size = 0
+    for name in os.listdir(dir_name):
+        size += os.path.getsize(os.path.join(dir_name, name))
+    return size
+
+
+def _write_df(df: pd.DataFrame, file_name: str) -> None:
+    """
+    Save a dataframe so that it can be read back unchanged.
+
+    We use `pyarrow` directly instead of `hparquet.to_parquet()` since:
+    - we need to preserve timestamps with nanosecond resolution
+    - pandas rejects column names that are not strings (e.g., asset ids)
+    """
+    table = pa.Table.from_pandas(df)
+    # Store the frequency of the index, which is not saved by Parquet.
+    freq = getattr(df.index, "freqstr", None)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b"node_output_cache.freq"] = str(freq).encode()
+    table = table.replace_schema_metadata(metadata)
+    pq.write_table(table, file_name, version="2.6")
+
+
+def _read_df(file_name: str) -> pd.DataFrame:
+    table = pq.read_table(file_name)
+    df = table.to_pandas()
+    freq = table.schema.metadata.get(b"node_output_cache.freq", b"None")
+    freq = freq.decode()
+    if freq != "None":
+        try:
+            df.index.freq = freq
+        except ValueError:
+            _LOG.warning("Can't restore freq='%s' for '%s'", freq, file_name)
+    return df
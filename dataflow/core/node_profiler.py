@@ -0,0 +1,333 @@
+"""
+Collect structured information about the execution of the DAG nodes.
+
+Each execution of a node method generates a record with the resources used
+(e.g., wall and CPU time, memory) and the size of the data at the interface of
+the node. The records of a DAG run are saved as a single Parquet file so that
+they can be loaded and analyzed as a dataframe, instead of parsing the text
+files written by `DAG._write_prof_stats_to_dst_dir()`.
+
+Import as:
+
+import dataflow.core.node_profiler as dtfcnoprof
+"""
+
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+import dataflow.core.node as dtfcornode
+import helpers.hdbg as hdbg
+import helpers.hio as hio
+import helpers.hparquet as hparque
+import helpers.hprint as hprint
+import helpers.hwall_clock_time as hwacltim
+
+_LOG = logging.getLogger(__name__)
+
+# Name of the dir, under the DAG `dst_dir`, storing the profiling records.
+NODE_PROFILING_STATS_DIR = "node_io.prof_stats"
+
+# Columns of the profiling records.
+NODE_PROFILING_STATS_COLUMNS = [
+    # Bar being processed by the DAG, if any.
+    "bar_timestamp",
+    # Machine wall clock time (in UTC) when the execution started.
+    "start_timestamp",
+    "method",
+    "topological_id",
+    "nid",
+    "wall_time_in_secs",
+    # CPU time of the thread executing the node. The CPU time spent in a
+    # worker process (i.e., in "process" execution mode) is not accounted for.
+    "cpu_time_in_secs",
+    # Change of the resident memory of the process.
+    "rss_diff_in_bytes",
+    # Increase of the peak resident memory of the process.
+    "max_rss_diff_in_bytes",
+    "num_input_rows",
+    "input_size_in_bytes",
+    "num_output_rows",
+    "output_size_in_bytes",
+    # Whether the outputs were retrieved from the node output cache.
+    "cache_hit",
+    "pid",
+    "thread_id",
+]
+
+
+# #############################################################################
+# NodeProfiler
+# #############################################################################
+
+
+class NodeProfiler:
+    """
+    Measure the resources used by a single execution of a node method.
+
+    E.g.,
+    ```
+    profiler = NodeProfiler(topological_id, nid, method)
+    profiler.start()
+    output = node.fit(**kwargs)
+    profiler.stop()
+    record = profiler.get_record(kwargs, output, cache_hit=False)
+    ```
+    """
+
+    def __init__(
+        self,
+        topological_id: int,
+        nid: dtfcornode.NodeId,
+        method: dtfcornode.Method,
+    ) -> None:
+        self._topological_id = topological_id
+        self._nid = nid
+        self._method = method
+        self._start_timestamp = None
+        self._start_state: Optional[Dict[str, Any]] = None
+        self._end_state: Optional[Dict[str, Any]] = None
+
+    def start(self) -> None:
+        hdbg.dassert_is(self._start_state, None, "Profiler already started")
+        self._start_timestamp = hwacltim.get_machine_wall_clock_time()
+        self._start_state = _get_resource_state()
+
+    def stop(self) -> None:
+        hdbg.dassert_is_not(self._start_state, None, "Profiler not started")
+        hdbg.dassert_is(self._end_state, None, "Profiler already stopped")
+        self._end_state = _get_resource_state()
+
+    def get_record(
+        self,
+        inputs: Dict[str, Any],
+        outputs: Dict[str, Any],
+        *,
+        cache_hit: bool,
+    ) -> Dict[str, Any]:
+        """
+        Return the profiling record of the node execution.
+
+        :param inputs: the inputs of the node method (e.g., `{"df_in": df}`)
+        :param outputs: the outputs of the node method (e.g., `{"df_out": df}`)
+        :param cache_hit: whether the outputs were retrieved from a cache
+        :return: a dict with keys `NODE_PROFILING_STATS_COLUMNS`
+        """
+        hdbg.dassert_is_not(self._end_state, None, "Profiler not stopped")
+        start_state = self._start_state
+        end_state = self._end_state
+        bar_timestamp = hwacltim.get_current_bar_timestamp()
+        num_input_rows, input_size_in_bytes = _get_data_size(inputs)
+        num_output_rows, output_size_in_bytes = _get_data_size(outputs)
+        record = {
+            "bar_timestamp": bar_timestamp,
+            "start_timestamp": pd.Timestamp(self._start_timestamp, tz="UTC"),
+            "method": self._method,
+            "topological_id": self._topological_id,
+            "nid": str(self._nid),
+            "wall_time_in_secs": end_state["wall_time"]
+            - start_state["wall_time"],
+            "cpu_time_in_secs": end_state["cpu_time"] - start_state["cpu_time"],
+            "rss_diff_in_bytes": end_state["rss"] - start_state["rss"],
+            "max_rss_diff_in_bytes": end_state["max_rss"]
+            - start_state["max_rss"],
+            "num_input_rows": num_input_rows,
+            "input_size_in_bytes": input_size_in_bytes,
+            "num_output_rows": num_output_rows,
+            "output_size_in_bytes": output_size_in_bytes,
+            "cache_hit": cache_hit,
+            "pid": os.getpid(),
+            "thread_id": threading.get_ident(),
+        }
+        hdbg.dassert_eq(list(record.keys()), NODE_PROFILING_STATS_COLUMNS)
+        return record
+
+
+def _get_resource_state() -> Dict[str, Any]:
+    """
+    Return a snapshot of the resources used by the current process / thread.
+    """
+    import psutil
+
+    # `ru_maxrss` is in KB on Linux and in bytes on macOS.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        max_rss *= 1024
+    state = {
+        "wall_time": time.perf_counter(),
+        "cpu_time": time.thread_time(),
+        "rss": psutil.Process().memory_info().rss,
+        "max_rss": max_rss,
+    }
+    return state
+
+
+def _get_data_size(values: Dict[str, Any]) -> Tuple[int, int]:
+    """
+    Return the total number of rows and bytes of the dataframes in `values`.
+
+    Values that are not dataframes or series (e.g., a fit state) are ignored.
+    """
+    num_rows = 0
+    size_in_bytes = 0
+    for value in values.values():
+        if isinstance(value, pd.DataFrame):
+            num_rows += value.shape[0]
+            size_in_bytes += int(value.memory_usage(deep=True).sum())
+        elif isinstance(value, pd.Series):
+            num_rows += value.shape[0]
+            size_in_bytes += int(value.memory_usage(deep=True))
+    return num_rows, size_in_bytes
+
+
+# #############################################################################
+# Save / load profiling records.
+# #############################################################################
+
+
+def save_node_profiling_stats_to_dst_dir(
+    records: List[Dict[str, Any]],
+    dst_dir: str,
+    method: dtfcornode.Method,
+) -> str:
+    """
+    Save the profiling records of a DAG run as a Parquet file.
+
+    The file has a format like:
+    ```
+    {dst_dir}/
+        node_io.prof_stats/
+            {method}.{bar_timestamp}.{machine_timestamp}.parquet
+    ```
+    E.g.,
+    ```
+        system_log_dir/20220808/dag/
+            node_io.prof_stats/
+                predict.20220808_161500.20220808_161502123456.parquet
+    ```
+
+    :param records: profiling records built by `NodeProfiler.get_record()`
+    :param dst_dir: dir that contains the DAG output
+    :param method: DAG method that generated the records
+    :return: path to the saved file
+    """
+    hdbg.dassert_lt(0, len(records))
+    df = pd.DataFrame(records, columns=NODE_PROFILING_STATS_COLUMNS)
+    # Make sure the column has a consistent type also when there is no bar.
+    df["bar_timestamp"] = pd.to_datetime(df["bar_timestamp"])
+    bar_timestamp = hwacltim.get_current_bar_timestamp(as_str=True)
+    # Use the machine timestamp to distinguish multiple runs for the same bar.
+    machine_timestamp = hwacltim.get_machine_wall_clock_time(
+        as_str=True, include_msec=True
+    )
+    file_name = f"{method}.{bar_timestamp}.{machine_timestamp}.parquet"
+    file_name = os.path.join(dst_dir, NODE_PROFILING_STATS_DIR, file_name)
+    hparque.to_parquet(df, file_name)
+    _LOG.debug("Saved profiling stats to '%s'", file_name)
+    return file_name
+
+
+def has_node_profiling_stats(dst_dir: str) -> bool:
+    """
+    Return whether `dst_dir` contains profiling records of DAG runs.
+    """
+    dir_name = os.path.join(dst_dir, NODE_PROFILING_STATS_DIR)
+    return os.path.isdir(dir_name)
+
+
+def load_node_profiling_stats_from_dst_dir(dst_dir: str) -> pd.DataFrame:
+    """
+    Load the profiling records of all the DAG runs saved in `dst_dir`.
+
+    This function is mirroring `save_node_profiling_stats_to_dst_dir()`.
+
+    :param dst_dir: dir that contains the DAG output
+    :return: one row per execution of a node method, sorted by time of
+        execution, e.g.,
+        ```
+          bar_timestamp              start_timestamp                   method  topological_id  nid        wall_time_in_secs ...
+        0 2023-02-21 02:55:00-05:00  2023-02-21 07:55:01.123000+00:00  predict 0               read_data  11.483
+        1 2023-02-21 02:55:00-05:00  2023-02-21 07:55:12.606000+00:00  predict 1               resample   2.030
+        ```
+    """
+    dir_name = os.path.join(dst_dir, NODE_PROFILING_STATS_DIR)
+    hdbg.dassert_dir_exists(dir_name)
+    file_names = hio.listdir(
+        dir_name, "*.parquet", only_files=True, use_relative_paths=False
+    )
+    hdbg.dassert_lt(0, len(file_names), "No profiling stats in '%s'", dir_name)
+    dfs = [hparque.from_parquet(file_name) for file_name in sorted(file_names)]
+    df = pd.concat(dfs, axis=0, ignore_index=True)
+    df = df.sort_values(["start_timestamp", "topological_id"])
+    df = df.reset_index(drop=True)
+    return df
+
+
+# #############################################################################
+# Chrome trace.
+# #############################################################################
+
+
+def get_chrome_trace(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Convert profiling records into the Chrome trace event format.
+
+    The result can be saved as JSON and visualized with `chrome://tracing` or
+    https://ui.perfetto.dev, with one timeline per thread executing the nodes.
+
+    :param df: profiling records as returned by
+        `load_node_profiling_stats_from_dst_dir()`
+    :return: a dict like `{"traceEvents": [...], "displayTimeUnit": "ms"}`
+    """
+    hdbg.dassert_is_subset(NODE_PROFILING_STATS_COLUMNS, df.columns)
+    events = []
+    for _, row in df.iterrows():
+        # Chrome traces use microseconds.
+        ts = row["start_timestamp"].value / 1e3
+        dur = row["wall_time_in_secs"] * 1e6
+        args = {
+            col: row[col]
+            for col in [
+                "cpu_time_in_secs",
+                "rss_diff_in_bytes",
+                "max_rss_diff_in_bytes",
+                "num_input_rows",
+                "input_size_in_bytes",
+                "num_output_rows",
+                "output_size_in_bytes",
+                "cache_hit",
+            ]
+        }
+        # Convert the numpy scalars so that the result can be serialized.
+        args = {k: v.item() if hasattr(v, "item") else v for k, v in args.items()}
+        args["bar_timestamp"] = str(row["bar_timestamp"])
+        event = {
+            "name": f"{row['method']}.{row['topological_id']}.{row['nid']}",
+            "cat": row["method"],
+            "ph": "X",
+            "ts": ts,
+            "dur": dur,
+            "pid": int(row["pid"]),
+            "tid": int(row["thread_id"]),
+            "args": args,
+        }
+        events.append(event)
+    trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+    return trace
+
+
+def save_chrome_trace(df: pd.DataFrame, file_name: str) -> None:
+    """
+    Save profiling records as a Chrome trace JSON file.
+
+    See `get_chrome_trace()` for params.
+    """
+    _LOG.debug(hprint.to_str("file_name"))
+    trace = get_chrome_trace(df)
+    hio.to_json(file_name, trace)
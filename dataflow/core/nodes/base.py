@@ -57,6 +57,10 @@ class FitPredictNode(dtfcornode.Node, abc.ABC):
             outputs = ["df_out"]
         super().__init__(nid, inputs, outputs)
         self._info: collections.OrderedDict = collections.OrderedDict()
+        # State used to run `predict()` only on the new rows of the input (see
+        # `set_incremental_predict()`).
+        self._incremental_predict = False
+        self._incremental_predict_state: Optional[Dict[str, Any]] = None
 
     @abc.abstractmethod
     def fit(self, df_in: pd.DataFrame) -> "FitPredictNode.NodeOutput":
@@ -73,6 +77,54 @@ class FitPredictNode(dtfcornode.Node, abc.ABC):
     def set_fit_state(self, fit_state: "FitPredictNode.NodeState") -> None:
         _ = self, fit_state
 
+    def set_incremental_predict(self, incremental_predict: bool) -> None:
+        """
+        Enable / disable running `predict()` only on the new rows of the input.
+
+        This is useful when the node is invoked repeatedly on a window of data
+        that moves forward (e.g., in a real-time system, where the source node
+        returns the last N bars of data at every bar).
+
+        The node needs to declare through `get_incremental_predict_window()`
+        how many rows of the input are needed to compute the output for a row.
+        Nodes that don't support incremental computation are always run on
+        the entire input.
+        """
+        hdbg.dassert_isinstance(incremental_predict, bool)
+        self._incremental_predict = incremental_predict
+        self._incremental_predict_state = None
+
+    def get_incremental_predict_window(self) -> Optional[Tuple[int, int]]:
+        """
+        Return the number of rows needed to compute the output for a row.
+
+        :return: `(lookback, lookahead)` such that the output of `predict()` for
+            the row `t` depends only on the input rows in
+            `[t - lookback, t + lookahead]`, or `None` if the output can't be
+            computed incrementally
+        """
+        _ = self
+        return None
+
+    def get_required_input_columns(
+        self, output_columns: Optional[List[Any]]
+    ) -> Optional[List[Any]]:
+        """
+        Return the columns of `df_in` needed to compute some output columns.
+
+        This is used to infer statically which columns a DAG consumes, so that
+        the source nodes can read only those columns (see
+        `dtfcorvisi.push_down_required_columns()`).
+
+        :param output_columns: columns of `df_out` needed by the successors of
+            the node (the first level of the columns for multi-index columns).
+            `None` means all the columns
+        :return: the columns of `df_in` needed by the node, or `None` if all the
+            columns are (or might be) needed
+        """
+        _ = self, output_columns
+        return None
+
     def get_info(
         self, method: dtfcornode.Method
     ) -> Optional[Union[str, collections.OrderedDict]]:
@@ -101,6 +153,96 @@ class FitPredictNode(dtfcornode.Node, abc.ABC):
         # Save the info in the node: we make a copy just to be safe.
         self._info[method] = copy.copy(values)
 
+    def _predict_incrementally(
+        self,
+        df_in: pd.DataFrame,
+        predict_func: Callable[[pd.DataFrame], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """
+        Compute `predict_func(df_in)` reusing the output of the previous call.
+
+        If the input extends the input of the previous invocation (e.g., the
+        window of data moved forward by one bar), `predict_func()` is run only
+        on:
+        - the new rows
+        - the last `lookahead` rows of the previous output, which can depend on
+          the new rows
+        - the `lookback` rows before them, needed to warm up the computation
+        and the output for the other rows is taken from the previous output.
+
+        Otherwise (e.g., first invocation, incremental mode disabled, data
+        revised, gap in the data) `predict_func()` is run on the entire input.
+
+        Note that for nodes with an infinite memory (e.g., an exponential
+        smoothing) the output computed incrementally is equal to the one
+        computed on the entire input only up to the tail of the kernel
+        truncated by `lookback`.
+
+        The previous output can be reused only if `predict_func()` preserves
+        the index. If it doesn't (e.g., a resampling or dropping the rows with
+        NaNs), `predict_func()` is always run on the entire input.
+
+        :param df_in: input of `predict()`
+        :param predict_func: function computing the output dataframe from the
+            input dataframe
+        :return: output of `predict_func(df_in)`
+        """
+        window = self.get_incremental_predict_window()
+        if not self._incremental_predict or window is None:
+            return predict_func(df_in)
+        lookback, lookahead = window
+        hdbg.dassert_lte(0, lookback)
+        hdbg.dassert_lte(0, lookahead)
+        df_out = None
+        state = self._incremental_predict_state
+        # A change of the window (e.g., a model re-fit with a different
+        # parameter) invalidates the previous output.
+        if state is not None and state["window"] == window:
+            # The previous input is valid only if its last rows, which determine
+            # the previous output that we want to reuse, didn't change.
+            df_in_tail = state["df_in_tail"]
+            if df_in_tail.index.isin(df_in.index).all() and df_in_tail.equals(
+                df_in.loc[df_in_tail.index]
+            ):
+                # Find the first row whose output needs to be recomputed.
+                first_new_row = df_in.index.get_loc(df_in_tail.index[-1]) + 1
+                start = max(0, first_new_row - lookahead)
+                warmup_start = max(0, start - lookback)
+                df_out_old = state["df_out"]
+                if df_in.index[:start].isin(df_out_old.index).all():
+                    df_in_new = df_in.iloc[warmup_start:]
+                    df_out_new = predict_func(df_in_new)
+                    if df_out_new.index.equals(
+                        df_in_new.index
+                    ) and df_out_old.columns.equals(df_out_new.columns):
+                        df_out_new = df_out_new.iloc[start - warmup_start :]
+                        df_out_old = df_out_old.loc[df_in.index[:start]]
+                        df_out = pd.concat([df_out_old, df_out_new])
+                        _LOG.debug(
+                            "nid='%s': computed %s rows out of %s incrementally",
+                            self.nid,
+                            df_out_new.shape[0],
+                            df_out.shape[0],
+                        )
+        if df_out is None:
+            _LOG.debug("nid='%s': computing all the rows", self.nid)
+            df_out = predict_func(df_in)
+            if not df_out.index.equals(df_in.index):
+                _LOG.debug(
+                    "nid='%s': the output can't be reused since the index "
+                    "changed",
+                    self.nid,
+                )
+                self._incremental_predict_state = None
+                return df_out
+        # Store the state for the next invocation.
+        self._incremental_predict_state = {
+            "window": window,
+            "df_in_tail": df_in.iloc[-(lookback + lookahead + 1) :].copy(),
+            "df_out": df_out,
+        }
+        return df_out
+
 
 # #############################################################################
 
@@ -145,6 +287,7 @@ class DataSource(FitPredictNode, abc.ABC):
         self._fit_intervals: Optional[dtfcorutil.Intervals] = None
         self._predict_intervals: Optional[dtfcorutil.Intervals] = None
         self._predict_idxs = None
+        self._columns_to_read: Optional[List[Any]] = None
 
     def set_fit_intervals(
         self, intervals: Optional[dtfcorutil.Intervals]
@@ -163,6 +306,22 @@ class DataSource(FitPredictNode, abc.ABC):
             dtfcorutil.dassert_valid_intervals(intervals)
         self._fit_intervals = intervals
 
+    def set_columns_to_read(self, columns: Optional[List[Any]]) -> None:
+        """
+        Set the columns that need to be emitted by the node.
+
+        Derived classes can use this information to avoid reading from the
+        backend the columns that are not consumed downstream.
+
+        :param columns: the columns to emit (the first level of the columns for
+            multi-index columns). `None` means all the columns
+        """
+        _LOG.debug("columns=%s", columns)
+        if columns is not None:
+            hdbg.dassert_isinstance(columns, list)
+            hdbg.dassert_no_duplicates(columns)
+        self._columns_to_read = columns
+
     # `DataSource` uses data passed at construction time, so it does not need a
     # `df_in` in either `fit()` or `predict()` as a typical `FitPredictNode` does.
     # For this reason the function signature is different.
@@ -186,6 +345,7 @@ class DataSource(FitPredictNode, abc.ABC):
             fit_df = self.df.loc[idx]
         else:
             fit_df = self.df
+        fit_df = self._select_columns_to_read(fit_df)
         # TODO(gp): Is this copy necessary?
         fit_df = fit_df.copy()
         hdbg.dassert(not fit_df.empty, "`fit_df` is empty")
@@ -220,9 +380,10 @@ class DataSource(FitPredictNode, abc.ABC):
                 for interval in self._predict_intervals
             ]
             idx = functools.reduce(lambda x, y: x.union(y), idx_slices)
-            predict_df = self.df.loc[idx].copy()
+            predict_df = self.df.loc[idx]
         else:
-            predict_df = self.df.copy()
+            predict_df = self.df
+        predict_df = self._select_columns_to_read(predict_df).copy()
         hdbg.dassert(not predict_df.empty)
         # Update `info`.
         info = collections.OrderedDict()
@@ -234,6 +395,26 @@ class DataSource(FitPredictNode, abc.ABC):
         hdbg.dassert_is_not(self.df, None, "No DataFrame found!")
         return self.df
 
+    def _select_columns_to_read(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Keep only the columns set through `set_columns_to_read()`.
+        """
+        if self._columns_to_read is None:
+            return df
+        columns = self._columns_to_read
+        if df.columns.nlevels > 1:
+            # Select the columns using the first level.
+            columns = [
+                col[0] if isinstance(col, tuple) else col for col in columns
+            ]
+            level_values = df.columns.get_level_values(0)
+            hdbg.dassert_is_subset(columns, level_values)
+            df = df.loc[:, level_values.isin(columns)]
+        else:
+            hdbg.dassert_is_subset(columns, df.columns)
+            df = df[[col for col in df.columns if col in columns]]
+        return df
+
 
 # #############################################################################
 
@@ -248,8 +429,25 @@ class Transformer(FitPredictNode, abc.ABC):
 
     # TODO(Paul): Consider giving users the option of renaming the single
     #  input and single output (but verify there is only one of each).
-    def __init__(self, nid: dtfcornode.NodeId) -> None:
+    def __init__(
+        self,
+        nid: dtfcornode.NodeId,
+        *,
+        incremental_lookback: Optional[int] = None,
+    ) -> None:
+        """
+        :param nid: unique node id
+        :param incremental_lookback: number of rows before a row needed to
+            compute the transformation for that row, when the transformation
+            is causal with a bounded memory and preserves the index. This
+            allows to run `predict()` incrementally (see
+            `set_incremental_predict()`). `None` means that the transformation
+            needs to be computed on the entire input
+        """
         super().__init__(nid)
+        if incremental_lookback is not None:
+            hdbg.dassert_lte(0, incremental_lookback)
+        self._incremental_lookback = incremental_lookback
 
     def fit(self, df_in: pd.DataFrame) -> Dict[str, pd.DataFrame]:
         hdbg.dassert_no_duplicates(df_in.columns)
@@ -262,13 +460,26 @@ class Transformer(FitPredictNode, abc.ABC):
 
     def predict(self, df_in: pd.DataFrame) -> Dict[str, pd.DataFrame]:
         hdbg.dassert_no_duplicates(df_in.columns)
-        # Transform the input df.
-        df_out, info = self._transform(df_in)
+        infos = []
+
+        def _run_predict(df: pd.DataFrame) -> pd.DataFrame:
+            # Transform the input df.
+            df_out, info = self._transform(df)
+            infos.append(info)
+            return df_out
+
+        # Transform only the new rows of the input df, if possible.
+        df_out = self._predict_incrementally(df_in, _run_predict)
         hdbg.dassert_no_duplicates(df_out.columns)
         # Update `info`.
-        self._set_info("predict", info)
+        self._set_info("predict", infos[-1])
         return {"df_out": df_out}
 
+    def get_incremental_predict_window(self) -> Optional[Tuple[int, int]]:
+        if self._incremental_lookback is None:
+            return None
+        return self._incremental_lookback, 0
+
     @abc.abstractmethod
     def _transform(
         self, df: pd.DataFrame
@@ -377,6 +588,42 @@ class ColModeMixin:
 
     # TODO(Paul): Refactor this so that it has clear pre and post processing stages.
 
+    @staticmethod
+    def _get_required_input_columns_from_col_mode(
+        cols: Optional[List[Any]],
+        transformed_cols: Optional[List[Any]],
+        col_mode: Optional[str],
+        output_columns: Optional[List[Any]],
+    ) -> Optional[List[Any]]:
+        """
+        Return the input columns needed to compute `output_columns`.
+
+        See `FitPredictNode.get_required_input_columns()`.
+
+        :param cols: columns in `df_in` that are transformed by the node
+            - `None` means all the columns
+        :param transformed_cols: names of the transformed columns in `df_out`
+            - `None` means that the names are not known before running the node
+        :param col_mode: as in `_apply_col_mode()`
+        :param output_columns: columns of `df_out` needed downstream
+        """
+        if cols is None:
+            return None
+        required_columns = list(cols)
+        col_mode = col_mode or "merge_all"
+        if col_mode == "replace_all":
+            # Only the transformed columns are propagated.
+            return required_columns
+        # With `merge_all` and `replace_selected` the input columns are
+        # propagated, thus the non-transformed output columns needed downstream
+        # come from the input.
+        if output_columns is None or transformed_cols is None:
+            return None
+        for col in output_columns:
+            if col not in transformed_cols and col not in required_columns:
+                required_columns.append(col)
+        return required_columns
+
     def _apply_col_mode(
         self,
         df_in: pd.DataFrame,
@@ -1,5 +1,7 @@
+import collections
 import io
 import logging
+from typing import Tuple
 
 import numpy as np
 import pandas as pd
@@ -7,6 +9,7 @@ import pytest
 
 import core.artificial_signal_generators as carsigen
 import core.config as cconfig
+import dataflow.core.nodes.base as dtfconobas
 import dataflow.core.nodes.test.helpers as cdnth
 import dataflow.core.nodes.transformers as dtfconotra
 import helpers.hpandas as hpandas
@@ -15,6 +18,100 @@ import helpers.hunit_test as hunitest
 _LOG = logging.getLogger(__name__)
 
 
+class TestColumnTransformer1(hunitest.TestCase):
+    """
+    Test running `predict()` incrementally on a moving window of data.
+    """
+
+    def test_incremental_predict1(self) -> None:
+        """
+        Check that the output on a moving window is the same as computing the
+        output on the entire window.
+        """
+        data = self._get_data()
+        node = self._get_node()
+        node.set_incremental_predict(True)
+        for end in range(10, 20):
+            df_in = data.iloc[end - 10 : end]
+            actual = node.predict(df_in)["df_out"]
+            expected = self._get_node().predict(df_in)["df_out"]
+            # The first rows of the window are computed on the entire data
+            # only in incremental mode.
+            self.assert_equal(str(actual.index), str(expected.index))
+            self.assert_dfs_close(
+                actual.iloc[2:], expected.iloc[2:], equal_nan=True
+            )
+            if end > 11:
+                self.assertTrue(actual["x_mean"].iloc[:2].notna().all())
+
+    def test_incremental_predict2(self) -> None:
+        """
+        Check that revised data triggers a computation on the entire input.
+        """
+        data = self._get_data()
+        node = self._get_node()
+        node.set_incremental_predict(True)
+        node.predict(data.iloc[:10])
+        # Revise the last row of the previous window.
+        df_in = data.iloc[:11].copy()
+        df_in.iloc[9] = 100.0
+        actual = node.predict(df_in)["df_out"]
+        expected = self._get_node().predict(df_in)["df_out"]
+        self.assert_dfs_close(actual, expected, equal_nan=True)
+
+    @staticmethod
+    def _get_node() -> dtfconotra.ColumnTransformer:
+        node = dtfconotra.ColumnTransformer(
+            "rolling_mean",
+            transformer_func=lambda df: df.rolling(3).mean(),
+            col_rename_func=lambda x: f"{x}_mean",
+            col_mode="merge_all",
+            incremental_lookback=2,
+        )
+        return node
+
+    @staticmethod
+    def _get_data() -> pd.DataFrame:
+        idx = pd.date_range("2016-01-04 09:30:00", periods=20, freq="T")
+        data = pd.DataFrame({"x": np.arange(20, dtype=float) ** 2}, index=idx)
+        return data
+
+
+class _DropNaNs(dtfconobas.Transformer):
+    """
+    Transformer computing a rolling mean after dropping the rows with NaNs.
+    """
+
+    def _transform(
+        self, df: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
+        df = df.dropna().rolling(3).mean()
+        return df, collections.OrderedDict()
+
+
+class TestTransformer1(hunitest.TestCase):
+    def test_incremental_predict1(self) -> None:
+        """
+        Check running `predict()` incrementally with a transformation that
+        doesn't preserve the index.
+        """
+        idx = pd.date_range("2016-01-04 09:30:00", periods=20, freq="T")
+        data = pd.DataFrame({"x": np.arange(20, dtype=float) ** 2}, index=idx)
+        data.iloc[13] = np.nan
+        node = _DropNaNs("drop_nans", incremental_lookback=2)
+        node.set_incremental_predict(True)
+        for end in range(10, 20):
+            df_in = data.iloc[end - 10 : end]
+            actual = node.predict(df_in)["df_out"]
+            expected = _DropNaNs("drop_nans").predict(df_in)["df_out"]
+            # The output is computed on the entire input once the NaN is in
+            # the window.
+            if end > 13:
+                self.assert_dfs_close(actual, expected, equal_nan=True)
+            else:
+                self.assert_equal(str(actual.index), str(expected.index))
+
+
 class TestGroupedColDfToDfTransformer1(hunitest.TestCase):
     def test_column_arithmetic(self) -> None:
         data = self._get_data()
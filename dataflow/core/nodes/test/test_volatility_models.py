@@ -115,6 +115,32 @@ class TestSmaModel(hunitest.TestCase):
         )
         self.assert_equal(actual, expected)
 
+    def test6(self) -> None:
+        """
+        Run `predict()` incrementally on a growing window of data.
+        """
+        data = self._get_data()
+        config = cconfig.Config.from_dict(
+            {
+                "col": ["vol_sq"],
+                "steps_ahead": 2,
+                "tau": 2,
+                "nan_mode": "drop",
+            }
+        )
+        node = SmaModel("sma", **config.to_dict())
+        node.fit(data)
+        node.set_incremental_predict(True)
+        expected_node = SmaModel("sma", **config.to_dict())
+        expected_node.fit(data)
+        for end in range(30, 41):
+            df_in = data.iloc[:end]
+            actual = node.predict(df_in)["df_out"]
+            expected = expected_node.predict(df_in)["df_out"]
+            # The new rows are computed on a truncated history, so the results
+            # are equal up to the truncated weights of the kernel.
+            self.assert_dfs_close(actual, expected, rtol=1e-3, equal_nan=True)
+
     @staticmethod
     def _get_data() -> pd.DataFrame:
         """
@@ -52,6 +52,7 @@ class ColumnTransformer(dtfconobas.Transformer, dtfconobas.ColModeMixin):
         col_rename_func: Optional[Callable[[Any], Any]] = None,
         col_mode: Optional[str] = None,
         nan_mode: Optional[str] = None,
+        incremental_lookback: Optional[int] = None,
     ) -> None:
         """
         :param nid: unique node id
@@ -69,8 +70,9 @@ class ColumnTransformer(dtfconobas.Transformer, dtfconobas.ColModeMixin):
         :param nan_mode: determines how to handle NaNs
             - `leave_unchanged` (default): do not process NaNs
             - `drop`: it applies to all columns simultaneously.
+        :param incremental_lookback: as in `Transformer`
         """
-        super().__init__(nid)
+        super().__init__(nid, incremental_lookback=incremental_lookback)
         if cols is not None:
             hdbg.dassert_isinstance(cols, list)
         self._cols = cols
@@ -96,6 +98,20 @@ class ColumnTransformer(dtfconobas.Transformer, dtfconobas.ColModeMixin):
         col_names = cast(List[str], col_names)
         return col_names
 
+    def get_required_input_columns(
+        self, output_columns: Optional[List[Any]]
+    ) -> Optional[List[Any]]:
+        """
+        See the parent class.
+        """
+        if self._cols is None:
+            return None
+        col_rename_func = self._col_rename_func or (lambda x: x)
+        transformed_cols = [col_rename_func(col) for col in self._cols]
+        return self._get_required_input_columns_from_col_mode(
+            self._cols, transformed_cols, self._col_mode, output_columns
+        )
+
     def _transform(
         self, df: pd.DataFrame
     ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
@@ -167,6 +183,7 @@ class SeriesTransformer(dtfconobas.Transformer, dtfconobas.ColModeMixin):
         col_rename_func: Optional[Callable[[Any], Any]] = None,
         col_mode: Optional[str] = None,
         nan_mode: Optional[str] = None,
+        incremental_lookback: Optional[int] = None,
     ) -> None:
         """
         :param nid: unique node id
@@ -183,8 +200,9 @@ class SeriesTransformer(dtfconobas.Transformer, dtfconobas.ColModeMixin):
             Determines what columns are propagated by the node.
         :param nan_mode: `leave_unchanged` or `drop`. If `drop`, applies to
             columns individually.
+        :param incremental_lookback: as in `Transformer`
         """
-        super().__init__(nid)
+        super().__init__(nid, incremental_lookback=incremental_lookback)
         if cols is not None:
             hdbg.dassert_isinstance(cols, list)
         self._cols = cols
@@ -209,6 +227,20 @@ class SeriesTransformer(dtfconobas.Transformer, dtfconobas.ColModeMixin):
         col_names = cast(List[str], col_names)
         return col_names
 
+    def get_required_input_columns(
+        self, output_columns: Optional[List[Any]]
+    ) -> Optional[List[Any]]:
+        """
+        See the parent class.
+        """
+        if self._cols is None:
+            return None
+        col_rename_func = self._col_rename_func or (lambda x: x)
+        transformed_cols = [col_rename_func(col) for col in self._cols]
+        return self._get_required_input_columns_from_col_mode(
+            self._cols, transformed_cols, self._col_mode, output_columns
+        )
+
     def _transform(
         self, df: pd.DataFrame
     ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
@@ -285,6 +317,7 @@ class GroupedColDfToDfTransformer(dtfconobas.Transformer):
         drop_nans: bool = False,
         reindex_like_input: bool = True,
         join_output_with_input: bool = True,
+        incremental_lookback: Optional[int] = None,
     ) -> None:
         """
         For reference, let.
@@ -311,8 +344,9 @@ class GroupedColDfToDfTransformer(dtfconobas.Transformer):
         :param join_output_with_input: whether to join the output with the input. A
             common case where this should typically be set to `False` is in
             resampling.
+        :param incremental_lookback: as in `Transformer`
         """
-        super().__init__(nid)
+        super().__init__(nid, incremental_lookback=incremental_lookback)
         # TODO(Paul): Add more checks here.
         hdbg.dassert_isinstance(in_col_groups, list)
         hdbg.dassert_isinstance(out_col_group, tuple)
@@ -328,6 +362,19 @@ class GroupedColDfToDfTransformer(dtfconobas.Transformer):
         # The leaf col names are determined from the dataframe at runtime.
         self._leaf_cols = None
 
+    def get_required_input_columns(
+        self, output_columns: Optional[List[Any]]
+    ) -> Optional[List[Any]]:
+        """
+        See the parent class.
+        """
+        return _get_required_input_columns_from_col_groups(
+            self._in_col_groups,
+            self._out_col_group,
+            self._join_output_with_input,
+            output_columns,
+        )
+
     def _transform(
         self, df: pd.DataFrame
     ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
@@ -521,6 +568,19 @@ class SeriesToDfTransformer(dtfconobas.Transformer):
         # The leaf col names are determined from the dataframe at runtime.
         self._leaf_cols = None
 
+    def get_required_input_columns(
+        self, output_columns: Optional[List[Any]]
+    ) -> Optional[List[Any]]:
+        """
+        See the parent class.
+        """
+        return _get_required_input_columns_from_col_groups(
+            [self._in_col_group],
+            self._out_col_group,
+            self._join_output_with_input,
+            output_columns,
+        )
+
     def _transform(
         self, df: pd.DataFrame
     ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
@@ -651,6 +711,19 @@ class SeriesToSeriesTransformer(dtfconobas.Transformer):
         # The leaf col names are determined from the dataframe at runtime.
         self._leaf_cols = None
 
+    def get_required_input_columns(
+        self, output_columns: Optional[List[Any]]
+    ) -> Optional[List[Any]]:
+        """
+        See the parent class.
+        """
+        return _get_required_input_columns_from_col_groups(
+            [self._in_col_group],
+            self._out_col_group,
+            self._join_output_with_input,
+            output_columns,
+        )
+
     def _transform(
         self, df: pd.DataFrame
     ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
@@ -698,6 +771,38 @@ class SeriesToSeriesTransformer(dtfconobas.Transformer):
         return df, info
 
 
+def _get_required_input_columns_from_col_groups(
+    in_col_groups: List[Tuple[dtfcorutil.NodeColumn]],
+    out_col_group: Tuple[dtfcorutil.NodeColumn],
+    join_output_with_input: bool,
+    output_columns: Optional[List[Any]],
+) -> Optional[List[Any]]:
+    """
+    Return the input columns needed by a node processing groups of columns.
+
+    The columns are identified by the first level of the multi-index columns.
+    See `FitPredictNode.get_required_input_columns()`.
+    """
+    if any(len(in_col_group) == 0 for in_col_group in in_col_groups):
+        # An empty group selects all the columns.
+        return None
+    required_columns: List[Any] = []
+    for in_col_group in in_col_groups:
+        if in_col_group[0] not in required_columns:
+            required_columns.append(in_col_group[0])
+    if not join_output_with_input:
+        return required_columns
+    # The input columns are propagated, thus the output columns needed
+    # downstream that are not generated by the node come from the input.
+    if output_columns is None or len(out_col_group) == 0:
+        # The names of the generated columns are known only at runtime.
+        return None
+    for col in output_columns:
+        if col != out_col_group[0] and col not in required_columns:
+            required_columns.append(col)
+    return required_columns
+
+
 def _apply_func_to_data(
     data: Union[pd.Series, pd.DataFrame],
     func: Callable,
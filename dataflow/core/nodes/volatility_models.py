@@ -28,6 +28,26 @@ import helpers.hdbg as hdbg
 _LOG = logging.getLogger(__name__)
 
 
+def _get_sma_incremental_predict_lookback(
+    tau: float, min_tau_periods: float
+) -> int:
+    """
+    Return the number of rows needed to warm up a smooth moving average.
+
+    We use the same warm-up length of
+    `csigproc.extract_smooth_moving_average_weights()`, i.e., 10 times the
+    range of the kernel, so that the truncated weights are negligible.
+
+    :param tau: kernel tau
+    :param min_tau_periods: as in `SmaModel`
+    :return: number of rows
+    """
+    # For `min_depth = max_depth = 1` the range of the kernel is `tau`.
+    warmup_length = int(np.round(10 * tau))
+    min_periods = int(np.rint(min_tau_periods * tau))
+    return max(warmup_length, min_periods)
+
+
 class SmaModel(dtfconobas.FitPredictNode, dtfconobas.ColModeMixin):
     """
     Fit and predict a smooth moving average (SMA) model.
@@ -103,20 +123,41 @@ class SmaModel(dtfconobas.FitPredictNode, dtfconobas.ColModeMixin):
 
     def predict(self, df_in: pd.DataFrame) -> Dict[str, pd.DataFrame]:
         dtfcorutil.validate_df_indices(df_in)
-        df = df_in.copy()
-        idx = df.index
-        # Restrict to times where col has no NaNs.
-        non_nan_idx = df.loc[idx][self._col].dropna().index
-        # Handle presence of NaNs according to `nan_mode`.
-        self._handle_nans(idx, non_nan_idx)
-        # Use trained model to generate predictions.
-        hdbg.dassert_is_not(
-            self._tau,
-            None,
-            "Parameter tau not found! Check if `fit` has been run.",
+
+        def _run_predict(df: pd.DataFrame) -> pd.DataFrame:
+            idx = df.index
+            # Restrict to times where col has no NaNs.
+            non_nan_idx = df[self._col].dropna().index
+            # Handle presence of NaNs according to `nan_mode`.
+            self._handle_nans(idx, non_nan_idx)
+            # Use trained model to generate predictions.
+            hdbg.dassert_is_not(
+                self._tau,
+                None,
+                "Parameter tau not found! Check if `fit` has been run.",
+            )
+            return self._predict_and_package_results(
+                df, idx, non_nan_idx, fit=False
+            )["df_out"]
+
+        df_out = self._predict_incrementally(df_in, _run_predict)
+        return {"df_out": df_out}
+
+    def get_incremental_predict_window(self) -> Optional[Tuple[int, int]]:
+        if self._tau is None:
+            return None
+        lookback = _get_sma_incremental_predict_lookback(
+            self._tau, self._min_tau_periods
         )
-        return self._predict_and_package_results(
-            df_in, idx, non_nan_idx, fit=False
+        # The forward targets depend on the next `steps_ahead` rows.
+        return lookback, self._steps_ahead
+
+    def get_required_input_columns(
+        self, output_columns: Optional[List[Any]]
+    ) -> Optional[List[Any]]:
+        # The names of the generated columns depend on the input data.
+        return self._get_required_input_columns_from_col_mode(
+            self._col, None, self._col_mode, output_columns
         )
 
     def get_fit_state(self) -> Dict[str, Any]:
@@ -271,7 +312,20 @@ class SingleColumnVolatilityModel(dtfconobas.FitPredictNode):
         return {"df_out": self._fit_predict_helper(df_in, fit=True)}
 
     def predict(self, df_in: pd.DataFrame) -> Dict[str, pd.DataFrame]:
-        return {"df_out": self._fit_predict_helper(df_in, fit=False)}
+        df_out = self._predict_incrementally(
+            df_in, lambda df: self._fit_predict_helper(df, fit=False)
+        )
+        return {"df_out": df_out}
+
+    def get_incremental_predict_window(self) -> Optional[Tuple[int, int]]:
+        if self._tau is None:
+            return None
+        # The internal `SmaModel` uses the default `min_tau_periods`.
+        lookback = _get_sma_incremental_predict_lookback(self._tau, 2)
+        # The volatility prediction is shifted by `steps_ahead` to demodulate
+        # the signal, and the forward targets depend on the next `steps_ahead`
+        # rows.
+        return lookback + self._steps_ahead, self._steps_ahead
 
     # TODO(gp): This code has several copies. Move it to the base class.
     @staticmethod
@@ -412,6 +466,18 @@ class SingleColumnVolatilityModel(dtfconobas.FitPredictNode):
 
 
 class _MultiColVolatilityModelMixin:
+    def _get_incremental_predict_window(self) -> Optional[Tuple[int, int]]:
+        # Use the largest tau learned for the columns.
+        taus = [
+            col_fit_state["_tau"]
+            for col_fit_state in self._col_fit_state.values()
+        ]
+        if not taus or any(tau is None for tau in taus):
+            return None
+        lookback = _get_sma_incremental_predict_lookback(max(taus), 2)
+        # See `SingleColumnVolatilityModel.get_incremental_predict_window()`.
+        return lookback + self._steps_ahead, self._steps_ahead
+
     def _fit_predict_volatility_model(
         self, df: pd.DataFrame, fit: bool, out_col_prefix: Optional[str] = None
     ) -> Tuple[Dict[str, pd.DataFrame], collections.OrderedDict]:
@@ -506,7 +572,13 @@ class VolatilityModel(
         return self._fit_predict_helper(df_in, fit=True)
 
     def predict(self, df_in: pd.DataFrame) -> Dict[str, pd.DataFrame]:
-        return self._fit_predict_helper(df_in, fit=False)
+        df_out = self._predict_incrementally(
+            df_in, lambda df: self._fit_predict_helper(df, fit=False)["df_out"]
+        )
+        return {"df_out": df_out}
+
+    def get_incremental_predict_window(self) -> Optional[Tuple[int, int]]:
+        return self._get_incremental_predict_window()
 
     def get_fit_state(self) -> Dict[str, Any]:
         fit_state = {
@@ -592,7 +664,13 @@ class MultiindexVolatilityModel(
         return self._fit_predict_helper(df_in, fit=True)
 
     def predict(self, df_in: pd.DataFrame) -> Dict[str, pd.DataFrame]:
-        return self._fit_predict_helper(df_in, fit=False)
+        df_out = self._predict_incrementally(
+            df_in, lambda df: self._fit_predict_helper(df, fit=False)["df_out"]
+        )
+        return {"df_out": df_out}
+
+    def get_incremental_predict_window(self) -> Optional[Tuple[int, int]]:
+        return self._get_incremental_predict_window()
 
     def get_fit_state(self) -> Dict[str, Any]:
         fit_state = {
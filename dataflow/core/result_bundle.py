@@ -8,12 +8,14 @@ import collections
 import copy
 import datetime
 import logging
+import os
 from typing import Any, Dict, List, Optional, Set, Tuple, cast
 
 import pandas as pd
 
 import core.config as cconfig
 import dataflow.core.node as dtfcornode
+import helpers.harrow as harrow
 import helpers.hdbg as hdbg
 import helpers.hgit as hgit
 import helpers.hio as hio
@@ -109,12 +111,17 @@ class ResultBundle(abc.ABC):
         file_name: str,
         use_pq: bool = True,
         columns: Optional[List[str]] = None,
+        *,
+        memory_map: bool = False,
     ) -> "ResultBundle":
         """
         Deserialize the current `ResultBundle`.
 
         :param use_pq: load multiple files storing the data
         :param columns: columns of `result_df` to load
+        :param memory_map: memory-map the `result_df` saved as Feather instead
+            of reading it, so that the data is not copied in memory. The
+            resulting `result_df` is read-only (see `harrow.from_feather()`)
         """
         # TODO(gp): We should pass file_name without an extension, since the
         #  extension(s) depend on the format used.
@@ -132,17 +139,33 @@ class ResultBundle(abc.ABC):
                 if hasattr(obj, "payload"):
                     obj.payload = None
                 hdbg.dassert_isinstance(obj, ResultBundle)
-            # Load the `result_df` as parquet.
-            file_name_pq = hio.change_filename_extension(file_name, "pkl", "pq")
-            if columns is None:
-                _LOG.warning(
-                    "Loading the entire `result_df` without filtering by columns: "
-                    "this is slow and requires a lot of memory"
+            file_name_feather = hio.change_filename_extension(
+                file_name, "pkl", "feather"
+            )
+            if os.path.exists(file_name_feather):
+                # Load the `result_df` as Feather.
+                obj.result_df = harrow.from_feather(
+                    file_name_feather, columns=columns, memory_map=memory_map
+                )
+            else:
+                # Load the `result_df` as parquet.
+                hdbg.dassert(
+                    not memory_map,
+                    "`memory_map` can be specified only for `result_df` saved "
+                    "as Feather",
                 )
-            with htimer.TimedScope(logging.DEBUG, "Load parquet"):
-                obj.result_df = hparque.from_parquet(
-                    file_name_pq, columns=columns, log_level=logging.DEBUG
+                file_name_pq = hio.change_filename_extension(
+                    file_name, "pkl", "pq"
                 )
+                if columns is None:
+                    _LOG.warning(
+                        "Loading the entire `result_df` without filtering by "
+                        "columns: this is slow and requires a lot of memory"
+                    )
+                with htimer.TimedScope(logging.DEBUG, "Load parquet"):
+                    obj.result_df = hparque.from_parquet(
+                        file_name_pq, columns=columns, log_level=logging.DEBUG
+                    )
             file_name_metadata_df = hio.change_filename_extension(
                 file_name, "pkl", "metadata_df.pkl"
             )
@@ -170,6 +193,10 @@ class ResultBundle(abc.ABC):
                 None,
                 "`columns` can be specified only with `use_pq=True`",
             )
+            hdbg.dassert(
+                not memory_map,
+                "`memory_map` can be specified only with `use_pq=True`",
+            )
             file_name = hio.change_filename_extension(
                 file_name, "pkl", "v1_0.pkl"
             )
@@ -297,14 +324,23 @@ class ResultBundle(abc.ABC):
 
     # Methods to serialize to / from disk.
 
-    def to_pickle(self, file_name: str, use_pq: bool = True) -> List[str]:
+    def to_pickle(
+        self, file_name: str, use_pq: bool = True, *, use_feather: bool = False
+    ) -> List[str]:
         """
         Serialize the current `ResultBundle`.
 
         :param use_pq: save the `result_df` dataframe using Parquet.
             If False, everything is saved as a single pickle object.
+        :param use_feather: with `use_pq`, save the `result_df` using Feather
+            instead of Parquet. The file is larger, but it can be loaded without
+            decoding and memory-mapped, see `from_pickle()`
         :return: list with names of the files saved
         """
+        hdbg.dassert(
+            use_pq or not use_feather,
+            "`use_feather` can be specified only with `use_pq=True`",
+        )
         # TODO(gp): We should pass file_name without an extension, since the
         #  extension(s) depend on the format used.
         hio.create_enclosing_dir(file_name, incremental=True)
@@ -319,11 +355,20 @@ class ResultBundle(abc.ABC):
                 file_name, "pkl", "v2_0.pkl"
             )
             hpickle.to_pickle(obj, file_name_rb, log_level=logging.DEBUG)
-            # Save the `result_df` as parquet.
-            file_name_pq = hio.change_filename_extension(
-                file_name, "pkl", "v2_0.pq"
-            )
-            hparque.to_parquet(result_df, file_name_pq, log_level=logging.DEBUG)
+            if use_feather:
+                # Save the `result_df` as Feather.
+                file_name_df = hio.change_filename_extension(
+                    file_name, "pkl", "v2_0.feather"
+                )
+                harrow.to_feather(result_df, file_name_df)
+            else:
+                # Save the `result_df` as parquet.
+                file_name_df = hio.change_filename_extension(
+                    file_name, "pkl", "v2_0.pq"
+                )
+                hparque.to_parquet(
+                    result_df, file_name_df, log_level=logging.DEBUG
+                )
             file_name_metadata_df = hio.change_filename_extension(
                 file_name, "pkl", "v2_0.metadata_df.pkl"
             )
@@ -332,7 +377,7 @@ class ResultBundle(abc.ABC):
                 metadata_df, file_name_metadata_df, log_level=logging.DEBUG
             )
             #
-            res = [file_name_rb, file_name_pq, file_name_metadata_df]
+            res = [file_name_rb, file_name_df, file_name_metadata_df]
         else:
             # Save the entire object as pickle.
             file_name = hio.change_filename_extension(
@@ -1,9 +1,17 @@
 import logging
 import os
+from typing import List
+
+import numpy as np
+import pandas as pd
 
 import dataflow.core.dag as dtfcordag
 import dataflow.core.node as dtfcornode
+import dataflow.core.nodes.base as dtfconobas
+import dataflow.core.nodes.sources as dtfconosou
+import dataflow.core.nodes.transformers as dtfconotra
 import dataflow.core.visualization as dtfcorvisu
+import helpers.hpandas as hpandas
 import helpers.hprint as hprint
 import helpers.hunit_test as hunitest
 
@@ -527,3 +535,171 @@ class Test_dataflow_core_DAG5(_TestDataflowHelper):
         #
         dag1.compose(dag2)
         self._check(dag1)
+
+
+# #############################################################################
+# Test_dataflow_core_DAG6
+# #############################################################################
+
+
+# The functions are defined at module level so that the nodes can be pickled in
+# "process" mode.
+def _cumsum(df: pd.DataFrame) -> pd.DataFrame:
+    return df.cumsum().add_suffix(".cumsum")
+
+
+def _square(df: pd.DataFrame) -> pd.DataFrame:
+    return (df**2).add_suffix(".square")
+
+
+def _join(df_in1: pd.DataFrame, df_in2: pd.DataFrame) -> pd.DataFrame:
+    return df_in1.join(df_in2)
+
+
+class Test_dataflow_core_DAG6(hunitest.TestCase):
+    """
+    Check that the parallel execution modes give the same results as the serial
+    one.
+    """
+
+    @staticmethod
+    def get_dag() -> dtfcordag.DAG:
+        """
+        Build a DAG with two independent branches merged by a `YConnector`.
+
+        ```
+                     -> cumsum -
+        read_data --|           |--> join
+                     -> square -
+        ```
+        """
+        index = pd.date_range("2022-01-03 09:30", periods=10, freq="T")
+        data = np.arange(20, dtype=float).reshape(10, 2)
+        df = pd.DataFrame(data, index=index, columns=["x", "y"])
+        dag = dtfcordag.DAG()
+        dag.add_node(dtfconosou.DfDataSource("read_data", df))
+        for nid, func in [("cumsum", _cumsum), ("square", _square)]:
+            node = dtfconotra.ColumnTransformer(
+                nid, transformer_func=func, col_mode="replace_all"
+            )
+            dag.add_node(node)
+            dag.connect("read_data", nid)
+        dag.add_node(dtfconobas.YConnector("join", _join))
+        dag.connect("cumsum", ("join", "df_in1"))
+        dag.connect("square", ("join", "df_in2"))
+        return dag
+
+    def run_dag(self, execution_mode: str) -> str:
+        dag = self.get_dag()
+        dag.set_execution_mode(execution_mode, num_workers=2)
+        df_out = dag.run_leq_node("join", "fit", progress_bar=False)["df_out"]
+        actual = hpandas.df_to_str(df_out, num_rows=None)
+        return actual
+
+    def test_thread1(self) -> None:
+        expected = self.run_dag("serial")
+        actual = self.run_dag("thread")
+        self.assert_equal(actual, expected)
+
+    def test_process1(self) -> None:
+        expected = self.run_dag("serial")
+        actual = self.run_dag("process")
+        self.assert_equal(actual, expected)
+
+    def test_run_dag1(self) -> None:
+        """
+        Check that all the sinks are computed in "thread" mode.
+        """
+        dag = self.get_dag()
+        dag.set_execution_mode("thread", num_workers=4)
+        dag_output = dag.run_dag("fit")
+        self.assertEqual(list(dag_output.keys()), ["join"])
+        self.assertEqual(
+            dag_output["join"]["df_out"].columns.tolist(),
+            ["x.cumsum", "y.cumsum", "x.square", "y.square"],
+        )
+
+
+# #############################################################################
+# Test_dataflow_core_DAG7
+# #############################################################################
+
+
+class Test_dataflow_core_DAG7(hunitest.TestCase):
+    """
+    Check that `force_free_nodes` frees the outputs that are not needed anymore.
+    """
+
+    def helper(self, execution_mode: str, pinned_nids: List[str]) -> List[str]:
+        """
+        Run the DAG freeing the nodes and return the nodes with an output.
+        """
+        dag = Test_dataflow_core_DAG6.get_dag()
+        dag.set_execution_mode(execution_mode, num_workers=2)
+        dag.force_free_nodes = True
+        for nid in pinned_nids:
+            dag.pin_node(nid)
+        df_out = dag.run_leq_node("join", "fit", progress_bar=False)["df_out"]
+        # Check that freeing the nodes doesn't change the output.
+        expected = Test_dataflow_core_DAG6.get_dag().run_leq_node(
+            "join", "fit", progress_bar=False
+        )["df_out"]
+        self.assert_dfs_close(df_out, expected)
+        # Collect the nodes that still store an output.
+        nids = []
+        for nid in ["read_data", "cumsum", "square", "join"]:
+            try:
+                dag.get_node(nid).get_outputs("fit")
+                nids.append(nid)
+            except AssertionError:
+                pass
+        return nids
+
+    def test_serial1(self) -> None:
+        actual = self.helper("serial", [])
+        self.assertEqual(actual, ["join"])
+
+    def test_serial2(self) -> None:
+        """
+        Check that the outputs of the pinned nodes are kept.
+        """
+        actual = self.helper("serial", ["cumsum"])
+        self.assertEqual(actual, ["cumsum", "join"])
+
+    def test_thread1(self) -> None:
+        actual = self.helper("thread", ["read_data"])
+        self.assertEqual(actual, ["read_data", "join"])
+
+
+# #############################################################################
+# Test_dataflow_core_DAG8
+# #############################################################################
+
+
+class Test_dataflow_core_DAG8(hunitest.TestCase):
+    """
+    Check spilling the outputs of the nodes to memory-mapped files.
+    """
+
+    def test_spill1(self) -> None:
+        expected = Test_dataflow_core_DAG6.get_dag().run_leq_node(
+            "join", "fit", progress_bar=False
+        )["df_out"]
+        dag = Test_dataflow_core_DAG6.get_dag()
+        spill_dir = os.path.join(self.get_scratch_space(), "spill")
+        dag.set_output_spill_dir(spill_dir)
+        df_out = dag.run_leq_node("join", "fit", progress_bar=False)["df_out"]
+        hunitest.compare_df(df_out, expected)
+        self.assertEqual(df_out.index.freq, expected.index.freq)
+        # The outputs are read-only dfs backed by the spilled files.
+        self.assertFalse(df_out["x.cumsum"].to_numpy().flags.writeable)
+        files = sorted(os.listdir(spill_dir))
+        self.assertEqual(
+            files,
+            [
+                "fit.cumsum.df_out.feather",
+                "fit.join.df_out.feather",
+                "fit.read_data.df_out.feather",
+                "fit.square.df_out.feather",
+            ],
+        )
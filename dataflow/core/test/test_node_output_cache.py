@@ -0,0 +1,266 @@
+import importlib.util
+import logging
+import os
+import sys
+import unittest.mock as umock
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+import dataflow.core.dag as dtfcordag
+import dataflow.core.node_output_cache as dtfcnoouca
+import dataflow.core.nodes.sources as dtfconosou
+import dataflow.core.nodes.transformers as dtfconotra
+import dataflow.core.nodes.volatility_models as dtfcnovomo
+import helpers.hunit_test as hunitest
+
+_LOG = logging.getLogger(__name__)
+
+_SCALE = 2.0
+
+# Module defining a node, to check that the fingerprint of the node depends on
+# the code of the module.
+_NODE_MODULE_CODE = """
+import collections
+
+import dataflow.core.nodes.base as dtfconobas
+
+
+def _scale(df):
+    return df * {scale}
+
+
+class ScaleNode(dtfconobas.Transformer):
+    def _transform(self, df):
+        return _scale(df), collections.OrderedDict()
+"""
+
+
+# Modules defining a node that calls a helper from another module, to check that
+# the fingerprint of the node depends on the code of the modules it imports.
+_HELPER_MODULE_CODE = """
+def scale(df):
+    return df * {scale}
+"""
+
+_NODE_WITH_HELPER_MODULE_CODE = """
+import collections
+
+import dataflow.core.nodes.base as dtfconobas
+import scale_helper
+
+
+class ScaleNode(dtfconobas.Transformer):
+    def _transform(self, df):
+        return scale_helper.scale(df), collections.OrderedDict()
+"""
+
+
+def _get_data() -> pd.DataFrame:
+    idx = pd.date_range(
+        "2022-01-03 09:31", periods=100, freq="T", tz="America/New_York"
+    )
+    values = np.random.RandomState(seed=1).normal(size=(100, 2))
+    # Use integer column names like asset ids.
+    df = pd.DataFrame(values, index=idx, columns=[101, 202])
+    return df
+
+
+def _scale(df: pd.DataFrame) -> pd.DataFrame:
+    return df * _SCALE
+
+
+def _get_dag(
+    node_output_cache: dtfcnoouca.NodeOutputCache, *, tau: float
+) -> dtfcordag.DAG:
+    """
+    Build a DAG `read_data -> abs -> sma`.
+    """
+    dag = dtfcordag.DAG()
+    dag.set_node_output_cache(node_output_cache)
+    dag.add_node(dtfconosou.DfDataSource("read_data", _get_data()))
+    node = dtfconotra.ColumnTransformer(
+        "abs", transformer_func=lambda df: df.abs(), col_mode="replace_all"
+    )
+    dag.add_node(node)
+    node = dtfcnovomo.SmaModel("sma", col=[101], steps_ahead=1, tau=tau)
+    dag.add_node(node)
+    dag.connect("read_data", "abs")
+    dag.connect("abs", "sma")
+    return dag
+
+
+# #############################################################################
+# TestNodeOutputCache1
+# #############################################################################
+
+
+class TestNodeOutputCache1(hunitest.TestCase):
+    def test_rerun1(self) -> None:
+        """
+        Check that a second run reuses all the outputs of the first one.
+        """
+        node_output_cache = self._get_node_output_cache()
+        dag = _get_dag(node_output_cache, tau=5)
+        expected = dag.run_leq_node("sma", "fit")["df_out"]
+        self.assertEqual(node_output_cache.get_stats()["writes"], 3)
+        # Run a new DAG with the same config.
+        dag = _get_dag(node_output_cache, tau=5)
+        actual = dag.run_leq_node("sma", "fit")["df_out"]
+        stats = node_output_cache.get_stats()
+        self.assertEqual(stats["hits"], 3)
+        self.assertEqual(stats["misses"], 3)
+        hunitest.compare_df(actual, expected)
+        self.assertEqual(str(actual.index.freq), str(expected.index.freq))
+
+    def test_rerun2(self) -> None:
+        """
+        Check that changing a downstream node reuses the upstream outputs.
+        """
+        node_output_cache = self._get_node_output_cache()
+        dag = _get_dag(node_output_cache, tau=5)
+        dag.run_leq_node("sma", "fit")
+        dag = _get_dag(node_output_cache, tau=10)
+        actual = dag.run_leq_node("sma", "fit")["df_out"]
+        # Only `sma` is recomputed.
+        stats = node_output_cache.get_stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["writes"], 4)
+        expected = _get_dag(None, tau=10).run_leq_node("sma", "fit")["df_out"]
+        hunitest.compare_df(actual, expected)
+
+    def test_fit_state1(self) -> None:
+        """
+        Check that a cached `fit()` restores the learned state of the node.
+        """
+        node_output_cache = self._get_node_output_cache()
+        dag = _get_dag(node_output_cache, tau=None)
+        dag.run_leq_node("sma", "fit")
+        expected = dag.get_node("sma").get_fit_state()["_tau"]
+        dag = _get_dag(node_output_cache, tau=None)
+        dag.run_leq_node("sma", "fit")
+        self.assertEqual(node_output_cache.get_stats()["hits"], 3)
+        actual = dag.get_node("sma").get_fit_state()["_tau"]
+        self.assertEqual(actual, expected)
+        # The restored state can be used to predict.
+        dag.run_leq_node("sma", "predict")
+
+    def test_eviction1(self) -> None:
+        """
+        Check that the least recently used entries are evicted.
+        """
+        node_output_cache = self._get_node_output_cache()
+        dag = _get_dag(node_output_cache, tau=5)
+        dag.run_leq_node("sma", "fit")
+        size_in_bytes = node_output_cache.get_size_in_bytes()
+        # Allow to store only about half of the entries.
+        node_output_cache = dtfcnoouca.NodeOutputCache(
+            node_output_cache.dir_name, max_size_in_bytes=size_in_bytes // 2
+        )
+        dag = _get_dag(node_output_cache, tau=10)
+        dag.run_leq_node("sma", "fit")
+        stats = node_output_cache.get_stats()
+        self.assertLess(0, stats["evictions"])
+        self.assertLessEqual(
+            node_output_cache.get_size_in_bytes(), size_in_bytes // 2
+        )
+
+    def test_lambdas1(self) -> None:
+        """
+        Check that nodes differing only in a lambda have different keys.
+        """
+        node1 = dtfconotra.ColumnTransformer(
+            "abs", transformer_func=lambda df: df.abs()
+        )
+        node2 = dtfconotra.ColumnTransformer(
+            "abs", transformer_func=lambda df: df**2
+        )
+        fingerprint1 = dtfcnoouca.get_node_fingerprint(node1)
+        fingerprint2 = dtfcnoouca.get_node_fingerprint(node2)
+        self.assertNotEqual(fingerprint1, fingerprint2)
+
+    def test_globals1(self) -> None:
+        """
+        Check that the key changes when a global used by a function changes.
+        """
+        node = dtfconotra.ColumnTransformer("scale", transformer_func=_scale)
+        fingerprint1 = dtfcnoouca.get_node_fingerprint(node)
+        with umock.patch.object(sys.modules[__name__], "_SCALE", 3.0):
+            fingerprint2 = dtfcnoouca.get_node_fingerprint(node)
+        self.assertIsNotNone(fingerprint1)
+        self.assertNotEqual(fingerprint1, fingerprint2)
+
+    def test_class_source1(self) -> None:
+        """
+        Check that the key changes when the module defining the node changes.
+        """
+        fingerprints = []
+        for scale in [2.0, 3.0]:
+            modules = {"scale_node": _NODE_MODULE_CODE.format(scale=scale)}
+            fingerprints.append(self._get_module_node_fingerprint(modules))
+        self.assertIsNotNone(fingerprints[0])
+        self.assertNotEqual(fingerprints[0], fingerprints[1])
+
+    def test_module_dependencies1(self) -> None:
+        """
+        Check that the key changes when a module imported by the module
+        defining the node changes.
+        """
+        fingerprints = []
+        for scale in [2.0, 3.0]:
+            modules = {
+                "scale_helper": _HELPER_MODULE_CODE.format(scale=scale),
+                "scale_node": _NODE_WITH_HELPER_MODULE_CODE,
+            }
+            fingerprints.append(self._get_module_node_fingerprint(modules))
+        self.assertIsNotNone(fingerprints[0])
+        self.assertNotEqual(fingerprints[0], fingerprints[1])
+
+    def test_version1(self) -> None:
+        """
+        Check that caches with different versions don't share the entries.
+        """
+        dir_name = os.path.join(self.get_scratch_space(), "cache")
+        stats = []
+        for version in ["v1", "v1", "v2"]:
+            node_output_cache = dtfcnoouca.NodeOutputCache(
+                dir_name, version=version
+            )
+            dag = _get_dag(node_output_cache, tau=10)
+            dag.run_leq_node("sma", "fit")
+            stats.append(node_output_cache.get_stats())
+        self.assertEqual(stats[0]["hits"], 0)
+        self.assertEqual(stats[1]["misses"], 0)
+        self.assertEqual(stats[2]["hits"], 0)
+
+    def _get_module_node_fingerprint(self, modules: Dict[str, str]) -> str:
+        """
+        Write and import the modules, and fingerprint the node `ScaleNode`
+        defined by the last one.
+
+        :param modules: module name to code of the module
+        """
+        # Simulate a new run by importing the modules again and forgetting the
+        # module hashes computed so far.
+        dir_name = self.get_scratch_space()
+        with umock.patch.dict(sys.modules):
+            for module_name, code in modules.items():
+                file_name = os.path.join(dir_name, f"{module_name}.py")
+                with open(file_name, "w") as f:
+                    f.write(code)
+                spec = importlib.util.spec_from_file_location(
+                    module_name, file_name
+                )
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                spec.loader.exec_module(module)
+            dtfcnoouca._get_module_fingerprint.cache_clear()
+            dtfcnoouca._get_module_dependencies_fingerprint.cache_clear()
+            node = module.ScaleNode("scale")
+            fingerprint = dtfcnoouca.get_node_fingerprint(node)
+        return fingerprint
+
+    def _get_node_output_cache(self) -> dtfcnoouca.NodeOutputCache:
+        dir_name = os.path.join(self.get_scratch_space(), "cache")
+        return dtfcnoouca.NodeOutputCache(dir_name)
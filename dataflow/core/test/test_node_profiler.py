@@ -0,0 +1,107 @@
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+import dataflow.core.dag as dtfcordag
+import dataflow.core.node_output_cache as dtfcnoouca
+import dataflow.core.node_profiler as dtfcnoprof
+import dataflow.core.nodes.sources as dtfconosou
+import dataflow.core.nodes.transformers as dtfconotra
+import helpers.hio as hio
+import helpers.hunit_test as hunitest
+
+_LOG = logging.getLogger(__name__)
+
+
+def _get_data() -> pd.DataFrame:
+    idx = pd.date_range(
+        "2022-01-03 09:31", periods=100, freq="T", tz="America/New_York"
+    )
+    values = np.random.RandomState(seed=1).normal(size=(100, 2))
+    df = pd.DataFrame(values, index=idx, columns=["a", "b"])
+    return df
+
+
+def _get_dag(dst_dir: str) -> dtfcordag.DAG:
+    """
+    Build a DAG `read_data -> abs` profiling its execution.
+    """
+    dag = dtfcordag.DAG()
+    dag.set_debug_mode("", True, dst_dir)
+    dag.add_node(dtfconosou.DfDataSource("read_data", _get_data()))
+    node = dtfconotra.ColumnTransformer(
+        "abs", transformer_func=lambda df: df.abs(), col_mode="replace_all"
+    )
+    dag.add_node(node)
+    dag.connect("read_data", "abs")
+    return dag
+
+
+# #############################################################################
+# TestNodeProfiler1
+# #############################################################################
+
+
+class TestNodeProfiler1(hunitest.TestCase):
+    def test_run1(self) -> None:
+        """
+        Check the profiling records of a DAG run.
+        """
+        dst_dir = self.get_scratch_space()
+        dag = _get_dag(dst_dir)
+        dag.run_leq_node("abs", "fit")
+        df = dtfcnoprof.load_node_profiling_stats_from_dst_dir(dst_dir)
+        self.assertEqual(
+            df.columns.tolist(), dtfcnoprof.NODE_PROFILING_STATS_COLUMNS
+        )
+        self.assertEqual(df["nid"].tolist(), ["read_data", "abs"])
+        self.assertEqual(df["method"].tolist(), ["fit", "fit"])
+        self.assertEqual(df["num_input_rows"].tolist(), [0, 100])
+        self.assertEqual(df["num_output_rows"].tolist(), [100, 100])
+        # The input of `abs` is the output of `read_data`.
+        self.assertEqual(
+            df["input_size_in_bytes"].iloc[1], df["output_size_in_bytes"].iloc[0]
+        )
+        self.assertEqual(df["cache_hit"].tolist(), [False, False])
+        self.assertTrue((df["wall_time_in_secs"] >= 0).all())
+        self.assertTrue(df["bar_timestamp"].isna().all())
+
+    def test_run2(self) -> None:
+        """
+        Check that the cache hits are reported.
+        """
+        dst_dir = self.get_scratch_space()
+        cache_dir = os.path.join(dst_dir, "cache")
+        node_output_cache = dtfcnoouca.NodeOutputCache(cache_dir)
+        for _ in range(2):
+            dag = _get_dag(os.path.join(dst_dir, "dag"))
+            dag.set_node_output_cache(node_output_cache)
+            dag.run_leq_node("abs", "fit")
+        # `set_debug_mode()` recreates `dst_dir` so only the second run is
+        # stored.
+        df = dtfcnoprof.load_node_profiling_stats_from_dst_dir(
+            os.path.join(dst_dir, "dag")
+        )
+        self.assertEqual(df["cache_hit"].tolist(), [True, True])
+
+    def test_chrome_trace1(self) -> None:
+        """
+        Check the Chrome trace built from the profiling records.
+        """
+        dst_dir = self.get_scratch_space()
+        dag = _get_dag(dst_dir)
+        dag.run_leq_node("abs", "fit")
+        df = dtfcnoprof.load_node_profiling_stats_from_dst_dir(dst_dir)
+        file_name = os.path.join(dst_dir, "trace.json")
+        dtfcnoprof.save_chrome_trace(df, file_name)
+        trace = hio.from_json(file_name)
+        events = trace["traceEvents"]
+        self.assertEqual(
+            [event["name"] for event in events], ["fit.0.read_data", "fit.1.abs"]
+        )
+        self.assertEqual({event["ph"] for event in events}, {"X"})
+        self.assertEqual(events[1]["args"]["num_output_rows"], 100)
+        # The events follow the execution order.
+        self.assertLessEqual(events[0]["ts"], events[1]["ts"])
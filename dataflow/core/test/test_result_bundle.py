@@ -92,6 +92,43 @@ class TestResultBundle(hunitest.TestCase):
         expected = hprint.dedent(expected)
         self.assert_equal(str(actual), str(expected), purify_text=True)
 
+    def test_pickle2(self) -> None:
+        """
+        Check saving and loading a `ResultBundle` with `result_df` as Feather.
+        """
+        rb = self._get_result_bundle()
+        idx = pd.date_range(
+            "2022-01-03 09:31", periods=3, freq="T", tz="America/New_York"
+        )
+        result_df = pd.DataFrame(
+            [[float(i + j) for j in range(5)] for i in range(3)],
+            index=idx,
+            columns=[f"col{i}" for i in range(5)],
+        )
+        rb.result_df = result_df
+        # Serialize.
+        dir_name = self.get_scratch_space()
+        file_name = os.path.join(dir_name, "result_bundle.pkl")
+        rb.to_pickle(file_name, use_pq=True, use_feather=True)
+        actual = hunitest.get_dir_signature(dir_name, include_file_content=False)
+        expected = """
+        # Dir structure
+        $GIT_ROOT/dataflow/core/test/outcomes/TestResultBundle.test_pickle2/tmp.scratch
+        $GIT_ROOT/dataflow/core/test/outcomes/TestResultBundle.test_pickle2/tmp.scratch/result_bundle.v2_0.feather
+        $GIT_ROOT/dataflow/core/test/outcomes/TestResultBundle.test_pickle2/tmp.scratch/result_bundle.v2_0.metadata_df.pkl
+        $GIT_ROOT/dataflow/core/test/outcomes/TestResultBundle.test_pickle2/tmp.scratch/result_bundle.v2_0.pkl
+        """
+        expected = hprint.dedent(expected)
+        self.assert_equal(str(actual), str(expected), purify_text=True)
+        # Deserialize.
+        file_name = os.path.join(dir_name, "result_bundle.v2_0.pkl")
+        rb2 = dtfcorebun.ResultBundle.from_pickle(
+            file_name, columns=["col1", "col3"], memory_map=True
+        )
+        pd.testing.assert_frame_equal(rb2.result_df, result_df[["col1", "col3"]])
+        self.assertEqual(rb2.result_df.index.freq, result_df.index.freq)
+        self.assertEqual(rb2.column_to_tags, rb.column_to_tags)
+
     def test_get_tags_for_column1(self) -> None:
         rb = self._get_result_bundle()
         #
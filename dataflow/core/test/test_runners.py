@@ -1,9 +1,14 @@
 import logging
+from typing import Any, List, Tuple
 
+import numpy as np
 import pandas as pd
 
+import dataflow.core.dag as dtfcordag
 import dataflow.core.dag_builder_example as dtfcdabuex
 import dataflow.core.dag_runner as dtfcodarun
+import dataflow.core.nodes.sources as dtfconosou
+import dataflow.core.nodes.volatility_models as dtfcnovomo
 import dataflow.core.visitors as dtfcorvisi
 import helpers.hpandas as hpandas
 import helpers.hunit_test as hunitest
@@ -92,6 +97,55 @@ class TestRollingFitPredictDagRunner1(hunitest.TestCase):
         self.assert_equal(actual, expected, fuzzy_match=True)
 
 
+class TestRollingFitPredictDagRunner2(hunitest.TestCase):
+    def test_num_workers1(self) -> None:
+        """
+        Check that running the retraining windows in parallel gives the same
+        results as running them sequentially.
+        """
+        expected = self._run(num_workers=1)
+        actual = self._run(num_workers=2)
+        self.assertEqual(len(actual), 7)
+        self.assertEqual(len(actual), len(expected))
+        for actual_result, expected_result in zip(actual, expected):
+            # Check the training datetime.
+            self.assertEqual(actual_result[0], expected_result[0])
+            # Check the fit and predict `ResultBundle`s.
+            for idx in (1, 2):
+                hunitest.compare_df(
+                    actual_result[idx].result_df, expected_result[idx].result_df
+                )
+                self.assertEqual(
+                    actual_result[idx].info["sma"],
+                    expected_result[idx].info["sma"],
+                )
+
+    @staticmethod
+    def _run(num_workers: int) -> List[Tuple[str, Any, Any]]:
+        """
+        Run a DAG `read_data -> sma` retraining the model every week.
+        """
+        idx = pd.date_range("2010-01-01", "2010-03-31", freq="D")
+        values = np.random.RandomState(seed=0).normal(size=len(idx)) ** 2
+        df = pd.DataFrame({"x": values}, index=idx)
+        dag = dtfcordag.DAG()
+        dag.add_node(dtfconosou.DfDataSource("read_data", df))
+        node = dtfcnovomo.SmaModel(
+            "sma", col=["x"], steps_ahead=1, nan_mode="drop"
+        )
+        dag.add_node(node)
+        dag.connect("read_data", "sma")
+        dag_runner = dtfcodarun.RollingFitPredictDagRunner(
+            dag,
+            pd.Timestamp("2010-02-01"),
+            pd.Timestamp("2010-03-15"),
+            "1W",
+            3,
+            num_workers=num_workers,
+        )
+        return list(dag_runner.fit_predict())
+
+
 # #############################################################################
 
 
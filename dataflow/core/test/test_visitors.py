@@ -0,0 +1,122 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+import dataflow.core.dag as dtfcordag
+import dataflow.core.nodes.sources as dtfconosou
+import dataflow.core.nodes.transformers as dtfconotra
+import dataflow.core.nodes.volatility_models as dtfcnovomo
+import dataflow.core.visitors as dtfcorvisi
+import helpers.hunit_test as hunitest
+
+_LOG = logging.getLogger(__name__)
+
+
+def _get_data() -> pd.DataFrame:
+    idx = pd.date_range(
+        "2022-01-03 09:31", periods=50, freq="T", tz="America/New_York"
+    )
+    values = np.random.RandomState(seed=1).normal(size=(50, 3))
+    df = pd.DataFrame(values, index=idx, columns=["a", "b", "c"])
+    return df
+
+
+def _get_multiindex_data() -> pd.DataFrame:
+    df = _get_data()
+    df = pd.concat({101: df, 202: df + 1.0}, axis=1).swaplevel(axis=1)
+    df = df.sort_index(axis=1)
+    return df
+
+
+# #############################################################################
+# Test_push_down_required_columns1
+# #############################################################################
+
+
+class Test_push_down_required_columns1(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check the columns inferred for a DAG `read_data -> abs -> sma`.
+        """
+        dag = self._get_dag()
+        actual = dtfcorvisi.get_required_columns(dag)
+        # `abs` propagates its input, thus it needs to read also the column
+        # consumed by `sma`.
+        expected = {"sma": None, "abs": ["b"], "read_data": ["a", "b"]}
+        self.assertDictEqual(actual, expected)
+
+    def test2(self) -> None:
+        """
+        Check that pushing down the columns doesn't change the DAG output.
+        """
+        dag = self._get_dag()
+        expected = dag.run_leq_node("sma", "fit")["df_out"]
+        #
+        dag = self._get_dag()
+        dtfcorvisi.push_down_required_columns(dag)
+        actual = dag.run_leq_node("sma", "fit")["df_out"]
+        hunitest.compare_df(actual, expected)
+        # The source node emits only the needed columns.
+        df_out = dag.get_node("read_data").get_output("fit", "df_out")
+        self.assertEqual(df_out.columns.tolist(), ["a", "b"])
+
+    def test3(self) -> None:
+        """
+        Check that the columns are not pushed down when a node might need all
+        of them.
+        """
+        dag = self._get_dag()
+        node = dtfconotra.ColumnTransformer(
+            "square", transformer_func=lambda df: df**2, col_mode="replace_all"
+        )
+        dag.add_node(node)
+        dag.connect("read_data", "square")
+        actual = dtfcorvisi.get_required_columns(dag)
+        self.assertIsNone(actual["read_data"])
+
+    def test4(self) -> None:
+        """
+        Check the columns inferred for a DAG with multi-index columns.
+        """
+        dag = dtfcordag.DAG()
+        node = dtfconosou.DfDataSource("read_data", _get_multiindex_data())
+        dag.add_node(node)
+        node = dtfconotra.GroupedColDfToDfTransformer(
+            "sum",
+            in_col_groups=[("a",), ("c",)],
+            out_col_group=(),
+            transformer_func=lambda df: (df["a"] + df["c"]).to_frame("sum"),
+            join_output_with_input=False,
+        )
+        dag.add_node(node)
+        dag.connect("read_data", "sum")
+        expected = dag.run_leq_node("sum", "fit")["df_out"]
+        #
+        actual = dtfcorvisi.get_required_columns(dag)
+        self.assertDictEqual(actual, {"sum": None, "read_data": ["a", "c"]})
+        dtfcorvisi.push_down_required_columns(dag)
+        actual = dag.run_leq_node("sum", "fit")["df_out"]
+        hunitest.compare_df(actual, expected)
+        df_out = dag.get_node("read_data").get_output("fit", "df_out")
+        self.assertEqual(
+            df_out.columns.get_level_values(0).unique().tolist(), ["a", "c"]
+        )
+
+    @staticmethod
+    def _get_dag() -> dtfcordag.DAG:
+        dag = dtfcordag.DAG()
+        dag.add_node(dtfconosou.DfDataSource("read_data", _get_data()))
+        node = dtfconotra.ColumnTransformer(
+            "abs",
+            transformer_func=lambda df: df.abs(),
+            cols=["a"],
+            col_rename_func=lambda x: f"{x}.abs",
+            col_mode="merge_all",
+        )
+        dag.add_node(node)
+        node = dtfcnovomo.SmaModel("sma", col=["b"], steps_ahead=1, tau=5)
+        dag.add_node(node)
+        dag.connect("read_data", "abs")
+        dag.connect("abs", "sma")
+        return dag
@@ -7,7 +7,9 @@ import dataflow.core.visitors as dtfcorvisi
 import collections
 import copy
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, cast
+
+import networkx as networ
 
 import dataflow.core.dag as dtfcordag
 import dataflow.core.node as dtfcornode
@@ -97,3 +99,91 @@ def set_fit_state(dag: dtfcordag.DAG, fit_state: NodeState) -> None:
         hdbg.dassert_in(nid, fit_state.keys())
         node_fit_state = copy.copy(fit_state[nid])
         node.set_fit_state(node_fit_state)
+
+
+# #############################################################################
+
+
+def set_incremental_predict(
+    dag: dtfcordag.DAG, incremental_predict: bool
+) -> None:
+    """
+    Enable / disable incremental `predict()` for all the nodes of a DAG.
+
+    Nodes that don't support incremental computation keep processing their
+    entire input. See `FitPredictNode.set_incremental_predict()`.
+
+    :param dag: dataflow DAG consisting of `FitPredictNode`s
+    :param incremental_predict: whether to run `predict()` incrementally
+    """
+    hdbg.dassert_isinstance(dag, dtfcordag.DAG)
+    graph = dag.nx_dag
+    # Scan the nodes.
+    for nid in graph.nodes():
+        node = dag.get_node(nid)
+        hdbg.dassert_isinstance(node, dtfconobas.FitPredictNode)
+        node.set_incremental_predict(incremental_predict)
+
+
+# #############################################################################
+
+
+def get_required_columns(
+    dag: dtfcordag.DAG,
+) -> Dict[dtfcornode.NodeId, Optional[List[Any]]]:
+    """
+    Infer which columns of the output of each node are consumed downstream.
+
+    The DAG is scanned from the sinks to the sources, asking each node through
+    `FitPredictNode.get_required_input_columns()` which input columns it needs
+    to compute the output columns needed by its successors.
+
+    :param dag: dataflow DAG consisting of `FitPredictNode`s
+    :return: map from nid to the columns of `df_out` needed downstream
+        - `None` means all the columns, e.g., for the sink nodes
+    """
+    hdbg.dassert_isinstance(dag, dtfcordag.DAG)
+    graph = dag.nx_dag
+    required_columns: Dict[dtfcornode.NodeId, Optional[List[Any]]] = {}
+    for nid in reversed(list(networ.topological_sort(graph))):
+        columns: Optional[List[Any]] = None
+        successors = list(graph.successors(nid))
+        if successors:
+            columns = []
+        for successor_nid in successors:
+            successor = dag.get_node(successor_nid)
+            hdbg.dassert_isinstance(successor, dtfconobas.FitPredictNode)
+            # Only single-input successors consuming `df_out` can declare the
+            # columns they need.
+            is_single_input = successor.input_names == ["df_in"]
+            edge = graph.edges[nid, successor_nid]
+            if not is_single_input or edge != {"df_in": "df_out"}:
+                columns = None
+                break
+            successor_columns = successor.get_required_input_columns(
+                required_columns[successor_nid]
+            )
+            if successor_columns is None:
+                columns = None
+                break
+            columns = cast(List[Any], columns)
+            for col in successor_columns:
+                if col not in columns:
+                    columns.append(col)
+        _LOG.debug("nid=%s -> columns=%s", nid, columns)
+        required_columns[nid] = columns
+    return required_columns
+
+
+def push_down_required_columns(dag: dtfcordag.DAG) -> None:
+    """
+    Make the source nodes of a DAG read only the columns consumed downstream.
+
+    See `get_required_columns()` and `DataSource.set_columns_to_read()`.
+    """
+    required_columns = get_required_columns(dag)
+    for nid, columns in required_columns.items():
+        node = dag.get_node(nid)
+        if isinstance(node, dtfconobas.DataSource):
+            _LOG.debug("Setting columns to read for nid=%s: %s", nid, columns)
+            node.set_columns_to_read(columns)
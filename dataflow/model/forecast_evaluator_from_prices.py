@@ -4,9 +4,10 @@ Import as:
 import dataflow.model.forecast_evaluator_from_prices as dtfmfefrpr
 """
 import collections
+import inspect
 import logging
 import os
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -15,6 +16,7 @@ import core.finance as cofinanc
 import core.statistics as costatis
 import helpers.hdbg as hdbg
 import helpers.hio as hio
+import helpers.hnumba as hnumba
 import helpers.hpandas as hpandas
 import helpers.hprint as hprint
 
@@ -385,6 +387,7 @@ class ForecastEvaluatorFromPrices:
         burn_in_days: int = 0,
         compute_extended_stats: bool = False,
         asset_id_to_share_decimals: Optional[Dict[int, int]] = None,
+        engine: str = "pandas",
         **kwargs,
     ) -> Dict[str, pd.DataFrame]:
         """
@@ -413,6 +416,13 @@ class ForecastEvaluatorFromPrices:
             artifacts). Applied independently of `burn_in_bars`.
         :param compute_extended_stats: compute additional stats beyond the
             five "core" stats.
+        :param engine: how to compute holdings, trades, and PnL from the
+            target positions
+            - "pandas": use a sequence of pandas operations
+            - "numpy": simulate the portfolio bar-by-bar on NumPy arrays in a
+              single pass (using numba, if available). The results are
+              identical to "pandas", but `adjust_for_splits` and buy / sell
+              price columns are not supported
         :param kwargs: forwarded to either
             `compute_target_positions_cross_sectionally()` or
             `compute_target_positions_longitudinally()` depending upon the
@@ -421,7 +431,10 @@ class ForecastEvaluatorFromPrices:
             ["holdings_shares", "holdings_notional", "executed_trades_shares",
              "executed_trades_notional", "pnl", "stats"]
         """
-        _LOG.debug("df=\n%s", hpandas.df_to_str(df, print_shape_info=True))
+        if _LOG.isEnabledFor(logging.DEBUG):
+            # Avoid formatting the df when the message is not logged, since it
+            # dominates the run time when evaluating many configs.
+            _LOG.debug("df=\n%s", hpandas.df_to_str(df, print_shape_info=True))
         self._validate_df(df)
         # Record index in case we reindex the results.
         if reindex_like_input:
@@ -436,33 +449,65 @@ class ForecastEvaluatorFromPrices:
             style,
             **kwargs,
         )
-        # Compute holdings (in shares).
         # TODO(Paul): Expose these two parameters.
         ffill_limit = 4
-        holdings_shares = self._compute_holdings_shares(
-            df,
-            target_holdings_notional,
-            quantization,
-            liquidate_at_end_of_day,
-            adjust_for_splits,
-            ffill_limit,
-            asset_id_to_share_decimals,
-        )
-        # Compute cash inflows/outflows from trades.
-        executed_trades_shares = self._compute_executed_trades_shares(
-            df,
-            holdings_shares,
-            initialize_beginning_of_day_trades_to_zero,
-        )
-        executed_trades_notional = self._compute_executed_trades_notional(
-            df,
-            executed_trades_shares,
-            ffill_limit,
-        )
-        # Compute notional positions.
-        holdings_notional = self._compute_holdings_notional(df, holdings_shares)
-        # Compute PnL.
-        pnl = self._compute_pnl(df, holdings_notional, executed_trades_notional)
+        if engine == "pandas":
+            # Compute holdings (in shares).
+            holdings_shares = self._compute_holdings_shares(
+                df,
+                target_holdings_notional,
+                quantization,
+                liquidate_at_end_of_day,
+                adjust_for_splits,
+                ffill_limit,
+                asset_id_to_share_decimals,
+            )
+            # Compute cash inflows/outflows from trades.
+            executed_trades_shares = self._compute_executed_trades_shares(
+                df,
+                holdings_shares,
+                initialize_beginning_of_day_trades_to_zero,
+            )
+            executed_trades_notional = self._compute_executed_trades_notional(
+                df,
+                executed_trades_shares,
+                ffill_limit,
+            )
+            # Compute notional positions.
+            holdings_notional = self._compute_holdings_notional(
+                df, holdings_shares
+            )
+            # Compute PnL.
+            pnl = self._compute_pnl(
+                df, holdings_notional, executed_trades_notional
+            )
+        elif engine == "numpy":
+            hdbg.dassert(
+                not adjust_for_splits,
+                "`adjust_for_splits` is not supported with engine='numpy'",
+            )
+            hdbg.dassert_is(
+                self._buy_price_col,
+                None,
+                "Buy / sell prices are not supported with engine='numpy'",
+            )
+            (
+                holdings_shares,
+                holdings_notional,
+                executed_trades_shares,
+                executed_trades_notional,
+                pnl,
+            ) = self._compute_portfolio_with_numpy(
+                df,
+                target_holdings_notional,
+                quantization,
+                liquidate_at_end_of_day,
+                initialize_beginning_of_day_trades_to_zero,
+                ffill_limit,
+                asset_id_to_share_decimals,
+            )
+        else:
+            raise ValueError(f"Invalid engine='{engine}'")
         # Compute statistics.
         stats = self._compute_stats(
             df,
@@ -505,21 +550,160 @@ class ForecastEvaluatorFromPrices:
             df,
             **kwargs,
         )
-        dfs = {
-            "price": df[self._price_col],
-            "volatility": df[self._volatility_col],
-            "prediction": df[self._prediction_col],
-            "holdings_shares": derived_dfs["holdings_shares"],
-            "holdings_notional": derived_dfs["holdings_notional"],
-            "executed_trades_shares": derived_dfs["executed_trades_shares"],
-            "executed_trades_notional": derived_dfs["executed_trades_notional"],
-            "pnl": derived_dfs["pnl"],
-        }
-        if self._spread_col is not None:
-            dfs["spread"] = df[self._spread_col]
-        portfolio_df = ForecastEvaluatorFromPrices._build_multiindex_df(dfs)
+        portfolio_df = self._build_portfolio_df(df, derived_dfs)
         return portfolio_df, derived_dfs["stats"]
 
+    def compute_portfolios(
+        self,
+        df: pd.DataFrame,
+        configs: List[Dict[str, Any]],
+        *,
+        ffill_limit: int = 4,
+    ) -> List[Dict[str, pd.DataFrame]]:
+        """
+        Compute the portfolios for multiple evaluation configs at once.
+
+        The result is the same as calling `compute_portfolio(df, **config)`
+        with `engine="numpy"` for each config, but:
+        - `df` is validated and trimmed only once
+        - the target positions are computed only once for configs sharing
+          `style` and the params forwarded to the target position computation
+          (e.g., when sweeping `quantization` or `burn_in_bars`)
+        - the holdings, trades, and PnL of all the configs are simulated
+          together, stacking the portfolios along the asset axis
+
+        :param df: as in `compute_portfolio()`
+        :param configs: params of `compute_portfolio()` for each evaluation,
+            e.g.,
+            ```
+            [
+                {"target_gmv": 1e5, "quantization": "no_quantization"},
+                {"target_gmv": 1e5, "quantization": "nearest_share"},
+                {"style": "longitudinal", "target_dollar_risk_per_name": 1e2},
+            ]
+            ```
+        :param ffill_limit: maximum number of bars to forward fill the missing
+            prices and holdings for, like `compute_portfolio()` does
+        :return: dictionary of portfolio dataframes, as returned by
+            `compute_portfolio()`, for each config
+        """
+        hdbg.dassert_isinstance(configs, list)
+        hdbg.dassert_lt(0, len(configs))
+        hdbg.dassert_is(
+            self._buy_price_col,
+            None,
+            "Buy / sell prices are not supported with multiple configs",
+        )
+        # Resolve the params of each config, including the defaults.
+        signature = inspect.signature(self.compute_portfolio)
+        params = []
+        for config in configs:
+            hdbg.dassert_isinstance(config, dict)
+            hdbg.dassert_not_in("engine", config)
+            bound_args = signature.bind(df, **config)
+            bound_args.apply_defaults()
+            params_ = bound_args.arguments
+            hdbg.dassert(
+                not params_["adjust_for_splits"],
+                "`adjust_for_splits` is not supported with multiple configs",
+            )
+            params.append(params_)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("df=\n%s", hpandas.df_to_str(df, print_shape_info=True))
+        self._validate_df(df)
+        idx = df.index
+        # Trim to indices with prices and beginning of forecast availability.
+        df = self._apply_trimming(df)
+        # Compute target positions (in dollars) once for each distinct set of
+        # params.
+        target_holdings_notional_cache: Dict[str, pd.DataFrame] = {}
+        portfolio_params = []
+        for params_ in params:
+            key = repr((params_["style"], sorted(params_["kwargs"].items())))
+            if key not in target_holdings_notional_cache:
+                target_holdings_notional_cache[
+                    key
+                ] = self._compute_target_holdings_notional(
+                    df,
+                    params_["style"],
+                    **params_["kwargs"],
+                )
+            portfolio_params.append(
+                (
+                    target_holdings_notional_cache[key],
+                    params_["quantization"],
+                    params_["liquidate_at_end_of_day"],
+                    params_["initialize_beginning_of_day_trades_to_zero"],
+                    params_["asset_id_to_share_decimals"],
+                )
+            )
+        _LOG.debug(
+            "Computed target positions for %s configs out of %s",
+            len(target_holdings_notional_cache),
+            len(params),
+        )
+        # Compute holdings, trades, and PnL of all the configs.
+        hdbg.dassert_lte(0, ffill_limit)
+        portfolio_dfs = self._compute_portfolios_with_numpy(
+            df, portfolio_params, ffill_limit
+        )
+        # Compute statistics and apply burn-in for each config.
+        derived_dfs_list = []
+        for params_, portfolio_dfs_ in zip(params, portfolio_dfs):
+            (
+                holdings_shares,
+                holdings_notional,
+                executed_trades_shares,
+                executed_trades_notional,
+                pnl,
+            ) = portfolio_dfs_
+            stats = self._compute_stats(
+                df,
+                holdings_notional,
+                executed_trades_notional,
+                pnl,
+                params_["compute_extended_stats"],
+            )
+            derived_dfs = {
+                "holdings_shares": holdings_shares,
+                "holdings_notional": holdings_notional,
+                "executed_trades_shares": executed_trades_shares,
+                "executed_trades_notional": executed_trades_notional,
+                "pnl": pnl,
+                "stats": stats,
+            }
+            derived_dfs = self._apply_burn_in_and_reindex(
+                df,
+                derived_dfs,
+                params_["burn_in_bars"],
+                params_["burn_in_days"],
+                idx if params_["reindex_like_input"] else None,
+            )
+            derived_dfs_list.append(derived_dfs)
+        return derived_dfs_list
+
+    def annotate_forecasts_for_configs(
+        self,
+        df: pd.DataFrame,
+        configs: List[Dict[str, Any]],
+        **kwargs: Any,
+    ) -> List[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Wraps `compute_portfolios()`, like `annotate_forecasts()` does.
+
+        :param df: as in `compute_portfolio()`
+        :param configs: as in `compute_portfolios()`
+        :param kwargs: forwarded to `compute_portfolios()`
+        :return: multiindexed portfolio dataframe, stats dataframe for each
+            config
+        """
+        derived_dfs_list = self.compute_portfolios(df, configs, **kwargs)
+        results = []
+        for derived_dfs in derived_dfs_list:
+            portfolio_df = self._build_portfolio_df(df, derived_dfs)
+            results.append((portfolio_df, derived_dfs["stats"]))
+        return results
+
     def get_cols(self) -> List[str]:
         """
         Return the names of the price, volatility, and prediction columns.
@@ -624,6 +808,30 @@ class ForecastEvaluatorFromPrices:
 
     # /////////////////////////////////////////////////////////////////////////////
 
+    def _build_portfolio_df(
+        self, df: pd.DataFrame, derived_dfs: Dict[str, pd.DataFrame]
+    ) -> pd.DataFrame:
+        """
+        Build the multiindexed portfolio dataframe from the input and outputs.
+
+        :param df: as in `compute_portfolio()`
+        :param derived_dfs: as returned by `compute_portfolio()`
+        """
+        dfs = {
+            "price": df[self._price_col],
+            "volatility": df[self._volatility_col],
+            "prediction": df[self._prediction_col],
+            "holdings_shares": derived_dfs["holdings_shares"],
+            "holdings_notional": derived_dfs["holdings_notional"],
+            "executed_trades_shares": derived_dfs["executed_trades_shares"],
+            "executed_trades_notional": derived_dfs["executed_trades_notional"],
+            "pnl": derived_dfs["pnl"],
+        }
+        if self._spread_col is not None:
+            dfs["spread"] = df[self._spread_col]
+        portfolio_df = ForecastEvaluatorFromPrices._build_multiindex_df(dfs)
+        return portfolio_df
+
     @staticmethod
     def _build_multiindex_df(dfs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
         portfolio_df = pd.concat(dfs.values(), axis=1, keys=dfs.keys())
@@ -732,7 +940,8 @@ class ForecastEvaluatorFromPrices:
         )
         df = df.loc[first_valid_index:]
         _LOG.debug("df.shape=%s", str(df.shape))
-        _LOG.debug("trimmed df=\n%s", hpandas.df_to_str(df))
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("trimmed df=\n%s", hpandas.df_to_str(df))
         return df
 
     def _compute_target_holdings_notional(
@@ -754,11 +963,13 @@ class ForecastEvaluatorFromPrices:
         prediction_df = ForecastEvaluatorFromPrices._get_df(
             df, self._prediction_col
         )
-        _LOG.debug("prediction_df=\n%s", hpandas.df_to_str(prediction_df))
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("prediction_df=\n%s", hpandas.df_to_str(prediction_df))
         volatility_df = ForecastEvaluatorFromPrices._get_df(
             df, self._volatility_col
         )
-        _LOG.debug("volatility_df=\n%s", hpandas.df_to_str(volatility_df))
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("volatility_df=\n%s", hpandas.df_to_str(volatility_df))
         spread_df = None
         if self._spread_col is not None:
             spread_df = ForecastEvaluatorFromPrices._get_df(df, self._spread_col)
@@ -870,10 +1081,11 @@ class ForecastEvaluatorFromPrices:
         executed_trades_shares = holdings_shares.subtract(
             holdings_shares.shift(1), fill_value=0
         )
-        _LOG.debug(
-            "`executed_trades_shares pre-adjusted`=\n%s",
-            hpandas.df_to_str(executed_trades_shares),
-        )
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug(
+                "`executed_trades_shares pre-adjusted`=\n%s",
+                hpandas.df_to_str(executed_trades_shares),
+            )
         # In equity markets with corporate actions, the previous end-of-day
         # share counts may differ from the beginning-of-day share counts even
         # though no trades have taken place. This can be remedied by resetting
@@ -887,10 +1099,11 @@ class ForecastEvaluatorFromPrices:
             )
             # Set overnight trades to zero.
             executed_trades_shares.loc[bod_timestamps["timestamp"]] *= 0
-        _LOG.debug(
-            "`executed_trades_shares adjusted`=\n%s",
-            hpandas.df_to_str(executed_trades_shares),
-        )
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug(
+                "`executed_trades_shares adjusted`=\n%s",
+                hpandas.df_to_str(executed_trades_shares),
+            )
         return executed_trades_shares
 
     def _compute_executed_trades_notional(
@@ -994,6 +1207,139 @@ class ForecastEvaluatorFromPrices:
         ).subtract(executed_trades_notional, fill_value=0)
         return pnl
 
+    def _compute_portfolio_with_numpy(
+        self,
+        df: pd.DataFrame,
+        target_notional_positions: pd.DataFrame,
+        quantization: str,
+        liquidate_at_end_of_day: bool,
+        initialize_beginning_of_day_trades_to_zero: bool,
+        ffill_limit: int,
+        asset_id_to_share_decimals: Optional[Dict[int, int]],
+    ) -> Tuple[
+        pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame
+    ]:
+        """
+        Compute holdings, trades, and PnL like the "pandas" engine does.
+
+        Each step mirrors the pandas computation in the corresponding
+        `_compute_...()` method, so that the results are identical.
+
+        :param df: as in `compute_portfolio()`
+        :param target_notional_positions: from
+            `_compute_target_holdings_notional()`
+        :return: end-of-bar indexed holdings in shares, holdings in dollars,
+            trades in shares, trades in dollars, PnL
+        """
+        portfolio_params = [
+            (
+                target_notional_positions,
+                quantization,
+                liquidate_at_end_of_day,
+                initialize_beginning_of_day_trades_to_zero,
+                asset_id_to_share_decimals,
+            )
+        ]
+        dfs = self._compute_portfolios_with_numpy(
+            df, portfolio_params, ffill_limit
+        )
+        return dfs[0]
+
+    def _compute_portfolios_with_numpy(
+        self,
+        df: pd.DataFrame,
+        portfolio_params: List[
+            Tuple[pd.DataFrame, str, bool, bool, Optional[Dict[int, int]]]
+        ],
+        ffill_limit: int,
+    ) -> List[
+        Tuple[
+            pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame
+        ]
+    ]:
+        """
+        Compute holdings, trades, and PnL of multiple portfolios at once.
+
+        The portfolios are stacked along the asset axis, so that they are
+        simulated with a single call to the kernel.
+
+        :param df: as in `compute_portfolio()`
+        :param portfolio_params: for each portfolio, the target notional
+            positions and the params `quantization`, `liquidate_at_end_of_day`,
+            `initialize_beginning_of_day_trades_to_zero`,
+            `asset_id_to_share_decimals` as in `_compute_portfolio_with_numpy()`
+        :return: for each portfolio, the dataframes returned by
+            `_compute_portfolio_with_numpy()`
+        """
+        mark_to_market_price = ForecastEvaluatorFromPrices._get_df(
+            df, self._price_col
+        )
+        price = mark_to_market_price.to_numpy(dtype=np.float64)
+        num_assets = price.shape[1]
+        target_holdings_shares = []
+        liquidate_at_end_of_day = []
+        initialize_beginning_of_day_trades_to_zero = []
+        for (
+            target_notional_positions,
+            quantization,
+            liquidate_at_end_of_day_,
+            initialize_beginning_of_day_trades_to_zero_,
+            asset_id_to_share_decimals,
+        ) in portfolio_params:
+            hpandas.dassert_axes_equal(
+                target_notional_positions, mark_to_market_price
+            )
+            target_holdings_shares_ = (
+                target_notional_positions.to_numpy(dtype=np.float64) / price
+            )
+            target_holdings_shares_ = _quantize_shares(
+                target_holdings_shares_,
+                mark_to_market_price.columns,
+                quantization,
+                asset_id_to_share_decimals,
+            )
+            target_holdings_shares.append(target_holdings_shares_)
+            liquidate_at_end_of_day.append(
+                np.full(num_assets, liquidate_at_end_of_day_)
+            )
+            initialize_beginning_of_day_trades_to_zero.append(
+                np.full(num_assets, initialize_beginning_of_day_trades_to_zero_)
+            )
+        # Holdings are adjusted at the boundaries of each day.
+        is_bod, is_eod = _get_day_boundaries(mark_to_market_price.index)
+        # Trades are reset at the first bar of each day with a price, like
+        # `cofinanc.retrieve_beginning_of_day_timestamps()` does.
+        is_active = ~np.isnan(price).all(axis=1)
+        is_active_bod = np.zeros_like(is_active)
+        is_active_bod[is_active] = _get_day_boundaries(
+            mark_to_market_price.index[is_active]
+        )[0]
+        num_portfolios = len(portfolio_params)
+        arrays = _compute_portfolio_kernel(
+            np.hstack(target_holdings_shares),
+            np.tile(price, (1, num_portfolios)),
+            is_bod,
+            is_eod,
+            is_active_bod,
+            np.concatenate(liquidate_at_end_of_day),
+            np.concatenate(initialize_beginning_of_day_trades_to_zero),
+            ffill_limit,
+        )
+        # Split the results by portfolio.
+        dfs = []
+        for idx in range(num_portfolios):
+            cols = slice(idx * num_assets, (idx + 1) * num_assets)
+            dfs_ = tuple(
+                pd.DataFrame(
+                    array[:, cols],
+                    index=mark_to_market_price.index,
+                    columns=mark_to_market_price.columns,
+                )
+                for array in arrays
+            )
+            dfs.append(dfs_)
+        return dfs
+
     def _compute_stats(
         self,
         df: pd.DataFrame,
@@ -1053,6 +1399,179 @@ class ForecastEvaluatorFromPrices:
         return derived_dfs
 
 
+# #############################################################################
+# NumPy engine
+# #############################################################################
+
+
+def _quantize_shares(
+    shares: np.ndarray,
+    asset_ids: pd.Index,
+    quantization: str,
+    asset_id_to_decimals: Optional[Dict[int, int]],
+) -> np.ndarray:
+    """
+    Quantize shares like `cofinanc.quantize_shares()` does for a df.
+    """
+    if quantization in ("no_quantization", "nearest_share", "nearest_lot"):
+        hdbg.dassert(
+            asset_id_to_decimals is None,
+            "asset_id_to_decimals must be `None` when `quantization`=%s",
+            quantization,
+        )
+    if quantization == "no_quantization":
+        quantized_shares = shares
+    elif quantization == "nearest_share":
+        quantized_shares = np.rint(shares)
+    elif quantization == "nearest_lot":
+        quantized_shares = shares.round(-2)
+    elif quantization == "asset_specific":
+        hdbg.dassert_isinstance(asset_id_to_decimals, dict)
+        hdbg.dassert_is_subset(asset_ids, asset_id_to_decimals.keys())
+        quantized_shares = np.empty_like(shares)
+        for idx, asset_id in enumerate(asset_ids):
+            decimals = asset_id_to_decimals[asset_id]
+            quantized_shares[:, idx] = shares[:, idx].round(decimals)
+    else:
+        raise ValueError(f"Invalid quantization strategy `{quantization}`")
+    return quantized_shares
+
+
+def _get_day_boundaries(idx: pd.DatetimeIndex) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return masks of the first and last bar of each day in `idx`.
+    """
+    dates = idx.normalize().asi8
+    is_bod = np.ones(len(dates), dtype=bool)
+    is_eod = np.ones(len(dates), dtype=bool)
+    is_new_date = dates[1:] != dates[:-1]
+    is_bod[1:] = is_new_date
+    is_eod[:-1] = is_new_date
+    return is_bod, is_eod
+
+
+@hnumba.jit
+def _subtract_with_fill(value1: float, value2: float) -> float:
+    """
+    Subtract like `pd.DataFrame.subtract(..., fill_value=0)`.
+    """
+    if np.isnan(value1) and np.isnan(value2):
+        return np.nan
+    if np.isnan(value1):
+        value1 = 0.0
+    if np.isnan(value2):
+        value2 = 0.0
+    return value1 - value2
+
+
+@hnumba.jit
+def _compute_portfolio_kernel(
+    target_holdings_shares: np.ndarray,
+    price: np.ndarray,
+    is_bod: np.ndarray,
+    is_eod: np.ndarray,
+    is_active_bod: np.ndarray,
+    liquidate_at_end_of_day: np.ndarray,
+    initialize_beginning_of_day_trades_to_zero: np.ndarray,
+    ffill_limit: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simulate the portfolio bar-by-bar for each asset.
+
+    :param target_holdings_shares: quantized holdings to trade into over the
+        next bar
+    :param price: mark-to-market price
+    :param is_bod, is_eod: masks of the first and last bar of each day
+    :param is_active_bod: mask of the first bar with a price of each day
+    :param liquidate_at_end_of_day,
+        initialize_beginning_of_day_trades_to_zero: per-asset flags as in
+        `ForecastEvaluatorFromPrices.compute_portfolio()`
+    :return: holdings in shares, holdings in dollars, trades in shares,
+        trades in dollars, PnL
+    """
+    num_bars, num_assets = price.shape
+    holdings_shares = np.empty((num_bars, num_assets))
+    holdings_notional = np.empty((num_bars, num_assets))
+    executed_trades_shares = np.empty((num_bars, num_assets))
+    executed_trades_notional = np.empty((num_bars, num_assets))
+    pnl = np.empty((num_bars, num_assets))
+    for j in range(num_assets):
+        # State of the forward fill of the holdings within a day.
+        last_holdings = np.nan
+        num_holdings_fills = 0
+        # State of the two consecutive forward fills of the execution price.
+        last_price1 = np.nan
+        num_price1_fills = 0
+        last_price2 = np.nan
+        num_price2_fills = 0
+        prev_holdings = np.nan
+        prev_holdings_notional = np.nan
+        for i in range(num_bars):
+            # Compute holdings, i.e., the target holdings of the previous bar
+            # adjusted for the end of day.
+            holdings = np.nan
+            if i > 0:
+                holdings = target_holdings_shares[i - 1, j]
+            if liquidate_at_end_of_day[j]:
+                if is_eod[i]:
+                    holdings = 0.0
+                if is_bod[i]:
+                    holdings *= 0
+            if ffill_limit > 0:
+                if is_bod[i]:
+                    last_holdings = np.nan
+                    num_holdings_fills = 0
+                if np.isnan(holdings):
+                    num_holdings_fills += 1
+                    if num_holdings_fills <= ffill_limit:
+                        holdings = last_holdings
+                else:
+                    last_holdings = holdings
+                    num_holdings_fills = 0
+            # Compute trades.
+            trades = _subtract_with_fill(holdings, prev_holdings)
+            if initialize_beginning_of_day_trades_to_zero[j] and is_active_bod[i]:
+                trades *= 0
+            # Compute the execution price forward filling the price twice.
+            execution_price = price[i, j]
+            if np.isnan(execution_price):
+                num_price1_fills += 1
+                if num_price1_fills <= ffill_limit:
+                    execution_price = last_price1
+            else:
+                last_price1 = execution_price
+                num_price1_fills = 0
+            if np.isnan(execution_price):
+                num_price2_fills += 1
+                if num_price2_fills <= ffill_limit:
+                    execution_price = last_price2
+            else:
+                last_price2 = execution_price
+                num_price2_fills = 0
+            trades_notional = trades * execution_price
+            # Compute notional holdings and PnL.
+            notional = holdings * price[i, j]
+            pnl_ = _subtract_with_fill(
+                _subtract_with_fill(notional, prev_holdings_notional),
+                trades_notional,
+            )
+            #
+            holdings_shares[i, j] = holdings
+            holdings_notional[i, j] = notional
+            executed_trades_shares[i, j] = trades
+            executed_trades_notional[i, j] = trades_notional
+            pnl[i, j] = pnl_
+            prev_holdings = holdings
+            prev_holdings_notional = notional
+    return (
+        holdings_shares,
+        holdings_notional,
+        executed_trades_shares,
+        executed_trades_notional,
+        pnl,
+    )
+
+
 # #############################################################################
 
 
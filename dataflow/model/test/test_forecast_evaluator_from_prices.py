@@ -553,3 +553,139 @@ class TestForecastEvaluatorFromPrices1(hunitest.TestCase):
 2022-01-03 09:55:00-05:00    -278.06      9.64e+05  -200690.59  1.00e+06 -236802.17
 2022-01-03 10:00:00-05:00    1385.12      1.21e+05  -120770.11  9.98e+05 -356187.17"""
         self.assert_equal(stats_df_str, expected_stats_df_str, fuzzy_match=True)
+
+    def test_numpy_engine1(self) -> None:
+        """
+        Check that the NumPy engine matches the pandas engine exactly.
+        """
+        data = self.get_data(
+            pd.Timestamp("2022-01-03 09:30:00", tz="America/New_York"),
+            pd.Timestamp("2022-01-05 16:00:00", tz="America/New_York"),
+            asset_ids=[101, 201, 301],
+        )
+        # Add missing prices, including a gap spanning multiple bars.
+        price = data["price"].copy()
+        price.iloc[::7, 0] = np.nan
+        price.iloc[20:30, 1] = np.nan
+        data["price"] = price
+        forecast_evaluator = dtfmfefrpr.ForecastEvaluatorFromPrices(
+            price_col="price",
+            volatility_col="volatility",
+            prediction_col="prediction",
+        )
+        for style, quantization, liquidate_at_end_of_day in [
+            ("cross_sectional", "no_quantization", False),
+            ("cross_sectional", "nearest_share", True),
+            ("longitudinal", "nearest_lot", False),
+            ("longitudinal", "asset_specific", True),
+        ]:
+            kwargs = {
+                "style": style,
+                "quantization": quantization,
+                "liquidate_at_end_of_day": liquidate_at_end_of_day,
+                "initialize_beginning_of_day_trades_to_zero": True,
+                "burn_in_bars": 0,
+            }
+            if quantization == "asset_specific":
+                kwargs["asset_id_to_share_decimals"] = {101: -1, 201: 0, 301: 1}
+            if style == "cross_sectional":
+                kwargs["target_gmv"] = 1e5
+            else:
+                kwargs["target_dollar_risk_per_name"] = 1e2
+            expected = forecast_evaluator.compute_portfolio(data, **kwargs)
+            actual = forecast_evaluator.compute_portfolio(
+                data, engine="numpy", **kwargs
+            )
+            self.assertEqual(actual.keys(), expected.keys())
+            for key in expected:
+                pd.testing.assert_frame_equal(
+                    actual[key], expected[key], check_exact=True
+                )
+
+    def test_compute_portfolios1(self) -> None:
+        """
+        Check that evaluating multiple configs at once matches evaluating
+        each config separately.
+        """
+        data = self.get_data(
+            pd.Timestamp("2022-01-03 09:30:00", tz="America/New_York"),
+            pd.Timestamp("2022-01-05 16:00:00", tz="America/New_York"),
+            asset_ids=[101, 201, 301],
+        )
+        forecast_evaluator = dtfmfefrpr.ForecastEvaluatorFromPrices(
+            price_col="price",
+            volatility_col="volatility",
+            prediction_col="prediction",
+        )
+        configs = [
+            {"target_gmv": 1e5},
+            {"target_gmv": 1e5, "quantization": "nearest_share"},
+            {
+                "target_gmv": 1e6,
+                "liquidate_at_end_of_day": False,
+                "burn_in_bars": 0,
+                "reindex_like_input": True,
+            },
+            {
+                "style": "longitudinal",
+                "target_dollar_risk_per_name": 1e2,
+                "compute_extended_stats": True,
+                "burn_in_days": 1,
+            },
+        ]
+        actual = forecast_evaluator.compute_portfolios(data, configs)
+        self.assertEqual(len(actual), len(configs))
+        for config, actual_dfs in zip(configs, actual):
+            expected_dfs = forecast_evaluator.compute_portfolio(data, **config)
+            self.assertEqual(actual_dfs.keys(), expected_dfs.keys())
+            for key in expected_dfs:
+                pd.testing.assert_frame_equal(
+                    actual_dfs[key], expected_dfs[key], check_exact=True
+                )
+        # Check the multiindexed portfolio dataframes.
+        actual = forecast_evaluator.annotate_forecasts_for_configs(
+            data, configs[:2]
+        )
+        for config, (portfolio_df, stats_df) in zip(configs, actual):
+            (
+                expected_portfolio_df,
+                expected_stats_df,
+            ) = forecast_evaluator.annotate_forecasts(data, **config)
+            pd.testing.assert_frame_equal(portfolio_df, expected_portfolio_df)
+            pd.testing.assert_frame_equal(stats_df, expected_stats_df)
+
+    def test_compute_portfolios2(self) -> None:
+        """
+        Check that `ffill_limit` controls how long the missing prices are
+        forward filled.
+        """
+        data = self.get_data(
+            pd.Timestamp("2022-01-03 09:30:00", tz="America/New_York"),
+            pd.Timestamp("2022-01-05 16:00:00", tz="America/New_York"),
+            asset_ids=[101, 201, 301],
+        )
+        # Add a gap of missing prices spanning multiple bars.
+        price = data["price"].copy()
+        price.iloc[20:23, 1] = np.nan
+        data["price"] = price
+        forecast_evaluator = dtfmfefrpr.ForecastEvaluatorFromPrices(
+            price_col="price",
+            volatility_col="volatility",
+            prediction_col="prediction",
+        )
+        configs = [{"target_gmv": 1e5}]
+        # The default matches `compute_portfolio()`.
+        expected = forecast_evaluator.compute_portfolio(data, **configs[0])
+        actual = forecast_evaluator.compute_portfolios(data, configs)[0]
+        pd.testing.assert_frame_equal(actual["pnl"], expected["pnl"])
+        actual = forecast_evaluator.compute_portfolios(
+            data, configs, ffill_limit=4
+        )[0]
+        pd.testing.assert_frame_equal(actual["pnl"], expected["pnl"])
+        # Without forward filling, the PnL is missing during the gap.
+        actual = forecast_evaluator.compute_portfolios(
+            data, configs, ffill_limit=0
+        )[0]
+        self.assertGreater(
+            actual["pnl"].isna().sum().sum(), expected["pnl"].isna().sum().sum()
+        )
@@ -50,6 +50,7 @@ class RealTimeDagRunner(dtfcore.DagRunner):
         set_current_bar_timestamp: bool = True,
         # TODO(Danya): -> `max_allowed_delay_from_bar_start_in_secs`.
         max_distance_in_secs: int = 30,
+        incremental_predict: bool = False,
     ) -> None:
         """
         Build object.
@@ -64,6 +65,9 @@ class RealTimeDagRunner(dtfcore.DagRunner):
             since for now we support only bars that last a multiple of one minute.
         :param max_distance_in_secs: maximal distance that is allowed from the
             start of the bar.
+        :param incremental_predict: compute `predict()` only on the new bars of
+            data for the nodes supporting it, reusing the output computed in the
+            previous bars (see `FitPredictNode.set_incremental_predict()`)
         """
         super().__init__(dag)
         # Save input parameters.
@@ -77,6 +81,8 @@ class RealTimeDagRunner(dtfcore.DagRunner):
         self._bar_duration_in_secs = bar_duration_in_secs
         self._set_current_bar_timestamp = set_current_bar_timestamp
         self._max_distance_in_secs = max_distance_in_secs
+        if incremental_predict:
+            dtfcore.set_incremental_predict(self.dag, True)
         # Store information about the real-time execution.
         self._events: creatime.Events = []
         _LOG.debug("After RealTimeDagRunner ctor: \n%s", repr(self))
@@ -545,6 +545,13 @@ class HistoricalDataSource(dtfcore.DataSource):
         # We assume that the `MarketData` object is in charge of specifying
         # the universe of assets.
         asset_ids = None
+        # Read only the columns consumed downstream, if known.
+        columns = self._columns_to_read
+        if columns is not None:
+            columns = [
+                col[0] if isinstance(col, tuple) else col for col in columns
+            ]
+            columns = list(dict.fromkeys(columns))
         df = self._market_data.get_data_for_interval(
             min_timestamp,
             max_timestamp,
@@ -552,6 +559,7 @@ class HistoricalDataSource(dtfcore.DataSource):
             asset_ids,
             left_close=left_close,
             right_close=right_close,
+            columns=columns,
         )
         # Remove the columns that are not needed.
         if self._col_names_to_remove is not None:
@@ -563,6 +571,9 @@ class HistoricalDataSource(dtfcore.DataSource):
                 "Removing %s from %s", self._col_names_to_remove, df.columns
             )
             for col_name in self._col_names_to_remove:
+                if columns is not None and col_name not in df.columns:
+                    # The column was not read.
+                    continue
                 hdbg.dassert_in(col_name, df.columns)
                 del df[col_name]
             _LOG.debug(
@@ -85,6 +85,13 @@ _LOG = logging.getLogger(__name__)
 #     - profile_execution
 #     - dst_dir
 #     - force_free_nodes
+#     - execution_mode_config
+#       - execution_mode
+#       - num_workers
+#     - node_output_cache_config
+#       - dir_name
+#       - max_size_in_bytes
+#     - push_down_required_columns
 #
 #   - dag_builder_object
 #   - dag_builder_config
@@ -111,6 +118,7 @@ _LOG = logging.getLogger(__name__)
 #     - universe_str
 #     - trading_period_str
 #     - time_interval_str
+#     - num_workers
 #
 #   - cf_config
 
@@ -500,6 +500,32 @@ def apply_dag_property(
     if force_free_nodes:
         _LOG.warning("Setting force free nodes")
         dag.force_free_nodes = force_free_nodes
+    # 3) execution_mode_config
+    execution_mode_config = system.config.get_and_mark_as_used(
+        ("dag_property_config", "execution_mode_config"), default_value=None
+    )
+    _LOG.debug(hprint.to_str("execution_mode_config"))
+    if execution_mode_config:
+        _LOG.warning("Setting execution mode")
+        dag.set_execution_mode(**execution_mode_config)
+    # 4) node_output_cache_config
+    node_output_cache_config = system.config.get_and_mark_as_used(
+        ("dag_property_config", "node_output_cache_config"), default_value=None
+    )
+    _LOG.debug(hprint.to_str("node_output_cache_config"))
+    if node_output_cache_config:
+        _LOG.warning("Setting node output cache")
+        node_output_cache = dtfcore.NodeOutputCache(**node_output_cache_config)
+        dag.set_node_output_cache(node_output_cache)
+    # 5) push_down_required_columns
+    push_down_required_columns = system.config.get_and_mark_as_used(
+        ("dag_property_config", "push_down_required_columns"),
+        default_value=False,
+    )
+    _LOG.debug(hprint.to_str("push_down_required_columns"))
+    if push_down_required_columns:
+        _LOG.warning("Pushing down the required columns to the source nodes")
+        dtfcore.push_down_required_columns(dag)
     return system
 
 
@@ -1119,6 +1145,9 @@ def get_RealTimeDagRunner_from_System(
     max_distance_in_secs = system.config.get_and_mark_as_used(
         ("dag_runner_config", "max_distance_in_secs"), default_value=30
     )
+    incremental_predict = system.config.get_and_mark_as_used(
+        ("dag_runner_config", "incremental_predict"), default_value=False
+    )
     execute_rt_loop_config = {
         "get_wall_clock_time": get_wall_clock_time,
         "bar_duration_in_secs": bar_duration_in_secs,
@@ -1138,6 +1167,7 @@ def get_RealTimeDagRunner_from_System(
         "wake_up_timestamp": wake_up_timestamp,
         "bar_duration_in_secs": bar_duration_in_secs,
         "max_distance_in_secs": max_distance_in_secs,
+        "incremental_predict": incremental_predict,
     }
     # _LOG.debug("system=\n%s", str(system.config))
     dag_runner = dtfsrtdaru.RealTimeDagRunner(**dag_runner_kwargs)
@@ -1156,6 +1186,9 @@ def get_RollingFitPredictDagRunner_from_System(
     predict_end_timestamp = system.config["backtest_config", "end_timestamp"]
     retraining_freq = system.config["backtest_config", "retraining_freq"]
     retraining_lookback = system.config["backtest_config", "retraining_lookback"]
+    num_workers = system.config.get_and_mark_as_used(
+        ("backtest_config", "num_workers"), default_value=1
+    )
     #
     dag_runner = dtfcore.RollingFitPredictDagRunner(
         dag,
@@ -1163,5 +1196,6 @@ def get_RollingFitPredictDagRunner_from_System(
         predict_end_timestamp,
         retraining_freq,
         retraining_lookback,
+        num_workers=num_workers,
     )
     return dag_runner
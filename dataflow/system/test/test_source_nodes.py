@@ -1,7 +1,12 @@
+from typing import List, Optional
+
+import pandas as pd
 import pytest
 
 import dataflow.system.source_nodes as dtfsysonod
+import helpers.hasyncio as hasynci
 import helpers.hunit_test as hunitest
+import market_data as mdata
 
 
 class TestKibotEquityReader(hunitest.TestCase):
@@ -17,3 +22,44 @@ class TestKibotEquityReader(hunitest.TestCase):
         df = node.fit()["df_out"]
         df_str = hunitest.convert_df_to_string(df, index=True)
         self.check_string(df_str)
+
+
+class TestHistoricalDataSource1(hunitest.TestCase):
+    def test_set_columns_to_read1(self) -> None:
+        """
+        Check that only the columns set through `set_columns_to_read()` are
+        read from `MarketData`.
+        """
+        expected = self._get_data(columns_to_read=None)
+        expected = expected[["close"]]
+        actual = self._get_data(columns_to_read=["close"])
+        columns = actual.columns.get_level_values(0).unique().tolist()
+        self.assertEqual(columns, ["close"])
+        hunitest.compare_df(actual, expected)
+
+    @staticmethod
+    def _get_data(columns_to_read: Optional[List[str]]) -> pd.DataFrame:
+        with hasynci.solipsism_context() as event_loop:
+            start_datetime = pd.Timestamp("2000-01-01 09:30:00-05:00")
+            end_datetime = pd.Timestamp("2000-01-01 10:29:00-05:00")
+            replayed_delay_in_mins_or_timestamp = 60
+            asset_ids = [101, 202]
+            market_data, _ = mdata.get_ReplayedTimeMarketData_example2(
+                event_loop,
+                start_datetime,
+                end_datetime,
+                replayed_delay_in_mins_or_timestamp,
+                asset_ids,
+                columns=["close", "volume"],
+            )
+            node = dtfsysonod.HistoricalDataSource(
+                "read_data",
+                market_data,
+                "end_datetime",
+                True,
+                col_names_to_remove=["start_datetime", "timestamp_db"],
+            )
+            node.set_columns_to_read(columns_to_read)
+            node.set_fit_intervals([(start_datetime, end_datetime)])
+            df = node.fit()["df_out"]
+        return df
@@ -0,0 +1,125 @@
+"""
+Save and load dataframes as Arrow IPC (aka Feather v2) files.
+
+Unlike Parquet, the Arrow IPC format stores the data with the same layout
+used in memory, so a file can be memory-mapped and converted to a dataframe
+without decoding and, for numeric columns, without copying the data.
+
+Import as:
+
+import helpers.harrow as harrow
+"""
+
+import logging
+import os
+from typing import Any, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as paipc
+
+import helpers.hdbg as hdbg
+import helpers.hio as hio
+import helpers.htimer as htimer
+
+_LOG = logging.getLogger(__name__)
+
+# Key of the Arrow schema metadata storing the frequency of the index, which
+# is not saved by Arrow.
+_FREQ_METADATA_KEY = b"harrow.index.freq"
+
+
+def to_feather(
+    df: pd.DataFrame,
+    file_name: str,
+    *,
+    log_level: int = logging.DEBUG,
+) -> None:
+    """
+    Save a dataframe as an uncompressed Arrow IPC file.
+
+    Compared to `df.to_feather()`:
+    - the index and non-string column names (e.g., asset ids) are preserved
+    - NaNs in float columns are stored as values and not as nulls, so that
+      the columns can be loaded without copying the data
+    - the file is written atomically, so that it can replace a file that is
+      memory-mapped by another reader
+    """
+    hdbg.dassert_isinstance(df, pd.DataFrame)
+    hdbg.dassert_file_extension(file_name, ["feather"])
+    with htimer.TimedScope(log_level, f"# Writing Feather file '{file_name}'"):
+        table = pa.Table.from_pandas(df)
+        # Replace the float columns with arrays without nulls. The columns of
+        # the df are the first columns of the table, followed by the index.
+        for idx in range(df.shape[1]):
+            values = df.iloc[:, idx].to_numpy()
+            if values.dtype.kind == "f":
+                array = pa.array(values, from_pandas=False)
+                table = table.set_column(idx, table.field(idx), array)
+        freq = getattr(df.index, "freqstr", None)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_FREQ_METADATA_KEY] = str(freq).encode()
+        table = table.replace_schema_metadata(metadata)
+        hio.create_enclosing_dir(file_name, incremental=True)
+        tmp_file_name = f"{file_name}.tmp.{os.getpid()}"
+        with pa.OSFile(tmp_file_name, "wb") as sink:
+            with paipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_file_name, file_name)
+
+
+def from_feather(
+    file_name: str,
+    *,
+    columns: Optional[List[Any]] = None,
+    memory_map: bool = False,
+    log_level: int = logging.DEBUG,
+) -> pd.DataFrame:
+    """
+    Load a dataframe saved with `to_feather()`.
+
+    :param columns: columns to load. `None` means all the columns
+    :param memory_map: memory-map the file instead of reading it. The numeric
+        columns of the returned df point to the file, without being copied in
+        memory, and are read-only, thus they can't be modified in place
+        (e.g., with `df.iloc[0, 0] = 1` or `df["a"] *= 2`)
+    :return: the loaded dataframe
+    """
+    hdbg.dassert_file_exists(file_name)
+    with htimer.TimedScope(log_level, f"# Reading Feather file '{file_name}'"):
+        if memory_map:
+            source = pa.memory_map(file_name, "r")
+        else:
+            source = pa.OSFile(file_name, "rb")
+        with source:
+            table = paipc.open_file(source).read_all()
+        if columns is not None:
+            table = _select_columns(table, columns)
+        if memory_map:
+            # Avoid consolidating the columns in a single block, which would
+            # copy the data.
+            df = table.to_pandas(split_blocks=True)
+        else:
+            df = table.to_pandas()
+        if not isinstance(df.columns, pd.MultiIndex):
+            # Arrow restores non-string column names (e.g., asset ids) in an
+            # index of type `object`, so we infer the original type.
+            df.columns = pd.Index(df.columns.tolist())
+        freq = table.schema.metadata.get(_FREQ_METADATA_KEY, b"None").decode()
+        if freq != "None":
+            df.index.freq = freq
+    return df
+
+
+def _select_columns(table: pa.Table, columns: List[Any]) -> pa.Table:
+    """
+    Select `columns` from a table created from a df, together with its index.
+    """
+    # Arrow stores the column names as strings.
+    field_names = [str(col) for col in columns]
+    hdbg.dassert_is_subset(field_names, table.column_names)
+    index_columns = table.schema.pandas_metadata["index_columns"]
+    # A `RangeIndex` is stored as metadata and not as a column.
+    index_columns = [col for col in index_columns if isinstance(col, str)]
+    table = table.select(field_names + index_columns)
+    return table
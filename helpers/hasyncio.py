@@ -483,3 +483,39 @@ async def async_wait_until(
     hprint.log_frame(
         _LOG, "%s: wall_clock_time=%s: done waiting", tag, get_wall_clock_time()
     )
+
+
+# #############################################################################
+# Rate limiting.
+# #############################################################################
+
+
+class RateLimiter:
+    """
+    Space out the requests sent to a service (e.g., an exchange) by a minimum
+    interval.
+
+    The object should be created inside the event loop that uses it.
+    """
+
+    def __init__(self, rate_limit_in_ms: float) -> None:
+        """
+        Constructor.
+
+        :param rate_limit_in_ms: minimum time between the start of two
+            consecutive requests
+        """
+        hdbg.dassert_lte(0, rate_limit_in_ms)
+        self._rate_limit_in_secs = rate_limit_in_ms / 1000
+        self._next_request_time = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """
+        Wait until a request can be sent without exceeding the rate limit.
+        """
+        async with self._lock:
+            delay_in_secs = self._next_request_time - time.monotonic()
+            if delay_in_secs > 0:
+                await asyncio.sleep(delay_in_secs)
+            self._next_request_time = time.monotonic() + self._rate_limit_in_secs
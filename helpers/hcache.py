@@ -7,16 +7,34 @@ import helpers.hcache as hcache
 """
 
 import atexit
+import collections
+import contextlib
 import copy
+import fcntl
 import functools
 import logging
 import os
+import shutil
 import time
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
+import weakref
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
 import joblib
+import joblib._store_backends as jstobac
 import joblib.func_inspect as jfunci
 import joblib.memory as jmemor
+import numpy as np
+import pandas as pd
 
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
@@ -96,6 +114,19 @@ def get_global_cache_info(
         description = f"global {cache_type}"
         cache_info = _get_cache_size(path, description)
         txt.append(cache_info)
+        max_size_in_bytes, max_age_in_secs = get_global_cache_limits(
+            cache_type, tag=tag
+        )
+        txt.append(
+            f"'{description}' cache limits: "
+            f"max_size_in_bytes={max_size_in_bytes}, "
+            f"max_age_in_secs={max_age_in_secs}"
+        )
+        stats = _CACHE_STATS[cache_type]
+        txt.append(
+            f"'{description}' cache stats: hits={stats['hits']}, "
+            f"misses={stats['misses']}, evictions={stats['evictions']}"
+        )
     txt = "\n".join(txt)
     return txt
 
@@ -319,6 +350,180 @@ def clear_global_cache(
     _LOG.info("After clear_global_cache: %s", info_after)
 
 
+# #############################################################################
+# Cache limits
+# #############################################################################
+
+# Size (in bytes) and age (in seconds) limits of the global caches, indexed by
+# cache type and tag. A missing entry or a `None` limit means no limit.
+_GLOBAL_CACHE_LIMITS: Dict[
+    Tuple[str, Optional[str]], Tuple[Optional[int], Optional[float]]
+] = {}
+
+# Number of hits, misses, and evictions in this process for each cache type.
+_CACHE_STATS: Dict[str, collections.Counter] = collections.defaultdict(
+    collections.Counter
+)
+
+# Cached functions using `read_only_results`, whose values kept in the process
+# are dropped when the corresponding items are evicted from the cache.
+_READ_ONLY_CACHED_FUNCS: "weakref.WeakSet[_Cached]" = weakref.WeakSet()
+
+
+def set_global_cache_limits(
+    cache_type: str,
+    *,
+    max_size_in_bytes: Optional[int] = None,
+    max_age_in_secs: Optional[float] = None,
+    tag: Optional[str] = None,
+) -> None:
+    """
+    Bound the size and the age of the items in a global cache.
+
+    The limits are enforced every time a new item is stored in the cache:
+    - the items older than `max_age_in_secs` are evicted
+    - the least recently used items are evicted until the size of the cache
+      is smaller than `max_size_in_bytes`
+    An item older than `max_age_in_secs` is also considered not cached when
+    it is accessed.
+
+    :param cache_type: type of a cache
+    :param max_size_in_bytes: max size of the items stored in the cache.
+        `None` for no limit
+    :param max_age_in_secs: max time since an item was stored in the cache.
+        `None` for no limit
+    :param tag: optional unique tag of the cache
+    """
+    _dassert_is_valid_cache_type(cache_type)
+    if max_size_in_bytes is not None:
+        hdbg.dassert_lte(0, max_size_in_bytes)
+    if max_age_in_secs is not None:
+        hdbg.dassert_lt(0, max_age_in_secs)
+    _LOG.debug(hprint.to_str("cache_type tag max_size_in_bytes max_age_in_secs"))
+    _GLOBAL_CACHE_LIMITS[(cache_type, tag)] = (
+        max_size_in_bytes,
+        max_age_in_secs,
+    )
+
+
+def get_global_cache_limits(
+    cache_type: str, tag: Optional[str] = None
+) -> Tuple[Optional[int], Optional[float]]:
+    """
+    Return the limits set with `set_global_cache_limits()`.
+
+    :return: max size in bytes, max age in seconds
+    """
+    _dassert_is_valid_cache_type(cache_type)
+    limits = _GLOBAL_CACHE_LIMITS.get((cache_type, tag), (None, None))
+    return limits
+
+
+def _get_item_file_name(item_dir: str) -> str:
+    """
+    Return the file storing the value of an item of a Joblib cache.
+    """
+    return os.path.join(item_dir, "output.pkl")
+
+
+def _touch_cache_item(item_dir: str) -> None:
+    """
+    Mark an item as accessed now, to implement the LRU eviction policy.
+
+    The access time of the file is updated explicitly, since it is not
+    reliable on file systems mounted with `relatime` or `noatime`, while the
+    modification time is left unchanged as the time the item was stored.
+    """
+    file_name = _get_item_file_name(item_dir)
+    try:
+        os.utime(file_name, (time.time(), os.path.getmtime(file_name)))
+    except OSError as e:
+        # The item might have been evicted by another process.
+        _LOG.debug("Can't touch '%s': %s", file_name, str(e))
+
+
+def _is_cache_item_expired(
+    item_dir: str, max_age_in_secs: Optional[float]
+) -> bool:
+    """
+    Return whether an item was stored more than `max_age_in_secs` ago.
+    """
+    if max_age_in_secs is None:
+        return False
+    try:
+        age_in_secs = time.time() - os.path.getmtime(
+            _get_item_file_name(item_dir)
+        )
+    except OSError:
+        # The item has been evicted by another process.
+        return True
+    return age_in_secs > max_age_in_secs
+
+
+def _evict_cache_items(
+    store_backend: jstobac.FileSystemStoreBackend,
+    dir_name: str,
+    max_size_in_bytes: Optional[int],
+    max_age_in_secs: Optional[float],
+    cache_type: str,
+) -> None:
+    """
+    Evict the items stored under `dir_name` exceeding the limits.
+
+    :param store_backend: Joblib backend storing the items
+    :param dir_name: dir with the items to consider, i.e., the dir of the
+        backend (for the entire cache) or the dir of a function (for a single
+        function)
+    :param max_size_in_bytes, max_age_in_secs: as in
+        `set_global_cache_limits()`
+    :param cache_type: type of the cache, used to count the evictions
+    """
+    if max_size_in_bytes is None and max_age_in_secs is None:
+        return
+    items = [
+        item
+        for item in store_backend.get_items()
+        if item.path.startswith(dir_name + os.sep)
+    ]
+    # Evict the expired items.
+    items_to_evict = [
+        item
+        for item in items
+        if _is_cache_item_expired(item.path, max_age_in_secs)
+    ]
+    # Evict the least recently used items exceeding the size.
+    if max_size_in_bytes is not None:
+        items = [item for item in items if item not in items_to_evict]
+        size_in_bytes = sum(item.size for item in items)
+        for item in sorted(items, key=lambda item: item.last_access):
+            if size_in_bytes <= max_size_in_bytes:
+                break
+            items_to_evict.append(item)
+            size_in_bytes -= item.size
+    for item in items_to_evict:
+        _LOG.debug("Evicting cache item '%s'", item.path)
+        # Another process might be evicting the same item.
+        shutil.rmtree(item.path, ignore_errors=True)
+    _CACHE_STATS[cache_type]["evictions"] += len(items_to_evict)
+
+
+@contextlib.contextmanager
+def _single_flight_lock(file_name: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock on `file_name` across threads and processes.
+
+    The lock is released automatically if the process dies.
+    """
+    hio.create_enclosing_dir(file_name, incremental=True)
+    with open(file_name, "a") as file:
+        with htimer.TimedScope(logging.DEBUG, f"Acquiring lock '{file_name}'"):
+            fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
 # #############################################################################
 
 
@@ -339,6 +544,56 @@ class NotCachedValueException(RuntimeError):
     """
 
 
+def _make_read_only(obj: Any) -> None:
+    """
+    Make the numeric data of `obj` read-only in place.
+
+    Dataframes, series, arrays, and the ones nested in dicts, lists, and
+    tuples are handled. Other objects are left unchanged.
+    """
+    if isinstance(obj, np.ndarray):
+        obj.setflags(write=False)
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        # pylint: disable=protected-access
+        for array in obj._mgr.arrays:
+            # Extension arrays (e.g., for datetimes with timezone) are backed
+            # by a NumPy array.
+            array = getattr(array, "_ndarray", array)
+            if isinstance(array, np.ndarray):
+                array.setflags(write=False)
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            _make_read_only(value)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            _make_read_only(value)
+
+
+def _get_read_only_view(obj: Any) -> Any:
+    """
+    Return a view of an object made read-only by `_make_read_only()`.
+
+    The view shares the data with `obj` without copying it, but changing the
+    structure of the view (e.g., adding a column to a dataframe or a key to a
+    dict) doesn't affect `obj`.
+    """
+    if isinstance(obj, np.ndarray):
+        view = obj.view()
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        view = obj.copy(deep=False)
+    elif isinstance(obj, dict):
+        view = obj.__class__(
+            (key, _get_read_only_view(value)) for key, value in obj.items()
+        )
+    elif isinstance(obj, list):
+        view = [_get_read_only_view(value) for value in obj]
+    elif isinstance(obj, tuple) and not hasattr(obj, "_fields"):
+        view = tuple(_get_read_only_view(value) for value in obj)
+    else:
+        view = obj
+    return view
+
+
 class _Cached:
     # pylint: disable=protected-access
     """
@@ -369,6 +624,10 @@ class _Cached:
         tag: Optional[str] = None,
         disk_cache_path: Optional[str] = None,
         aws_profile: Optional[str] = "am",
+        read_only_results: bool = False,
+        max_size_in_bytes: Optional[int] = None,
+        max_age_in_secs: Optional[float] = None,
+        single_flight: bool = False,
     ):
         """
         Construct the class.
@@ -385,6 +644,23 @@ class _Cached:
             when running unit tests we want to use a different cache)
         :param disk_cache_path: path of the function-specific cache
         :param aws_profile: the AWS profile to use in case of S3 backend
+        :param read_only_results: return the cached values as read-only views
+            of objects kept in the process, instead of deep copies of the
+            values loaded from the cache. This makes a cache hit O(1) in the
+            size of the value, but the numeric data of the returned
+            dataframes, series, and arrays can't be modified in place (e.g.,
+            `df.iloc[0, 0] = 1` raises), while replacing or adding columns
+            is allowed since it doesn't affect the cached value. Other types
+            of values are returned as they are and must not be modified
+        :param max_size_in_bytes, max_age_in_secs: limits of the items of this
+            function in each cache, as in `set_global_cache_limits()`. The
+            limits of the global cache, if any, are also enforced
+        :param single_flight: when multiple threads or processes (e.g., the
+            workers of `hjoblib.parallel_execute()`) miss the same value in a
+            cache at the same time, compute the value only once, while the
+            others wait for it and then read it from the cache. Since the
+            memory cache is on a RAM disk, this works across all the
+            processes on the same machine
         """
         # Make the class have the same attributes (e.g., `__name__`, `__doc__`,
         # `__dict__`) as the called function.
@@ -401,6 +677,21 @@ class _Cached:
         self._tag = tag
         self._disk_cache_path = disk_cache_path
         self._aws_profile = aws_profile
+        self._read_only_results = read_only_results
+        if max_size_in_bytes is not None:
+            hdbg.dassert_lte(0, max_size_in_bytes)
+        if max_age_in_secs is not None:
+            hdbg.dassert_lt(0, max_age_in_secs)
+        self._max_size_in_bytes = max_size_in_bytes
+        self._max_age_in_secs = max_age_in_secs
+        self._single_flight = single_flight
+        # Map the digests of the function and of the arguments to the values
+        # returned when `read_only_results` is used. The values are kept only
+        # as long as the corresponding items are in the cache, so that the
+        # limits of the cache bound also the memory used by the process.
+        self._read_only_objs: Dict[Tuple[str, str], Any] = {}
+        if read_only_results:
+            _READ_ONLY_CACHED_FUNCS.add(self)
         #
         self._reset_cache_tracing()
         # Create the memory and disk cache objects for this function.
@@ -440,15 +731,23 @@ class _Cached:
         else:
             # Caching is allowed.
             self._reset_cache_tracing()
-            obj = self._execute_func(*args, **kwargs)
+            if self._read_only_results:
+                obj = self._execute_func_with_read_only_results(*args, **kwargs)
+            else:
+                obj = self._execute_func(*args, **kwargs)
             _LOG.debug(
                 "%s: executed from '%s'",
                 self._func.__name__,
                 self.get_last_cache_accessed(),
             )
-            # TODO(gp): Not sure making a deep copy is a good idea. In the end,
-            #  the client should not modify a cached value.
-            obj = copy.deepcopy(obj)
+            if self._read_only_results:
+                # Return a view of the cached value, so that the client can't
+                # modify it.
+                obj = _get_read_only_view(obj)
+            else:
+                # TODO(gp): Not sure making a deep copy is a good idea. In the
+                #  end, the client should not modify a cached value.
+                obj = copy.deepcopy(obj)
         # Print caching info.
         if self._is_verbose:
             # Get time.
@@ -633,6 +932,7 @@ class _Cached:
             hio.delete_dir(cache_path)
         else:
             self._disk_cache.clear()
+        self._read_only_objs.clear()
         # Print stats.
         info_after = _get_cache_size(cache_path, description)
         _LOG.info("After clear_function_cache: %s", info_after)
@@ -824,6 +1124,15 @@ class _Cached:
         )
         _LOG.debug("has_cached_version=%s", has_cached_version)
         if has_cached_version:
+            item_dir = self._get_item_dir(cache_type, func_id, args_id)
+            max_age_in_secs = self._get_max_age_in_secs(cache_type)
+            if item_dir is not None and _is_cache_item_expired(
+                item_dir, max_age_in_secs
+            ):
+                _LOG.debug("The cached version is expired")
+                shutil.rmtree(item_dir, ignore_errors=True)
+                _CACHE_STATS[cache_type]["evictions"] += 1
+                return False
             # We must check that the source of the function is the same, otherwise,
             # cache tracing will not be correct.
             # First, try faster check via joblib hash.
@@ -841,6 +1150,37 @@ class _Cached:
                 return True
         return False
 
+    def _check_cached_version(
+        self,
+        cache_type: str,
+        func_id: str,
+        args_id: str,
+        exit_stack: contextlib.ExitStack,
+    ) -> bool:
+        """
+        Check if a cache contains an entry, like `_has_cached_version()`.
+
+        When `single_flight` is used and there is no entry, acquire a lock on
+        the entry that is kept until `exit_stack` is closed, i.e., until the
+        value is computed and stored. In this way the other threads and
+        processes missing the same entry wait and then find it in the cache.
+
+        :param exit_stack: context holding the lock
+        :return: whether there is an entry in a cache
+        """
+        has_cached_version = self._has_cached_version(
+            cache_type, func_id, args_id
+        )
+        if not has_cached_version and self._single_flight:
+            item_dir = self._get_item_dir(cache_type, func_id, args_id)
+            if item_dir is not None:
+                exit_stack.enter_context(_single_flight_lock(f"{item_dir}.lock"))
+                # The value might have been stored while waiting for the lock.
+                has_cached_version = self._has_cached_version(
+                    cache_type, func_id, args_id
+                )
+        return has_cached_version
+
     def _store_cached_version(
         self, cache_type: str, func_id: str, args_id: str, obj: Any
     ) -> None:
@@ -869,6 +1209,106 @@ class _Cached:
 
     # ///////////////////////////////////////////////////////////////////////////
 
+    def _get_item_dir(
+        self, cache_type: str, func_id: str, args_id: str
+    ) -> Optional[str]:
+        """
+        Return the dir storing a cached value.
+
+        :return: the dir or `None` if the cache is not on the local file
+            system (e.g., on S3), and thus its limits are not enforced
+        """
+        store_backend = self._get_memorized_result(cache_type).store_backend
+        if not isinstance(store_backend, jstobac.FileSystemStoreBackend):
+            return None
+        item_dir = os.path.join(store_backend.location, func_id, args_id)
+        return item_dir
+
+    def _get_global_cache_limits(
+        self, cache_type: str
+    ) -> Tuple[Optional[int], Optional[float]]:
+        """
+        Return the limits of the global cache used for `cache_type`.
+        """
+        if cache_type == "disk" and self.has_function_cache():
+            # A function-specific cache is not bound by the global limits.
+            limits: Tuple[Optional[int], Optional[float]] = (None, None)
+        else:
+            limits = get_global_cache_limits(cache_type, tag=self._tag)
+        return limits
+
+    def _get_max_age_in_secs(self, cache_type: str) -> Optional[float]:
+        """
+        Return the max age of the items of this function in `cache_type`.
+        """
+        max_ages_in_secs = [
+            self._get_global_cache_limits(cache_type)[1],
+            self._max_age_in_secs,
+        ]
+        max_ages_in_secs = [val for val in max_ages_in_secs if val is not None]
+        max_age_in_secs = min(max_ages_in_secs) if max_ages_in_secs else None
+        return max_age_in_secs
+
+    def _record_cache_hit(
+        self, cache_type: str, func_id: str, args_id: str
+    ) -> None:
+        """
+        Update the stats and the access time of an item after a cache hit.
+        """
+        _CACHE_STATS[cache_type]["hits"] += 1
+        item_dir = self._get_item_dir(cache_type, func_id, args_id)
+        if item_dir is not None:
+            _touch_cache_item(item_dir)
+
+    def _enforce_cache_limits(self, cache_type: str, func_id: str) -> None:
+        """
+        Evict the items exceeding the limits after storing a new item.
+
+        The limits of this function are enforced first, then the limits of
+        the global cache.
+        """
+        store_backend = self._get_memorized_result(cache_type).store_backend
+        if not isinstance(store_backend, jstobac.FileSystemStoreBackend):
+            return
+        # Enforce the function limits.
+        func_dir = os.path.join(store_backend.location, func_id)
+        _evict_cache_items(
+            store_backend,
+            func_dir,
+            self._max_size_in_bytes,
+            self._max_age_in_secs,
+            cache_type,
+        )
+        # Enforce the global cache limits.
+        max_size_in_bytes, max_age_in_secs = self._get_global_cache_limits(
+            cache_type
+        )
+        _evict_cache_items(
+            store_backend,
+            store_backend.location,
+            max_size_in_bytes,
+            max_age_in_secs,
+            cache_type,
+        )
+        # Drop the values kept in the process for the evicted items, also of
+        # the other functions, since the global limits evict their items too.
+        for cached_func in list(_READ_ONLY_CACHED_FUNCS):
+            cached_func._drop_evicted_read_only_objs()
+
+    def _drop_evicted_read_only_objs(self) -> None:
+        """
+        Drop the values kept in the process whose items are not in the cache
+        anymore, e.g., because they were evicted by this or another process.
+        """
+        cache_type = self._get_read_only_cache_type()
+        if cache_type is None:
+            return
+        store_backend = self._get_memorized_result(cache_type).store_backend
+        for key in list(self._read_only_objs):
+            func_id, args_id = key
+            if not store_backend.contains_item([func_id, args_id]):
+                del self._read_only_objs[key]
+
     def _reset_cache_tracing(self) -> None:
         """
         Reset the values used to track which cache we are hitting when
@@ -888,34 +1328,38 @@ class _Cached:
         )
         # Get the function signature.
         func_id, args_id = self._get_identifiers("disk", *args, **kwargs)
-        if self._has_cached_version("disk", func_id, args_id):
-            _LOG.debug("There is a disk cached version")
-            with htimer.TimedScope(
-                logging.INFO, "Loading cached version from disk"
-            ):
-                obj = self._disk_cached_func(*args, **kwargs)
-            if self._check_only_if_present:
-                raise CachedValueException(func_info)
-        else:
-            # INV: we didn't hit neither memory nor the disk cache.
-            self._last_used_disk_cache = False
-            #
-            _LOG.debug(
-                "%s: execute the intrinsic function",
-                func_info,
-            )
-            # If the cache was read-only, then assert.
-            if self._enable_read_only:
-                msg = f"{func_info}: trying to execute"
-                raise NotCachedValueException(msg)
-            with htimer.TimedScope(
-                logging.INFO, "Updating cached version on disk"
-            ):
-                obj = self._disk_cached_func(*args, **kwargs)
-            # obj = self._execute_intrinsic_function(*args, **kwargs)
-            # The function was not cached in disk, so now we need to update the
-            # memory cache.
-            # self._store_cached_version("disk", func_id, args_id, obj)
+        with contextlib.ExitStack() as exit_stack:
+            if self._check_cached_version("disk", func_id, args_id, exit_stack):
+                _LOG.debug("There is a disk cached version")
+                with htimer.TimedScope(
+                    logging.INFO, "Loading cached version from disk"
+                ):
+                    obj = self._disk_cached_func(*args, **kwargs)
+                if self._check_only_if_present:
+                    raise CachedValueException(func_info)
+                self._record_cache_hit("disk", func_id, args_id)
+            else:
+                # INV: we didn't hit neither memory nor the disk cache.
+                self._last_used_disk_cache = False
+                _CACHE_STATS["disk"]["misses"] += 1
+                #
+                _LOG.debug(
+                    "%s: execute the intrinsic function",
+                    func_info,
+                )
+                # If the cache was read-only, then assert.
+                if self._enable_read_only:
+                    msg = f"{func_info}: trying to execute"
+                    raise NotCachedValueException(msg)
+                with htimer.TimedScope(
+                    logging.INFO, "Updating cached version on disk"
+                ):
+                    obj = self._disk_cached_func(*args, **kwargs)
+                self._enforce_cache_limits("disk", func_id)
+                # obj = self._execute_intrinsic_function(*args, **kwargs)
+                # The function was not cached in disk, so now we need to update
+                # the memory cache.
+                # self._store_cached_version("disk", func_id, args_id, obj)
         return obj
 
     def _execute_func_from_mem_cache(self, *args: Any, **kwargs: Any) -> Any:
@@ -930,33 +1374,37 @@ class _Cached:
         )
         # Get the function signature.
         func_id, args_id = self._get_identifiers("mem", *args, **kwargs)
-        if self._has_cached_version("mem", func_id, args_id):
-            _LOG.debug("There is a mem cached version")
-            if self._check_only_if_present:
-                raise CachedValueException(func_info)
-            # The function execution was cached in the mem cache.
-            with htimer.TimedScope(
-                logging.INFO, "Loading cached version from memory"
-            ):
-                obj = self._memory_cached_func(*args, **kwargs)
-        else:
-            # INV: we know that we didn't hit the memory cache, but we don't know
-            # about the disk cache.
-            _LOG.debug("There is not a mem cached version")
-            self._last_used_mem_cache = False
-            #
-            if self._use_disk_cache:
-                # Try the disk cache.
-                _LOG.debug(
-                    "Trying to retrieve from disk",
-                )
-                obj = self._execute_func_from_disk_cache(*args, **kwargs)
+        with contextlib.ExitStack() as exit_stack:
+            if self._check_cached_version("mem", func_id, args_id, exit_stack):
+                _LOG.debug("There is a mem cached version")
+                if self._check_only_if_present:
+                    raise CachedValueException(func_info)
+                # The function execution was cached in the mem cache.
+                with htimer.TimedScope(
+                    logging.INFO, "Loading cached version from memory"
+                ):
+                    obj = self._memory_cached_func(*args, **kwargs)
+                self._record_cache_hit("mem", func_id, args_id)
             else:
-                _LOG.warning("Skipping disk cache")
-                obj = self._execute_intrinsic_function(*args, **kwargs)
-            # The function was not cached in memory, so now we need to update the
-            # memory cache.
-            self._store_cached_version("mem", func_id, args_id, obj)
+                # INV: we know that we didn't hit the memory cache, but we don't
+                # know about the disk cache.
+                _LOG.debug("There is not a mem cached version")
+                self._last_used_mem_cache = False
+                _CACHE_STATS["mem"]["misses"] += 1
+                #
+                if self._use_disk_cache:
+                    # Try the disk cache.
+                    _LOG.debug(
+                        "Trying to retrieve from disk",
+                    )
+                    obj = self._execute_func_from_disk_cache(*args, **kwargs)
+                else:
+                    _LOG.warning("Skipping disk cache")
+                    obj = self._execute_intrinsic_function(*args, **kwargs)
+                # The function was not cached in memory, so now we need to update
+                # the memory cache.
+                self._store_cached_version("mem", func_id, args_id, obj)
+                self._enforce_cache_limits("mem", func_id)
         return obj
 
     def _execute_intrinsic_function(self, *args: Any, **kwargs: Any) -> Any:
@@ -1006,6 +1454,61 @@ class _Cached:
                 obj = self._execute_intrinsic_function(*args, **kwargs)
         return obj
 
+    def _execute_func_with_read_only_results(
+        self, *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Execute the function returning values kept in the process, if possible.
+
+        The values are kept only as long as they are in the first cache level,
+        so that clearing the cache is honored.
+
+        :return: a read-only value, which must not be returned to the client
+            without making a view with `_get_read_only_view()`
+        """
+        if _TRACE:
+            _LOG.trace("")
+        cache_type = self._get_read_only_cache_type()
+        if cache_type is None:
+            # There is no cache to validate the values kept in the process.
+            obj = self._execute_func(*args, **kwargs)
+            return obj
+        func_id, args_id = self._get_identifiers(cache_type, *args, **kwargs)
+        key = (func_id, args_id)
+        if key in self._read_only_objs and self._has_cached_version(
+            cache_type, func_id, args_id
+        ):
+            _LOG.debug("There is a read-only version in the process")
+            if self._check_only_if_present:
+                func_info = (
+                    f"{self._func.__name__}(args={str(args)} "
+                    f"kwargs={str(kwargs)})"
+                )
+                raise CachedValueException(func_info)
+            # The cache tracing is already pointing to `cache_type`.
+            obj = self._read_only_objs[key]
+            self._record_cache_hit(cache_type, func_id, args_id)
+        else:
+            obj = self._execute_func(*args, **kwargs)
+            _make_read_only(obj)
+            self._read_only_objs[key] = obj
+        return obj
+
+    def _get_read_only_cache_type(self) -> Optional[str]:
+        """
+        Return the first cache level, which validates the values kept in the
+        process when `read_only_results` is used.
+
+        :return: "mem", "disk", or `None` if no cache is used
+        """
+        if self._use_mem_cache:
+            cache_type = "mem"
+        elif self._use_disk_cache:
+            cache_type = "disk"
+        else:
+            cache_type = None
+        return cache_type
+
 
 # #############################################################################
 # Decorator
@@ -1019,6 +1522,10 @@ def cache(
     tag: Optional[str] = None,
     disk_cache_path: Optional[str] = None,
     aws_profile: Optional[str] = None,
+    read_only_results: bool = False,
+    max_size_in_bytes: Optional[int] = None,
+    max_age_in_secs: Optional[float] = None,
+    single_flight: bool = False,
 ) -> Union[Callable, _Cached]:
     """
     Decorate a function with a cache.
@@ -1036,6 +1543,10 @@ def cache(
     @hcache.cache(use_mem_cache=False)
     def add(x: int, y: int) -> int:
         return x + y
+
+    @hcache.cache(read_only_results=True)
+    def load_data(file_name: str) -> pd.DataFrame:
+        return pd.read_csv(file_name)
     ```
     """
 
@@ -1048,6 +1559,10 @@ def cache(
             tag=tag,
             disk_cache_path=disk_cache_path,
             aws_profile=aws_profile,
+            read_only_results=read_only_results,
+            max_size_in_bytes=max_size_in_bytes,
+            max_age_in_secs=max_age_in_secs,
+            single_flight=single_flight,
         )
 
     return wrapper
@@ -5,10 +5,22 @@ import helpers.hparquet as hparque
 """
 
 import collections
+import concurrent.futures
+import contextlib
 import datetime
 import logging
 import os
-from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 import pandas as pd
@@ -22,6 +34,7 @@ import helpers.hdataframe as hdatafr
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hintrospection as hintros
+import helpers.hparquet_tile_cache as hpatica
 import helpers.hpandas as hpandas
 import helpers.hprint as hprint
 import helpers.hs3 as hs3
@@ -87,6 +100,10 @@ def from_parquet(
     log_level: int = logging.DEBUG,
     report_stats: bool = False,
     aws_profile: hs3.AwsProfile = None,
+    num_threads: Optional[int] = None,
+    read_ahead: Optional[int] = None,
+    tile_cache: Optional[hpatica.ParquetTileCache] = None,
+    use_row_group_index: bool = True,
 ) -> pd.DataFrame:
     """
     Load a dataframe from a Parquet file.
@@ -105,12 +122,43 @@ def from_parquet(
     :param report_stats: whether to report Parquet file size or not
     :param aws_profile: AWS profile to use if and only if using an S3 path,
         otherwise `None` for local path
+    :param num_threads: number of threads fetching the row groups
+        concurrently. `None` to read the dataset with a single Arrow call,
+        which fetches the files sequentially. Reading row groups concurrently
+        is faster when the reads are bound by the latency of each fetch
+        (e.g., for many small files on S3)
+    :param read_ahead: max number of row groups being fetched or waiting to
+        be assembled, when using `num_threads`. `None` for twice the number of
+        threads
+    :param tile_cache: local cache of the files of a dataset stored on S3. The
+        files needed by the query are downloaded in the cache, unless a valid
+        copy is already cached, and the dataset is read from the cache. `None`
+        to use the default cache set with `hpatica.set_default_tile_cache()`,
+        if any
+    :param use_row_group_index: use the row group index of the dataset, if
+        any (see `build_row_group_index()`), to skip the row groups that
+        can't match `filters` without reading the metadata of each file. The
+        index is looked up only when `filters` refer to columns that are not
+        partition columns, since the partition columns have no statistics
     :return: data from Parquet dataset
     """
     _LOG.debug(hprint.to_str("file_name columns filters schema"))
     hdbg.dassert_isinstance(file_name, str)
     hs3.dassert_is_valid_aws_profile(file_name, aws_profile)
-    if hs3.is_s3_path(file_name):
+    # Keep the original path to report the stats.
+    src_file_name = file_name
+    if tile_cache is None:
+        tile_cache = hpatica.get_default_tile_cache()
+    # Context providing the path to read the dataset from, while the data is
+    # loaded.
+    read_context: Optional[ContextManager[str]] = None
+    if hs3.is_s3_path(file_name) and tile_cache is not None and not n_rows:
+        # Read the dataset from the local copy of the files, which are not
+        # evicted while they are read.
+        s3_filesystem = hs3.get_s3fs(aws_profile)
+        read_context = tile_cache.read(file_name, s3_filesystem, filters=filters)
+        filesystem = None
+    elif hs3.is_s3_path(file_name):
         if isinstance(aws_profile, str):
             filesystem = get_pyarrow_s3fs(aws_profile)
         else:
@@ -124,8 +172,10 @@ def from_parquet(
     else:
         filesystem = None
         hdbg.dassert_path_exists(file_name)
+    if read_context is None:
+        read_context = contextlib.nullcontext(file_name)
     # Load data.
-    with htimer.TimedScope(
+    with read_context as file_name, htimer.TimedScope(
         logging.DEBUG, f"# Reading Parquet file '{file_name}'"
     ) as ts:
         if n_rows:
@@ -164,10 +214,32 @@ def from_parquet(
             if columns:
                 # Note: `schema.names` also includes and index.
                 hdbg.dassert_is_subset(columns, dataset.schema.names)
-            # To read also the index we need to use `read_pandas()`, instead of
-            # `read_table()`.
-            # See https://arrow.apache.org/docs/python/parquet.html#reading-and-writing-single-files.
-            table = dataset.read_pandas(columns=columns)
+            row_group_index = None
+            if (
+                filters
+                and use_row_group_index
+                and _has_non_partition_filters(filters, dataset.partitioning)
+            ):
+                row_group_index = _load_row_group_index(
+                    dataset.filesystem, file_name
+                )
+            if num_threads is None and row_group_index is None:
+                # To read also the index we need to use `read_pandas()`,
+                # instead of `read_table()`.
+                # See https://arrow.apache.org/docs/python/parquet.html#reading-and-writing-single-files.
+                table = dataset.read_pandas(columns=columns)
+            else:
+                table = _read_row_groups_in_parallel(
+                    file_name,
+                    filesystem,
+                    partitioning,
+                    dataset.schema,
+                    columns,
+                    filters,
+                    num_threads or 1,
+                    read_ahead,
+                    row_group_index=row_group_index,
+                )
             df = table.to_pandas()
     # Report stats about the df.
     _LOG.debug("df.shape=%s", str(df.shape))
@@ -175,17 +247,123 @@ def from_parquet(
     _LOG.debug("df.memory_usage=%s", hintros.format_size(mem))
     # Report stats about the Parquet file size.
     if report_stats:
-        file_size = hs3.du(file_name, human_format=True, aws_profile=aws_profile)
+        file_size = hs3.du(
+            src_file_name, human_format=True, aws_profile=aws_profile
+        )
         _LOG.log(
             log_level,
             "Loaded '%s' (size=%s, time=%.1fs)",
-            file_name,
+            src_file_name,
             file_size,
             ts.elapsed_time,
         )
     return df
 
 
+def _read_row_groups_in_parallel(
+    file_name: str,
+    filesystem: Any,
+    partitioning: ds.Partitioning,
+    schema: pa.Schema,
+    columns: Optional[List[str]],
+    filters: Optional[List[Any]],
+    num_threads: int,
+    read_ahead: Optional[int],
+    *,
+    row_group_index: Optional[pd.DataFrame] = None,
+) -> pa.Table:
+    """
+    Read the row groups of a Parquet dataset concurrently.
+
+    The result is the same as `pq.ParquetDataset(...).read_pandas()`:
+    - the files are listed once, pruning the partitions with `filters`
+    - the row groups that can't match `filters` according to their
+      statistics are skipped
+    - the row groups are fetched by a pool of `num_threads` threads, in
+      order, and concatenated in a single table
+
+    See `from_parquet()` for the params.
+
+    :param schema: schema of the dataset
+    :param row_group_index: row group index of the dataset, used to skip row
+        groups without reading the file metadata
+    """
+    hdbg.dassert_lte(1, num_threads)
+    if read_ahead is None:
+        read_ahead = 2 * num_threads
+    hdbg.dassert_lte(num_threads, read_ahead)
+    dataset = ds.dataset(
+        file_name,
+        filesystem=filesystem,
+        format="parquet",
+        partitioning=partitioning,
+    )
+    filter_expression = pq.filters_to_expression(filters) if filters else None
+    # Read also the columns storing the index, like `read_pandas()` does.
+    metadata = schema.metadata or {}
+    if columns is not None and b"pandas" in metadata:
+        index_columns = [
+            col
+            for col in schema.pandas_metadata["index_columns"]
+            # A `RangeIndex` is stored as metadata and not as a column.
+            if isinstance(col, str) and col not in columns
+        ]
+        columns = list(columns) + index_columns
+    # List the row groups to read.
+    with htimer.TimedScope(logging.DEBUG, "# Listing row groups"):
+        fragments = dataset.get_fragments(filter=filter_expression)
+        if row_group_index is None:
+            row_groups = [
+                row_group
+                for fragment in fragments
+                for row_group in fragment.split_by_row_group(
+                    filter_expression, schema=schema
+                )
+            ]
+        else:
+            row_groups = _prune_row_groups_with_index(
+                dataset,
+                file_name,
+                fragments,
+                row_group_index,
+                filters,
+                filter_expression,
+                schema,
+            )
+    _LOG.debug("Reading %s row groups", len(row_groups))
+    if not row_groups:
+        # Build an empty table with the expected columns.
+        table = dataset.to_table(columns=columns, filter=filter_expression)
+    else:
+
+        def _read_row_group(row_group: ds.ParquetFileFragment) -> pa.Table:
+            return row_group.to_table(
+                schema=schema,
+                columns=columns,
+                filter=filter_expression,
+                use_threads=False,
+            )
+
+        tables = []
+        with concurrent.futures.ThreadPoolExecutor(num_threads) as executor:
+            # Keep at most `read_ahead` row groups in flight, consuming them
+            # in order.
+            futures: collections.deque = collections.deque()
+            for row_group in row_groups:
+                if len(futures) == read_ahead:
+                    tables.append(futures.popleft().result())
+                futures.append(executor.submit(_read_row_group, row_group))
+            while futures:
+                tables.append(futures.popleft().result())
+        table = pa.concat_tables(tables)
+    # Restore the pandas metadata, which is lost when selecting columns.
+    if b"pandas" in metadata:
+        table_metadata = dict(table.schema.metadata or {})
+        table_metadata[b"pandas"] = metadata[b"pandas"]
+        table = table.replace_schema_metadata(table_metadata)
+    return table
+
+
 # Copied from `hio.create_enclosing_dir()` to avoid circular dependencies.
 def _create_enclosing_dir(file_name: str) -> Optional[str]:
     dir_name = os.path.dirname(file_name)
@@ -590,6 +768,7 @@ def get_parquet_filters_from_timestamp_interval(
     end_timestamp: Optional[pd.Timestamp],
     *,
     additional_filters: Optional[List[ParquetFilter]] = None,
+    timestamp_column: Optional[str] = None,
 ) -> Union[ParquetOrAndFilter, ParquetAndFilter]:
     """
     Convert a constraint on a timestamp [start_timestamp, end_timestamp] into a
@@ -604,6 +783,10 @@ def get_parquet_filters_from_timestamp_interval(
         E.g., if we want to constraint also on `exchange_id` and 'currency_pair`,
         we can specify
         `[("exchange_id", "in", (...)),("currency_pair", "in", (...))]`
+    :param timestamp_column: name of a column storing the timestamps. If
+        passed, the interval is also applied to the column, and not only to
+        the partitions, so that the rows and the row groups outside the
+        interval (see `build_row_group_index()`) are skipped
     :return: list of OR-AND predicates
     """
     # Check timestamp interval.
@@ -701,6 +884,18 @@ def get_parquet_filters_from_timestamp_interval(
             or_and_filter.append(and_filter)
     else:
         raise ValueError(f"Unknown partition mode `{partition_mode}`!")
+    if timestamp_column is not None:
+        timestamp_filters = []
+        if start_timestamp:
+            timestamp_filters.append((timestamp_column, ">=", start_timestamp))
+        if end_timestamp:
+            timestamp_filters.append((timestamp_column, "<=", end_timestamp))
+        if or_and_filter:
+            or_and_filter = [
+                and_filter + timestamp_filters for and_filter in or_and_filter
+            ]
+        elif timestamp_filters:
+            or_and_filter = [timestamp_filters]
     if additional_filters:
         hdbg.dassert_isinstance(additional_filters, list)
         if or_and_filter:
@@ -770,6 +965,8 @@ def to_partitioned_parquet(
     *,
     partition_filename: Union[Callable, None] = lambda x: "data.parquet",
     aws_profile: hs3.AwsProfile = None,
+    row_group_size: Optional[int] = None,
+    index_row_groups: bool = False,
 ) -> None:
     """
     Save the given dataframe as Parquet file partitioned along the given
@@ -780,6 +977,11 @@ def to_partitioned_parquet(
     :param dst_dir: location of partitioned dataset
     :param partition_filename: a callable to override standard partition names. None for `uuid`.
     :param aws_profile: the name of an AWS profile or a s3fs filesystem
+    :param row_group_size: max number of rows in each row group. `None` for
+        the Arrow default. Smaller row groups of data sorted by time allow to
+        skip more data when reading a short interval
+    :param index_row_groups: update the row group index of the dataset after
+        writing (see `build_row_group_index()`)
 
     E.g., in case of partition using `date`, the file layout looks like:
     ```
@@ -837,7 +1039,279 @@ def to_partitioned_parquet(
             partition_cols=partition_columns,
             partition_filename_cb=partition_filename,
             filesystem=filesystem,
+            row_group_size=row_group_size,
         )
+    if index_row_groups:
+        build_row_group_index(dst_dir, aws_profile=aws_profile)
+
+
+# #############################################################################
+# Row group index
+# #############################################################################
+
+
+# Name of the file, in the root dir of a dataset, storing the row group index.
+# Arrow ignores the files starting with "_" when reading a dataset.
+ROW_GROUP_INDEX_FILE_NAME = "_row_group_index.pq"
+
+
+def build_row_group_index(
+    dir_name: str,
+    *,
+    columns: Optional[List[str]] = None,
+    aws_profile: hs3.AwsProfile = None,
+) -> pd.DataFrame:
+    """
+    Build the index of the row groups of a Parquet dataset and save it.
+
+    The index stores the min / max statistics of the columns for each row
+    group, so that `from_parquet()` can skip the row groups that can't match
+    the filters of a query (e.g., a short time interval) without reading the
+    metadata of all the files of the dataset.
+
+    The index is saved in the root dir of the dataset as
+    `ROW_GROUP_INDEX_FILE_NAME`. The entries of the files that are not
+    modified since the index was built are reused, so that the index can be
+    updated cheaply after adding files to a dataset.
+
+    :param dir_name: root dir of the Parquet dataset
+    :param columns: columns to store the statistics of. `None` for all the
+        columns with statistics
+    :param aws_profile: AWS profile to use if and only if using an S3 path
+    :return: the index with one row per row group, e.g.,
+        ```
+           file_name                      file_size  mtime_ns             row_group  num_rows  timestamp.min              timestamp.max              asset_id.min ...
+        0  asset=A/year=2022/month=1/...  4096       1672531200000000000  0          1440      2022-01-01 00:00:00+00:00  2022-01-01 23:59:00+00:00  1
+        ```
+    """
+    hdbg.dassert_isinstance(dir_name, str)
+    hs3.dassert_is_valid_aws_profile(dir_name, aws_profile)
+    filesystem = None
+    if hs3.is_s3_path(dir_name):
+        if isinstance(aws_profile, str):
+            filesystem = get_pyarrow_s3fs(aws_profile)
+        else:
+            filesystem = aws_profile
+        dir_name = dir_name[len("s3://") :]
+    dir_name = dir_name.rstrip("/")
+    dataset = ds.dataset(
+        dir_name, filesystem=filesystem, format="parquet", partitioning="hive"
+    )
+    file_infos = _get_dataset_file_infos(dataset, dir_name)
+    # Reuse the entries of the files that didn't change.
+    old_index = _load_row_group_index(dataset.filesystem, dir_name)
+    old_index_by_file = {}
+    if old_index is not None:
+        old_index_by_file = dict(tuple(old_index.groupby("file_name")))
+    with htimer.TimedScope(logging.DEBUG, "# Building row group index"):
+        dfs = []
+        for fragment in dataset.get_fragments():
+            rel_path = os.path.relpath(fragment.path, dir_name)
+            file_info = file_infos[rel_path]
+            df = old_index_by_file.get(rel_path)
+            if df is None or not _is_index_entry_valid(df, file_info):
+                df = _get_row_group_stats(fragment, rel_path, file_info, columns)
+            dfs.append(df)
+        if dfs:
+            index = pd.concat(dfs, ignore_index=True)
+        else:
+            index = pd.DataFrame(
+                columns=["file_name", "file_size", "mtime_ns", "row_group"]
+            )
+    _LOG.debug("Indexed %s row groups in '%s'", index.shape[0], dir_name)
+    file_name = f"{dir_name}/{ROW_GROUP_INDEX_FILE_NAME}"
+    table = pa.Table.from_pandas(index, preserve_index=False)
+    pq.write_table(table, file_name, filesystem=dataset.filesystem)
+    return index
+
+
+def _get_dataset_file_infos(
+    dataset: ds.FileSystemDataset, dir_name: str
+) -> Dict[str, pafs.FileInfo]:
+    """
+    Return the info of the files of a dataset, listing the dataset dir once.
+
+    :return: file info indexed by path relative to `dir_name`
+    """
+    selector = pafs.FileSelector(dir_name, recursive=True)
+    file_paths = set(dataset.files)
+    file_infos = {
+        os.path.relpath(file_info.path, dir_name): file_info
+        for file_info in dataset.filesystem.get_file_info(selector)
+        if file_info.path in file_paths
+    }
+    return file_infos
+
+
+def _get_row_group_stats(
+    fragment: ds.ParquetFileFragment,
+    rel_path: str,
+    file_info: pafs.FileInfo,
+    columns: Optional[List[str]],
+) -> pd.DataFrame:
+    """
+    Return the index entries of the row groups of a file.
+    """
+    metadata = fragment.metadata
+    rows = []
+    for row_group_id in range(metadata.num_row_groups):
+        row_group = metadata.row_group(row_group_id)
+        row = {
+            "file_name": rel_path,
+            "file_size": file_info.size,
+            "mtime_ns": file_info.mtime_ns,
+            "row_group": row_group_id,
+            "num_rows": row_group.num_rows,
+        }
+        for idx in range(row_group.num_columns):
+            column = row_group.column(idx)
+            col_name = column.path_in_schema
+            if columns is not None and col_name not in columns:
+                continue
+            stats = column.statistics
+            if stats is None or not stats.has_min_max:
+                continue
+            row[f"{col_name}.min"] = stats.min
+            row[f"{col_name}.max"] = stats.max
+        rows.append(row)
+    df = pd.DataFrame(rows)
+    return df
+
+
+def _is_index_entry_valid(df: pd.DataFrame, file_info: pafs.FileInfo) -> bool:
+    """
+    Return whether the index entries of a file refer to its current version.
+    """
+    is_valid = (
+        df["file_size"].iloc[0] == file_info.size
+        and df["mtime_ns"].iloc[0] == file_info.mtime_ns
+    )
+    return bool(is_valid)
+
+
+def _load_row_group_index(
+    filesystem: pafs.FileSystem, dir_name: str
+) -> Optional[pd.DataFrame]:
+    """
+    Load the row group index of a dataset, if it exists.
+    """
+    dir_name = dir_name.rstrip("/")
+    if filesystem.get_file_info(dir_name).type != pafs.FileType.Directory:
+        return None
+    file_name = f"{dir_name}/{ROW_GROUP_INDEX_FILE_NAME}"
+    if filesystem.get_file_info(file_name).type != pafs.FileType.File:
+        return None
+    index = pq.read_table(file_name, filesystem=filesystem).to_pandas()
+    _LOG.debug("Loaded row group index '%s'", file_name)
+    return index
+
+
+def _has_non_partition_filters(
+    filters: List[Any], partitioning: Optional[ds.Partitioning]
+) -> bool:
+    """
+    Return whether `filters` refer to a column that is not a partition column.
+
+    :param filters: Parquet filters as list of OR-AND predicates or a single
+        AND predicate
+    """
+    if isinstance(filters[0], tuple):
+        filters = [filters]
+    filter_columns = {col for and_filter in filters for col, _, _ in and_filter}
+    partition_columns = set()
+    if partitioning is not None:
+        partition_columns = set(partitioning.schema.names)
+    return not filter_columns.issubset(partition_columns)
+
+
+def _prune_row_groups_with_index(
+    dataset: ds.FileSystemDataset,
+    dir_name: str,
+    fragments: Iterator[ds.ParquetFileFragment],
+    row_group_index: pd.DataFrame,
+    filters: Optional[List[Any]],
+    filter_expression: Optional[ds.Expression],
+    schema: pa.Schema,
+) -> List[ds.ParquetFileFragment]:
+    """
+    Return the row groups that can match `filters` according to the index.
+
+    The files that are not in the index or that changed since the index was
+    built are pruned using the statistics in their metadata.
+    """
+    dir_name = dir_name.rstrip("/")
+    file_infos = _get_dataset_file_infos(dataset, dir_name)
+    index_by_file = dict(tuple(row_group_index.groupby("file_name")))
+    row_groups = []
+    num_skipped = 0
+    for fragment in fragments:
+        rel_path = os.path.relpath(fragment.path, dir_name)
+        df = index_by_file.get(rel_path)
+        if df is None or not _is_index_entry_valid(df, file_infos[rel_path]):
+            _LOG.debug("Row group index is stale for '%s'", rel_path)
+            row_groups.extend(
+                fragment.split_by_row_group(filter_expression, schema=schema)
+            )
+            continue
+        for _, row in df.iterrows():
+            if not _may_match_row_group_stats(row, filters):
+                num_skipped += 1
+                continue
+            row_group = fragment.format.make_fragment(
+                fragment.path,
+                filesystem=fragment.filesystem,
+                partition_expression=fragment.partition_expression,
+                row_groups=[int(row["row_group"])],
+            )
+            row_groups.append(row_group)
+    _LOG.debug("Skipped %s row groups using the index", num_skipped)
+    return row_groups
+
+
+def _may_match_row_group_stats(row: pd.Series, filters: List[Any]) -> bool:
+    """
+    Return whether a row group can contain rows matching `filters`.
+
+    The conditions on columns without statistics are assumed to be true.
+
+    :param row: index entry of the row group
+    :param filters: Parquet filters as list of OR-AND predicates or a single
+        AND predicate
+    """
+    if isinstance(filters[0], tuple):
+        filters = [filters]
+    return any(
+        all(_may_match_condition(row, condition) for condition in and_filter)
+        for and_filter in filters
+    )
+
+
+def _may_match_condition(row: pd.Series, condition: ParquetFilter) -> bool:
+    col, op, value = condition
+    min_, max_ = row.get(f"{col}.min"), row.get(f"{col}.max")
+    if pd.isna(min_) or pd.isna(max_):
+        return True
+    try:
+        if op in ("=", "=="):
+            ret = min_ <= value <= max_
+        elif op == "<":
+            ret = min_ < value
+        elif op == "<=":
+            ret = min_ <= value
+        elif op == ">":
+            ret = max_ > value
+        elif op == ">=":
+            ret = max_ >= value
+        elif op == "in":
+            ret = any(min_ <= val <= max_ for val in value)
+        else:
+            # E.g., `!=` and `not in` can't be decided from min and max.
+            ret = True
+    except TypeError:
+        # The value is not comparable with the statistics, e.g., a naive and
+        # a tz-aware timestamp.
+        ret = True
+    return bool(ret)
 
 
 def list_and_merge_pq_files(
@@ -0,0 +1,525 @@
+"""
+Local read-through cache for the tiles of Parquet datasets stored on S3.
+
+The files of a dataset read from S3 are mirrored in a local dir, keeping the
+same layout, e.g.,
+```
+s3://cryptokaizen-data/reorg/.../ohlcv/ccxt/binance/
+    currency_pair=BTC_USDT/year=2022/month=1/data.parquet
+```
+is cached as
+```
+{cache_dir}/cryptokaizen-data/reorg/.../ohlcv/ccxt/binance/
+    currency_pair=BTC_USDT/year=2022/month=1/data.parquet
+```
+so that the local mirror can be read as a Parquet dataset with the same
+filters.
+
+A cached file is used only if its fingerprint (ETag, or size and modification
+time) matches the one of the remote file, so that tiles overwritten on S3 are
+downloaded again. The total size of the cache can be bounded, evicting the
+least recently used files.
+
+A cache dir can be shared by multiple processes: the files are evicted only
+when no process is reading from the cache (see `ParquetTileCache.read()`).
+
+Import as:
+
+import helpers.hparquet_tile_cache as hpatica
+"""
+
+import collections
+import contextlib
+import fcntl
+import logging
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import fsspec
+
+import helpers.hdbg as hdbg
+import helpers.hio as hio
+import helpers.hprint as hprint
+import helpers.hs3 as hs3
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+# ParquetTileCache
+# #############################################################################
+
+
+class ParquetTileCache:
+    """
+    Cache the files of remote Parquet datasets in a local dir.
+
+    E.g.,
+    ```
+    tile_cache = ParquetTileCache("/app/cache/parquet", max_size_in_bytes=2**34)
+    with tile_cache.read(
+        "s3://bucket/ohlcv/ccxt/binance", s3fs_, filters=filters
+    ) as local_dir:
+        df = hparque.from_parquet(local_dir, filters=filters)
+    ```
+    """
+
+    def __init__(
+        self, cache_dir: str, *, max_size_in_bytes: Optional[int] = None
+    ) -> None:
+        """
+        Constructor.
+
+        :param cache_dir: local dir storing the cached files
+        :param max_size_in_bytes: max total size of the cached files. `None`
+            means no limit
+        """
+        hdbg.dassert_isinstance(cache_dir, str)
+        hdbg.dassert(
+            not hs3.is_s3_path(cache_dir),
+            "The cache dir '%s' must be local",
+            cache_dir,
+        )
+        if max_size_in_bytes is not None:
+            hdbg.dassert_lte(0, max_size_in_bytes)
+        self._cache_dir = os.path.abspath(cache_dir)
+        self._max_size_in_bytes = max_size_in_bytes
+        hio.create_dir(self._cache_dir, incremental=True)
+        # File locked by the processes reading from the cache and evicting
+        # files from it. The name starts with "." so that it's not considered
+        # a cached file.
+        self._lock_file_name = os.path.join(self._cache_dir, ".lock")
+        self._stats: collections.Counter = collections.Counter()
+
+    def __str__(self) -> str:
+        txt = hprint.to_str("self._cache_dir self._max_size_in_bytes")
+        return f"{self.__class__.__name__}: {txt}"
+
+    def sync(
+        self,
+        root_dir: str,
+        filesystem: fsspec.AbstractFileSystem,
+        *,
+        filters: Optional[List[Any]] = None,
+    ) -> str:
+        """
+        Make sure that the files of a remote dataset are cached locally.
+
+        Only the files whose partition values can satisfy `filters` are
+        downloaded. Cached files that are stale or that don't exist anymore
+        in the remote dataset are removed.
+
+        Another process sharing the cache dir can evict the files before they
+        are read: use `read()` in that case.
+
+        :param root_dir: root dir of the remote Parquet dataset, e.g.,
+            `s3://bucket/ohlcv/ccxt/binance`, or a single remote file
+        :param filesystem: filesystem storing `root_dir`, e.g., the `s3fs`
+            object returned by `hs3.get_s3fs()`
+        :param filters: Parquet filters used to read the dataset (see
+            `hparque.from_parquet()`), if any
+        :return: path to the local mirror of `root_dir`
+        """
+        with self._lock(fcntl.LOCK_SH):
+            local_path, used_files = self._sync(root_dir, filesystem, filters)
+        self._enforce_size_limit(used_files)
+        return local_path
+
+    @contextlib.contextmanager
+    def read(
+        self,
+        root_dir: str,
+        filesystem: fsspec.AbstractFileSystem,
+        *,
+        filters: Optional[List[Any]] = None,
+    ) -> Iterator[str]:
+        """
+        Cache the files of a remote dataset and keep them while they are read.
+
+        The other processes sharing the cache dir don't evict any file while
+        the context is active. The size limit is enforced when exiting the
+        context.
+
+        See `sync()` for the params.
+
+        :return: path to the local mirror of `root_dir`
+        """
+        with self._lock(fcntl.LOCK_SH):
+            local_path, used_files = self._sync(root_dir, filesystem, filters)
+            yield local_path
+        self._enforce_size_limit(used_files)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return the stats about the cache usage since the cache was created.
+
+        :return: dict with the number of file hits, misses, and evictions, the
+            bytes downloaded and the bytes saved by hitting the cache
+        """
+        stats = {
+            key: self._stats[key]
+            for key in [
+                "num_hits",
+                "num_misses",
+                "num_evictions",
+                "bytes_downloaded",
+                "bytes_saved",
+            ]
+        }
+        num_reads = stats["num_hits"] + stats["num_misses"]
+        stats["hit_rate"] = stats["num_hits"] / num_reads if num_reads else None
+        stats["size_in_bytes"] = self.get_size_in_bytes()
+        return stats
+
+    def get_size_in_bytes(self) -> int:
+        """
+        Return the total size of the cached files.
+        """
+        size_in_bytes = sum(
+            os.path.getsize(os.path.join(self._cache_dir, rel_path))
+            for rel_path in self._list_cached_files(self._cache_dir)
+        )
+        return size_in_bytes
+
+    def clear(self) -> None:
+        """
+        Remove all the cached files.
+        """
+        _LOG.debug("Clearing '%s'", self._cache_dir)
+        hio.create_dir(self._cache_dir, incremental=False)
+
+    # /////////////////////////////////////////////////////////////////////////
+
+    def _sync(
+        self,
+        root_dir: str,
+        filesystem: fsspec.AbstractFileSystem,
+        filters: Optional[List[Any]],
+    ) -> Tuple[str, Set[str]]:
+        """
+        Implement `sync()` without enforcing the size limit.
+
+        :return: path to the local mirror of `root_dir` and paths of the files
+            needed by the query
+        """
+        _LOG.debug(hprint.to_str("root_dir filters"))
+        remote_root_dir = filesystem._strip_protocol(root_dir).rstrip("/")
+        local_root_dir = self._get_local_path(remote_root_dir)
+        found_files = filesystem.find(remote_root_dir, detail=True)
+        if list(found_files) == [remote_root_dir]:
+            # `root_dir` is a single file, so we mirror the file.
+            info = found_files[remote_root_dir]
+            self._fetch_file(filesystem, remote_root_dir, info, local_root_dir)
+            return local_root_dir, {local_root_dir}
+        # List the files of the remote dataset.
+        remote_files = {}
+        for path, info in found_files.items():
+            rel_path = os.path.relpath(path, remote_root_dir)
+            if _is_ignored_by_parquet(rel_path):
+                continue
+            remote_files[rel_path] = info
+        # Remove the cached files that don't exist anymore.
+        for rel_path in self._list_cached_files(local_root_dir):
+            if rel_path not in remote_files:
+                _LOG.debug("Removing deleted file '%s'", rel_path)
+                _remove_cached_file(os.path.join(local_root_dir, rel_path))
+        # Fetch the files needed by the query.
+        used_files = set()
+        for rel_path, info in sorted(remote_files.items()):
+            if not _may_satisfy_filters(rel_path, filters):
+                continue
+            local_path = os.path.join(local_root_dir, rel_path)
+            remote_path = f"{remote_root_dir}/{rel_path}"
+            self._fetch_file(filesystem, remote_path, info, local_path)
+            used_files.add(local_path)
+        # The mirror must exist to be read also when no file is needed.
+        hio.create_dir(local_root_dir, incremental=True)
+        return local_root_dir, used_files
+
+    def _get_local_path(self, remote_path: str) -> str:
+        local_path = os.path.join(self._cache_dir, remote_path.lstrip("/"))
+        return local_path
+
+    def _fetch_file(
+        self,
+        filesystem: fsspec.AbstractFileSystem,
+        remote_path: str,
+        info: Dict[str, Any],
+        local_path: str,
+    ) -> None:
+        """
+        Download `remote_path` in `local_path` unless a valid copy is cached.
+        """
+        size = int(info["size"])
+        fingerprint = _get_fingerprint(info)
+        metadata_file_name = _get_metadata_file_name(local_path)
+        if os.path.exists(local_path) and os.path.exists(metadata_file_name):
+            metadata = hio.from_json(metadata_file_name)
+            if (
+                metadata["fingerprint"] == fingerprint
+                and os.path.getsize(local_path) == size
+            ):
+                _LOG.debug("Cache hit for '%s'", remote_path)
+                self._stats["num_hits"] += 1
+                self._stats["bytes_saved"] += size
+                # Mark the file as recently used.
+                _touch_file(local_path)
+                return
+        _LOG.debug("Cache miss for '%s'", remote_path)
+        self._stats["num_misses"] += 1
+        self._stats["bytes_downloaded"] += size
+        hio.create_enclosing_dir(local_path, incremental=True)
+        # Download to a tmp file so that a concurrent reader never sees a
+        # partially written file.
+        tmp_local_path = f"{local_path}.tmp.{os.getpid()}"
+        filesystem.get_file(remote_path, tmp_local_path)
+        os.replace(tmp_local_path, local_path)
+        # Write the metadata after the data, so that an interrupted download
+        # is detected as a stale file.
+        hio.to_json(metadata_file_name, {"fingerprint": fingerprint})
+
+    def _list_cached_files(self, dir_name: str) -> List[str]:
+        """
+        Return the paths of the cached files under `dir_name`, relative to it.
+        """
+        rel_paths = []
+        for root, _, file_names in os.walk(dir_name):
+            for file_name in file_names:
+                path = os.path.join(root, file_name)
+                rel_path = os.path.relpath(path, dir_name)
+                # Skip the metadata and the files being downloaded.
+                is_tmp = ".tmp." in file_name
+                if not _is_ignored_by_parquet(rel_path) and not is_tmp:
+                    rel_paths.append(rel_path)
+        return rel_paths
+
+    @contextlib.contextmanager
+    def _lock(self, operation: int) -> Iterator[bool]:
+        """
+        Hold a lock on the cache dir, across threads and processes.
+
+        :param operation: `fcntl.LOCK_SH` to read the cached files, or
+            `fcntl.LOCK_EX | fcntl.LOCK_NB` to evict them
+        :return: whether the lock was acquired, which is always the case for a
+            blocking lock
+        """
+        with open(self._lock_file_name, "a") as file:
+            try:
+                fcntl.flock(file, operation)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+    def _enforce_size_limit(self, used_files: Set[str]) -> None:
+        """
+        Evict the least recently used files until the cache fits its budget.
+
+        The files are evicted only if no process is reading from the cache.
+        Otherwise the eviction is left to the next call.
+
+        :param used_files: files needed by the current query, which are not
+            evicted
+        """
+        if self._max_size_in_bytes is None:
+            return
+        with self._lock(fcntl.LOCK_EX | fcntl.LOCK_NB) as is_locked:
+            if not is_locked:
+                _LOG.debug("Skipping the eviction since the cache is in use")
+                return
+            self._evict_files(used_files)
+
+    def _evict_files(self, used_files: Set[str]) -> None:
+        """
+        Implement `_enforce_size_limit()` while holding the lock.
+        """
+        hdbg.dassert_is_not(self._max_size_in_bytes, None)
+        files = []
+        size_in_bytes = 0
+        for rel_path in self._list_cached_files(self._cache_dir):
+            path = os.path.join(self._cache_dir, rel_path)
+            stat = os.stat(path)
+            files.append((stat.st_atime, path, stat.st_size))
+            size_in_bytes += stat.st_size
+        # Evict from the least recently used.
+        for _, path, file_size in sorted(files):
+            if size_in_bytes <= self._max_size_in_bytes:
+                break
+            if path in used_files:
+                continue
+            _LOG.debug("Evicting '%s'", path)
+            _remove_cached_file(path)
+            self._stats["num_evictions"] += 1
+            size_in_bytes -= file_size
+        if size_in_bytes > self._max_size_in_bytes:
+            _LOG.warning(
+                "The files needed by the query (%s bytes) exceed the cache "
+                "size limit (%s bytes)",
+                size_in_bytes,
+                self._max_size_in_bytes,
+            )
+
+
+# #############################################################################
+# Default cache.
+# #############################################################################
+
+
+_DEFAULT_TILE_CACHE: Optional[ParquetTileCache] = None
+
+
+def set_default_tile_cache(tile_cache: Optional[ParquetTileCache]) -> None:
+    """
+    Set the cache used by `hparque.from_parquet()` to read datasets from S3.
+
+    The default cache is used by all the clients reading Parquet data from S3
+    (e.g., `HistoricalPqByTileClient`, `RawDataReader`) without passing it
+    explicitly.
+
+    :param tile_cache: cache to use. `None` to disable caching
+    """
+    global _DEFAULT_TILE_CACHE
+    _LOG.debug("Setting default tile cache to %s", tile_cache)
+    _DEFAULT_TILE_CACHE = tile_cache
+
+
+def get_default_tile_cache() -> Optional[ParquetTileCache]:
+    """
+    Return the cache set with `set_default_tile_cache()`, if any.
+    """
+    return _DEFAULT_TILE_CACHE
+
+
+# #############################################################################
+# Utils.
+# #############################################################################
+
+
+def _is_ignored_by_parquet(rel_path: str) -> bool:
+    """
+    Return whether a file is not part of a Parquet dataset.
+
+    Like Arrow, we skip the files and dirs starting with "." or "_", which
+    includes the metadata files of the cache.
+    """
+    return any(part.startswith((".", "_")) for part in rel_path.split("/"))
+
+
+def _get_metadata_file_name(local_path: str) -> str:
+    dir_name, file_name = os.path.split(local_path)
+    return os.path.join(dir_name, f".{file_name}.json")
+
+
+def _get_fingerprint(info: Dict[str, Any]) -> str:
+    """
+    Return a string identifying the content of a remote file.
+
+    :param info: file info returned by the filesystem, e.g.,
+        `{"ETag": '"0c5f..."', "size": 1024, ...}` for S3 or
+        `{"size": 1024, "mtime": 1670000000.0, ...}` for a local filesystem
+    """
+    etag = info.get("ETag")
+    if etag is not None:
+        fingerprint = f"etag={etag}"
+    else:
+        mtime = info.get("LastModified", info.get("mtime"))
+        fingerprint = f"size={info['size']},mtime={mtime}"
+    return fingerprint
+
+
+def _touch_file(path: str) -> None:
+    """
+    Update the access time of a file, leaving the modification time unchanged.
+    """
+    os.utime(path, (time.time(), os.path.getmtime(path)))
+
+
+def _remove_cached_file(path: str) -> None:
+    os.remove(path)
+    metadata_file_name = _get_metadata_file_name(path)
+    if os.path.exists(metadata_file_name):
+        os.remove(metadata_file_name)
+
+
+def _may_satisfy_filters(rel_path: str, filters: Optional[List[Any]]) -> bool:
+    """
+    Return whether the partition values of a file can satisfy `filters`.
+
+    The conditions on columns that are not partition columns can't be
+    evaluated from the path and are assumed to be true.
+
+    :param rel_path: path of a file relative to the dataset root dir, e.g.,
+        `currency_pair=BTC_USDT/year=2022/month=1/data.parquet`
+    :param filters: Parquet filters in disjunctive normal form, e.g.,
+        `[[("year", "=", 2022), ("month", "in", [1, 2])], ...]`, or a single
+        conjunction, e.g., `[("year", "=", 2022), ...]`
+    """
+    if not filters:
+        return True
+    partition_values = {}
+    for part in rel_path.split("/")[:-1]:
+        if "=" in part:
+            key, value = part.split("=", 1)
+            partition_values[key] = value
+    if isinstance(filters[0], tuple):
+        filters = [filters]
+    return any(
+        all(
+            _may_satisfy_condition(partition_values, condition)
+            for condition in conjunction
+        )
+        for conjunction in filters
+    )
+
+
+def _may_satisfy_condition(
+    partition_values: Dict[str, str], condition: Any
+) -> bool:
+    col, op, value = condition
+    if col not in partition_values:
+        return True
+    # The partition values are stored as strings in the path.
+    if op in ("in", "not in"):
+        partition_value = _cast_like(partition_values[col], list(value)[:1])
+    else:
+        partition_value = _cast_like(partition_values[col], [value])
+    try:
+        if op in ("=", "=="):
+            ret = partition_value == value
+        elif op == "!=":
+            ret = partition_value != value
+        elif op == "<":
+            ret = partition_value < value
+        elif op == "<=":
+            ret = partition_value <= value
+        elif op == ">":
+            ret = partition_value > value
+        elif op == ">=":
+            ret = partition_value >= value
+        elif op == "in":
+            ret = partition_value in value
+        elif op == "not in":
+            ret = partition_value not in value
+        else:
+            # Be conservative with operators we don't know.
+            ret = True
+    except TypeError:
+        ret = True
+    return bool(ret)
+
+
+def _cast_like(value: str, examples: List[Any]) -> Any:
+    """
+    Cast a partition value to the type of the values it's compared to.
+    """
+    if examples and not isinstance(examples[0], str):
+        for type_ in (int, float):
+            try:
+                return type_(value)
+            except ValueError:
+                pass
+    return value
@@ -17,6 +17,7 @@ else:
     from typing import Any
 
     DbConnection = Any
+    DbConnectionPool = Any
 
 
 def create_in_operator(values: List[str], column_name: str) -> str:
@@ -5,16 +5,19 @@ import helpers.hsql_implementation as hsqlimpl
 """
 
 import collections
+import contextlib
 import io
 import logging
 import os
 import re
 import time
-from typing import Any, Dict, List, Optional, Tuple, Union, cast
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union, cast
 
+import numpy as np
 import pandas as pd
 import psycopg2 as psycop
 import psycopg2.extras as extras
+import psycopg2.pool as ppool
 import psycopg2.sql as psql
 
 import helpers.hasyncio as hasynci
@@ -160,6 +163,64 @@ def get_connection_info_from_env_file(env_file_path: str) -> DbConnectionInfo:
     return connection_parameters
 
 
+DbConnectionPool = ppool.ThreadedConnectionPool
+
+
+def get_connection_pool(
+    host: str,
+    dbname: str,
+    port: int,
+    user: str,
+    password: str,
+    *,
+    min_connections: int = 1,
+    max_connections: int = 10,
+) -> DbConnectionPool:
+    """
+    Create a pool of connections to a SQL database that can be shared across
+    threads.
+
+    Use `get_connection_from_pool()` to borrow a connection from the pool.
+    """
+    _LOG.debug(hprint.to_str("host dbname port user max_connections"))
+    hdbg.dassert_lte(0, min_connections)
+    hdbg.dassert_lte(min_connections, max_connections)
+    connection_pool = ppool.ThreadedConnectionPool(
+        min_connections,
+        max_connections,
+        host=host,
+        dbname=dbname,
+        port=port,
+        user=user,
+        password=password,
+    )
+    return connection_pool
+
+
+@contextlib.contextmanager
+def get_connection_from_pool(
+    connection_pool: DbConnectionPool, autocommit: bool = True
+) -> Iterator[DbConnection]:
+    """
+    Borrow a connection from a pool, returning it to the pool on exit.
+
+    E.g.,
+    ```
+    with hsql.get_connection_from_pool(connection_pool) as connection:
+        df = hsql.execute_query_to_df(connection, query)
+    ```
+    """
+    connection = connection_pool.getconn()
+    try:
+        if connection.autocommit != autocommit:
+            connection.autocommit = autocommit
+        yield connection
+    finally:
+        # Discard the connections that are not usable anymore.
+        close = bool(connection.closed)
+        connection_pool.putconn(connection, close=close)
+
+
 def check_db_connection(
     host: str,
     dbname: str,
@@ -777,6 +838,119 @@ def execute_insert_on_conflict_do_nothing_query(
         raise e
 
 
+def execute_copy_on_conflict_do_nothing_query(
+    connection: DbConnection,
+    obj: Union[pd.DataFrame, pd.Series],
+    table_name: str,
+    unique_columns: List[str],
+) -> int:
+    """
+    Insert data into a table streaming it with `COPY`. If a UNIQUE constraint
+    is violated for a provided set of columns, duplicates are not inserted.
+
+    This is equivalent to `execute_insert_on_conflict_do_nothing_query()` but
+    much faster for large dataframes, since the data is sent in a single
+    round-trip. The rows are copied into a temporary table and then merged into
+    the target table with a single `INSERT ... ON CONFLICT DO NOTHING` in the
+    same transaction.
+
+    :param connection: connection to the DB
+    :param obj: data to insert
+    :param table_name: name of the table for insertion
+    :param unique_columns: set of columns which should be unique record-wise.
+       If unique_columns is an empty list, all the rows are inserted
+    :return: number of inserted rows
+    """
+    if isinstance(obj, pd.Series):
+        df = obj.to_frame().T
+    else:
+        df = obj
+    hdbg.dassert_isinstance(df, pd.DataFrame)
+    hdbg.dassert_in(table_name, get_table_names(connection))
+    hdbg.dassert_is_subset(unique_columns, list(df.columns))
+    _LOG.debug("df=\n%s", hpandas.df_to_str(df, use_tabulate=False))
+    buffer = _df_to_copy_buffer(df)
+    # Build the queries.
+    columns = ",".join(list(df.columns))
+    tmp_table_name = f"tmp_copy_{table_name}"
+    # The temporary table has only the columns to insert, with the same types
+    # as in the target table.
+    create_query = (
+        f"CREATE TEMPORARY TABLE {tmp_table_name} ON COMMIT DROP AS "
+        f"SELECT {columns} FROM {table_name} WITH NO DATA"
+    )
+    copy_query = (
+        f"COPY {tmp_table_name} ({columns}) FROM STDIN "
+        f"WITH (FORMAT csv, NULL '{_COPY_NULL}')"
+    )
+    insert_query = (
+        f"INSERT INTO {table_name} ({columns}) "
+        f"SELECT {columns} FROM {tmp_table_name}"
+    )
+    if unique_columns:
+        unique_columns_str = ",".join(unique_columns)
+        insert_query += f" ON CONFLICT ({unique_columns_str}) DO NOTHING"
+    # Run the queries in a single transaction, so that the temporary table is
+    # dropped when it is committed.
+    autocommit = connection.autocommit
+    if autocommit:
+        connection.autocommit = False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(create_query)
+            cursor.copy_expert(copy_query, buffer)
+            cursor.execute(insert_query)
+            num_inserted_rows: int = cursor.rowcount
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        _LOG.error(
+            "Failed to copy data with the '%s'. Query %s.",
+            str(e),
+            insert_query,
+        )
+        raise e
+    finally:
+        if autocommit:
+            connection.autocommit = True
+    _LOG.debug(
+        "Inserted %s rows out of %s into '%s'",
+        num_inserted_rows,
+        df.shape[0],
+        table_name,
+    )
+    return num_inserted_rows
+
+
+# Representation of the missing values in the data sent with `COPY`.
+_COPY_NULL = "\\N"
+
+
+def _df_to_copy_buffer(df: pd.DataFrame) -> io.StringIO:
+    """
+    Serialize a dataframe as CSV for `COPY`.
+    """
+    df = df.copy(deep=False)
+    for column in df.columns:
+        srs = df[column]
+        # Serialize the float columns with integer values (e.g., integers
+        # with NaNs) as integers, since a value like `1.0` can't be copied
+        # into an integer column.
+        if srs.dtype.kind == "f":
+            values = srs.dropna()
+            is_integer = (
+                np.isfinite(values).all()
+                and (values == values.round()).all()
+                and (values.abs() < 2**53).all()
+            )
+            if is_integer:
+                df[column] = srs.astype("Int64")
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False, na_rep=_COPY_NULL)
+    buffer.seek(0)
+    return buffer
+
+
 def execute_query(connection: DbConnection, query: str) -> List[tuple]:
     """
     Use for generic simple operations.
@@ -1,7 +1,9 @@
+import concurrent.futures
 import logging
+import os
 import tempfile
 import time
-from typing import Any, Callable, Tuple
+from typing import Any, Callable, Dict, Tuple
 
 import numpy as np
 import pandas as pd
@@ -905,5 +907,246 @@ class TestCacheEnableCheckOnlyIfPresent1(_ResetGlobalCacheHelper):
         self._execute_and_check_state(f, cf, 2, 2, exp_cf_state=cache_from)
 
 
+# #############################################################################
+
+
+def _get_load_data_function() -> Callable:
+    """
+    Return a function returning dataframes and arrays, used for testing.
+    """
+
+    def func(n: int) -> Dict[str, Any]:
+        func.executed = True  # type: ignore[attr-defined]
+        df = pd.DataFrame({"a": np.arange(n, dtype=float), "b": np.arange(n)})
+        return {"df": df, "array": np.arange(n)}
+
+    func.executed = False  # type: ignore[attr-defined]
+    return func
+
+
+class TestCacheReadOnlyResults1(_ResetGlobalCacheHelper):
+    def test_mem_cache1(self) -> None:
+        self._helper(cache_from="mem", use_mem_cache=True, use_disk_cache=True)
+
+    def test_disk_cache1(self) -> None:
+        self._helper(cache_from="disk", use_mem_cache=False, use_disk_cache=True)
+
+    def test_clear_cache1(self) -> None:
+        """
+        Check that the values kept in the process are not used after clearing
+        the cache.
+        """
+        f = _get_load_data_function()
+        cf = hcache._Cached(f, tag=self.cache_tag, read_only_results=True)
+        cf(3)
+        hcache.clear_global_cache("all", tag=self.cache_tag)
+        _reset_add_function(f)
+        cf(3)
+        self.assertTrue(f.executed)  # type: ignore[attr-defined]
+        self.assertEqual(cf.get_last_cache_accessed(), "no_cache")
+
+    def test_eviction1(self) -> None:
+        """
+        Check that the values kept in the process are dropped when their items
+        are evicted from the cache.
+        """
+        f = _get_random_array_function()
+        # Only 2 items fit the cache.
+        cf = hcache._Cached(
+            f,
+            tag=self.cache_tag,
+            use_disk_cache=False,
+            read_only_results=True,
+            max_size_in_bytes=20000,
+        )
+        for seed in range(1, 4):
+            cf(seed)
+        # The first item was evicted.
+        self.assertEqual(len(cf._read_only_objs), 2)
+        _reset_add_function(f)
+        cf(3)
+        self.assertFalse(f.executed)  # type: ignore[attr-defined]
+        cf(1)
+        self.assertTrue(f.executed)  # type: ignore[attr-defined]
+        self.assertEqual(len(cf._read_only_objs), 2)
+
+    def _helper(self, cache_from: str, **kwargs: Any) -> None:
+        f = _get_load_data_function()
+        cf = hcache._Cached(
+            f, tag=self.cache_tag, read_only_results=True, **kwargs
+        )
+        # 1) Execute the first time.
+        obj1 = cf(3)
+        self.assertTrue(f.executed)  # type: ignore[attr-defined]
+        self.assertEqual(cf.get_last_cache_accessed(), "no_cache")
+        # 2) Execute the second time. Must use the cache.
+        _reset_add_function(f)
+        obj2 = cf(3)
+        self.assertFalse(f.executed)  # type: ignore[attr-defined]
+        self.assertEqual(cf.get_last_cache_accessed(), cache_from)
+        pd.testing.assert_frame_equal(obj2["df"], obj1["df"])
+        # The data is shared and not copied.
+        self.assertTrue(
+            np.shares_memory(obj1["df"]["a"].values, obj2["df"]["a"].values)
+        )
+        self.assertTrue(np.shares_memory(obj1["array"], obj2["array"]))
+        # 3) The data can't be modified in place.
+        with self.assertRaises(ValueError):
+            obj2["df"].iloc[0, 0] = 1.0
+        with self.assertRaises(ValueError):
+            obj2["array"][0] = 1
+        # 4) Changing the structure of the returned value doesn't affect the
+        # cached value.
+        obj2["df"]["a"] = 0.0
+        obj2["df"]["c"] = 1.0
+        obj2["array"] = None
+        obj3 = cf(3)
+        pd.testing.assert_frame_equal(obj3["df"], obj1["df"])
+        np.testing.assert_array_equal(obj3["array"], np.arange(3))
+
+
+# #############################################################################
+
+
+def _get_random_array_function() -> Callable:
+    """
+    Return a function returning an array of about 8KB, used for testing.
+    """
+
+    def func(seed: int) -> np.ndarray:
+        func.executed = True  # type: ignore[attr-defined]
+        return np.random.RandomState(seed).rand(1000)
+
+    func.executed = False  # type: ignore[attr-defined]
+    return func
+
+
+class TestCacheLimits1(_ResetGlobalCacheHelper):
+    def test_function_max_size1(self) -> None:
+        """
+        Check that the least recently used items of a function are evicted.
+        """
+        f = _get_random_array_function()
+        # Only 2 items fit the cache.
+        cf = hcache._Cached(
+            f, tag=self.cache_tag, use_disk_cache=False, max_size_in_bytes=20000
+        )
+        self._check_lru_eviction(f, cf)
+
+    def test_global_max_size1(self) -> None:
+        """
+        Check that the least recently used items of a global cache are
+        evicted.
+        """
+        hcache.set_global_cache_limits(
+            "mem", max_size_in_bytes=20000, tag=self.cache_tag
+        )
+        self.addCleanup(hcache.set_global_cache_limits, "mem", tag=self.cache_tag)
+        f = _get_random_array_function()
+        cf = hcache._Cached(f, tag=self.cache_tag, use_disk_cache=False)
+        self._check_lru_eviction(f, cf)
+        # The limits and stats are reported.
+        txt = hcache.get_global_cache_info(tag=self.cache_tag)
+        self.assertIn(
+            "'global mem' cache limits: max_size_in_bytes=20000, "
+            "max_age_in_secs=None",
+            txt,
+        )
+        self.assertRegex(
+            txt, r"'global mem' cache stats: hits=\d+, misses=\d+, evictions=\d+"
+        )
+
+    def test_max_age1(self) -> None:
+        """
+        Check that an expired item is computed again.
+        """
+        f = _get_random_array_function()
+        cf = hcache._Cached(
+            f, tag=self.cache_tag, use_mem_cache=False, max_age_in_secs=0.5
+        )
+        cf(1)
+        _reset_add_function(f)
+        cf(1)
+        self.assertFalse(f.executed)  # type: ignore[attr-defined]
+        self.assertEqual(cf.get_last_cache_accessed(), "disk")
+        # Wait for the item to expire.
+        evictions = hcache._CACHE_STATS["disk"]["evictions"]
+        time.sleep(0.6)
+        cf(1)
+        self.assertTrue(f.executed)  # type: ignore[attr-defined]
+        self.assertEqual(cf.get_last_cache_accessed(), "no_cache")
+        self.assertEqual(hcache._CACHE_STATS["disk"]["evictions"], evictions + 1)
+
+    def _check_lru_eviction(self, f: Callable, cf: hcache._Cached) -> None:
+        """
+        Store 3 items in a cache fitting 2 items and check the evictions.
+        """
+        stats = hcache._CACHE_STATS["mem"].copy()
+        cf(1)
+        cf(2)
+        # Access the first item, so that the second one is the least recently
+        # used.
+        cf(1)
+        self.assertEqual(cf.get_last_cache_accessed(), "mem")
+        cf(3)
+        # The second item was evicted.
+        _reset_add_function(f)
+        cf(1)
+        self.assertFalse(f.executed)  # type: ignore[attr-defined]
+        cf(3)
+        self.assertFalse(f.executed)  # type: ignore[attr-defined]
+        cf(2)
+        self.assertTrue(f.executed)  # type: ignore[attr-defined]
+        # Check the stats: storing the 2nd item again evicts another item.
+        actual = {
+            key: hcache._CACHE_STATS["mem"][key] - stats[key]
+            for key in ["hits", "misses", "evictions"]
+        }
+        expected = {"hits": 3, "misses": 4, "evictions": 2}
+        self.assertDictEqual(actual, expected)
+
+
+# #############################################################################
+
+
+def _slow_func(counter_file_name: str) -> int:
+    """
+    Record each execution in `counter_file_name` and return a value slowly.
+    """
+    hio.to_file(counter_file_name, "executed\n", mode="a")
+    time.sleep(0.5)
+    return 42
+
+
+def _execute_slow_func(cache_tag: str, counter_file_name: str) -> int:
+    """
+    Execute the cached version of `_slow_func()` in a worker.
+    """
+    cf = hcache._Cached(_slow_func, tag=cache_tag, single_flight=True)
+    return cf(counter_file_name)
+
+
+class TestCacheSingleFlight1(_ResetGlobalCacheHelper):
+    def test_processes1(self) -> None:
+        """
+        Check that concurrent misses in multiple processes execute the
+        function only once.
+        """
+        counter_file_name = os.path.join(self.get_scratch_space(), "counter.txt")
+        num_workers = 4
+        with concurrent.futures.ProcessPoolExecutor(num_workers) as executor:
+            futures = [
+                executor.submit(
+                    _execute_slow_func, self.cache_tag, counter_file_name
+                )
+                for _ in range(num_workers)
+            ]
+            results = [future.result() for future in futures]
+        self.assertEqual(results, [42] * num_workers)
+        # The function was executed only once.
+        txt = hio.from_file(counter_file_name)
+        self.assertEqual(txt.count("executed"), 1)
+
+
 # TODO(gp): Add a test for verbose mode in __call__
 # TODO(gp): get_function_cache_info
@@ -0,0 +1,92 @@
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+import helpers.harrow as harrow
+import helpers.hunit_test as hunitest
+
+_LOG = logging.getLogger(__name__)
+
+
+def _get_df() -> pd.DataFrame:
+    """
+    Create a df with asset ids as column names and NaNs.
+    """
+    idx = pd.date_range(
+        "2022-01-03 09:31", periods=5, freq="T", tz="America/New_York"
+    )
+    values = np.arange(10, dtype=float).reshape(5, 2)
+    values[1, 0] = np.nan
+    df = pd.DataFrame(values, index=idx, columns=[101, 202])
+    return df
+
+
+# #############################################################################
+# Test_to_from_feather1
+# #############################################################################
+
+
+class Test_to_from_feather1(hunitest.TestCase):
+    def test_round_trip1(self) -> None:
+        """
+        Check that a df is saved and loaded unchanged.
+        """
+        df = _get_df()
+        file_name = os.path.join(self.get_scratch_space(), "df.feather")
+        harrow.to_feather(df, file_name)
+        act = harrow.from_feather(file_name)
+        pd.testing.assert_frame_equal(act, df)
+        self.assertEqual(act.index.freq, df.index.freq)
+        # The loaded df can be modified.
+        act.iloc[0, 0] = 1.0
+
+    def test_round_trip2(self) -> None:
+        """
+        Check a df with a strings column.
+        """
+        df = _get_df()
+        df.columns = ["a", "b"]
+        df["instr"] = list("ABCDE")
+        file_name = os.path.join(self.get_scratch_space(), "df.feather")
+        harrow.to_feather(df, file_name)
+        act = harrow.from_feather(file_name, memory_map=True)
+        pd.testing.assert_frame_equal(act, df)
+
+    def test_round_trip3(self) -> None:
+        """
+        Check a df with multi-index columns.
+        """
+        df = _get_df()
+        df = pd.concat({"close": df, "volume": df * 10}, axis=1)
+        file_name = os.path.join(self.get_scratch_space(), "df.feather")
+        harrow.to_feather(df, file_name)
+        act = harrow.from_feather(file_name, memory_map=True)
+        pd.testing.assert_frame_equal(act, df)
+
+    def test_memory_map1(self) -> None:
+        """
+        Check that the numeric columns of a memory-mapped df are not copied.
+        """
+        df = _get_df()
+        file_name = os.path.join(self.get_scratch_space(), "df.feather")
+        harrow.to_feather(df, file_name)
+        act = harrow.from_feather(file_name, memory_map=True)
+        pd.testing.assert_frame_equal(act, df)
+        # The data points to the read-only mapped file.
+        self.assertFalse(act[101].to_numpy().flags.writeable)
+        self.assertFalse(act[202].to_numpy().flags.writeable)
+        # The file can be replaced while it is mapped.
+        harrow.to_feather(df * 2, file_name)
+        pd.testing.assert_frame_equal(act, df)
+
+    def test_columns1(self) -> None:
+        """
+        Check loading a subset of the columns.
+        """
+        df = _get_df()
+        file_name = os.path.join(self.get_scratch_space(), "df.feather")
+        harrow.to_feather(df, file_name)
+        act = harrow.from_feather(file_name, columns=[202], memory_map=True)
+        pd.testing.assert_frame_equal(act, df[[202]])
@@ -2,10 +2,14 @@ import datetime
 import logging
 import os
 import random
+import unittest.mock as umock
 from typing import Any, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import pyarrow
+import pyarrow.dataset
+import pyarrow.fs
 import pyarrow.parquet as parquet
 import pytest
 
@@ -490,6 +494,61 @@ class TestPartitionedParquet1(hunitest.TestCase):
 # #############################################################################
 
 
+class TestFromParquetInParallel1(hunitest.TestCase):
+    """
+    Check that reading row groups in parallel gives the same result as
+    reading the dataset with a single call.
+    """
+
+    def test_read_everything1(self) -> None:
+        self._helper(columns=None, filters=None)
+
+    def test_read_columns1(self) -> None:
+        self._helper(columns=["instr", "val1"], filters=None)
+
+    def test_read_with_filters1(self) -> None:
+        # Filter on both a partitioning and a data column, so that some row
+        # groups are skipped according to their statistics.
+        filters = [[("idx", "in", [1, 3]), ("val1", ">", 50)]]
+        self._helper(columns=["instr", "val1"], filters=filters)
+
+    def test_read_nothing1(self) -> None:
+        filters = [[("idx", "=", 10)]]
+        self._helper(columns=["instr", "val1"], filters=filters)
+
+    def _helper(
+        self, columns: Optional[List[str]], filters: Optional[List[Any]]
+    ) -> None:
+        df = _get_df_example1()
+        dir_name = os.path.join(self.get_scratch_space(), "data.parquet")
+        # Write a partitioned dataset with multiple row groups for each file.
+        table = pyarrow.Table.from_pandas(df)
+        pyarrow.dataset.write_dataset(
+            table,
+            dir_name,
+            format="parquet",
+            partitioning=["idx"],
+            partitioning_flavor="hive",
+            min_rows_per_group=10,
+            max_rows_per_group=10,
+        )
+        expected = hparque.from_parquet(
+            dir_name, columns=columns, filters=filters
+        )
+        for num_threads, read_ahead in [(1, None), (4, None), (2, 3)]:
+            actual = hparque.from_parquet(
+                dir_name,
+                columns=columns,
+                filters=filters,
+                num_threads=num_threads,
+                read_ahead=read_ahead,
+            )
+            pd.testing.assert_frame_equal(actual, expected)
+
+
+# #############################################################################
+
+
 class TestGetParquetFiltersFromTimestampInterval1(hunitest.TestCase):
     def test_no_interval(self) -> None:
         """
@@ -690,6 +749,161 @@ class TestGetParquetFiltersFromTimestampInterval1(hunitest.TestCase):
         )
         self.assert_equal(actual, expected)
 
+    def test_timestamp_column1(self) -> None:
+        """
+        Test applying the interval also to a timestamp column.
+        """
+        partition_mode = "by_year_month"
+        start_ts = pd.Timestamp("2020-06-02 09:31:00+00:00")
+        end_ts = pd.Timestamp("2020-06-02 10:31:00+00:00")
+        filters = hparque.get_parquet_filters_from_timestamp_interval(
+            partition_mode,
+            start_ts,
+            end_ts,
+            timestamp_column="timestamp",
+        )
+        actual = str(filters)
+        expected = (
+            r"[[('year', '==', 2020), ('month', '>=', 6), ('month', '<=', 6), "
+            r"('timestamp', '>=', "
+            r"Timestamp('2020-06-02 09:31:00+0000', tz='UTC')), "
+            r"('timestamp', '<=', "
+            r"Timestamp('2020-06-02 10:31:00+0000', tz='UTC'))]]"
+        )
+        self.assert_equal(actual, expected)
+
+
+# #############################################################################
+
+
+class TestRowGroupIndex1(hunitest.TestCase):
+    def test_build_index1(self) -> None:
+        """
+        Check the index built when writing a dataset.
+        """
+        df = self._get_df()
+        dir_name = self._write_dataset(df)
+        index = hparque.build_row_group_index(dir_name)
+        # 2 months with 1440 rows per asset and day, in groups of 120 rows.
+        self.assertEqual(index.shape[0], 2 * 2 * 1440 // 120)
+        self.assertEqual(
+            index.columns[:5].tolist(),
+            ["file_name", "file_size", "mtime_ns", "row_group", "num_rows"],
+        )
+        self.assertIn("timestamp.min", index.columns)
+        self.assertIn("asset_id.max", index.columns)
+        # The index file is not part of the dataset.
+        actual = hparque.from_parquet(dir_name)
+        self.assertEqual(actual.shape[0], df.shape[0])
+
+    def test_read1(self) -> None:
+        """
+        Check that reading a short interval skips the row groups outside it.
+        """
+        df = self._get_df()
+        dir_name = self._write_dataset(df)
+        start_ts = pd.Timestamp("2022-01-31 10:00:00+00:00")
+        end_ts = pd.Timestamp("2022-01-31 10:30:00+00:00")
+        filters = hparque.get_parquet_filters_from_timestamp_interval(
+            "by_year_month",
+            start_ts,
+            end_ts,
+            additional_filters=[("asset_id", "in", [101])],
+            timestamp_column="timestamp",
+        )
+        actual = hparque.from_parquet(dir_name, filters=filters)
+        expected = hparque.from_parquet(
+            dir_name, filters=filters, use_row_group_index=False
+        )
+        pd.testing.assert_frame_equal(actual, expected)
+        self.assertEqual(actual.shape[0], 31)
+        # Only one row group can contain the data.
+        filesystem = pyarrow.fs.LocalFileSystem()
+        index = hparque._load_row_group_index(filesystem, dir_name)
+        mask = index.apply(
+            lambda row: hparque._may_match_row_group_stats(row, filters), axis=1
+        )
+        self.assertEqual(mask.sum(), 1)
+
+    def test_stale_index1(self) -> None:
+        """
+        Check that the files changed after building the index are read.
+        """
+        df = self._get_df()
+        dir_name = self._write_dataset(df)
+        index = hparque.build_row_group_index(dir_name)
+        # Add data for a new month without updating the index.
+        df2 = df.copy()
+        df2.index = df2.index + pd.DateOffset(months=2)
+        df2, _ = hparque.add_date_partition_columns(df2, "by_year_month")
+        hparque.to_partitioned_parquet(
+            df2, ["year", "month"], dir_name, row_group_size=120
+        )
+        filters = [[("timestamp", ">=", pd.Timestamp("2022-03-31", tz="UTC"))]]
+        actual = hparque.from_parquet(dir_name, filters=filters)
+        expected = hparque.from_parquet(
+            dir_name, filters=filters, use_row_group_index=False
+        )
+        pd.testing.assert_frame_equal(actual, expected)
+        self.assertEqual(actual.shape[0], df2.shape[0])
+        # Updating the index adds the entries of the new files.
+        index2 = hparque.build_row_group_index(dir_name)
+        self.assertEqual(index2.shape[0], 2 * index.shape[0])
+        pd.testing.assert_frame_equal(
+            index2[index2["file_name"].isin(index["file_name"])], index
+        )
+
+    def test_partition_filters1(self) -> None:
+        """
+        Check that the index is not looked up when filtering only partitions.
+        """
+        df = self._get_df()
+        dir_name = self._write_dataset(df)
+        filters = [[("year", "==", 2022), ("month", "==", 1)]]
+        with umock.patch.object(
+            hparque,
+            "_load_row_group_index",
+            wraps=hparque._load_row_group_index,
+        ) as load_mock:
+            actual = hparque.from_parquet(dir_name, filters=filters)
+            self.assertEqual(load_mock.call_count, 0)
+            # Filtering on a column with statistics uses the index.
+            filters = [filters[0] + [("asset_id", "==", 101)]]
+            hparque.from_parquet(dir_name, filters=filters)
+            self.assertEqual(load_mock.call_count, 1)
+        self.assertEqual(actual.shape[0], 2 * 1440)
+
+    @staticmethod
+    def _get_df() -> pd.DataFrame:
+        """
+        Build a df with 2 assets and 1-minute data on the last day of 2 months.
+        """
+        dfs = []
+        for date in ["2022-01-31", "2022-02-28"]:
+            idx = pd.date_range(date, periods=1440, freq="T", tz="UTC")
+            for asset_id in [101, 202]:
+                df = pd.DataFrame(
+                    {"asset_id": asset_id, "price": np.arange(1440.0)}, index=idx
+                )
+                dfs.append(df)
+        df = pd.concat(dfs)
+        df.index.name = "timestamp"
+        # Sort by time so that each row group spans a short interval.
+        df = df.sort_index(kind="stable")
+        df, _ = hparque.add_date_partition_columns(df, "by_year_month")
+        return df
+
+    def _write_dataset(self, df: pd.DataFrame) -> str:
+        dir_name = os.path.join(self.get_scratch_space(), "data")
+        hparque.to_partitioned_parquet(
+            df,
+            ["year", "month"],
+            dir_name,
+            row_group_size=120,
+            index_row_groups=True,
+        )
+        return dir_name
+
 
 # #############################################################################
 
@@ -0,0 +1,237 @@
+import logging
+import os
+import time
+from typing import Tuple
+
+import fsspec
+import numpy as np
+import pandas as pd
+import pytest
+
+import helpers.henv as henv
+import helpers.hio as hio
+import helpers.hmoto as hmoto
+import helpers.hparquet as hparque
+import helpers.hparquet_tile_cache as hpatica
+import helpers.hs3 as hs3
+import helpers.hunit_test as hunitest
+
+_LOG = logging.getLogger(__name__)
+
+
+def _get_df(value: float = 0.0) -> pd.DataFrame:
+    """
+    Create a df with 2 assets over 3 months.
+    """
+    idx = pd.date_range("2022-01-01", "2022-03-31", freq="D", tz="UTC")
+    idx.name = "timestamp"
+    dfs = []
+    for asset in ["A", "B"]:
+        df = pd.DataFrame({"asset": asset, "close": value}, index=idx)
+        dfs.append(df)
+    df = pd.concat(dfs)
+    df["close"] += np.arange(df.shape[0])
+    df, _ = hparque.add_date_partition_columns(df, "by_year_month")
+    return df
+
+
+def _write_dataset(df: pd.DataFrame, dst_dir: str) -> None:
+    hparque.to_partitioned_parquet(df, ["asset", "year", "month"], dst_dir)
+
+
+# #############################################################################
+# TestParquetTileCache1
+# #############################################################################
+
+
+class TestParquetTileCache1(hunitest.TestCase):
+    """
+    Use a local dir in place of the remote S3 dataset.
+    """
+
+    def test_read_through1(self) -> None:
+        """
+        Check that the files are downloaded only the first time.
+        """
+        src_dir, tile_cache = self._get_src_dir_and_cache()
+        filesystem = fsspec.filesystem("file")
+        # The first read downloads all the files.
+        local_dir = tile_cache.sync(src_dir, filesystem)
+        actual = hparque.from_parquet(local_dir)
+        expected = hparque.from_parquet(src_dir)
+        pd.testing.assert_frame_equal(actual, expected)
+        stats = tile_cache.get_stats()
+        self.assertEqual(stats["num_hits"], 0)
+        self.assertEqual(stats["num_misses"], 6)
+        self.assertEqual(stats["bytes_saved"], 0)
+        # The second read hits the cache.
+        local_dir = tile_cache.sync(src_dir, filesystem)
+        actual = hparque.from_parquet(local_dir)
+        pd.testing.assert_frame_equal(actual, expected)
+        stats = tile_cache.get_stats()
+        self.assertEqual(stats["num_hits"], 6)
+        self.assertEqual(stats["num_misses"], 6)
+        self.assertEqual(stats["hit_rate"], 0.5)
+        self.assertEqual(stats["bytes_saved"], stats["bytes_downloaded"])
+        self.assertEqual(stats["size_in_bytes"], stats["bytes_downloaded"])
+
+    def test_filters1(self) -> None:
+        """
+        Check that only the files matching the filters are downloaded.
+        """
+        src_dir, tile_cache = self._get_src_dir_and_cache()
+        filesystem = fsspec.filesystem("file")
+        filters = [
+            [("asset", "=", "A"), ("month", ">=", 2)],
+            [("asset", "=", "B"), ("month", "in", [1])],
+        ]
+        local_dir = tile_cache.sync(src_dir, filesystem, filters=filters)
+        actual = hparque.from_parquet(local_dir, filters=filters)
+        expected = hparque.from_parquet(src_dir, filters=filters)
+        pd.testing.assert_frame_equal(actual, expected)
+        self.assertEqual(tile_cache.get_stats()["num_misses"], 3)
+        # A filter matching no partition doesn't download anything.
+        filters = [("year", "=", 2021)]
+        local_dir = tile_cache.sync(src_dir, filesystem, filters=filters)
+        self.assertEqual(tile_cache.get_stats()["num_misses"], 3)
+        self.assertEqual(tile_cache.get_stats()["num_hits"], 0)
+
+    def test_invalidation1(self) -> None:
+        """
+        Check that modified and deleted remote files are not served.
+        """
+        src_dir, tile_cache = self._get_src_dir_and_cache()
+        filesystem = fsspec.filesystem("file")
+        tile_cache.sync(src_dir, filesystem)
+        # Overwrite the data and remove a tile.
+        df = _get_df(value=100.0)
+        df = df[~((df["asset"] == "B") & (df["month"] == 3))]
+        hio.create_dir(src_dir, incremental=False)
+        # Make sure that the modification time changes.
+        time.sleep(0.01)
+        _write_dataset(df, src_dir)
+        local_dir = tile_cache.sync(src_dir, filesystem)
+        actual = hparque.from_parquet(local_dir)
+        expected = hparque.from_parquet(src_dir)
+        pd.testing.assert_frame_equal(actual, expected)
+        stats = tile_cache.get_stats()
+        self.assertEqual(stats["num_hits"], 0)
+        self.assertEqual(stats["num_misses"], 6 + 5)
+
+    def test_eviction1(self) -> None:
+        """
+        Check that the least recently used files are evicted.
+        """
+        src_dir, tile_cache = self._get_src_dir_and_cache()
+        filesystem = fsspec.filesystem("file")
+        tile_cache.sync(src_dir, filesystem, filters=[("asset", "=", "A")])
+        size_in_bytes = tile_cache.get_size_in_bytes()
+        # Allow to store the files of a single asset and some more.
+        max_size_in_bytes = int(1.5 * size_in_bytes)
+        cache_dir = os.path.join(self.get_scratch_space(), "cache")
+        tile_cache = hpatica.ParquetTileCache(
+            cache_dir, max_size_in_bytes=max_size_in_bytes
+        )
+        tile_cache.sync(src_dir, filesystem, filters=[("asset", "=", "B")])
+        stats = tile_cache.get_stats()
+        self.assertEqual(stats["num_misses"], 3)
+        self.assertLess(0, stats["num_evictions"])
+        self.assertLessEqual(stats["size_in_bytes"], max_size_in_bytes)
+        # The files used by the last query are not evicted.
+        tile_cache.sync(src_dir, filesystem, filters=[("asset", "=", "B")])
+        stats = tile_cache.get_stats()
+        self.assertEqual(stats["num_misses"], 3)
+        self.assertEqual(stats["num_hits"], 3)
+
+    def test_single_file1(self) -> None:
+        """
+        Check caching a single file.
+        """
+        src_dir, tile_cache = self._get_src_dir_and_cache()
+        filesystem = fsspec.filesystem("file")
+        src_file_name = os.path.join(src_dir, "data.parquet")
+        df = _get_df()
+        hparque.to_parquet(df, src_file_name)
+        for _ in range(2):
+            local_file_name = tile_cache.sync(src_file_name, filesystem)
+            self.assertTrue(os.path.isfile(local_file_name))
+            actual = hparque.from_parquet(local_file_name)
+            expected = hparque.from_parquet(src_file_name)
+            pd.testing.assert_frame_equal(actual, expected)
+        stats = tile_cache.get_stats()
+        self.assertEqual(stats["num_misses"], 1)
+        self.assertEqual(stats["num_hits"], 1)
+
+    def test_shared_cache1(self) -> None:
+        """
+        Check that the files being read through a cache dir are not evicted
+        by another cache sharing the dir.
+        """
+        src_dir, tile_cache1 = self._get_src_dir_and_cache()
+        filesystem = fsspec.filesystem("file")
+        tile_cache1.sync(src_dir, filesystem, filters=[("asset", "=", "A")])
+        # Allow to store the files of a single asset and some more.
+        max_size_in_bytes = int(1.5 * tile_cache1.get_size_in_bytes())
+        cache_dir = os.path.join(self.get_scratch_space(), "cache")
+        tile_cache2 = hpatica.ParquetTileCache(
+            cache_dir, max_size_in_bytes=max_size_in_bytes
+        )
+        filters = [("asset", "=", "A")]
+        with tile_cache1.read(src_dir, filesystem, filters=filters) as local_dir:
+            # The files of asset "A" are not evicted while they are read.
+            tile_cache2.sync(src_dir, filesystem, filters=[("asset", "=", "B")])
+            self.assertEqual(tile_cache2.get_stats()["num_evictions"], 0)
+            actual = hparque.from_parquet(local_dir, filters=filters)
+        expected = hparque.from_parquet(src_dir, filters=filters)
+        pd.testing.assert_frame_equal(actual, expected)
+        # The next eviction brings the cache back to its size limit.
+        tile_cache2.sync(src_dir, filesystem, filters=[("asset", "=", "B")])
+        stats = tile_cache2.get_stats()
+        self.assertLess(0, stats["num_evictions"])
+        self.assertLessEqual(stats["size_in_bytes"], max_size_in_bytes)
+
+    def _get_src_dir_and_cache(self) -> Tuple[str, hpatica.ParquetTileCache]:
+        scratch_dir = self.get_scratch_space()
+        src_dir = os.path.join(scratch_dir, "src")
+        _write_dataset(_get_df(), src_dir)
+        cache_dir = os.path.join(scratch_dir, "cache")
+        tile_cache = hpatica.ParquetTileCache(cache_dir)
+        return src_dir, tile_cache
+
+
+# #############################################################################
+# TestParquetTileCache2
+# #############################################################################
+
+
+@pytest.mark.skipif(
+    not henv.execute_repo_config_code("is_CK_S3_available()"),
+    reason="Run only if CK S3 is available",
+)
+class TestParquetTileCache2(hmoto.S3Mock_TestCase):
+    def test_from_parquet1(self) -> None:
+        """
+        Check that `from_parquet()` reads a dataset on S3 through the cache.
+        """
+        scratch_dir = self.get_scratch_space()
+        src_dir = os.path.join(scratch_dir, "src")
+        _write_dataset(_get_df(), src_dir)
+        s3fs_ = hs3.get_s3fs(self.mock_aws_profile)
+        s3_dir = f"s3://{self.bucket_name}/data"
+        s3fs_.put(src_dir, s3_dir, recursive=True)
+        #
+        cache_dir = os.path.join(scratch_dir, "cache")
+        tile_cache = hpatica.ParquetTileCache(cache_dir)
+        filters = [("asset", "=", "A")]
+        expected = hparque.from_parquet(src_dir, filters=filters)
+        for _ in range(2):
+            actual = hparque.from_parquet(
+                s3_dir,
+                filters=filters,
+                aws_profile=s3fs_,
+                tile_cache=tile_cache,
+            )
+            pd.testing.assert_frame_equal(actual, expected)
+        stats = tile_cache.get_stats()
+        self.assertEqual(stats["num_misses"], 3)
+        self.assertEqual(stats["num_hits"], 3)
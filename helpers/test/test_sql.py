@@ -1,5 +1,6 @@
 import logging
 import pprint
+from typing import List, Optional
 
 import pandas as pd
 import psycopg2.errors as perrors
@@ -159,6 +160,87 @@ class TestSql1(imvcddbut.TestImDbHelper):
         # Delete the table.
         hsql.remove_table(self.connection, "test_table")
 
+    @pytest.mark.slow("10 seconds.")
+    def test_execute_copy_on_conflict_do_nothing_query1(self) -> None:
+        """
+        Verify that the data is copied skipping the duplicates.
+        """
+        self._create_test_table(unique_columns=["column_1", "column_2"])
+        test_data = self._get_duplicated_data()[["column_1", "column_2"]]
+        # Insert the data twice.
+        num_inserted_rows = hsql.execute_copy_on_conflict_do_nothing_query(
+            self.connection, test_data, "test_table", ["column_1", "column_2"]
+        )
+        self.assertEqual(num_inserted_rows, 3)
+        num_inserted_rows = hsql.execute_copy_on_conflict_do_nothing_query(
+            self.connection, test_data, "test_table", ["column_1", "column_2"]
+        )
+        self.assertEqual(num_inserted_rows, 0)
+        # Load data.
+        df = hsql.execute_query_to_df(
+            self.connection, "SELECT * FROM test_table ORDER BY column_1"
+        )
+        self.assertEqual(df["column_1"].tolist(), [1000, 1001, 1002])
+        self.assertEqual(
+            df["column_2"].tolist(),
+            ["test_string_1", "test_string_2", "test_string_3"],
+        )
+        # The temporary table is dropped and the connection is unchanged.
+        self.assertNotIn(
+            "tmp_copy_test_table", hsql.get_table_names(self.connection)
+        )
+        self.assertTrue(self.connection.autocommit)
+        # Delete the table.
+        hsql.remove_table(self.connection, "test_table")
+
+    @pytest.mark.slow("10 seconds.")
+    def test_execute_copy_on_conflict_do_nothing_query2(self) -> None:
+        """
+        Verify that missing values and float values are copied.
+        """
+        self._create_test_table()
+        test_data = pd.DataFrame(
+            {
+                "id": [1.0, 2.0, 3.0],
+                "column_1": [1.5, None, 3.0],
+                "column_2": ["test_string_1", None, ""],
+            }
+        )
+        hsql.execute_copy_on_conflict_do_nothing_query(
+            self.connection, test_data, "test_table", []
+        )
+        df = hsql.execute_query_to_df(
+            self.connection, "SELECT * FROM test_table ORDER BY id"
+        )
+        self.assertEqual(df["id"].tolist(), [1, 2, 3])
+        self.assertEqual(float(df["column_1"].iloc[0]), 1.5)
+        self.assertTrue(pd.isna(df["column_1"].iloc[1]))
+        self.assertEqual(df["column_2"].iloc[0], "test_string_1")
+        self.assertIsNone(df["column_2"].iloc[1])
+        self.assertEqual(df["column_2"].iloc[2], "")
+        # Delete the table.
+        hsql.remove_table(self.connection, "test_table")
+
+    @pytest.mark.slow("10 seconds.")
+    def test_get_connection_from_pool1(self) -> None:
+        """
+        Verify that the connections are borrowed from and returned to a pool.
+        """
+        connection_info = hsql.db_connection_to_tuple(self.connection)
+        connection_pool = hsql.get_connection_pool(
+            *connection_info, max_connections=2
+        )
+        with hsql.get_connection_from_pool(connection_pool) as connection1:
+            with hsql.get_connection_from_pool(connection_pool) as connection2:
+                self.assertIsNot(connection1, connection2)
+                self.assertTrue(connection2.autocommit)
+                db_names = hsql.get_db_names(connection2)
+                self.assertIn("im_postgres_db_local", db_names)
+        # The connections are reused.
+        with hsql.get_connection_from_pool(connection_pool) as connection3:
+            self.assertIn(connection3, [connection1, connection2])
+        connection_pool.closeall()
+
     @staticmethod
     def _get_test_data() -> pd.DataFrame:
         """
@@ -233,9 +315,13 @@ class TestSql1(imvcddbut.TestImDbHelper):
         )
         return test_data
 
-    def _create_test_table(self) -> None:
+    def _create_test_table(
+        self, *, unique_columns: Optional[List[str]] = None
+    ) -> None:
         """
         Create a test table.
+
+        :param unique_columns: columns with a UNIQUE constraint
         """
         query = """CREATE TABLE IF NOT EXISTS test_table(
                     id SERIAL PRIMARY KEY,
@@ -244,3 +330,7 @@ class TestSql1(imvcddbut.TestImDbHelper):
                     )
                     """
         self.connection.cursor().execute(query)
+        if unique_columns:
+            unique_columns_str = ",".join(unique_columns)
+            query = f"ALTER TABLE test_table ADD UNIQUE ({unique_columns_str})"
+            self.connection.cursor().execute(query)
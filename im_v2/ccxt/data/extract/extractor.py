@@ -6,6 +6,7 @@ import im_v2.ccxt.data.extract.extractor as ivcdexex
 
 import copy
 import logging
+import threading
 import time
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -51,6 +52,9 @@ class CcxtExtractor(imvcdexex.Extractor):
         #  we keep the ccxt.Exchange in _sync_exchange for backwards
         #  compatibility with our codebase.
         self._async_exchange = self.log_into_exchange(async_=True)
+        # A sync exchange is not thread-safe, so each thread uses its own
+        #  (see `_sync_exchange`).
+        self._thread_local = threading.local()
         self._sync_exchange = self.log_into_exchange(async_=False)
         self.currency_pairs = self.get_exchange_currency_pairs()
         self.vendor = "CCXT"
@@ -94,6 +98,25 @@ class CcxtExtractor(imvcdexex.Extractor):
         exchange = exchange_class(exchange_params)
         return exchange
 
+    @property
+    def _sync_exchange(self) -> ccxt.Exchange:
+        """
+        Return the sync exchange of the calling thread.
+
+        The REST download methods can be called from a pool of threads (e.g.,
+        by `download_exchange_data_to_db()`), so a thread other than the one
+        that built the extractor logs into its own exchange.
+        """
+        exchange = getattr(self._thread_local, "sync_exchange", None)
+        if exchange is None:
+            exchange = self.log_into_exchange(async_=False)
+            self._thread_local.sync_exchange = exchange
+        return exchange
+
+    @_sync_exchange.setter
+    def _sync_exchange(self, exchange: ccxt.Exchange) -> None:
+        self._thread_local.sync_exchange = exchange
+
     def get_exchange_currency_pairs(self) -> List[str]:
         """
         Get all the currency pairs available for the exchange.
@@ -1,3 +1,4 @@
+import concurrent.futures
 import logging
 import unittest.mock as umock
 
@@ -476,6 +477,32 @@ class TestCcxtExtractor1(hunitest.TestCase):
         expected = ["BTC/USDT"]
         self.assertEqual(actual, expected)
 
+    def test_sync_exchange_per_thread1(self) -> None:
+        """
+        Test that each thread uses its own sync exchange.
+        """
+        exchange_class = imvcdexex.CcxtExtractor("binance", "spot")
+        sync_exchange = exchange_class._sync_exchange
+        with umock.patch.object(
+            exchange_class,
+            "log_into_exchange",
+            side_effect=lambda async_: umock.MagicMock(),
+        ) as log_into_exchange_mock:
+            # The thread that built the extractor keeps its exchange.
+            self.assertIs(exchange_class._sync_exchange, sync_exchange)
+            self.assertEqual(log_into_exchange_mock.call_count, 0)
+            # Another thread logs into a new exchange once.
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                thread_sync_exchanges = [
+                    executor.submit(
+                        lambda: exchange_class._sync_exchange
+                    ).result()
+                    for _ in range(2)
+                ]
+        self.assertIsNot(thread_sync_exchanges[0], sync_exchange)
+        self.assertIs(thread_sync_exchanges[1], thread_sync_exchanges[0])
+        log_into_exchange_mock.assert_called_once_with(async_=False)
+
     def test_download_ohlcv_invalid_input1(self) -> None:
         """
         Run with invalid start timestamp.
@@ -6,7 +6,7 @@ import im_v2.common.data.client.base_im_clients as imvcdcbimcl
 
 import abc
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
 
@@ -206,6 +206,159 @@ class ImClient(abc.ABC):
         _LOG.debug(
             hpandas.df_to_str(df, print_shape_info=True, tag="after _read_data")
         )
+        df = self._postprocess_data(
+            df,
+            full_symbols,
+            start_ts,
+            end_ts,
+            columns,
+            filter_data_mode,
+            full_symbol_col_name,
+        )
+        return df
+
+    def read_data_iter(
+        self,
+        full_symbols: List[ivcu.FullSymbol],
+        start_ts: pd.Timestamp,
+        end_ts: pd.Timestamp,
+        columns: Optional[List[str]],
+        filter_data_mode: str,
+        *,
+        chunk_freq: str = "1D",
+        full_symbol_col_name: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read data in `[start_ts, end_ts]` as a sequence of time chunks.
+
+        Each chunk is read, normalized, and validated independently, like
+        the output of `read_data()` for the interval of the chunk, so that
+        long intervals can be processed without loading all the data in
+        memory. Concatenating the chunks gives the output of `read_data()`
+        for the entire interval, except for the resampling to 1 minute that is
+        applied within each chunk.
+
+        The chunks are aligned to `chunk_freq` (e.g., the chunks by day
+        start at midnight) and empty chunks are skipped.
+
+        The data is read from the backend in intervals aligned to the tiles
+        of the data, if any (see `_get_tile_freq()`), and to the chunks
+        otherwise, so that each tile is read only once even when it contains
+        several chunks. Thus the memory used is bounded by the data of one
+        tile (e.g., one month for a Parquet dataset partitioned by year and
+        month) plus the data of one chunk, and not only by the data of one
+        chunk.
+
+        See `read_data()` for the other params.
+
+        :param start_ts: the earliest date timestamp to load data for
+        :param end_ts: the latest date timestamp to load data for
+        :param chunk_freq: pandas frequency of the chunks, e.g., "1D", "6H",
+            "MS"
+        :return: iterator over the chunks with data, in time order
+        """
+        _LOG.debug(hprint.to_str("full_symbols start_ts end_ts chunk_freq"))
+        # Chunking requires a bounded interval.
+        hdbg.dassert_isinstance(start_ts, pd.Timestamp)
+        hdbg.dassert_isinstance(end_ts, pd.Timestamp)
+        ivcu.dassert_valid_full_symbols(full_symbols)
+        left_close = True
+        right_close = True
+        hdateti.dassert_is_valid_interval(
+            start_ts, end_ts, left_close, right_close
+        )
+        full_symbol_col_name = self._get_full_symbol_col_name(
+            full_symbol_col_name
+        )
+        if columns is not None:
+            hdbg.dassert_container_type(columns, list, str)
+            hdbg.dassert_lte(1, len(columns))
+        read_freq = self._get_tile_freq() or chunk_freq
+        read_intervals = iter(_get_chunk_intervals(start_ts, end_ts, read_freq))
+        # Data read from the backend and not returned yet.
+        read_dfs: List[pd.DataFrame] = []
+        read_end_ts = None
+        ts_col_name = None
+        for chunk_start_ts, chunk_end_ts in _get_chunk_intervals(
+            start_ts, end_ts, chunk_freq
+        ):
+            # Read until the end of the chunk. The last read interval and the
+            # last chunk both end at `end_ts`.
+            while read_end_ts is None or read_end_ts < chunk_end_ts:
+                read_start_ts, read_end_ts = next(read_intervals)
+                # Delegate to the derived classes to retrieve the data.
+                df = self._read_data(
+                    full_symbols,
+                    read_start_ts,
+                    read_end_ts,
+                    columns,
+                    full_symbol_col_name=full_symbol_col_name,
+                    **kwargs,
+                )
+                # The derived classes can return data outside the requested
+                # interval (e.g., the entire month of a Parquet tile).
+                df = hpandas.trim_df(
+                    df,
+                    ts_col_name,
+                    read_start_ts,
+                    read_end_ts,
+                    left_close,
+                    right_close,
+                )
+                read_dfs.append(df)
+            df = pd.concat(read_dfs)
+            # Keep the data after the chunk for the next chunks.
+            read_dfs = [df[df.index > chunk_end_ts]]
+            df = hpandas.trim_df(
+                df,
+                ts_col_name,
+                chunk_start_ts,
+                chunk_end_ts,
+                left_close,
+                right_close,
+            )
+            if df.empty:
+                _LOG.debug("No data in [%s, %s]", chunk_start_ts, chunk_end_ts)
+                continue
+            df = self._postprocess_data(
+                df,
+                full_symbols,
+                chunk_start_ts,
+                chunk_end_ts,
+                columns,
+                filter_data_mode,
+                full_symbol_col_name,
+            )
+            yield df
+
+    def _get_tile_freq(self) -> Optional[str]:
+        """
+        Return the frequency of the tiles that the backend reads entirely.
+
+        E.g., "MS" for a backend that reads all the data of a month to return
+        the data of a day.
+
+        :return: pandas frequency of the tiles, `None` if the backend can read
+            any interval without reading more data
+        """
+        return None
+
+    def _postprocess_data(
+        self,
+        df: pd.DataFrame,
+        full_symbols: List[ivcu.FullSymbol],
+        start_ts: Optional[pd.Timestamp],
+        end_ts: Optional[pd.Timestamp],
+        columns: Optional[List[str]],
+        filter_data_mode: str,
+        full_symbol_col_name: str,
+    ) -> pd.DataFrame:
+        """
+        Normalize and validate the data returned by `_read_data()`.
+
+        See `read_data()` for params.
+        """
         # Check that we got what we asked for.
         # hpandas.dassert_increasing_index(df)
         if "level" in df.columns:
@@ -540,6 +693,35 @@ class ImClient(abc.ABC):
         return timestamp
 
 
+def _get_chunk_intervals(
+    start_ts: pd.Timestamp, end_ts: pd.Timestamp, chunk_freq: str
+) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """
+    Split `[start_ts, end_ts]` in consecutive closed intervals.
+
+    E.g., for `[2022-01-01 10:00, 2022-01-03 12:00]` and "1D"
+    ```
+    [2022-01-01 10:00, 2022-01-01 23:59:59.999999999]
+    [2022-01-02 00:00, 2022-01-02 23:59:59.999999999]
+    [2022-01-03 00:00, 2022-01-03 12:00]
+    ```
+    """
+    # Align the boundaries of the chunks to the frequency.
+    boundaries = pd.date_range(start_ts.normalize(), end_ts, freq=chunk_freq)
+    boundaries = [start_ts] + [ts for ts in boundaries if ts > start_ts]
+    intervals = []
+    for chunk_start_ts, next_chunk_start_ts in zip(
+        boundaries, boundaries[1:] + [None]
+    ):
+        if next_chunk_start_ts is None:
+            chunk_end_ts = end_ts
+        else:
+            # The intervals are closed, so stop right before the next chunk.
+            chunk_end_ts = next_chunk_start_ts - pd.Timedelta(1, "ns")
+        intervals.append((chunk_start_ts, chunk_end_ts))
+    return intervals
+
+
 # #############################################################################
 # ImClientReadingOneSymbol
 # #############################################################################
@@ -6,6 +6,7 @@ import im_v2.common.data.client.historical_pq_clients as imvcdchpcl
 
 import abc
 import collections
+import concurrent.futures
 import logging
 import os
 from typing import Any, Dict, List, Optional
@@ -15,6 +16,7 @@ import pandas as pd
 import helpers.hdbg as hdbg
 import helpers.hpandas as hpandas
 import helpers.hparquet as hparque
+import helpers.hparquet_tile_cache as hpatica
 import helpers.hprint as hprint
 import helpers.hs3 as hs3
 import im_v2.common.data.client.base_im_clients as imvcdcbimcl
@@ -28,6 +30,7 @@ _LOG = logging.getLogger(__name__)
 # HistoricalPqByTileClient
 # #############################################################################
 
+
 # TODO(Dan): "Consolidate HistoricalPqByTileClients CmTask #1961."
 class HistoricalPqByTileClient(
     imvcdcbimcl.ImClientReadingMultipleSymbols, abc.ABC
@@ -54,6 +57,9 @@ class HistoricalPqByTileClient(
         aws_profile: Optional[str] = None,
         full_symbol_col_name: Optional[str] = None,
         resample_1min: bool = False,
+        num_threads: Optional[int] = None,
+        tile_cache: Optional[hpatica.ParquetTileCache] = None,
+        parquet_timestamp_col_name: Optional[str] = None,
     ):
         """
         Constructor.
@@ -68,6 +74,17 @@ class HistoricalPqByTileClient(
             originating the data. This allows to merging multiple Parquet files on
             exchange. See CmTask #1533 "Add exchange to the ParquetDataset partition".
         :param aws_profile: AWS profile, e.g., "ck"
+        :param num_threads: number of threads used to read the row groups of
+            a root dir (see `hparque.from_parquet()`) and to read multiple root
+            dirs concurrently. `None` means reading serially
+        :param tile_cache: local cache of the Parquet files read from S3 (see
+            `hparque.from_parquet()`)
+        :param parquet_timestamp_col_name: name of the column of the Parquet
+            data storing the timestamps as `pd.Timestamp` (e.g., the index of
+            the data). If passed, the requested interval is applied also to this
+            column, so that only the rows and the row groups (see
+            `hparque.build_row_group_index()`) in the interval are read, and
+            not the entire tiles. `None` to filter only the partitions
         """
         super().__init__(
             vendor,
@@ -80,6 +97,11 @@ class HistoricalPqByTileClient(
         self._infer_exchange_id = infer_exchange_id
         self._partition_mode = partition_mode
         self._aws_profile = aws_profile
+        if num_threads is not None:
+            hdbg.dassert_lte(1, num_threads)
+        self._num_threads = num_threads
+        self._tile_cache = tile_cache
+        self._parquet_timestamp_col_name = parquet_timestamp_col_name
 
     @staticmethod
     def get_metadata() -> pd.DataFrame:
@@ -154,90 +176,146 @@ class HistoricalPqByTileClient(
         )
         # Add AWS profile to kwargs.
         kwargs["aws_profile"] = self._aws_profile
+        # Read the row groups of each root dir in parallel, if requested.
+        kwargs.setdefault("num_threads", self._num_threads)
+        kwargs.setdefault("tile_cache", self._tile_cache)
         # Build root dirs to the data and Parquet filtering condition.
         root_dir_symbol_filter_dict = self._get_root_dirs_symbol_filters(
             full_symbols, full_symbol_col_name
         )
         #
-        res_df_list = []
-        for root_dir, symbol_filter in root_dir_symbol_filter_dict.items():
-            # Build list of filters for a query and add them to kwargs.
-            filters = hparque.get_parquet_filters_from_timestamp_interval(
-                self._partition_mode,
-                start_ts,
-                end_ts,
-                additional_filters=[symbol_filter],
-            )
-            kwargs["filters"] = filters
-            # Read Parquet data from a root dir.
-            root_dir_df = hparque.from_parquet(root_dir, **kwargs)
-            # TODO(Grisha): "Handle missing tiles" CmTask #1775.
-            # hdbg.dassert_lte(
-            #     1,
-            #     root_dir_df.shape[0],
-            #     "Can't find data for root_dir='%s' and symbol_filter='%s'",
-            #     root_dir,
-            #     symbol_filter,
-            # )
-            # Convert index to datetime.
-            root_dir_df.index = pd.to_datetime(root_dir_df.index)
-            # TODO(gp): IgHistoricalPqByTileTaqBarClient used a ctor param to rename a column.
-            #  Not sure if this is still needed.
-            #        # Rename column storing `full_symbols`, if needed.
-            #        hdbg.dassert_in(self._full_symbol_col_name, df.columns)
-            #        if full_symbol_col_name != self._full_symbol_col_name:
-            #            hdbg.dassert_not_in(full_symbol_col_name, df.columns)
-            #            df.rename(
-            #                columns={self._full_symbol_col_name: full_symbol_col_name},
-            #                inplace=True,
-            #            )
-            transformation_kwargs: Dict = {}
-            if self._infer_exchange_id:
-                # Infer `exchange_id` position in a file path.
-                s3_bucket_path = hs3.get_s3_bucket_path(self._aws_profile)
-                reorg_root_dir = os.path.join(s3_bucket_path, "reorg")
-                daily_staged_reorg_dir = os.path.join(
-                    reorg_root_dir, "daily_staged.airflow.pq"
+        read_args = [
+            (root_dir, symbol_filter, start_ts, end_ts, full_symbol_col_name)
+            for root_dir, symbol_filter in root_dir_symbol_filter_dict.items()
+        ]
+        if self._num_threads is None or len(read_args) == 1:
+            res_df_list = [
+                self._read_data_for_root_dir(*args, **kwargs)
+                for args in read_args
+            ]
+        else:
+            # Read the root dirs (e.g., one per exchange) concurrently, since
+            # reading from S3 is mostly waiting on the network. `map()` keeps
+            # the order of the root dirs.
+            max_workers = min(self._num_threads, len(read_args))
+            with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+                res_df_list = list(
+                    executor.map(
+                        lambda args: self._read_data_for_root_dir(
+                            *args, **kwargs
+                        ),
+                        read_args,
+                    )
                 )
-                if root_dir == daily_staged_reorg_dir:
-                    # E.g. "binance" from
-                    # "s3://cryptokaizen-data/reorg/daily_staged.airflow.pq/bid_ask-futures/crypto_chassis.downloaded_1min/binance/".
-                    exchange_loc = -1
-                else:
-                    # E.g. "binance" from
-                    # "s3://cryptokaizen-data/v3/periodic_daily/airflow/downloaded_1min/parquet/bid_ask/futures/v3/crypto_chassis/binance/v1_0_0/".
-                    exchange_loc = -2
-                # Infer `exchange_id` from a file path if it is not present in data.
-                # E.g., `s3://.../latest/ohlcv/ccxt/binance` -> `binance`.
-                transformation_kwargs["exchange_id"] = root_dir.split("/")[
-                    exchange_loc
-                ]
-            # Transform data.
-            root_dir_df = self._apply_transformations(
-                root_dir_df, full_symbol_col_name, **transformation_kwargs
-            )
-            # The columns are used just to partition the data but these columns
-            # are not included in the `ImClient` output.
-            current_columns = root_dir_df.columns.to_list()
-            month_column = "month"
-            if month_column in current_columns:
-                root_dir_df = root_dir_df.drop(month_column, axis=1)
-            year_column = "year"
-            if year_column in current_columns:
-                root_dir_df = root_dir_df.drop(year_column, axis=1)
-            # Column with name "timestamp" that stores epochs remains in most
-            # vendors data if no column filtering was done. Drop it since it
-            # replicates data from index and has the same name as index column
-            # which causes a break when we try to reset it.
-            timestamp_column = "timestamp"
-            if timestamp_column in current_columns:
-                root_dir_df = root_dir_df.drop(timestamp_column, axis=1)
-            #
-            res_df_list.append(root_dir_df)
         # Combine data from all root dirs into a single DataFrame.
         res_df = pd.concat(res_df_list, axis=0)
         return res_df
 
+    def _get_tile_freq(self) -> Optional[str]:
+        """
+        See description in the parent class.
+        """
+        if self._parquet_timestamp_col_name is not None:
+            # The reads are filtered also within the tiles.
+            return None
+        partition_mode_to_tile_freq = {
+            "by_date": "D",
+            "by_year_month_day": "D",
+            "by_year_month": "MS",
+        }
+        tile_freq = partition_mode_to_tile_freq.get(self._partition_mode)
+        return tile_freq
+
+    def _read_data_for_root_dir(
+        self,
+        root_dir: str,
+        symbol_filter: hparque.ParquetFilter,
+        start_ts: Optional[pd.Timestamp],
+        end_ts: Optional[pd.Timestamp],
+        full_symbol_col_name: str,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        """
+        Read and transform the data stored in a single root dir.
+
+        :param root_dir: root dir to the Parquet data
+        :param symbol_filter: filter on the symbols to read from `root_dir`
+        :param kwargs: params for `hparque.from_parquet()`
+        """
+        # Build list of filters for a query and add them to kwargs.
+        filters = hparque.get_parquet_filters_from_timestamp_interval(
+            self._partition_mode,
+            start_ts,
+            end_ts,
+            additional_filters=[symbol_filter],
+            timestamp_column=self._parquet_timestamp_col_name,
+        )
+        kwargs["filters"] = filters
+        # Read Parquet data from a root dir.
+        root_dir_df = hparque.from_parquet(root_dir, **kwargs)
+        # TODO(Grisha): "Handle missing tiles" CmTask #1775.
+        # hdbg.dassert_lte(
+        #     1,
+        #     root_dir_df.shape[0],
+        #     "Can't find data for root_dir='%s' and symbol_filter='%s'",
+        #     root_dir,
+        #     symbol_filter,
+        # )
+        # Convert index to datetime.
+        root_dir_df.index = pd.to_datetime(root_dir_df.index)
+        # TODO(gp): IgHistoricalPqByTileTaqBarClient used a ctor param to rename a column.
+        #  Not sure if this is still needed.
+        #        # Rename column storing `full_symbols`, if needed.
+        #        hdbg.dassert_in(self._full_symbol_col_name, df.columns)
+        #        if full_symbol_col_name != self._full_symbol_col_name:
+        #            hdbg.dassert_not_in(full_symbol_col_name, df.columns)
+        #            df.rename(
+        #                columns={self._full_symbol_col_name: full_symbol_col_name},
+        #                inplace=True,
+        #            )
+        transformation_kwargs: Dict = {}
+        if self._infer_exchange_id:
+            # Infer `exchange_id` position in a file path.
+            s3_bucket_path = hs3.get_s3_bucket_path(self._aws_profile)
+            reorg_root_dir = os.path.join(s3_bucket_path, "reorg")
+            daily_staged_reorg_dir = os.path.join(
+                reorg_root_dir, "daily_staged.airflow.pq"
+            )
+            if root_dir == daily_staged_reorg_dir:
+                # E.g. "binance" from
+                # "s3://cryptokaizen-data/reorg/daily_staged.airflow.pq/bid_ask-futures/crypto_chassis.downloaded_1min/binance/".
+                exchange_loc = -1
+            else:
+                # E.g. "binance" from
+                # "s3://cryptokaizen-data/v3/periodic_daily/airflow/downloaded_1min/parquet/bid_ask/futures/v3/crypto_chassis/binance/v1_0_0/".
+                exchange_loc = -2
+            # Infer `exchange_id` from a file path if it is not present in data.
+            # E.g., `s3://.../latest/ohlcv/ccxt/binance` -> `binance`.
+            transformation_kwargs["exchange_id"] = root_dir.split("/")[
+                exchange_loc
+            ]
+        # Transform data.
+        root_dir_df = self._apply_transformations(
+            root_dir_df, full_symbol_col_name, **transformation_kwargs
+        )
+        # The columns are used just to partition the data but these columns
+        # are not included in the `ImClient` output.
+        current_columns = root_dir_df.columns.to_list()
+        month_column = "month"
+        if month_column in current_columns:
+            root_dir_df = root_dir_df.drop(month_column, axis=1)
+        year_column = "year"
+        if year_column in current_columns:
+            root_dir_df = root_dir_df.drop(year_column, axis=1)
+        # Column with name "timestamp" that stores epochs remains in most
+        # vendors data if no column filtering was done. Drop it since it
+        # replicates data from index and has the same name as index column
+        # which causes a break when we try to reset it.
+        timestamp_column = "timestamp"
+        if timestamp_column in current_columns:
+            root_dir_df = root_dir_df.drop(timestamp_column, axis=1)
+        return root_dir_df
+
     # TODO(Grisha): try to unify child classes with the base class, see CmTask #1696
     # "Refactor HistoricalPqByTileClient and its child classes".
     # TODO(Grisha): remove the hack that allows to read data for multiple exchanges in
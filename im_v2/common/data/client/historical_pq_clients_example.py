@@ -48,6 +48,11 @@ def _generate_test_data(
     hsystem.system(cmd)
 
 
+# Column storing the timestamps of the test data, i.e., its index, which has no
+# name when it is saved to Parquet.
+_PARQUET_TIMESTAMP_COL_NAME = "__index_level_0__"
+
+
 class MockHistoricalByTileClient(imvcdchpcl.HistoricalPqByTileClient):
     def get_universe(self) -> List[str]:
         return ["binance::BTC_USDT", "kucoin::FIL_USDT"]
@@ -92,6 +97,7 @@ def get_MockHistoricalByTileClient_example1(
         partition_mode,
         infer_exchange_id,
         resample_1min=resample_1min,
+        parquet_timestamp_col_name=_PARQUET_TIMESTAMP_COL_NAME,
     )
     return im_client
 
@@ -136,6 +142,7 @@ def get_MockHistoricalByTileClient_example2(
         partition_mode,
         infer_exchange_id,
         resample_1min=resample_1min,
+        parquet_timestamp_col_name=_PARQUET_TIMESTAMP_COL_NAME,
     )
     return im_client
 
@@ -180,5 +187,6 @@ def get_MockHistoricalByTileClient_example3(
         partition_mode,
         infer_exchange_id,
         resample_1min=resample_1min,
+        parquet_timestamp_col_name=_PARQUET_TIMESTAMP_COL_NAME,
     )
     return im_client
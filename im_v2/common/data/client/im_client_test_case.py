@@ -186,6 +186,45 @@ class ImClientTestCase(hunitest.TestCase):
         )
         self.check_df_output(actual_df, *args, **kwargs)
 
+    def _test_read_data_iter1(
+        self,
+        im_client: icdc.ImClient,
+        full_symbols: List[ivcu.FullSymbol],
+        start_ts: pd.Timestamp,
+        end_ts: pd.Timestamp,
+        chunk_freq: str,
+        expected_num_chunks: int,
+    ) -> None:
+        """
+        Test:
+        - reading data in chunks for two or more symbols
+        - specified start_ts and end_ts
+        - the chunks are in time order and their concatenation is equal to the
+          data read at once
+        """
+        columns = None
+        filter_data_mode = "assert"
+        chunks = list(
+            im_client.read_data_iter(
+                full_symbols,
+                start_ts,
+                end_ts,
+                columns,
+                filter_data_mode,
+                chunk_freq=chunk_freq,
+            )
+        )
+        self.assertEqual(len(chunks), expected_num_chunks)
+        for chunk, next_chunk in zip(chunks[:-1], chunks[1:]):
+            self.assertLess(chunk.index.max(), next_chunk.index.min())
+        actual_df = pd.concat(chunks)
+        expected_df = im_client.read_data(
+            full_symbols, start_ts, end_ts, columns, filter_data_mode
+        )
+        # The frequency of the index is not preserved by `pd.concat()`.
+        expected_df.index.freq = None
+        hunitest.compare_df(actual_df, expected_df)
+
     # ////////////////////////////////////////////////////////////////////////
 
     def _test_filter_columns1(
@@ -16,6 +16,7 @@ import data_schema.dataset_schema_utils as dsdascut
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hparquet as hparque
+import helpers.hparquet_tile_cache as hpatica
 import helpers.hsql_implementation as hsqlimpl
 import im_v2.common.data.transform.transform_utils as imvcdttrut
 import im_v2.common.db.db_utils as imvcddbut
@@ -35,13 +36,21 @@ class RawDataReader:
     Load the raw data sample from S3 or the DB.
     """
 
-    def __init__(self, signature: str, *, stage: str = "prod"):
+    def __init__(
+        self,
+        signature: str,
+        *,
+        stage: str = "prod",
+        tile_cache: Optional[hpatica.ParquetTileCache] = None,
+    ):
         """
         Constructor.
 
         :param signature: dataset signature,
           e.g. `bulk.airflow.resampled_1min.pq.bid_ask.spot.v3.crypto_chassis.binance.v1_0_0`
         :param stage: which stage to execute in, determines which DB stage or S3 bucket is used.
+        :param tile_cache: local cache of the Parquet files read from S3 (see
+            `hparque.from_parquet()`)
         """
         # Validate signature schema.
         self.dataset_schema = dsdascut.get_dataset_schema()
@@ -50,6 +59,7 @@ class RawDataReader:
             signature, self.dataset_schema
         )
         self.stage = stage
+        self._tile_cache = tile_cache
         self.dataset_epoch_unit = imvcdttrut.get_vendor_epoch_unit(
             self.args["vendor"], self.args["data_type"]
         )
@@ -220,7 +230,12 @@ class RawDataReader:
         if currency_pairs:
             filters.append(("currency_pair", "in", currency_pairs))
         s3_path = self._build_s3_pq_file_path()
-        data = hparque.from_parquet(s3_path, filters=filters, aws_profile="ck")
+        data = hparque.from_parquet(
+            s3_path,
+            filters=filters,
+            aws_profile="ck",
+            tile_cache=self._tile_cache,
+        )
         return data
 
     def _setup_db_table_access(self) -> None:
@@ -1,11 +1,14 @@
 import logging
 import random
-from typing import List, Tuple
+import unittest.mock as umock
+from typing import Any, List, Optional, Tuple
 
 import pandas as pd
 import pytest
 
 import helpers.hdatetime as hdateti
+import helpers.hparquet as hparque
+import helpers.hunit_test as hunitest
 import im_v2.common.data.client as icdc
 import im_v2.common.data.client.historical_pq_clients_example as imvcdchpce
 import im_v2.common.universe as ivcu
@@ -201,6 +204,27 @@ class TestHistoricalPqByTileClient1(icdc.ImClientTestCase):
             expected_signature,
         )
 
+    def test_read_data_iter1(self) -> None:
+        # Generate Parquet test data and initialize client.
+        full_symbols = ["binance::BTC_USDT", "kucoin::FIL_USDT"]
+        resample_1min = True
+        im_client = imvcdchpce.get_MockHistoricalByTileClient_example1(
+            self, full_symbols, resample_1min
+        )
+        # Read the data across a month boundary in chunks of 1 day.
+        start_timestamp = pd.Timestamp("2021-12-30 12:00:00+00:00")
+        end_timestamp = pd.Timestamp("2022-01-01 01:00:00+00:00")
+        chunk_freq = "1D"
+        expected_num_chunks = 3
+        self._test_read_data_iter1(
+            im_client,
+            full_symbols,
+            start_timestamp,
+            end_timestamp,
+            chunk_freq,
+            expected_num_chunks,
+        )
+
     @pytest.mark.skip("CMTask1510: Faulty symbol not detected.")
     def test_read_data6(self) -> None:
         # Generate Parquet test data and initialize client.
@@ -822,3 +846,170 @@ class TestHistoricalPqByTileClient3(icdc.ImClientTestCase):
         self.assert_equal(str(actual_df.shape[0]), str(expected_length))
         self.assert_equal(str(actual_df.index[0]), str(start_ts))
         self.assert_equal(str(actual_df.index[-1]), str(end_ts))
+
+
+# #############################################################################
+# TestHistoricalPqByTileClient4
+# #############################################################################
+
+
+class TestHistoricalPqByTileClient4(hunitest.TestCase):
+    """
+    Test reading a short interval from Parquet data with an index of the row
+    groups.
+    """
+
+    def test_read_data1(self) -> None:
+        """
+        Check that reading one hour skips the row groups outside of it.
+        """
+        root_dir = self._write_test_data()
+        full_symbols = ["binance::BTC_USDT", "kucoin::FIL_USDT"]
+        start_ts = pd.Timestamp("2022-01-01 10:00:00+00:00")
+        end_ts = pd.Timestamp("2022-01-01 11:00:00+00:00")
+        # Read filtering also on the timestamps.
+        im_client = self._get_im_client(root_dir, "timestamp")
+        actual, row_groups = self._read_data(
+            im_client, full_symbols, start_ts, end_ts
+        )
+        # Read filtering only on the partitions.
+        im_client = self._get_im_client(root_dir, None)
+        expected, all_row_groups = self._read_data(
+            im_client, full_symbols, start_ts, end_ts
+        )
+        pd.testing.assert_frame_equal(actual, expected)
+        self.assertEqual(actual.shape[0], 61 * len(full_symbols))
+        # The tile of the month has 1 day with 1440 rows per asset, in groups
+        # of 120 rows.
+        self.assertEqual(all_row_groups, 2 * 1440 // 120)
+        # One hour spans at most 3 row groups of 1 hour.
+        self.assertLessEqual(row_groups, 3)
+
+    def test_read_data_iter1(self) -> None:
+        """
+        Check that reading in chunks reads each tile only once.
+        """
+        root_dir = self._write_test_data()
+        full_symbols = ["binance::BTC_USDT", "kucoin::FIL_USDT"]
+        start_ts = pd.Timestamp("2021-12-31 10:00:00+00:00")
+        end_ts = pd.Timestamp("2022-01-01 23:00:00+00:00")
+        chunk_freq = "6H"
+        # Filtering only on the partitions, the entire tiles are read.
+        im_client = self._get_im_client(root_dir, None)
+        actual, num_reads = self._read_data_iter(
+            im_client, full_symbols, start_ts, end_ts, chunk_freq
+        )
+        self.assertEqual(num_reads, 2)
+        # Filtering also on the timestamps, only the chunks are read.
+        im_client = self._get_im_client(root_dir, "timestamp")
+        expected, num_reads = self._read_data_iter(
+            im_client, full_symbols, start_ts, end_ts, chunk_freq
+        )
+        self.assertEqual(num_reads, 7)
+        self.assertEqual(len(actual), 7)
+        for actual_chunk, expected_chunk in zip(actual, expected):
+            pd.testing.assert_frame_equal(actual_chunk, expected_chunk)
+
+    def _write_test_data(self) -> str:
+        """
+        Save 1-minute data for 2 assets and 2 monthly tiles in row groups of 1
+        hour.
+        """
+        index = pd.date_range(
+            "2021-12-31", "2022-01-01 23:59:00", freq="1T", tz="UTC"
+        )
+        dfs = [
+            pd.DataFrame(
+                {"full_symbol": full_symbol, "close": range(len(index))},
+                index=index,
+            )
+            for full_symbol in ["binance::BTC_USDT", "kucoin::FIL_USDT"]
+        ]
+        df = pd.concat(dfs).sort_index(kind="stable")
+        df.index.name = "timestamp"
+        df, partition_cols = hparque.add_date_partition_columns(
+            df, "by_year_month"
+        )
+        root_dir = self.get_scratch_space()
+        hparque.to_partitioned_parquet(
+            df,
+            partition_cols,
+            root_dir,
+            row_group_size=120,
+            index_row_groups=True,
+        )
+        return root_dir
+
+    @staticmethod
+    def _get_im_client(
+        root_dir: str, parquet_timestamp_col_name: Optional[str]
+    ) -> imvcdchpce.MockHistoricalByTileClient:
+        vendor = "mock"
+        universe_version = "small"
+        partition_mode = "by_year_month"
+        infer_exchange_id = False
+        im_client = imvcdchpce.MockHistoricalByTileClient(
+            vendor,
+            universe_version,
+            root_dir,
+            partition_mode,
+            infer_exchange_id,
+            parquet_timestamp_col_name=parquet_timestamp_col_name,
+        )
+        return im_client
+
+    @staticmethod
+    def _read_data(
+        im_client: imvcdchpce.MockHistoricalByTileClient,
+        full_symbols: List[ivcu.FullSymbol],
+        start_ts: pd.Timestamp,
+        end_ts: pd.Timestamp,
+    ) -> Tuple[pd.DataFrame, int]:
+        """
+        Read the data and count the row groups read.
+        """
+        row_groups = []
+        prune_row_groups = hparque._prune_row_groups_with_index
+
+        def _prune_row_groups(*args: Any, **kwargs: Any) -> List[Any]:
+            ret = prune_row_groups(*args, **kwargs)
+            row_groups.extend(ret)
+            return ret
+
+        with umock.patch.object(
+            hparque, "_prune_row_groups_with_index", _prune_row_groups
+        ):
+            columns = None
+            filter_data_mode = "assert"
+            df = im_client.read_data(
+                full_symbols, start_ts, end_ts, columns, filter_data_mode
+            )
+        return df, len(row_groups)
+
+    @staticmethod
+    def _read_data_iter(
+        im_client: imvcdchpce.MockHistoricalByTileClient,
+        full_symbols: List[ivcu.FullSymbol],
+        start_ts: pd.Timestamp,
+        end_ts: pd.Timestamp,
+        chunk_freq: str,
+    ) -> Tuple[List[pd.DataFrame], int]:
+        """
+        Read the data in chunks and count the reads from the backend.
+        """
+        with umock.patch.object(
+            im_client, "_read_data", wraps=im_client._read_data
+        ) as read_mock:
+            columns = None
+            filter_data_mode = "assert"
+            chunks = list(
+                im_client.read_data_iter(
+                    full_symbols,
+                    start_ts,
+                    end_ts,
+                    columns,
+                    filter_data_mode,
+                    chunk_freq=chunk_freq,
+                )
+            )
+        return chunks, read_mock.call_count
@@ -205,6 +205,7 @@ def _run(args: argparse.Namespace) -> None:
         db_connection,
         args["db_table"],
         start_timestamp.tzname(),
+        use_copy=True,
     )
     _LOG.info(
         "%s rows successfully inserted into %s in %s stage.",
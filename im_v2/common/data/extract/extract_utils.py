@@ -8,12 +8,15 @@ import im_v2.common.data.extract.extract_utils as imvcdeexut
 
 import argparse
 import asyncio
+import concurrent.futures
+import functools
 import logging
 import os
 import re
+import threading
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, Iterator, List, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
 
 import pandas as pd
 
@@ -22,6 +25,7 @@ import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hparquet as hparque
 import helpers.hs3 as hs3
+import helpers.hsql as hsql
 import im_v2.common.data.extract.extractor as ivcdexex
 import im_v2.common.data.transform.transform_utils as imvcdttrut
 import im_v2.common.db.db_utils as imvcddbut
@@ -193,6 +197,23 @@ def add_periodical_download_args(
         type=int,
         help="Interval between download attempts, in minutes (applicable for --method=rest)",
     )
+    parser.add_argument(
+        "--max_concurrent_requests",
+        action="store",
+        required=False,
+        type=int,
+        help="Number of currency pairs downloaded concurrently, the data of all the "
+        "pairs is saved with a single DB insert (applicable for --method=rest)",
+    )
+    parser.add_argument(
+        "--rate_limit_in_ms",
+        action="store",
+        required=False,
+        type=float,
+        help="Minimum time between two requests to the exchange when downloading "
+        "concurrently, shared by all the downloads from the same exchange "
+        "(applicable for --method=rest)",
+    )
     return parser
 
 
@@ -274,6 +295,10 @@ def download_exchange_data_to_db(
     """
     Encapsulate common logic for downloading exchange data.
 
+    When `args["max_concurrent_requests"]` is greater than 1, the currency
+    pairs are downloaded concurrently, spacing the requests by
+    `args["rate_limit_in_ms"]`, and the data is saved with a single DB insert.
+
     :param args: arguments passed on script run
     :param exchange_class: which exchange is used in script run
     """
@@ -304,34 +329,199 @@ def download_exchange_data_to_db(
         raise ValueError(
             "Downloading for %s data_type is not implemented.", data_type
         )
-    # Download data for specified time period.
-    for currency_pair in currency_pairs:
-        # Currency pair used for getting data from exchange should not be used
-        # as column value as it can slightly differ.
-        currency_pair_for_download = exchange.convert_currency_pair(currency_pair)
-        # Download data.
-        #  Note: timestamp arguments are ignored since historical data is absent
-        #  from CCXT and only current state can be downloaded.
-        data = exchange.download_data(
-            data_type=data_type,
-            currency_pair=currency_pair_for_download,
-            exchange_id=exchange_id,
-            start_timestamp=start_timestamp,
-            end_timestamp=end_timestamp,
-            depth=bid_ask_depth,
+    max_concurrent_requests = args.get("max_concurrent_requests")
+    download_kwargs = {
+        "data_type": data_type,
+        "exchange_id": exchange_id,
+        "start_timestamp": start_timestamp,
+        "end_timestamp": end_timestamp,
+        "bid_ask_depth": bid_ask_depth,
+    }
+    if max_concurrent_requests is None or max_concurrent_requests == 1:
+        # Download data for specified time period.
+        for currency_pair in currency_pairs:
+            data = _download_data_for_currency_pair(
+                exchange, currency_pair, **download_kwargs
+            )
+            # Save data to the database.
+            imvcddbut.save_data_to_db(
+                data, data_type, db_connection, db_table, str(start_timestamp.tz)
+            )
+    else:
+        # Download all the currency pairs concurrently and save the data with
+        # a single insert.
+        rate_limit_in_ms = args.get("rate_limit_in_ms") or 0
+        dfs = asyncio.run(
+            _download_data_for_currency_pairs_concurrently(
+                exchange,
+                currency_pairs,
+                max_concurrent_requests,
+                rate_limit_in_ms,
+                **download_kwargs,
+            )
         )
-        # Assign pair and exchange columns.
-        data["currency_pair"] = currency_pair
-        data["exchange_id"] = exchange_id
-        # Add exchange specific filter.
-        if data_type == "ohlcv" and exchange_id == "binance":
-            data = imvcdttrut.remove_unfinished_ohlcv_bars(data)
-        # Save data to the database.
+        data = pd.concat(dfs, ignore_index=True)
         imvcddbut.save_data_to_db(
             data, data_type, db_connection, db_table, str(start_timestamp.tz)
         )
 
 
+def _download_data_for_currency_pair(
+    exchange: ivcdexex.Extractor,
+    currency_pair: str,
+    *,
+    data_type: str,
+    exchange_id: str,
+    start_timestamp: pd.Timestamp,
+    end_timestamp: pd.Timestamp,
+    bid_ask_depth: Optional[int],
+) -> pd.DataFrame:
+    """
+    Download the data for a currency pair and prepare it for the DB insert.
+    """
+    # Currency pair used for getting data from exchange should not be used
+    # as column value as it can slightly differ.
+    currency_pair_for_download = exchange.convert_currency_pair(currency_pair)
+    # Download data.
+    #  Note: timestamp arguments are ignored since historical data is absent
+    #  from CCXT and only current state can be downloaded.
+    data = exchange.download_data(
+        data_type=data_type,
+        currency_pair=currency_pair_for_download,
+        exchange_id=exchange_id,
+        start_timestamp=start_timestamp,
+        end_timestamp=end_timestamp,
+        depth=bid_ask_depth,
+    )
+    # Assign pair and exchange columns.
+    data["currency_pair"] = currency_pair
+    data["exchange_id"] = exchange_id
+    # Add exchange specific filter.
+    if data_type == "ohlcv" and exchange_id == "binance":
+        data = imvcdttrut.remove_unfinished_ohlcv_bars(data)
+    return data
+
+
+class _ExchangeRateLimiter:
+    """
+    Space out the requests sent to an exchange by a minimum interval.
+
+    The limiter is called from the threads sending the requests, so the same
+    object can be shared by downloads running in different threads or event
+    loops.
+    """
+
+    def __init__(
+        self,
+        rate_limit_in_ms: float,
+        *,
+        get_time: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Constructor.
+
+        :param rate_limit_in_ms: minimum time between the start of two
+            consecutive requests
+        :param get_time: return the current time in seconds
+        :param sleep: sleep for the given number of seconds
+        """
+        hdbg.dassert_lte(0, rate_limit_in_ms)
+        self.rate_limit_in_ms = rate_limit_in_ms
+        self._get_time = get_time
+        self._sleep = sleep
+        self._next_request_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """
+        Wait until a request can be sent without exceeding the rate limit.
+
+        Each caller reserves the next free slot and sleeps outside the lock,
+        so the callers waiting for their slots don't block each other.
+        """
+        with self._lock:
+            current_time = self._get_time()
+            request_time = max(current_time, self._next_request_time)
+            self._next_request_time = request_time + self.rate_limit_in_ms / 1000
+        delay_in_secs = request_time - current_time
+        if delay_in_secs > 0:
+            self._sleep(delay_in_secs)
+
+
+# Rate limiters by exchange id, shared by all the downloads in the process.
+_RATE_LIMITERS: Dict[str, _ExchangeRateLimiter] = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def _get_rate_limiter(
+    exchange_id: str, rate_limit_in_ms: float
+) -> _ExchangeRateLimiter:
+    """
+    Return the rate limiter of an exchange, creating it if needed.
+    """
+    with _RATE_LIMITERS_LOCK:
+        if exchange_id not in _RATE_LIMITERS:
+            _RATE_LIMITERS[exchange_id] = _ExchangeRateLimiter(rate_limit_in_ms)
+        rate_limiter = _RATE_LIMITERS[exchange_id]
+    hdbg.dassert_eq(
+        rate_limiter.rate_limit_in_ms,
+        rate_limit_in_ms,
+        msg=f"Inconsistent rate limits for exchange {exchange_id}",
+    )
+    return rate_limiter
+
+
+async def _download_data_for_currency_pairs_concurrently(
+    exchange: ivcdexex.Extractor,
+    currency_pairs: List[str],
+    max_concurrent_requests: int,
+    rate_limit_in_ms: float,
+    **download_kwargs: Any,
+) -> List[pd.DataFrame]:
+    """
+    Download the data for the currency pairs with concurrent requests.
+
+    The REST download methods of the extractors are blocking, so they are run
+    in a pool of threads. The extractor should be safe to call from several
+    threads (e.g., `CcxtExtractor` uses one ccxt exchange per thread).
+
+    :param max_concurrent_requests: maximum number of requests in flight
+    :param rate_limit_in_ms: minimum time between the start of two requests
+        to the exchange, shared with the other downloads from the same
+        exchange in the process
+    :return: the data for each currency pair, in the same order as
+        `currency_pairs`
+    """
+    hdbg.dassert_lte(1, max_concurrent_requests)
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrent_requests)
+    rate_limiter = _get_rate_limiter(
+        download_kwargs["exchange_id"], rate_limit_in_ms
+    )
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_concurrent_requests
+    ) as executor:
+
+        def _wait_and_download(currency_pair: str) -> pd.DataFrame:
+            rate_limiter.wait()
+            data = _download_data_for_currency_pair(
+                exchange, currency_pair, **download_kwargs
+            )
+            return data
+
+        async def _download(currency_pair: str) -> pd.DataFrame:
+            async with semaphore:
+                func = functools.partial(_wait_and_download, currency_pair)
+                data = await loop.run_in_executor(executor, func)
+            return data
+
+        dfs = await asyncio.gather(
+            *[_download(currency_pair) for currency_pair in currency_pairs]
+        )
+    return list(dfs)
+
+
 @timeout(TIMEOUT_SEC)
 def _download_exchange_data_to_db_with_timeout(
     args: Dict[str, Any],
@@ -383,7 +573,11 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
     )
     exchange_id = args["exchange_id"]
     currency_pairs = universe[exchange_id]
-    db_connection = imvcddbut.DbConnectionManager.get_connection(args["db_stage"])
+    # Borrow a connection from the pool of the process for each insert, so
+    #  that the connection is shared with the other readers and writers.
+    db_connection_pool = imvcddbut.DbConnectionManager.get_connection_pool(
+        args["db_stage"]
+    )
     db_table = args["db_table"]
     for currency_pair in currency_pairs:
         await exchange.subscribe_to_websocket_data(
@@ -424,9 +618,17 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
             df = imvcdttrut.transform_raw_websocket_data(
                 data_buffer, data_type, exchange_id
             )
-            imvcddbut.save_data_to_db(
-                df, data_type, db_connection, db_table, str(tz)
-            )
+            with hsql.get_connection_from_pool(
+                db_connection_pool
+            ) as db_connection:
+                imvcddbut.save_data_to_db(
+                    df,
+                    data_type,
+                    db_connection,
+                    db_table,
+                    str(tz),
+                    use_copy=True,
+                )
             # Empty buffer after persisting the data.
             data_buffer = []
         # Determine actual sleep time needed based on the difference
@@ -928,6 +1130,7 @@ def resample_rt_bid_ask_data_periodically(
                 db_connection,
                 dst_table,
                 str(start_ts.tz),
+                use_copy=True,
             )
         # Determine actual sleep time needed based on the difference
         # between value set in config and actual time it took to complete
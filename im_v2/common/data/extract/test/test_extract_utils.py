@@ -1,5 +1,7 @@
 import argparse
 import asyncio
+import threading
+import time
 import unittest.mock as umock
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
@@ -415,6 +417,8 @@ class TestDownloadExchangeDataToDbPeriodically2(hunitest.TestCase):
         # Check output.
         # Get the first dataset that was saved to DB.
         first_df_to_save = save_data_to_db.call_args[0][0]
+        # Check that the data is saved with `COPY`.
+        self.assertTrue(save_data_to_db.call_args.kwargs["use_copy"])
         # Check that all timestamps are between date-time range.
         self.assertTrue(
             all(
@@ -591,6 +595,182 @@ class TestDownloadExchangeDataToDb1(
         self.assertListEqual(csv_path_list, expected)
 
 
+class TestDownloadExchangeDataToDbConcurrently1(hunitest.TestCase):
+    """
+    Download data from a mocked exchange with concurrent requests.
+    """
+
+    currency_pairs = [f"COIN{idx}_USDT" for idx in range(8)]
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.get_vendor_universe_patch = umock.patch.object(
+            imvcdeexut.ivcu,
+            "get_vendor_universe",
+            return_value={"binance": self.currency_pairs},
+        )
+        self.get_connection_patch = umock.patch.object(
+            imvcddbut.DbConnectionManager, "get_connection"
+        )
+        self.save_data_to_db_patch = umock.patch.object(
+            imvcddbut, "save_data_to_db"
+        )
+        # Don't share the rate limiters with the other tests.
+        self.rate_limiters_patch = umock.patch.dict(
+            imvcdeexut._RATE_LIMITERS, clear=True
+        )
+        self.get_vendor_universe_patch.start()
+        self.get_connection_patch.start()
+        self.save_data_to_db_mock = self.save_data_to_db_patch.start()
+        self.rate_limiters_patch.start()
+        self.max_num_concurrent_requests = 0
+        self._num_concurrent_requests = 0
+        self._lock = threading.Lock()
+
+    def tearDown(self) -> None:
+        self.get_vendor_universe_patch.stop()
+        self.get_connection_patch.stop()
+        self.save_data_to_db_patch.stop()
+        self.rate_limiters_patch.stop()
+        super().tearDown()
+
+    @staticmethod
+    def get_args(
+        max_concurrent_requests: Optional[int], rate_limit_in_ms: float
+    ) -> Dict[str, Any]:
+        args = {
+            "start_timestamp": "2021-11-10 10:11:00+00:00",
+            "end_timestamp": "2021-11-10 10:12:00+00:00",
+            "exchange_id": "binance",
+            "universe": "v7",
+            "data_type": "ohlcv",
+            "db_stage": "local",
+            "db_table": "ccxt_ohlcv_spot",
+            "max_concurrent_requests": max_concurrent_requests,
+            "rate_limit_in_ms": rate_limit_in_ms,
+        }
+        return args
+
+    def get_extractor_mock(self) -> umock.MagicMock:
+        """
+        Return an extractor returning constant OHLCV data.
+
+        The number of concurrent requests is tracked in
+        `max_num_concurrent_requests`.
+        """
+        extractor_mock = umock.create_autospec(
+            imvcdexex.CcxtExtractor, instance=True
+        )
+        extractor_mock.vendor = "CCXT"
+        extractor_mock.convert_currency_pair.side_effect = (
+            lambda currency_pair: currency_pair.replace("_", "/")
+        )
+        extractor_mock.download_data.side_effect = self._download_data
+        return extractor_mock
+
+    def download(
+        self, max_concurrent_requests: Optional[int], rate_limit_in_ms: float
+    ) -> umock.MagicMock:
+        extractor_mock = self.get_extractor_mock()
+        args = self.get_args(max_concurrent_requests, rate_limit_in_ms)
+        imvcdeexut.download_exchange_data_to_db(args, extractor_mock)
+        return extractor_mock
+
+    def test_sequential1(self) -> None:
+        """
+        Check that each currency pair is saved separately by default.
+        """
+        extractor_mock = self.download(None, 0)
+        self.assertEqual(self.max_num_concurrent_requests, 1)
+        self.assertEqual(extractor_mock.download_data.call_count, 8)
+        self.assertEqual(self.save_data_to_db_mock.call_count, 8)
+
+    def test_concurrent1(self) -> None:
+        """
+        Check that the requests are bounded and the data is saved at once.
+        """
+        extractor_mock = self.download(3, 0)
+        self.assertEqual(self.max_num_concurrent_requests, 3)
+        self.assertEqual(extractor_mock.download_data.call_count, 8)
+        self.assertEqual(self.save_data_to_db_mock.call_count, 1)
+        data = self.save_data_to_db_mock.call_args.args[0]
+        self.assertEqual(data["currency_pair"].tolist(), self.currency_pairs)
+        self.assertEqual(data["exchange_id"].unique().tolist(), ["binance"])
+
+    def test_rate_limit1(self) -> None:
+        """
+        Check that the requests are spaced according to the rate limit.
+        """
+        rate_limit_in_ms = 20
+        # Use a clock that doesn't advance, so that the delays don't depend on
+        # the scheduling of the threads.
+        sleep_mock = umock.MagicMock()
+        rate_limiter = imvcdeexut._ExchangeRateLimiter(
+            rate_limit_in_ms, get_time=lambda: 0.0, sleep=sleep_mock
+        )
+        imvcdeexut._RATE_LIMITERS["binance"] = rate_limiter
+        self.download(8, rate_limit_in_ms)
+        self.assertEqual(self.save_data_to_db_mock.call_count, 1)
+        # The first request is sent right away and each of the others waits
+        # for its slot.
+        delays_in_ms = sorted(
+            call.args[0] * 1000 for call in sleep_mock.call_args_list
+        )
+        expected = [rate_limit_in_ms * idx for idx in range(1, 8)]
+        self.assertEqual(len(delays_in_ms), len(expected))
+        for delay_in_ms, expected_delay_in_ms in zip(delays_in_ms, expected):
+            self.assertAlmostEqual(delay_in_ms, expected_delay_in_ms)
+
+    def test_rate_limit2(self) -> None:
+        """
+        Check that the rate limit is shared by the downloads from an exchange.
+        """
+        rate_limiter = imvcdeexut._get_rate_limiter("binance", 20)
+        self.assertIs(imvcdeexut._get_rate_limiter("binance", 20), rate_limiter)
+        self.assertIsNot(imvcdeexut._get_rate_limiter("okx", 20), rate_limiter)
+        # A download reuses the rate limiter of the exchange.
+        self.download(4, 20)
+        self.assertIs(imvcdeexut._RATE_LIMITERS["binance"], rate_limiter)
+        # The same exchange can't be used with another rate limit.
+        with self.assertRaises(AssertionError):
+            imvcdeexut._get_rate_limiter("binance", 10)
+
+    def test_error1(self) -> None:
+        """
+        Check that a failed request fails the download, without saving data.
+        """
+        extractor_mock = self.get_extractor_mock()
+        extractor_mock.download_data.side_effect = ValueError("Dummy")
+        args = self.get_args(4, 0)
+        with self.assertRaises(ValueError):
+            imvcdeexut.download_exchange_data_to_db(args, extractor_mock)
+        self.assertEqual(self.save_data_to_db_mock.call_count, 0)
+
+    def _download_data(self, *args: Any, **kwargs: Any) -> pd.DataFrame:
+        with self._lock:
+            self._num_concurrent_requests += 1
+            self.max_num_concurrent_requests = max(
+                self.max_num_concurrent_requests, self._num_concurrent_requests
+            )
+        time.sleep(0.05)
+        with self._lock:
+            self._num_concurrent_requests -= 1
+        data = pd.DataFrame(
+            {
+                "timestamp": [1636539060000],
+                "open": [1.0],
+                "high": [1.0],
+                "low": [1.0],
+                "close": [1.0],
+                "volume": [1.0],
+                "end_download_timestamp": [
+                    pd.Timestamp("2021-11-10 10:12:00+00:00")
+                ],
+            }
+        )
+        return data
+
+
 def get_simple_crypto_chassis_mock_data(
     start_timestamp: int,
     number_of_seconds: int,
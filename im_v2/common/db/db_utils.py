@@ -58,6 +58,7 @@ class DbConnectionManager:
     """
 
     connection = None
+    connection_pool = None
     db_stage = None
 
     @classmethod
@@ -107,6 +108,41 @@ class DbConnectionManager:
             cls.db_stage = db_stage
         return cls.connection
 
+    @classmethod
+    def get_connection_pool(
+        cls, db_stage: str, *, max_connections: int = 10
+    ) -> hsql.DbConnectionPool:
+        """
+        Get a pool of database connections. If the pool exists, return the
+        object, otherwise create it.
+
+        The pool can be shared across threads, e.g., by the extractors saving
+        data and by the clients reading it, with each thread borrowing a
+        connection via `hsql.get_connection_from_pool()`.
+
+        :param db_stage: DB stage to create the connections to, see
+            `get_connection()`
+        :param max_connections: maximum number of connections in the pool
+        :return: DbConnectionPool
+        """
+        if cls.connection_pool is None:
+            # Reuse the logic to look up the credentials of the connection.
+            connection = cls.get_connection(db_stage)
+            connection_info = hsql.db_connection_to_tuple(connection)
+            cls.connection_pool = hsql.get_connection_pool(
+                *connection_info, max_connections=max_connections
+            )
+            _LOG.info(
+                "Created %s DB connection pool with up to %s connections",
+                db_stage,
+                max_connections,
+            )
+        elif cls.db_stage != db_stage:
+            raise ValueError(
+                "The connection has already been established to a different stage"
+            )
+        return cls.connection_pool
+
 
 def add_db_args(
     parser: argparse.ArgumentParser,
@@ -440,6 +476,8 @@ def save_data_to_db(
     db_table: str,
     # TODO(Vlad, Juraj): Implement the time_zone
     time_zone: str,
+    *,
+    use_copy: bool = False,
 ) -> None:
     """
     Save data into specified database table.
@@ -451,6 +489,9 @@ def save_data_to_db(
     :param db_connection: a database connection object
     :param db_table: name of the table to insert to.
     :param time_zone: time zone used to add correct knowledge_timestamp to the data
+    :param use_copy: stream the data to the DB with `COPY` instead of sending
+        a multi-row `INSERT` query, which is much faster for large amounts of
+        data
     """
     if data.empty:
         _LOG.warning("The DataFame is empty, nothing to insert.")
@@ -464,12 +505,20 @@ def save_data_to_db(
         unique_columns = TRADES_UNIQUE_COLUMNS
     else:
         raise ValueError(f"Invalid data_type='{data_type}'")
-    hsql.execute_insert_on_conflict_do_nothing_query(
-        connection=db_connection,
-        obj=data,
-        table_name=db_table,
-        unique_columns=unique_columns,
-    )
+    if use_copy:
+        hsql.execute_copy_on_conflict_do_nothing_query(
+            connection=db_connection,
+            obj=data,
+            table_name=db_table,
+            unique_columns=unique_columns,
+        )
+    else:
+        hsql.execute_insert_on_conflict_do_nothing_query(
+            connection=db_connection,
+            obj=data,
+            table_name=db_table,
+            unique_columns=unique_columns,
+        )
 
 
 # #############################################################################
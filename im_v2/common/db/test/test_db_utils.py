@@ -0,0 +1,116 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import helpers.hsql as hsql
+import helpers.htimer as htimer
+import im_v2.ccxt.db.utils as imvccdbut
+import im_v2.common.db.db_utils as imvcddbut
+
+_LOG = logging.getLogger(__name__)
+
+
+class TestSaveDataToDb1(imvcddbut.TestImDbHelper):
+    """
+    Save bid/ask data to the DB with `INSERT` and with `COPY`.
+    """
+
+    table_name = "ccxt_bid_ask_futures_raw"
+
+    @classmethod
+    def get_id(cls) -> int:
+        return hash(cls.__name__) % 10000
+
+    def setUp(self) -> None:
+        super().setUp()
+        query = imvccdbut.get_ccxt_create_bid_ask_futures_raw_table_query()
+        hsql.execute_query(self.connection, query)
+
+    def tearDown(self) -> None:
+        hsql.remove_table(self.connection, self.table_name)
+        super().tearDown()
+
+    @staticmethod
+    def get_bid_ask_data(num_rows: int) -> pd.DataFrame:
+        """
+        Get bid/ask data in the format of the websocket download.
+        """
+        num_levels = 10
+        timestamps = 1668187200000 + 200 * (np.arange(num_rows) // num_levels)
+        data = pd.DataFrame(
+            {
+                "timestamp": timestamps,
+                "bid_size": np.linspace(1.0, 2.0, num_rows),
+                "bid_price": np.linspace(16000.0, 17000.0, num_rows),
+                "ask_size": np.linspace(2.0, 3.0, num_rows),
+                "ask_price": np.linspace(16000.5, 17000.5, num_rows),
+                "currency_pair": "BTC_USDT",
+                "exchange_id": "binance",
+                "level": np.arange(num_rows) % num_levels + 1,
+                "end_download_timestamp": pd.Timestamp(
+                    "2022-11-11 17:20:00+00:00"
+                ),
+            }
+        )
+        return data
+
+    def save_data(self, data: pd.DataFrame, use_copy: bool) -> float:
+        """
+        Save the data to an empty table and return the time it took.
+        """
+        hsql.execute_query(self.connection, f"DELETE FROM {self.table_name}")
+        timer = htimer.Timer()
+        imvcddbut.save_data_to_db(
+            data,
+            "bid_ask",
+            self.connection,
+            self.table_name,
+            "UTC",
+            use_copy=use_copy,
+        )
+        elapsed_time = timer.get_elapsed()
+        return elapsed_time
+
+    def get_saved_data(self) -> pd.DataFrame:
+        query = (
+            "SELECT timestamp, bid_size, bid_price, ask_size, ask_price, "
+            "currency_pair, exchange_id, level, end_download_timestamp "
+            f"FROM {self.table_name} ORDER BY timestamp, level"
+        )
+        df = hsql.execute_query_to_df(self.connection, query)
+        return df
+
+    @pytest.mark.slow("10 seconds.")
+    def test_save_data_to_db1(self) -> None:
+        """
+        Verify that the data saved with `COPY` is the same as with `INSERT`.
+        """
+        data = self.get_bid_ask_data(100)
+        self.save_data(data, use_copy=False)
+        expected = self.get_saved_data()
+        self.save_data(data, use_copy=True)
+        actual = self.get_saved_data()
+        self.assertEqual(actual.shape[0], 100)
+        pd.testing.assert_frame_equal(actual, expected)
+
+    @pytest.mark.superslow("~1 minute.")
+    def test_benchmark1(self) -> None:
+        """
+        Compare the time to save a large amount of bid/ask data with `INSERT`
+        and with `COPY`.
+        """
+        num_rows = 100000
+        data = self.get_bid_ask_data(num_rows)
+        insert_time = self.save_data(data, use_copy=False)
+        copy_time = self.save_data(data, use_copy=True)
+        _LOG.info(
+            "Saved %s rows: INSERT=%.3f secs, COPY=%.3f secs",
+            num_rows,
+            insert_time,
+            copy_time,
+        )
+        num_saved_rows = hsql.get_num_rows(self.connection, self.table_name)
+        self.assertEqual(num_saved_rows, num_rows)
+        self.assertLess(copy_time, insert_time)
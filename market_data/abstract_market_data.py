@@ -7,7 +7,7 @@ import market_data.abstract_market_data as mdabmada
 import abc
 import asyncio
 import logging
-from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, cast
 
 import numpy as np
 import pandas as pd
@@ -270,6 +270,7 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
         right_close: bool = False,
         limit: Optional[int] = None,
         ignore_delay: bool = False,
+        columns: Optional[List[str]] = None,
     ) -> pd.DataFrame:
         """
         Return price data for an interval with `start_ts` and `end_ts`
@@ -284,10 +285,14 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
         :param asset_ids: list of asset ids to filter on. `None` for all asset ids.
         :param left_close, right_close: represent the type of interval
             - E.g., [start_ts, end_ts), or (start_ts, end_ts]
+        :param columns: columns (after the remapping) to read, in addition to
+            the asset id and the timestamp columns, so that the derived classes
+            can skip reading the unneeded columns from the backend. `None` means
+            the columns specified in the ctor
         """
         _LOG.debug(
             hprint.to_str(
-                "start_ts end_ts ts_col_name asset_ids left_close right_close limit ignore_delay"
+                "start_ts end_ts ts_col_name asset_ids left_close right_close limit ignore_delay columns"
             )
         )
         # Resolve the asset ids.
@@ -298,6 +303,11 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
         hdateti.dassert_is_valid_interval(
             start_ts, end_ts, left_close, right_close
         )
+        # Resolve the columns to read.
+        if columns is None:
+            query_columns = self._columns
+        else:
+            query_columns = self._get_columns_to_read(columns)
         # Delegate to the derived classes to retrieve the data.
         df = self._get_data(
             start_ts,
@@ -308,6 +318,7 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
             right_close,
             limit,
             ignore_delay,
+            query_columns,
         )
         _LOG.debug("-> df after _get_data=\n%s", hpandas.df_to_str(df))
         _LOG.debug("get_data_for_interval() columns '%s'", df.columns)
@@ -330,7 +341,13 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
         )
         # Check that columns are required ones.
         # TODO(gp): Difference between amp and cmamp.
-        if self._columns is not None:
+        if columns is not None:
+            # The end timestamps are stored in the index after the
+            # normalization and the timestamp columns might not be available
+            # in the backend, when the columns are not specified in the ctor.
+            query_columns = cast(List[str], query_columns)
+            df = df[[col for col in query_columns if col in df.columns]]
+        elif self._columns is not None:
             df = hpandas.check_and_filter_matching_columns(
                 df, self._columns, self._filter_data_mode
             )
@@ -479,6 +496,83 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
         # ```
         return twap_df
 
+    def get_twap_price_for_intervals(
+        self,
+        interval_timestamps: List[pd.Timestamp],
+        ts_col_name: str,
+        asset_ids: List[int],
+        columns: List[str],
+        *,
+        ignore_delay: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Compute TWAP of the columns `columns` in consecutive intervals.
+
+        This is equivalent to calling `get_twap_price()` for each interval
+        `(interval_timestamps[i], interval_timestamps[i + 1]]`, but the data
+        is read with a single query and the TWAPs are computed with a single
+        groupby.
+
+        E.g., `interval_timestamps = [9:30, 9:31, 9:32]` returns the TWAPs for
+        (9:30, 9:31] and (9:31, 9:32].
+
+        :param interval_timestamps: increasing timestamps delimiting the
+            intervals
+        :param ts_col_name: same as in `get_twap_price()`
+        :param columns: columns to use to compute the TWAP (e.g., `bid`, `ask`)
+        :return: df with a TWAP for each column, indexed by the end of the
+            interval and by asset id, like:
+            ```
+                                                  bid      ask
+            end_datetime              asset_id
+            2000-01-01 09:31:00-05:00 101      998.90   998.96
+                                      102     1000.01  1000.06
+            2000-01-01 09:32:00-05:00 101      998.17   998.19
+            ```
+        """
+        self._dassert_valid_asset_ids(asset_ids)
+        hdbg.dassert_lte(2, len(interval_timestamps))
+        interval_timestamps = pd.DatetimeIndex(interval_timestamps)
+        hdbg.dassert(interval_timestamps.is_monotonic_increasing)
+        hdbg.dassert(not interval_timestamps.has_duplicates)
+        # Get the slice (start_ts, end_ts] of prices covering all the
+        # intervals.
+        prices = self.get_data_for_interval(
+            interval_timestamps[0],
+            interval_timestamps[-1],
+            ts_col_name,
+            asset_ids,
+            left_close=False,
+            right_close=True,
+            limit=None,
+            ignore_delay=ignore_delay,
+        )
+        hdbg.dassert_is_subset(columns, prices.columns)
+        # Get the timestamps used to filter the data.
+        if ts_col_name == self._end_time_col_name:
+            # The end timestamps are in the index after the normalization.
+            timestamps = prices.index
+        else:
+            if self._column_remap:
+                ts_col_name = self._column_remap.get(ts_col_name, ts_col_name)
+            hdbg.dassert_in(ts_col_name, prices.columns)
+            timestamps = prices[ts_col_name]
+        timestamps = pd.DatetimeIndex(timestamps)
+        # Assign each timestamp `ts` to the interval `(t_i, t_{i+1}]`, i.e., to
+        # the first interval end `t_{i+1} >= ts`.
+        interval_end_timestamps = interval_timestamps[1:]
+        idxs = np.searchsorted(
+            interval_end_timestamps.asi8, timestamps.asi8, side="left"
+        )
+        interval_end_timestamps = interval_end_timestamps[idxs]
+        interval_end_timestamps.name = self._end_time_col_name
+        # Compute the mean value in each interval.
+        twap_df = prices.groupby(
+            [interval_end_timestamps, prices[self._asset_id_col].values]
+        )[columns].mean()
+        twap_df.index.names = [self._end_time_col_name, self._asset_id_col]
+        return twap_df
+
     # TODO(gp): When we want to evaluate a TWAP price in (a, b] we need to:
     #  1) wait until `MarketData` is updated
     #  2) assert that all the requested prices are actually available
@@ -760,6 +854,7 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
         right_close: bool,
         limit: Optional[int],
         ignore_delay: bool,
+        columns: Optional[List[str]],
     ) -> pd.DataFrame:
         """
         Return data in the interval start_ts, end_ts for certain assets.
@@ -775,6 +870,7 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
         :param left_close, right_close: represent the type of interval
             - E.g., [start_ts, end_ts), or (start_ts, end_ts]
         :param limit: keep only top N records
+        :param columns: columns to read. `None` means all available
         """
         ...
 
@@ -833,6 +929,41 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
         # _LOG.debug(hpandas.df_to_str(df, print_shape_info=True, tag="after process_data"))
         return df
 
+    def _get_columns_to_read(self, columns: List[str]) -> List[str]:
+        """
+        Convert the columns requested by a caller into the columns to read.
+
+        :param columns: column names after the remapping
+        :return: column names before the remapping, including the asset id and
+            the timestamp columns
+        """
+        hdbg.dassert_container_type(columns, list, str)
+        hdbg.dassert_no_duplicates(columns)
+        # Map the column names back to the names before the remapping.
+        if self._column_remap:
+            inverse_column_remap = {v: k for k, v in self._column_remap.items()}
+            columns = [inverse_column_remap.get(col, col) for col in columns]
+        # These columns are needed to index and normalize the data.
+        required_columns = [
+            self._asset_id_col,
+            self._start_time_col_name,
+            self._end_time_col_name,
+        ]
+        if self._columns is not None:
+            hdbg.dassert_is_subset(columns, self._columns)
+            # Preserve the order of the columns specified in the ctor.
+            query_columns = [
+                col
+                for col in self._columns
+                if col in columns or col in required_columns
+            ]
+        else:
+            query_columns = required_columns + [
+                col for col in columns if col not in required_columns
+            ]
+        _LOG.debug(hprint.to_str("columns query_columns"))
+        return query_columns
+
     def _remap_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Remap column names with provided mapping.
@@ -84,13 +84,14 @@ class ImClientMarketData(mdabmada.MarketData):
         right_close: bool,
         limit: Optional[int],
         ignore_delay: bool,
+        columns: Optional[List[str]],
     ) -> pd.DataFrame:
         """
         See the parent class.
         """
         _LOG.debug(
             hprint.to_str(
-                "start_ts end_ts ts_col_name asset_ids left_close right_close limit ignore_delay"
+                "start_ts end_ts ts_col_name asset_ids left_close right_close limit ignore_delay columns"
             )
         )
         # This is used only in ReplayedMarketData.
@@ -118,7 +119,7 @@ class ImClientMarketData(mdabmada.MarketData):
         #  the asset_id as "full_symbol" instead we access the class to see what
         #  is the name of that column.
         full_symbol_col_name = self._im_client._get_full_symbol_col_name(None)
-        if self._columns is not None:
+        if columns is not None:
             # Exclude columns specific of `MarketData` when querying `ImClient`.
             columns_to_exclude_in_im = [
                 self._asset_id_col,
@@ -126,16 +127,14 @@ class ImClientMarketData(mdabmada.MarketData):
                 self._end_time_col_name,
             ]
             query_columns = [
-                col
-                for col in self._columns
-                if col not in columns_to_exclude_in_im
+                col for col in columns if col not in columns_to_exclude_in_im
             ]
             if full_symbol_col_name not in query_columns:
                 # Add full symbol column to the query if its name wasn't passed
                 # since it is necessary for asset id column generation.
                 query_columns.insert(0, full_symbol_col_name)
         else:
-            query_columns = cast(List[str], self._columns)
+            query_columns = cast(List[str], columns)
         # Read data.
         market_data = self._im_client.read_data(
             full_symbols,
@@ -167,9 +166,9 @@ class ImClientMarketData(mdabmada.MarketData):
                 self._asset_id_col,
                 transformed_asset_ids,
             )
-        if self._columns is not None:
+        if columns is not None:
             # Drop full symbol column if it was not in the sepcified columns.
-            if full_symbol_col_name not in self._columns:
+            if full_symbol_col_name not in columns:
                 market_data = market_data.drop(full_symbol_col_name, axis=1)
         hdbg.dassert_in(self._asset_id_col, market_data.columns)
         if limit:
@@ -5,7 +5,7 @@ import market_data.real_time_market_data as mdrtmada
 """
 
 import logging
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Union
 
 import pandas as pd
 
@@ -32,26 +32,62 @@ class RealTimeMarketData(mdabmada.MarketData):
 
     def __init__(
         self,
-        db_connection,
+        db_connection: Union[hsql.DbConnection, hsql.DbConnectionPool],
         table_name: str,
         where_clause: Optional[str],
         valid_id: Any,
         # Params from abstract `MarketData`.
         *args: Any,
+        knowledge_timestamp_col_name: Optional[str] = None,
+        knowledge_timestamp_margin: pd.Timedelta = pd.Timedelta(seconds=10),
+        unique_col_names: Optional[List[str]] = None,
         **kwargs: Any,
     ) -> None:
         """
         Constructor.
 
+        :param db_connection: a connection to the DB, or a pool of connections
+            (see `hsql.get_connection_pool()`) from which a connection is
+            borrowed for each query, so that it can be shared with other
+            readers and writers
         :param table_name: the table to use to get the data
         :param where_clause: an SQL where clause
             - E.g., `WHERE ...=... AND ...=...`
+        :param knowledge_timestamp_col_name: the name of the column storing
+            when a row was inserted in the DB. If not `None`, the data is read
+            incrementally (see `_get_data_from_buffer()`)
+        :param knowledge_timestamp_margin: the max delay between assigning the
+            knowledge timestamp to a row and committing it to the DB. The rows
+            in this margin before the last knowledge timestamp read are read
+            again, so that the rows committed late are not lost
+        :param unique_col_names: the columns identifying a row of the table,
+            used to drop the rows read more than once. `None` means the asset
+            id and the start time columns
         """
         super().__init__(*args, **kwargs)  # type: ignore[arg-type]
         self.connection = db_connection
         self._table_name = table_name
         self._where_clause = where_clause
         self._valid_id = valid_id
+        self._knowledge_timestamp_col_name = knowledge_timestamp_col_name
+        if knowledge_timestamp_col_name is not None:
+            hdbg.dassert_is_not(self._asset_ids, None)
+        hdbg.dassert_lte(pd.Timedelta(0), knowledge_timestamp_margin)
+        self._knowledge_timestamp_margin = knowledge_timestamp_margin
+        if unique_col_names is None:
+            unique_col_names = [self._asset_id_col, self._start_time_col_name]
+        self._unique_col_names = unique_col_names
+        # State of the incremental mode.
+        # The rows read from the DB for all the asset ids, with the timestamp
+        # in `self._buffer_ts_col_name` >= `self._buffer_start_ts`.
+        self._buffer: Optional[pd.DataFrame] = None
+        self._buffer_ts_col_name: Optional[str] = None
+        self._buffer_start_ts: Optional[pd.Timestamp] = None
+        # The max length of the intervals requested so far, used to evict the
+        # rows that are too old to be requested again.
+        self._buffer_lookback = pd.Timedelta(0)
+        # The last knowledge timestamp in the buffer.
+        self._watermark: Optional[Any] = None
 
     def should_be_online(self, wall_clock_time: pd.Timestamp) -> bool:
         return True
@@ -68,6 +104,17 @@ class RealTimeMarketData(mdabmada.MarketData):
         ret: str = dt.strftime("%Y-%m-%d %H:%M:%S")
         return ret
 
+    def _execute_query_to_df(self, query: str) -> pd.DataFrame:
+        """
+        Run a query using the connection or a connection from the pool.
+        """
+        if isinstance(self.connection, hsql.DbConnectionPool):
+            with hsql.get_connection_from_pool(self.connection) as connection:
+                df = hsql.execute_query_to_df(connection, query)
+        else:
+            df = hsql.execute_query_to_df(self.connection, query)
+        return df
+
     def _convert_data_for_normalization(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Convert data to format required by normalization in parent class.
@@ -94,12 +141,35 @@ class RealTimeMarketData(mdabmada.MarketData):
         right_close: bool,
         limit: Optional[int],
         ignore_delay: bool,
+        columns: Optional[List[str]],
     ) -> pd.DataFrame:
         # This is used only in ReplayedMarketData.
         _ = ignore_delay
+        use_buffer = (
+            self._knowledge_timestamp_col_name is not None
+            and start_ts is not None
+            and limit is None
+            and (
+                self._buffer_ts_col_name is None
+                or self._buffer_ts_col_name == ts_col_name
+            )
+        )
+        if use_buffer:
+            df = self._get_data_from_buffer(
+                start_ts,
+                end_ts,
+                ts_col_name,
+                asset_ids,
+                left_close,
+                right_close,
+                columns,
+            )
+            # Prepare data for normalization by the parent class.
+            df = self._convert_data_for_normalization(df)
+            return df
         sort_time = True
         query = self._get_sql_query(
-            self._columns,
+            columns,
             start_ts,
             end_ts,
             ts_col_name,
@@ -110,7 +180,7 @@ class RealTimeMarketData(mdabmada.MarketData):
             limit,
         )
         _LOG.debug("query=%s", query)
-        df = hsql.execute_query_to_df(self.connection, query)
+        df = self._execute_query_to_df(query)
         # Prepare data for normalization by the parent class.
         df = self._convert_data_for_normalization(df)
         return df
@@ -119,6 +189,21 @@ class RealTimeMarketData(mdabmada.MarketData):
         """
         Return the last `end_time` available in the DB.
         """
+        if self._buffer is not None:
+            # Serve the last `end_time` from the buffer, if it has the data
+            # for `self._valid_id`.
+            self._update_buffer()
+            buffer = self._buffer
+            buffer = buffer[buffer[self._asset_id_col] == self._valid_id]
+            if not buffer.empty:
+                start_times = pd.to_datetime(buffer[self._start_time_col_name])
+                row = buffer.loc[start_times.idxmax()]
+                start_time = pd.Timestamp(row[self._start_time_col_name])
+                end_time = pd.Timestamp(row[self._end_time_col_name])
+                start_time = self._to_utc(start_time)
+                end_time = self._to_utc(end_time)
+                hdbg.dassert_eq(end_time, start_time + pd.Timedelta(minutes=1))
+                return end_time
         # We assume that all the bars are inserted together in a single
         # transaction, so we can check for the max timestamp.
         # Get the latest `start_time` (which is an index) with a query like:
@@ -136,7 +221,7 @@ class RealTimeMarketData(mdabmada.MarketData):
         query.append(f"{self._asset_id_col} = '{self._valid_id}'")
         query = " ".join(query)
         # _LOG.debug("query=%s", query)
-        df = hsql.execute_query_to_df(self.connection, query)
+        df = self._execute_query_to_df(query)
         # Check that the `start_time` is a single value.
         hdbg.dassert_eq(df.shape, (1, 1))
         start_time = df.iloc[0, 0]
@@ -163,7 +248,7 @@ class RealTimeMarketData(mdabmada.MarketData):
         )
         query = " ".join(query)
         # _LOG.debug("query=%s", query)
-        df = hsql.execute_query_to_df(self.connection, query)
+        df = self._execute_query_to_df(query)
         # Check that the `end_time` is a single value.
         hdbg.dassert_eq(df.shape, (1, 1))
         end_time = df.iloc[0, 0]
@@ -174,6 +259,160 @@ class RealTimeMarketData(mdabmada.MarketData):
         hdbg.dassert_eq(end_time, start_time + pd.Timedelta(minutes=1))
         return end_time
 
+    # /////////////////////////////////////////////////////////////////////////
+    # Incremental mode.
+    # /////////////////////////////////////////////////////////////////////////
+
+    @staticmethod
+    def _to_utc(ts: pd.Timestamp) -> pd.Timestamp:
+        """
+        Convert a timestamp from the DB into UTC.
+        """
+        if ts.tz is None:
+            ts = ts.tz_localize("UTC")
+        else:
+            ts = ts.tz_convert("UTC")
+        return ts
+
+    def _get_data_from_buffer(
+        self,
+        start_ts: pd.Timestamp,
+        end_ts: Optional[pd.Timestamp],
+        ts_col_name: str,
+        asset_ids: List[Any],
+        left_close: bool,
+        right_close: bool,
+        columns: Optional[List[str]],
+    ) -> pd.DataFrame:
+        """
+        Return the data in an interval from a buffer of the rows in the DB.
+
+        Instead of querying the DB for the entire interval every time, the
+        rows for all the asset ids are kept in memory and only the rows with a
+        knowledge timestamp greater than the last one in the buffer are read
+        from the DB, so that the data for a lookback window that moves forward
+        with time is read only once.
+
+        The buffer is reloaded from the DB when an interval starts before the
+        beginning of the buffer.
+
+        Since the knowledge timestamp is assigned before a row is committed,
+        a row can become visible after rows with a greater knowledge timestamp.
+        To not lose it, the rows with a knowledge timestamp in
+        `self._knowledge_timestamp_margin` before the last one in the buffer
+        are read again and the duplicates are dropped.
+        """
+        hdbg.dassert_isinstance(asset_ids, list)
+        if self._buffer is None or start_ts < self._buffer_start_ts:
+            self._load_buffer(start_ts, ts_col_name)
+        else:
+            self._update_buffer()
+        if end_ts is not None:
+            # Evict the rows that are before all the intervals requested so
+            # far.
+            self._buffer_lookback = max(self._buffer_lookback, end_ts - start_ts)
+            buffer_start_ts = end_ts - self._buffer_lookback
+            if buffer_start_ts > self._buffer_start_ts:
+                self._buffer_start_ts = buffer_start_ts
+                mask = self._get_interval_mask(
+                    self._buffer_start_ts, None, True, True
+                )
+                self._buffer = self._buffer[mask]
+        # Select the rows in the interval for the requested assets.
+        mask = self._get_interval_mask(start_ts, end_ts, left_close, right_close)
+        mask &= self._buffer[self._asset_id_col].isin(asset_ids)
+        df = self._buffer[mask]
+        # Sort like in the SQL query.
+        df = df.sort_values(self._end_time_col_name, ascending=False)
+        if columns is not None:
+            df = df[columns]
+        df = df.reset_index(drop=True)
+        return df
+
+    def _get_interval_mask(
+        self,
+        start_ts: Optional[pd.Timestamp],
+        end_ts: Optional[pd.Timestamp],
+        left_close: bool,
+        right_close: bool,
+    ) -> pd.Series:
+        """
+        Return the mask of the buffer rows with the timestamp in an interval.
+        """
+        srs = pd.to_datetime(self._buffer[self._buffer_ts_col_name])
+        mask = pd.Series(True, index=self._buffer.index)
+        for ts, close, is_start in [
+            (start_ts, left_close, True),
+            (end_ts, right_close, False),
+        ]:
+            if ts is None:
+                continue
+            # Compare with the same precision used in the SQL queries.
+            ts = pd.Timestamp(self._to_sql_datetime_string(ts))
+            if srs.dt.tz is not None:
+                ts = ts.tz_localize("UTC")
+            if is_start:
+                mask &= (srs >= ts) if close else (srs > ts)
+            else:
+                mask &= (srs <= ts) if close else (srs < ts)
+        return mask
+
+    def _load_buffer(self, start_ts: pd.Timestamp, ts_col_name: str) -> None:
+        """
+        Read all the rows from `start_ts` into the buffer.
+        """
+        _LOG.debug("Loading buffer from %s", start_ts)
+        self._buffer_ts_col_name = ts_col_name
+        self._buffer_start_ts = start_ts
+        condition = f"{ts_col_name} >= '{self._to_sql_datetime_string(start_ts)}'"
+        self._buffer = self._query_buffer_rows(condition)
+        self._update_watermark(self._buffer)
+
+    def _update_buffer(self) -> None:
+        """
+        Append the rows committed to the DB after the last update.
+        """
+        if self._watermark is None:
+            # The buffer is empty, so read again all the rows.
+            self._load_buffer(self._buffer_start_ts, self._buffer_ts_col_name)
+            return
+        # Read again the rows in the margin before the watermark, since the
+        # rows committed late can have a knowledge timestamp before it.
+        min_knowledge_ts = (
+            pd.Timestamp(self._watermark) - self._knowledge_timestamp_margin
+        )
+        condition = f"{self._knowledge_timestamp_col_name} > '{min_knowledge_ts}'"
+        df = self._query_buffer_rows(condition)
+        _LOG.debug("Read %s rows after %s", df.shape[0], min_knowledge_ts)
+        if not df.empty:
+            buffer = pd.concat([self._buffer, df], ignore_index=True)
+            # Keep the last version of the rows read again.
+            buffer = buffer.drop_duplicates(self._unique_col_names, keep="last")
+            self._buffer = buffer.reset_index(drop=True)
+            self._update_watermark(df)
+
+    def _update_watermark(self, df: pd.DataFrame) -> None:
+        if not df.empty:
+            self._watermark = df[self._knowledge_timestamp_col_name].max()
+
+    def _query_buffer_rows(self, condition: str) -> pd.DataFrame:
+        """
+        Read the rows satisfying a condition for all the asset ids.
+        """
+        query = []
+        query.append(f"SELECT * FROM {self._table_name}")
+        if self._where_clause is not None:
+            query.append(f"WHERE {self._where_clause} AND")
+        else:
+            query.append("WHERE")
+        ids_as_str = ",".join(map(str, self._asset_ids))
+        query.append(f"{self._asset_id_col} in ({ids_as_str})")
+        query.append(f"AND {condition}")
+        query = " ".join(query)
+        _LOG.debug("query=%s", query)
+        df = self._execute_query_to_df(query)
+        return df
+
     def _get_sql_query(
         self,
         columns: Optional[List[str]],
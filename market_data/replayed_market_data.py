@@ -93,12 +93,13 @@ class ReplayedMarketData(mdabmada.MarketData):
         limit: Optional[int],
         # TODO(gp): -> ignore_propagation_delay = instantaneous_market_?
         ignore_delay: bool,
+        columns: Optional[List[str]],
     ) -> pd.DataFrame:
         if _TRACE:
             _LOG.trace(
                 hprint.to_str(
                     "start_ts end_ts ts_col_name asset_ids left_close "
-                    "right_close limit ignore_delay"
+                    "right_close limit ignore_delay columns"
                 )
             )
         if ignore_delay:
@@ -125,15 +126,15 @@ class ReplayedMarketData(mdabmada.MarketData):
             wall_clock_time,
             delay_in_secs=delay_in_secs,
         )
-        # Handle `columns`.
-        if self._columns is not None:
-            hdbg.dassert_is_subset(self._columns, df_tmp.columns)
-            df_tmp = df_tmp[self._columns]
         # Handle `period`.
         hdbg.dassert_in(ts_col_name, df_tmp.columns)
         df_tmp = hpandas.trim_df(
             df_tmp, ts_col_name, start_ts, end_ts, left_close, right_close
         )
+        # Handle `columns`.
+        if columns is not None:
+            hdbg.dassert_is_subset(columns, df_tmp.columns)
+            df_tmp = df_tmp[columns]
         # Handle `asset_ids`
         if _TRACE:
             _LOG.trace("before df_tmp=\n%s", hpandas.df_to_str(df_tmp))
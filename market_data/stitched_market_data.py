@@ -321,10 +321,14 @@ class HorizontalStitchedMarketData(mdabmada.MarketData):
         right_close: bool,
         limit: Optional[int],
         ignore_delay: bool,
+        columns: Optional[List[str]],
     ) -> pd.DataFrame:
         """
         See the parent class.
         """
+        # Each `MarketData` reads the columns specified in its ctor, since the
+        # requested columns are split across the two of them.
+        _ = columns
         market_data_df1 = self._im_client_market_data1._get_data(
             start_ts,
             end_ts,
@@ -334,6 +338,7 @@ class HorizontalStitchedMarketData(mdabmada.MarketData):
             right_close,
             limit,
             ignore_delay,
+            self._im_client_market_data1._columns,
         )
         market_data_df2 = self._im_client_market_data2._get_data(
             start_ts,
@@ -344,6 +349,7 @@ class HorizontalStitchedMarketData(mdabmada.MarketData):
             right_close,
             limit,
             ignore_delay,
+            self._im_client_market_data2._columns,
         )
         # TODO(Grisha): @Dan If the data is coming from the same data source,
         # then we merge on `full_symbol` and `asset_id`. If the data is coming
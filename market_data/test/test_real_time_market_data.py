@@ -1,12 +1,16 @@
 import logging
+import sqlite3
+from typing import Optional, Union
 
 import pandas as pd
 
 import helpers.hpandas as hpandas
 import helpers.hsql as hsql
+import helpers.hunit_test as hunitest
 import im_v2.common.data.client as icdc
 import im_v2.common.db.db_utils as imvcddbut
 import market_data.market_data_example as mdmadaex
+import market_data.real_time_market_data as mdrtmada
 
 _LOG = logging.getLogger(__name__)
 
@@ -200,3 +204,241 @@ class TestRealTimeMarketData2(
             dedent=True,
             fuzzy_match=True,
         )
+
+
+class TestRealTimeMarketData1(imvcddbut.TestImDbHelper):
+    """
+    Test reading the data incrementally from the DB.
+    """
+
+    @classmethod
+    def get_id(cls) -> int:
+        return hash(cls.__name__) % 10000
+
+    def setUp(self) -> None:
+        super().setUp()
+        query = """CREATE TABLE IF NOT EXISTS bars(
+                    asset_id BIGINT,
+                    start_time TIMESTAMP,
+                    end_time TIMESTAMP,
+                    close NUMERIC,
+                    knowledge_timestamp TIMESTAMP
+                    )
+                    """
+        hsql.execute_query(self.connection, query)
+        self.wall_clock_time = None
+
+    def tearDown(self) -> None:
+        hsql.remove_table(self.connection, "bars")
+        super().tearDown()
+
+    def get_market_data(
+        self,
+        knowledge_timestamp_col_name: Optional[str],
+        *,
+        db_connection: Optional[
+            Union[hsql.DbConnection, hsql.DbConnectionPool]
+        ] = None,
+    ) -> mdrtmada.RealTimeMarketData:
+        if db_connection is None:
+            db_connection = self.connection
+        market_data = mdrtmada.RealTimeMarketData(
+            db_connection,
+            "bars",
+            "close IS NOT NULL",
+            101,
+            "asset_id",
+            [101, 202],
+            "start_time",
+            "end_time",
+            None,
+            lambda: self.wall_clock_time,
+            knowledge_timestamp_col_name=knowledge_timestamp_col_name,
+        )
+        return market_data
+
+    def insert_bar(self, idx: int) -> None:
+        """
+        Insert the bar `idx` for all the assets, as the DB writer does.
+        """
+        start_time = pd.Timestamp("2022-01-03 14:30:00") + pd.Timedelta(
+            minutes=idx
+        )
+        end_time = start_time + pd.Timedelta(minutes=1)
+        knowledge_timestamp = end_time + pd.Timedelta(seconds=5)
+        df = pd.DataFrame(
+            {
+                "asset_id": [101, 202],
+                "start_time": start_time,
+                "end_time": end_time,
+                "close": [100.0 + idx, 200.0 + idx],
+                "knowledge_timestamp": knowledge_timestamp,
+            }
+        )
+        hsql.execute_insert_query(self.connection, df, "bars")
+        wall_clock_time = knowledge_timestamp + pd.Timedelta(seconds=5)
+        self.wall_clock_time = wall_clock_time.tz_localize("UTC")
+
+    def test_get_data_for_last_period1(self) -> None:
+        """
+        Check that the incremental mode returns the same data as the queries.
+        """
+        market_data = self.get_market_data("knowledge_timestamp")
+        expected_market_data = self.get_market_data(None)
+        timedelta = pd.Timedelta("10T")
+        for idx in range(30):
+            self.insert_bar(idx)
+            actual = market_data.get_data_for_last_period(timedelta)
+            expected = expected_market_data.get_data_for_last_period(timedelta)
+            pd.testing.assert_frame_equal(actual, expected)
+            #
+            actual = market_data.get_last_end_time()
+            expected = expected_market_data.get_last_end_time()
+            self.assertEqual(actual, expected)
+        # The rows before the lookback window are evicted.
+        self.assertEqual(market_data._buffer.shape[0], 2 * 9)
+
+    def test_get_data_for_interval1(self) -> None:
+        """
+        Check an interval starting before the data in memory.
+        """
+        market_data = self.get_market_data("knowledge_timestamp")
+        expected_market_data = self.get_market_data(None)
+        for idx in range(30):
+            self.insert_bar(idx)
+        market_data.get_data_for_last_period(pd.Timedelta("5T"))
+        start_ts = pd.Timestamp("2022-01-03 09:35:00-05:00")
+        end_ts = pd.Timestamp("2022-01-03 09:45:00-05:00")
+        actual = market_data.get_data_for_interval(
+            start_ts, end_ts, "start_time", [202]
+        )
+        expected = expected_market_data.get_data_for_interval(
+            start_ts, end_ts, "start_time", [202]
+        )
+        self.assertEqual(actual.shape[0], 10)
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_connection_pool1(self) -> None:
+        """
+        Check that the data is read with connections borrowed from a pool.
+        """
+        connection_info = hsql.db_connection_to_tuple(self.connection)
+        connection_pool = hsql.get_connection_pool(
+            *connection_info, max_connections=2
+        )
+        market_data = self.get_market_data(
+            "knowledge_timestamp", db_connection=connection_pool
+        )
+        expected_market_data = self.get_market_data("knowledge_timestamp")
+        for idx in range(5):
+            self.insert_bar(idx)
+        actual = market_data.get_data_for_last_period(pd.Timedelta("10T"))
+        expected = expected_market_data.get_data_for_last_period(
+            pd.Timedelta("10T")
+        )
+        self.assertEqual(actual.shape[0], 2 * 5)
+        pd.testing.assert_frame_equal(actual, expected)
+        self.assertEqual(
+            market_data.get_last_end_time(),
+            expected_market_data.get_last_end_time(),
+        )
+        connection_pool.closeall()
+
+
+class TestRealTimeMarketData3(hunitest.TestCase):
+    """
+    Test reading the data incrementally when the rows are committed late.
+
+    The DB is emulated with an in-memory SQLite DB.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.connection = sqlite3.connect(":memory:")
+        self.wall_clock_time = None
+
+    def tearDown(self) -> None:
+        self.connection.close()
+        super().tearDown()
+
+    def get_market_data(
+        self, knowledge_timestamp_col_name: Optional[str]
+    ) -> mdrtmada.RealTimeMarketData:
+        market_data = mdrtmada.RealTimeMarketData(
+            self.connection,
+            "bars",
+            "close IS NOT NULL",
+            101,
+            "asset_id",
+            [101, 202],
+            "start_time",
+            "end_time",
+            None,
+            lambda: self.wall_clock_time,
+            knowledge_timestamp_col_name=knowledge_timestamp_col_name,
+        )
+        return market_data
+
+    def insert_bar(
+        self, idx: int, asset_id: int, knowledge_timestamp_delay: pd.Timedelta
+    ) -> None:
+        """
+        Commit the bar `idx` for an asset.
+        """
+        start_time = pd.Timestamp("2022-01-03 14:30:00") + pd.Timedelta(
+            minutes=idx
+        )
+        end_time = start_time + pd.Timedelta(minutes=1)
+        knowledge_timestamp = end_time + knowledge_timestamp_delay
+        df = pd.DataFrame(
+            {
+                "asset_id": [asset_id],
+                "start_time": [str(start_time)],
+                "end_time": [str(end_time)],
+                "close": [100.0 + idx],
+                "knowledge_timestamp": [str(knowledge_timestamp)],
+            }
+        )
+        df.to_sql("bars", self.connection, if_exists="append", index=False)
+        wall_clock_time = end_time + pd.Timedelta(seconds=10)
+        self.wall_clock_time = wall_clock_time.tz_localize("UTC")
+
+    def test_late_commit1(self) -> None:
+        """
+        Check that a row with a knowledge timestamp before the last one read
+        is not lost.
+        """
+        market_data = self.get_market_data("knowledge_timestamp")
+        start_ts = pd.Timestamp("2022-01-03 09:30:00-05:00")
+        end_ts = pd.Timestamp("2022-01-03 09:40:00-05:00")
+        self.insert_bar(0, 101, pd.Timedelta(seconds=5))
+        self.insert_bar(0, 202, pd.Timedelta(seconds=5))
+        actual = market_data.get_data_for_interval(
+            start_ts, end_ts, "start_time", [101, 202]
+        )
+        self.assertEqual(actual.shape[0], 2)
+        # The row of the asset 202 gets a knowledge timestamp before the one
+        # of the asset 101, but it is committed after the watermark has moved
+        # past it.
+        self.insert_bar(1, 101, pd.Timedelta(seconds=5))
+        actual = market_data.get_data_for_interval(
+            start_ts, end_ts, "start_time", [101, 202]
+        )
+        self.assertEqual(actual.shape[0], 3)
+        self.insert_bar(1, 202, pd.Timedelta(seconds=2))
+        actual = market_data.get_data_for_interval(
+            start_ts, end_ts, "start_time", [101, 202]
+        )
+        # The late row is read and the rows read again are not duplicated.
+        self.assertEqual(actual.shape[0], 4)
+        self.assertEqual(market_data._buffer.shape[0], 4)
+        actual = actual[["asset_id", "start_time", "close"]]
+        expected = r"""
+                                   asset_id                start_time  close
+        end_time
+        2022-01-03 09:31:00-05:00       101 2022-01-03 09:30:00-05:00  100.0
+        2022-01-03 09:31:00-05:00       202 2022-01-03 09:30:00-05:00  100.0
+        2022-01-03 09:32:00-05:00       101 2022-01-03 09:31:00-05:00  101.0
+        2022-01-03 09:32:00-05:00       202 2022-01-03 09:31:00-05:00  101.0
+        """
+        self.assert_equal(str(actual), expected, dedent=True, fuzzy_match=True)
@@ -509,6 +509,40 @@ class TestReplayedMarketData2(hunitest.TestCase):
             self, replayed_delay_in_mins_or_timestamp, func, expected_df_as_str
         )
 
+    def test_get_data_for_interval4(self) -> None:
+        """
+        - Current time is 9:35
+        - Ask only the column `last_price` in [9:30, 9:35)
+        - The returned data contains `last_price` and the asset id and timestamp
+          columns
+        """
+        replayed_delay_in_mins_or_timestamp = 5
+        start_ts = pd.Timestamp("2000-01-01 09:30:00-05:00")
+        end_ts = pd.Timestamp("2000-01-01 09:35:00-05:00")
+        ts_col_name = "end_datetime"
+        asset_ids = None
+        columns = ["last_price"]
+        func = lambda market_data: market_data.get_data_for_interval(
+            start_ts, end_ts, ts_col_name, asset_ids, columns=columns
+        )
+        # pylint: disable=line-too-long
+        expected_df_as_str = r"""
+        # df=
+        index=[2000-01-01 09:31:00-05:00, 2000-01-01 09:34:00-05:00]
+        columns=asset_id,last_price,start_datetime
+        shape=(4, 3)
+                                   asset_id   last_price            start_datetime
+        end_datetime
+        2000-01-01 09:31:00-05:00      1000   999.874540 2000-01-01 09:30:00-05:00
+        2000-01-01 09:32:00-05:00      1000  1000.325254 2000-01-01 09:31:00-05:00
+        2000-01-01 09:33:00-05:00      1000  1000.557248 2000-01-01 09:32:00-05:00
+        2000-01-01 09:34:00-05:00      1000  1000.655907 2000-01-01 09:33:00-05:00
+        """
+        # pylint: enable=line-too-long
+        _check_get_data(
+            self, replayed_delay_in_mins_or_timestamp, func, expected_df_as_str
+        )
+
     def test_get_data_at_timestamp1(self) -> None:
         """
         - Current time is 9:45
@@ -560,6 +594,50 @@ class TestReplayedMarketData2(hunitest.TestCase):
             self, replayed_delay_in_mins_or_timestamp, func, expected_df_as_str
         )
 
+    def test_get_twap_price_for_intervals1(self) -> None:
+        """
+        Check that the TWAPs are the same as computing them one interval at a
+        time.
+        """
+        interval_timestamps = pd.to_datetime(
+            [
+                "2000-01-01 09:30:00-05:00",
+                "2000-01-01 09:31:00-05:00",
+                "2000-01-01 09:33:00-05:00",
+                "2000-01-01 09:38:00-05:00",
+            ]
+        ).tolist()
+        column = "last_price"
+        with hasynci.solipsism_context() as event_loop:
+            start_datetime = pd.Timestamp("2000-01-01 09:30:00-05:00")
+            end_datetime = pd.Timestamp("2000-01-01 10:29:00-05:00")
+            replayed_delay_in_mins_or_timestamp = 10
+            asset_ids = [1000]
+            market_data, _ = mdmadaex.get_ReplayedTimeMarketData_example2(
+                event_loop,
+                start_datetime,
+                end_datetime,
+                replayed_delay_in_mins_or_timestamp,
+                asset_ids,
+            )
+            for ts_col_name in ["end_datetime", "start_datetime"]:
+                actual = market_data.get_twap_price_for_intervals(
+                    interval_timestamps, ts_col_name, asset_ids, [column]
+                )
+                # Compute the TWAPs one interval at a time.
+                expected = []
+                for start_ts, end_ts in zip(
+                    interval_timestamps[:-1], interval_timestamps[1:]
+                ):
+                    twap_df = market_data.get_twap_price(
+                        start_ts, end_ts, ts_col_name, asset_ids, column
+                    )
+                    expected.append(
+                        twap_df.set_index("asset_id", append=True)[[column]]
+                    )
+                expected = pd.concat(expected)
+                pd.testing.assert_frame_equal(actual, expected)
+
 
 # #############################################################################
 
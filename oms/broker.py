@@ -539,6 +539,92 @@ def _split_in_child_twap_orders(
     return child_orders
 
 
+def _get_child_twap_execution_prices(
+    market_data: mdata.MarketData,
+    child_orders: List[omorder.Order],
+    *,
+    timestamp_col: str = "end_datetime",
+    column_remap: Optional[Dict[str, str]] = None,
+) -> np.ndarray:
+    """
+    Get the simulated execution prices of the child orders of TWAP orders.
+
+    This is equivalent to calling `_get_execution_prices()` for each child
+    order, but it reads the data of all the child intervals with a single
+    query.
+
+    :param child_orders: child orders as returned by
+        `_split_in_child_twap_orders()`, i.e., with the same type and with
+        consecutive intervals
+    :return: the execution price of each child order
+    """
+    needed_columns = ["bid", "ask", "price", "midpoint"]
+    if column_remap is None:
+        column_remap = {col_name: col_name for col_name in needed_columns}
+    hdbg.dassert_set_eq(column_remap.keys(), needed_columns)
+    # Get the child intervals.
+    order_types = {order.type_ for order in child_orders}
+    hdbg.dassert_eq(len(order_types), 1)
+    order_type = order_types.pop()
+    intervals = sorted(
+        {(order.start_timestamp, order.end_timestamp) for order in child_orders}
+    )
+    for (_, prev_end_timestamp), (start_timestamp, _) in zip(
+        intervals[:-1], intervals[1:]
+    ):
+        hdbg.dassert_eq(prev_end_timestamp, start_timestamp)
+    interval_timestamps = [intervals[0][0]] + [end for _, end in intervals]
+    asset_ids = sorted({order.asset_id for order in child_orders})
+    # Parse the order type.
+    config = order_type.split("@")
+    hdbg.dassert_eq(len(config), 2, "Invalid type_='%s'", order_type)
+    price_type, timing = config
+    hdbg.dassert_eq(timing, "twap")
+    if price_type in ("price", "midpoint"):
+        columns = [column_remap[price_type]]
+    elif price_type.startswith("partial_spread"):
+        perc = float(price_type.split("_")[2])
+        hdbg.dassert_lte(0, perc)
+        hdbg.dassert_lte(perc, 1.0)
+        columns = [column_remap["bid"], column_remap["ask"]]
+    else:
+        raise ValueError(f"Invalid type='{order_type}'")
+    # Compute the TWAP prices of all the child intervals. We can ignore the
+    # delay as explained in `_get_price_per_share()`.
+    ignore_delay = True
+    twap_df = market_data.get_twap_price_for_intervals(
+        interval_timestamps,
+        timestamp_col,
+        asset_ids,
+        columns,
+        ignore_delay=ignore_delay,
+    )
+    if _TRACE:
+        _LOG.trace("twap_df=\n%s", hpandas.df_to_str(twap_df, precision=2))
+    # Each interval should have some prices, like in `_get_price_per_share()`.
+    is_nan = twap_df.isna().groupby(level=0).all()
+    hdbg.dassert_set_eq(is_nan.index, interval_timestamps[1:])
+    hdbg.dassert(not is_nan.any(axis=None), "twap_df=%s", twap_df)
+    # Get the prices of each child order.
+    keys = pd.MultiIndex.from_tuples(
+        [(order.end_timestamp, order.asset_id) for order in child_orders]
+    )
+    hdbg.dassert(keys.isin(twap_df.index).all(), "twap_df=%s", twap_df)
+    twap_df = twap_df.reindex(keys)
+    if price_type in ("price", "midpoint"):
+        prices = twap_df[columns[0]].to_numpy()
+    else:
+        bids = twap_df[columns[0]].to_numpy()
+        asks = twap_df[columns[1]].to_numpy()
+        is_buy = np.array([order.diff_num_shares >= 0 for order in child_orders])
+        is_sell = ~is_buy
+        # Same as in `_get_execution_prices()`.
+        buy_prices = (1.0 - perc) * bids + perc * asks
+        sell_prices = perc * bids + (1.0 - perc) * asks
+        prices = is_buy * buy_prices + is_sell * sell_prices
+    return prices
+
+
 def fill_orders_fully_twap(
     market_data: mdata.MarketData,
     timestamp_col: str,
@@ -563,14 +649,24 @@ def fill_orders_fully_twap(
     )
     # Split the orders in child orders over the period of time.
     child_orders = _split_in_child_twap_orders(orders, freq_as_pd_string)
-    #
+    # Price all the child orders at once, instead of calling
+    # `fill_orders_fully_at_once()` for each child order, which queries
+    # `MarketData` once per child order.
+    prices = _get_child_twap_execution_prices(
+        market_data,
+        child_orders,
+        timestamp_col=timestamp_col,
+        column_remap=column_remap,
+    )
     fills = []
-    for order in child_orders:
-        fills_tmp = fill_orders_fully_at_once(
-            market_data, timestamp_col, column_remap, [order]
-        )
-        hdbg.dassert_eq(len(fills_tmp), 1)
-        fills.append(fills_tmp[0])
+    for order, price in zip(child_orders, prices):
+        _LOG.debug(hprint.to_str("order"))
+        if not np.isfinite(price):
+            _LOG.warning("Unable to fill order=\n%s", order)
+            continue
+        fill = Fill(order, order.end_timestamp, order.diff_num_shares, price)
+        _LOG.debug(hprint.to_str("fill"))
+        fills.append(fill)
     return fills
 
 
@@ -8,14 +8,20 @@ import oms.ccxt.abstract_ccxt_broker as ocabccbr
 
 import abc
 import asyncio
+import concurrent.futures
+import functools
 import logging
 import os
 import re
-from typing import Any, Callable, Dict, List, Optional, Tuple
+import statistics
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import ccxt
 import pandas as pd
 
+import helpers.hasyncio as hasynci
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hio as hio
@@ -35,6 +41,11 @@ _LOG = logging.getLogger(__name__)
 
 # Max number of order submission retries.
 _MAX_ORDER_SUBMIT_RETRIES = 3
+# Max number of requests in flight to the exchange.
+_MAX_CONCURRENT_REQUESTS = 10
+# Min time between the start of two requests to the exchange.
+# E.g., Binance futures allows 300 orders every 10 seconds.
+_RATE_LIMIT_IN_MS = 35.0
 
 CcxtData = Dict[str, Any]
 
@@ -59,6 +70,8 @@ class AbstractCcxtBroker(ombroker.Broker):
         #  separately.
         bid_ask_im_client: Optional[icdc.ImClient] = None,
         max_order_submit_retries: Optional[int] = None,
+        max_concurrent_requests: Optional[int] = None,
+        rate_limit_in_ms: Optional[float] = None,
         **kwargs: Any,
     ) -> None:
         """
@@ -77,6 +90,10 @@ class AbstractCcxtBroker(ombroker.Broker):
             (required to calculate price for limit orders)
         :param max_order_submit_retries: maximum number of attempts to submit
             an order if the first try is unsuccessful
+        :param max_concurrent_requests: maximum number of requests in flight to
+            the exchange
+        :param rate_limit_in_ms: minimum time between the start of two requests
+            to the exchange
         :param *args: `ombroker.Broker` positional arguments
         :param **kwargs: `ombroker.Broker` keyword arguments
         """
@@ -88,6 +105,30 @@ class AbstractCcxtBroker(ombroker.Broker):
         self.max_order_submit_retries = (
             max_order_submit_retries or _MAX_ORDER_SUBMIT_RETRIES
         )
+        # The CCXT calls are blocking, so they are run in a pool of threads to
+        # send concurrent requests to the exchange.
+        self._max_concurrent_requests = (
+            max_concurrent_requests or _MAX_CONCURRENT_REQUESTS
+        )
+        hdbg.dassert_lte(1, self._max_concurrent_requests)
+        if rate_limit_in_ms is None:
+            rate_limit_in_ms = _RATE_LIMIT_IN_MS
+        self._rate_limit_in_ms = rate_limit_in_ms
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._max_concurrent_requests
+        )
+        # The CCXT exchanges are not thread-safe (e.g., they store the state of
+        # the last response), so each request run in `self._executor` uses an
+        # exchange that no other request is using (see `_call_exchange()`).
+        self._idle_exchanges: List[ccxt.Exchange] = []
+        self._thread_local = threading.local()
+        # The asyncio objects bounding the requests are bound to an event loop,
+        # so they are created in `_call_exchange()`.
+        self._request_event_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._request_semaphore: Optional[asyncio.Semaphore] = None
+        self._rate_limiter: Optional[hasynci.RateLimiter] = None
+        # Stats about the submission of each wave of child orders.
+        self._child_order_wave_stats: List[Dict[str, Any]] = []
         self._exchange_id = exchange_id
         #
         hdbg.dassert_in(account_type, ["trading", "sandbox"])
@@ -457,14 +498,7 @@ class AbstractCcxtBroker(ombroker.Broker):
         :return: list of dicts with trades in the format described in
             https://docs.ccxt.com/#/?id=trade-structure
         """
-        # Map currency symbols to the passed CCXT orders.
-        symbol_to_order_mapping: Dict[str, List[CcxtData]] = {}
-        for order in ccxt_orders:
-            symbol = order["symbol"]
-            if symbol in symbol_to_order_mapping:
-                symbol_to_order_mapping[symbol].append(order)
-            else:
-                symbol_to_order_mapping[symbol] = [order]
+        symbol_to_order_mapping = self._get_symbol_to_ccxt_orders(ccxt_orders)
         # Get trades for each symbol provided in the list of orders.
         # The trades are loaded for each symbol separately and then filtered
         # to leave only those corresponding to provided CCXT orders.
@@ -474,6 +508,24 @@ class AbstractCcxtBroker(ombroker.Broker):
             trades.extend(symbol_trades)
         return trades
 
+    def close(self) -> None:
+        """
+        Release the threads used to send the requests to the exchange.
+        """
+        self._executor.shutdown(wait=True)
+
+    def get_child_order_wave_stats(self) -> pd.DataFrame:
+        """
+        Return the stats about the submission of each wave of child orders.
+
+        :return: df with a row for each wave and columns like
+            `num_child_orders`, `max_submission_latency_in_secs`,
+            `cancellation_latency_in_secs` (see
+            `_update_child_order_wave_stats()`)
+        """
+        wave_stats = pd.DataFrame(self._child_order_wave_stats)
+        return wave_stats
+
     def get_open_positions(self) -> Dict[str, float]:
         """
         Return all the open positions (with non-zero amount) from the exchange.
@@ -605,6 +657,22 @@ class AbstractCcxtBroker(ombroker.Broker):
 
     # //////////////////////////////////////////////////////////////////////////
 
+    @staticmethod
+    def _get_symbol_to_ccxt_orders(
+        ccxt_orders: List[CcxtData],
+    ) -> Dict[str, List[CcxtData]]:
+        """
+        Map currency symbols to the passed CCXT orders.
+        """
+        symbol_to_order_mapping: Dict[str, List[CcxtData]] = {}
+        for order in ccxt_orders:
+            symbol = order["symbol"]
+            if symbol in symbol_to_order_mapping:
+                symbol_to_order_mapping[symbol].append(order)
+            else:
+                symbol_to_order_mapping[symbol] = [order]
+        return symbol_to_order_mapping
+
     @staticmethod
     def _is_submitted_order(order: omorder.Order) -> bool:
         """
@@ -870,6 +938,164 @@ class AbstractCcxtBroker(ombroker.Broker):
         # for order being accepted.
         _ = order_receipt
 
+    # //////////////////////////////////////////////////////////////////////////
+
+    @property
+    def _exchange(self) -> ccxt.Exchange:
+        """
+        Return the exchange to use in the current thread.
+
+        The requests run by `_call_exchange()` use the exchange assigned to
+        them, the other code the exchange of the broker.
+        """
+        exchange = getattr(self._thread_local, "exchange", None)
+        if exchange is None:
+            exchange = self._broker_exchange
+        return exchange
+
+    @_exchange.setter
+    def _exchange(self, exchange: ccxt.Exchange) -> None:
+        self._broker_exchange = exchange
+
+    async def _call_exchange(
+        self, func: Union[str, Callable], *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Call a blocking CCXT method without blocking the event loop.
+
+        The call is run in a pool of threads, so that requests issued by
+        different coroutines are in flight at the same time. The requests are
+        bounded by `max_concurrent_requests` and spaced out by
+        `rate_limit_in_ms`.
+
+        Each request uses its own exchange, since the CCXT exchanges are not
+        thread-safe. The exchanges are reused by the next requests, so at most
+        `max_concurrent_requests` exchanges are created.
+
+        :param func: name of the CCXT method to call (e.g., "createOrder") or
+            a method of the broker calling CCXT through `self._exchange`
+            (e.g., `self.cancel_open_orders`)
+        :return: the value returned by `func`
+        """
+        event_loop = asyncio.get_running_loop()
+        if self._request_event_loop is not event_loop:
+            # Create the objects in the loop running the requests.
+            self._request_event_loop = event_loop
+            self._request_semaphore = asyncio.Semaphore(
+                self._max_concurrent_requests
+            )
+            self._rate_limiter = hasynci.RateLimiter(self._rate_limit_in_ms)
+        async with self._request_semaphore:
+            await self._rate_limiter.wait()
+            # The semaphore bounds the number of exchanges in use. The idle
+            # exchanges are accessed only by the event loop, so they don't
+            # need a lock.
+            if self._idle_exchanges:
+                exchange = self._idle_exchanges.pop()
+            else:
+                exchange = self._log_into_exchange()
+            try:
+                func = functools.partial(
+                    self._call_with_exchange, exchange, func, *args, **kwargs
+                )
+                ret = await event_loop.run_in_executor(self._executor, func)
+            finally:
+                self._idle_exchanges.append(exchange)
+        return ret
+
+    def _call_with_exchange(
+        self,
+        exchange: ccxt.Exchange,
+        func: Union[str, Callable],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Call `func` using `exchange` as the exchange of the current thread.
+
+        See `_call_exchange()` for params.
+        """
+        self._thread_local.exchange = exchange
+        try:
+            if isinstance(func, str):
+                func = getattr(exchange, func)
+            ret = func(*args, **kwargs)
+        finally:
+            del self._thread_local.exchange
+        return ret
+
+    async def _cancel_open_orders_for_symbols(
+        self, ccxt_symbols: List[str]
+    ) -> None:
+        """
+        Cancel all the open orders for the given currency pairs concurrently.
+        """
+        coroutines = [
+            self._call_exchange(self.cancel_open_orders, ccxt_symbol)
+            for ccxt_symbol in ccxt_symbols
+        ]
+        await asyncio.gather(*coroutines)
+
+    async def _get_ccxt_trades_concurrently(
+        self,
+        ccxt_orders: List[CcxtData],
+    ) -> List[CcxtData]:
+        """
+        Same as `get_ccxt_trades()` but loading the trades of all the symbols
+        concurrently.
+        """
+        symbol_to_order_mapping = self._get_symbol_to_ccxt_orders(ccxt_orders)
+        coroutines = [
+            self._call_exchange(self._get_ccxt_trades_for_one_symbol, orders)
+            for orders in symbol_to_order_mapping.values()
+        ]
+        symbol_trades = await asyncio.gather(*coroutines)
+        trades = [trade for trades in symbol_trades for trade in trades]
+        return trades
+
+    def _update_child_order_wave_stats(
+        self,
+        wave_start_timestamp: pd.Timestamp,
+        child_orders: List[omorder.Order],
+        wave_start_time: float,
+    ) -> Dict[str, Any]:
+        """
+        Store the stats about the submission of a wave of child orders.
+
+        The submission latency of a child order is the time from the start of
+        the wave to the end of the order submission, i.e., how late in the wave
+        the order reached the exchange. The duration of the wave ends when this
+        method is called, so it should be called right after the last child
+        order is submitted and before waiting for the next wave.
+
+        :param wave_start_timestamp: wall clock time at the start of the wave
+        :param child_orders: child orders of the wave
+        :param wave_start_time: `time.perf_counter()` at the start of the wave
+        :return: the stats of the wave, which can be updated in place with
+            more info (e.g., about the cancellation of the orders)
+        """
+        latencies = [
+            child_order.extra_params["submission_latency_in_secs"]
+            for child_order in child_orders
+            if "submission_latency_in_secs" in child_order.extra_params
+        ]
+        num_submitted_child_orders = sum(
+            self._is_submitted_order(child_order) for child_order in child_orders
+        )
+        wave_stats = {
+            "wave_start_timestamp": wave_start_timestamp,
+            "num_child_orders": len(child_orders),
+            "num_submitted_child_orders": num_submitted_child_orders,
+            "max_submission_latency_in_secs": max(latencies, default=None),
+            "mean_submission_latency_in_secs": (
+                statistics.mean(latencies) if latencies else None
+            ),
+            "wave_duration_in_secs": time.perf_counter() - wave_start_time,
+        }
+        _LOG.debug(hprint.to_str("wave_stats"))
+        self._child_order_wave_stats.append(wave_stats)
+        return wave_stats
+
     def _get_market_info(self) -> Dict[int, Any]:
         """
         Load market information from the given exchange and map to asset ids.
@@ -1139,7 +1365,7 @@ class AbstractCcxtBroker(ombroker.Broker):
                     position_size,
                     max_leverage,
                 )
-                self._exchange.setLeverage(max_leverage, symbol)
+                await self._call_exchange("setLeverage", max_leverage, symbol)
                 _LOG.debug("Submitting order=%s", order)
                 params = {
                     "portfolio_id": self._portfolio_id,
@@ -1154,7 +1380,8 @@ class AbstractCcxtBroker(ombroker.Broker):
                     # keeping this assertion here.
                     hdbg.dassert_eq(order_type, "market")
                     _LOG.debug("Creating reduceOnly order: %s", str(order))
-                    ccxt_order_response = self._exchange.createReduceOnlyOrder(
+                    ccxt_order_response = await self._call_exchange(
+                        "createReduceOnlyOrder",
                         symbol=symbol,
                         type=order_type,
                         side=side,
@@ -1164,7 +1391,8 @@ class AbstractCcxtBroker(ombroker.Broker):
                     )
                 elif order_type == "market":
                     # Simple market order.
-                    ccxt_order_response = self._exchange.createOrder(
+                    ccxt_order_response = await self._call_exchange(
+                        "createOrder",
                         symbol=symbol,
                         type=order_type,
                         side=side,
@@ -1175,14 +1403,16 @@ class AbstractCcxtBroker(ombroker.Broker):
                     # Limit order.
                     hdbg.dassert_isinstance(limit_price, float)
                     if side == "buy":
-                        ccxt_order_response = self._exchange.createLimitBuyOrder(
+                        ccxt_order_response = await self._call_exchange(
+                            "createLimitBuyOrder",
                             symbol=symbol,
                             amount=position_size,
                             price=limit_price,
                             params=params,
                         )
                     elif side == "sell":
-                        ccxt_order_response = self._exchange.createLimitSellOrder(
+                        ccxt_order_response = await self._call_exchange(
+                            "createLimitSellOrder",
                             symbol=symbol,
                             amount=position_size,
                             price=limit_price,
@@ -1329,7 +1559,7 @@ class AbstractCcxtBroker(ombroker.Broker):
                 sleep_time,
             )
             sleep_time = 0
-        await asyncio.sleep(duration_in_secs)
+        await asyncio.sleep(sleep_time)
         _LOG.debug("Waiting for %s seconds done", sleep_time)
 
     # ///////////
@@ -356,11 +356,12 @@ class TestCcxtBroker_TestCase(hunitest.TestCase, abc.ABC):
             secret_id,
             bid_ask_im_client,
         )
-        # Check broker state and remove dynamic mock ids.
+        # Check broker state and remove dynamic mock ids and object addresses.
         broker_state_with_mock_ids = pprint.pformat(vars(broker))
         broker_state = re.sub(
             r" id='(.*?)'>", " id='***'>", broker_state_with_mock_ids
         )
+        broker_state = re.sub(r" at 0x[0-9a-f]+>", " at 0x***>", broker_state)
         self.check_string(broker_state, test_class_name=self.get_class_name())
 
     def test_log_into_exchange1(self) -> None:
@@ -863,7 +864,11 @@ class TestCcxtBroker_TestCase(hunitest.TestCase, abc.ABC):
             universe_version=universe_version,
             stage=stage,
             log_dir=log_dir,
+            # Don't space out the requests, since `asyncio.sleep()` is mocked
+            # in some tests.
+            rate_limit_in_ms=0.0,
         )
+        self.addCleanup(broker.close)
         return broker
 
     # //////////////////////////////////////////////////////////////////////////
@@ -6,6 +6,7 @@ import oms.ccxt.ccxt_broker_v2 as occcbrv2
 
 import asyncio
 import logging
+import time
 from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
@@ -144,13 +145,16 @@ class CcxtBroker_v2(ocabccbr.AbstractCcxtBroker):
             )
             # Cancel orders after waiting for them to finish.
             # Note: the alignment of the waiting time for the next minute
-            # is handled in `_submit_twap_child_order` coroutine.
-            for ccxt_symbol in parent_orders_ccxt_symbols:
-                self.cancel_open_orders(ccxt_symbol)
+            # is handled in `_submit_twap_child_orders()`.
+            start_time = time.perf_counter()
+            await self._cancel_open_orders_for_symbols(parent_orders_ccxt_symbols)
+            self._child_order_wave_stats[-1]["cancellation_latency_in_secs"] = (
+                time.perf_counter() - start_time
+            )
             # Log CCXT fills and trades.
             if self._log_dir is not None:
-                ccxt_fills = self.get_ccxt_fills(child_orders)
-                ccxt_trades = self.get_ccxt_trades(ccxt_fills)
+                ccxt_fills = await self._get_ccxt_fills_concurrently(child_orders)
+                ccxt_trades = await self._get_ccxt_trades_concurrently(ccxt_fills)
                 oms_fills=[]
                 self.log_ccxt_fills(self._log_dir, self._get_wall_clock_time, ccxt_fills, ccxt_trades, oms_fills)
             _LOG.debug(
@@ -211,6 +215,24 @@ class CcxtBroker_v2(ocabccbr.AbstractCcxtBroker):
             ccxt_order_structures.append(ccxt_order_structure)
         return ccxt_order_structures
 
+    async def _get_ccxt_fills_concurrently(
+        self, orders: List[omorder.Order]
+    ) -> List[Dict[str, Any]]:
+        """
+        Same as `get_ccxt_fills()` but querying the orders concurrently.
+        """
+        coroutines = [
+            self._call_exchange(self._get_ccxt_order_structure, order)
+            for order in orders
+        ]
+        ccxt_order_structures = await asyncio.gather(*coroutines)
+        ccxt_order_structures = [
+            ccxt_order_structure
+            for ccxt_order_structure in ccxt_order_structures
+            if ccxt_order_structure is not None
+        ]
+        return ccxt_order_structures
+
     @staticmethod
     def _update_stats_for_order(
         order: omorder.Order, tag: str, value: Any
@@ -250,6 +272,7 @@ class CcxtBroker_v2(ocabccbr.AbstractCcxtBroker):
         passivity_factor,
         bid_ask_data,
         parent_order,
+        wave_start_time: float,
     ) -> omorder.Order:
         # Get the total shares we want to achieve for the parent order during
         # the entire TWAP order.
@@ -329,12 +352,8 @@ class CcxtBroker_v2(ocabccbr.AbstractCcxtBroker):
             "child_order_submitted",
             self.market_data.get_wall_clock_time(),
         )
-        # TODO(gp): Pass the execution frequency.
-        await self._align_with_next_child_order_start_timestamp(60)
-        self._update_stats(
-            child_order,
-            "aligned_with_next_child_order_start_timestamp",
-            self.market_data.get_wall_clock_time(),
+        child_order.extra_params["submission_latency_in_secs"] = (
+            time.perf_counter() - wave_start_time
         )
         #
         is_submitted_order = self._is_submitted_order(child_order)
@@ -385,14 +404,19 @@ class CcxtBroker_v2(ocabccbr.AbstractCcxtBroker):
     ) -> List[pd.DataFrame]:
         """
         Given a set of parent orders, create and submit TWAP children orders.
+
+        The child orders are submitted concurrently and the stats of the wave
+        are stored in `self._child_order_wave_stats`.
         """
+        wave_start_time = time.perf_counter()
+        wave_start_timestamp = self.market_data.get_wall_clock_time()
         # Get market data for the latest available 10 seconds.
         bid_ask_data = self._bid_ask_market_data.get_data_for_last_period(
             pd.Timedelta("10S")
         )
         _LOG.debug(hpandas.df_to_str(bid_ask_data))
         # Get all the open positions to determine `curr_num_shares`.
-        open_positions = self.get_open_positions()
+        open_positions = await self._call_exchange(self.get_open_positions)
         _LOG.debug(hprint.to_str("open_positions"))
         #
         coroutines = []
@@ -411,6 +435,7 @@ class CcxtBroker_v2(ocabccbr.AbstractCcxtBroker):
                 passivity_factor,
                 bid_ask_data,
                 order,
+                wave_start_time,
             )
             self._update_stats(
                 order,
@@ -430,6 +455,19 @@ class CcxtBroker_v2(ocabccbr.AbstractCcxtBroker):
             )
         #
         # order_submission_time_scope=ts.get_result()
+        self._update_child_order_wave_stats(
+            wave_start_timestamp, child_orders, wave_start_time
+        )
+        # Wait for the next wave once for all the child orders, after the end
+        # of the wave is recorded.
+        # TODO(gp): Pass the execution frequency.
+        await self._align_with_next_child_order_start_timestamp(60)
+        for child_order in child_orders:
+            self._update_stats(
+                child_order,
+                "aligned_with_next_child_order_start_timestamp",
+                self.market_data.get_wall_clock_time(),
+            )
         return child_orders
 
     async def _submit_orders(
@@ -136,6 +136,7 @@ def _main(parser: argparse.ArgumentParser) -> None:
     hdbg.dassert_no_duplicates([order.asset_id for order in orders])
     passivity_factor = 0.55
     _ = asyncio.run(broker.submit_twap_orders(orders, passivity_factor))
+    broker.close()
 
 
 if __name__ == "__main__":
@@ -113,6 +113,7 @@ def _main(parser: argparse.ArgumentParser) -> None:
     _ = asyncio.run(
         broker.submit_twap_orders([order], execution_freq=execution_freq)
     )
+    broker.close()
 
 
 if __name__ == "__main__":
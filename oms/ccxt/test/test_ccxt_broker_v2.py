@@ -1,16 +1,91 @@
 import asyncio
 import logging
+import threading
+import time
 import unittest.mock as umock
-from typing import Type
+from typing import Any, Dict, List, Type
 
 import ccxt
+import pandas as pd
 
 import oms.ccxt.abstract_ccxt_broker as ocabccbr
 import oms.ccxt.ccxt_broker_test_case as occbteca
 import oms.ccxt.ccxt_broker_v2 as occcbrv2
+import oms.ccxt.ccxt_utils as occccuti
 
 _LOG = logging.getLogger(__name__)
 
+
+# #############################################################################
+# _FakeExchange
+# #############################################################################
+
+
+class _FakeExchange:
+    """
+    Exchange answering each request after a delay, in place of Binance.
+
+    The requests are served by the threads of the broker, so the state is
+    guarded by a lock.
+    """
+
+    def __init__(self, latency_in_secs: float) -> None:
+        self._latency_in_secs = latency_in_secs
+        self._lock = threading.Lock()
+        self._next_ccxt_id = 0
+        self._num_requests_in_flight = 0
+        self.max_num_requests_in_flight = 0
+        self.cancelled_symbols: List[str] = []
+
+    def setLeverage(self, leverage: int, symbol: str) -> None:
+        _ = leverage, symbol
+        self._serve_request()
+
+    def createLimitBuyOrder(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._create_order("buy", **kwargs)
+
+    def createLimitSellOrder(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._create_order("sell", **kwargs)
+
+    def fetchPositions(self) -> List[Dict[str, Any]]:
+        self._serve_request()
+        return []
+
+    def cancelAllOrders(self, symbol: str) -> None:
+        self._serve_request()
+        with self._lock:
+            self.cancelled_symbols.append(symbol)
+
+    def fetchMyTrades(self, symbol: str, limit: int) -> List[Dict[str, Any]]:
+        _ = limit
+        self._serve_request()
+        # Return a trade for each of the orders 0 and 1.
+        trades = [
+            {"info": {"orderId": order_id}, "symbol": symbol, "id": order_id}
+            for order_id in ["0", "1"]
+        ]
+        return trades
+
+    def _create_order(self, side: str, **kwargs: Any) -> Dict[str, Any]:
+        self._serve_request()
+        with self._lock:
+            ccxt_id = self._next_ccxt_id
+            self._next_ccxt_id += 1
+        ccxt_order = {"id": str(ccxt_id), "side": side}
+        ccxt_order.update(kwargs)
+        return ccxt_order
+
+    def _serve_request(self) -> None:
+        with self._lock:
+            self._num_requests_in_flight += 1
+            self.max_num_requests_in_flight = max(
+                self.max_num_requests_in_flight, self._num_requests_in_flight
+            )
+        time.sleep(self._latency_in_secs)
+        with self._lock:
+            self._num_requests_in_flight -= 1
+
+
 # #############################################################################
 # TestCcxtBroker_V2
 # #############################################################################
@@ -114,6 +189,143 @@ class TestCcxtBroker_V2(occbteca.TestCcxtBroker_TestCase):
         broker._update_stats_for_order(order, tag, value)
         self.assertDictEqual({tag: value}, order.extra_params["stats"])
 
+    def test_submit_twap_child_orders1(self) -> None:
+        """
+        Check that the child orders of a wave are submitted concurrently.
+        """
+        broker = self._get_local_test_broker()
+        exchange = _FakeExchange(latency_in_secs=0.1)
+        self._set_exchange(broker, exchange)
+        broker._bid_ask_market_data = umock.MagicMock()
+        broker._bid_ask_market_data.get_data_for_last_period.return_value = (
+            pd.DataFrame()
+        )
+        broker.market_data.get_wall_clock_time.return_value = pd.Timestamp(
+            "2022-08-05 10:35:55-04:00", tz="America/New_York"
+        )
+        parent_orders = self._get_test_orders2()
+        for parent_order in parent_orders:
+            parent_order.extra_params["ccxt_id"] = []
+        parent_order_ids_to_child_order_shares = {0: 5.0, 1: -10.0}
+        execution_freq = pd.Timedelta("1T")
+        passivity_factor = 0.4
+        # Run.
+        alignment_in_secs = 1.0
+
+        async def _align_with_next_child_order_start_timestamp(
+            *args: Any,
+        ) -> None:
+            _ = args
+            await asyncio.sleep(alignment_in_secs)
+
+        with umock.patch.object(
+            occccuti, "calculate_limit_price", return_value={"limit_price": 1.0}
+        ), umock.patch.object(
+            broker,
+            "_align_with_next_child_order_start_timestamp",
+            side_effect=_align_with_next_child_order_start_timestamp,
+        ) as align_mock:
+            child_orders = asyncio.run(
+                broker._submit_twap_child_orders(
+                    parent_orders,
+                    parent_order_ids_to_child_order_shares,
+                    execution_freq,
+                    passivity_factor,
+                )
+            )
+        # Check that the requests for the 2 orders were in flight together.
+        self.assertEqual(exchange.max_num_requests_in_flight, 2)
+        ccxt_ids = sorted(
+            child_order.extra_params["ccxt_id"] for child_order in child_orders
+        )
+        self.assertListEqual(ccxt_ids, [0, 1])
+        for parent_order in parent_orders:
+            self.assertEqual(len(parent_order.extra_params["ccxt_id"]), 1)
+        # Check the stats of the wave.
+        wave_stats = broker.get_child_order_wave_stats()
+        self.assertEqual(wave_stats.shape[0], 1)
+        self.assertEqual(wave_stats.loc[0, "num_child_orders"], 2)
+        self.assertEqual(wave_stats.loc[0, "num_submitted_child_orders"], 2)
+        self.assertLessEqual(
+            wave_stats.loc[0, "max_submission_latency_in_secs"],
+            wave_stats.loc[0, "wave_duration_in_secs"],
+        )
+        # The wave waits for the next one once and after its end is recorded.
+        self.assertEqual(align_mock.await_count, 1)
+        self.assertLess(
+            wave_stats.loc[0, "wave_duration_in_secs"], alignment_in_secs
+        )
+
+    def test_cancel_open_orders_for_symbols1(self) -> None:
+        """
+        Check that the orders of all the symbols are cancelled concurrently.
+        """
+        broker = self._get_local_test_broker()
+        exchange = _FakeExchange(latency_in_secs=0.2)
+        self._set_exchange(broker, exchange)
+        symbols = ["BTC/USDT", "ETH/USDT"]
+        asyncio.run(broker._cancel_open_orders_for_symbols(symbols))
+        self.assertListEqual(sorted(exchange.cancelled_symbols), symbols)
+        self.assertEqual(exchange.max_num_requests_in_flight, 2)
+
+    def test_get_ccxt_trades_concurrently1(self) -> None:
+        """
+        Check that loading the trades concurrently gives the same results as
+        `get_ccxt_trades()`.
+        """
+        broker = self._get_local_test_broker()
+        exchange = _FakeExchange(latency_in_secs=0.2)
+        self._set_exchange(broker, exchange)
+        ccxt_orders = [
+            {"id": "0", "symbol": "BTC/USDT"},
+            {"id": "1", "symbol": "ETH/USDT"},
+        ]
+        actual = asyncio.run(broker._get_ccxt_trades_concurrently(ccxt_orders))
+        self.assertEqual(exchange.max_num_requests_in_flight, 2)
+        expected = broker.get_ccxt_trades(ccxt_orders)
+        self.assertListEqual(actual, expected)
+        # Only the trade of the order of each symbol is kept.
+        self.assertEqual(len(actual), 2)
+
+    def test_call_exchange1(self) -> None:
+        """
+        Check that the concurrent requests use different exchanges.
+        """
+        broker = self._get_local_test_broker()
+        exchanges = []
+
+        def _log_into_exchange() -> _FakeExchange:
+            exchange = _FakeExchange(latency_in_secs=0.2)
+            exchanges.append(exchange)
+            return exchange
+
+        broker._log_into_exchange = _log_into_exchange
+
+        async def _call_exchange() -> None:
+            coroutines = [
+                broker._call_exchange(broker.get_open_positions) for _ in range(3)
+            ]
+            await asyncio.gather(*coroutines)
+            # The next requests reuse the exchanges.
+            await broker._call_exchange("fetchPositions")
+
+        asyncio.run(_call_exchange())
+        self.assertEqual(len(exchanges), 3)
+        for exchange in exchanges:
+            self.assertEqual(exchange.max_num_requests_in_flight, 1)
+        # The exchange of the broker is not used by the requests.
+        self.assertEqual(broker._exchange.fetchPositions.call_count, 0)
+
+    @staticmethod
+    def _set_exchange(
+        broker: ocabccbr.AbstractCcxtBroker, exchange: _FakeExchange
+    ) -> None:
+        """
+        Use `exchange` for the broker and for all its requests.
+        """
+        broker._exchange = exchange
+        broker._log_into_exchange = lambda: exchange
+
     def _get_local_test_broker(self) -> ocabccbr.AbstractCcxtBroker:
         """
         Return a CCXT Broker for local testing.
@@ -13,6 +13,7 @@ import pandas as pd
 from tqdm.autonotebook import tqdm
 
 import helpers.hdbg as hdbg
+import helpers.hnumba as hnumba
 import helpers.hprint as hprint
 import helpers.htqdm as htqdm
 
@@ -21,7 +22,6 @@ _LOG = logging.getLogger(__name__)
 # _LOG.debug = _LOG.info
 
 # TODO(gp): Generalize for different intervals, besides 5 mins trading.
-# TODO(gp): Extend for computing PnL on multiple stocks.
 # TODO(gp): Consider ts -> datetime_, {start,end}_ts -> {start,end}_datetime for
 #  uniformity with the rest of the code.
 # TODO(gp): Find a better name for `future_snoop_allocation` that represents the
@@ -128,6 +128,30 @@ def get_example_market_data2(
     return df, df_5mins
 
 
+def get_example_multi_asset_market_data(
+    num_samples: int, num_assets: int, seed: int
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Fixed random example with multiple assets.
+
+    :return:
+        - 1-minute market data with columns like `(price, asset_id)`
+        - 5-minute predictions with a column for each asset, splitting the
+          wealth equally among the assets
+    """
+    dfs = {}
+    preds = {}
+    for asset_id in range(num_assets):
+        asset_seed = seed + asset_id
+        df = get_random_market_data(num_samples, seed=asset_seed)
+        df_5mins = resample_data(df, "instantaneous", seed=asset_seed)
+        dfs[asset_id] = df
+        preds[asset_id] = df_5mins["preds"] / num_assets
+    df = pd.concat(dfs, axis=1).swaplevel(axis=1).sort_index(axis=1)
+    preds_df = pd.DataFrame(preds)
+    return df, preds_df
+
+
 # #############################################################################
 
 
@@ -744,6 +768,304 @@ def _compute_pnl_level2(
     return accounting
 
 
+# #############################################################################
+# Vectorized level 2 simulation.
+# #############################################################################
+
+
+def compute_pnl_level2_vectorized(
+    df: pd.DataFrame,
+    preds_df: pd.DataFrame,
+    initial_wealth: float,
+    config: Dict[str, Any],
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Run the level 2 simulation for multiple assets with a compiled kernel.
+
+    This implements the same accounting of `compute_pnl_level2()`, but:
+    - the assets share the same cash and wealth, and a prediction represents
+      the fraction of the wealth to allocate to an asset (for a single asset
+      the results are the same as `compute_pnl_level2()`)
+    - the execution prices of the orders for all the bars and assets are
+      computed with vectorized operations, instead of creating an `Order` for
+      each bar
+    - the loop over bars and assets runs in a numba kernel (if available)
+
+    As in `compute_pnl_level2()`, at each bar there is a single order per
+    asset spanning the next bar, which is executed at once. This is equivalent
+    to merging all the orders with the same interval, as done by
+    `_get_orders_to_execute()`.
+
+    :param df: 1-minute market data with columns like `(price, asset_id)`,
+        `(ask, asset_id)`, `(bid, asset_id)`
+    :param preds_df: 5-minute predictions with a column for each asset
+    :param config: same as in `compute_pnl_level2()`
+    :return:
+        - df with the accounting for each asset, with columns like
+          `(holdings, asset_id)`
+        - df with the accounting of the portfolio, i.e., cash, wealth, PnL
+    """
+    hdbg.dassert_isinstance(df, pd.DataFrame)
+    hdbg.dassert_eq(df.columns.nlevels, 2)
+    hdbg.dassert(df.index.is_monotonic_increasing)
+    hdbg.dassert(preds_df.index.is_monotonic_increasing)
+    hdbg.dassert_lte(2, preds_df.shape[0])
+    asset_ids = preds_df.columns
+    preds = preds_df.to_numpy(dtype=float)
+    hdbg.dassert(np.isfinite(preds).all(), "preds_df=%s", preds_df)
+    price_column = config["price_column"]
+    order_type = config["order_type"]
+    future_snoop_allocation = config.get("future_snoop_allocation", False)
+    # Each order is executed in the interval (ts, ts + 5 mins].
+    offset_5min = pd.Timedelta(minutes=5)
+    ts_start = preds_df.index
+    ts_end = ts_start + offset_5min
+    # Get the prices to mark to market.
+    mark_price = _get_prices_at(df, price_column, asset_ids, ts_start)
+    next_mark_price = _get_prices_at(
+        df, price_column, asset_ids, ts_end[:-1], num_rows=len(ts_end)
+    )
+    # Get the execution prices of the buy and sell orders. The last bar
+    # doesn't place orders.
+    buy_price, sell_price = _get_execution_prices(
+        df, order_type, asset_ids, ts_start[:-1], ts_end[:-1]
+    )
+    buy_price = _append_nan_row(buy_price)
+    sell_price = _append_nan_row(sell_price)
+    # Run the simulation.
+    (
+        target_n_shares,
+        holdings,
+        diff_n_shares,
+        holdings_next,
+        cash,
+        wealth,
+        cash_next,
+    ) = _compute_pnl_level2_kernel(
+        preds,
+        mark_price,
+        next_mark_price,
+        buy_price,
+        sell_price,
+        initial_wealth,
+        future_snoop_allocation,
+    )
+    # Package the results.
+    asset_accounting = {
+        "target_n_shares": target_n_shares,
+        "holdings": holdings,
+        "diff_n_shares": diff_n_shares,
+        # All the orders are filled.
+        "filled_n_shares": diff_n_shares,
+        "holdings+1": holdings_next,
+    }
+    asset_df = pd.concat(
+        {
+            key: pd.DataFrame(value, index=preds_df.index, columns=asset_ids)
+            for key, value in asset_accounting.items()
+        },
+        axis=1,
+    )
+    portfolio_df = pd.DataFrame(
+        {"cash": cash, "wealth": wealth, "cash+1": cash_next},
+        index=preds_df.index,
+    )
+    portfolio_df["pnl"] = portfolio_df["wealth"].pct_change()
+    return asset_df, portfolio_df
+
+
+def _append_nan_row(values: np.ndarray) -> np.ndarray:
+    nan_row = np.full((1, values.shape[1]), np.nan)
+    return np.concatenate([values, nan_row])
+
+
+def _get_prices_at(
+    df: pd.DataFrame,
+    column: str,
+    asset_ids: pd.Index,
+    timestamps: pd.DatetimeIndex,
+    *,
+    num_rows: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Get the instantaneous prices of `column` at `timestamps`.
+
+    :param num_rows: number of rows of the returned array, padding with NaNs
+    :return: array with a row for each timestamp and a column for each asset
+    """
+    hdbg.dassert_in(column, df.columns.get_level_values(0))
+    hdbg.dassert_is_subset(timestamps, df.index)
+    prices = df[column].reindex(index=timestamps, columns=asset_ids)
+    prices = prices.to_numpy(dtype=float)
+    hdbg.dassert(np.isfinite(prices).all(), "%s has NaNs", column)
+    if num_rows is not None:
+        hdbg.dassert_lte(prices.shape[0], num_rows)
+        padding = np.full((num_rows - prices.shape[0], prices.shape[1]), np.nan)
+        prices = np.concatenate([prices, padding])
+    return prices
+
+
+def _get_prices(
+    df: pd.DataFrame,
+    column: str,
+    asset_ids: pd.Index,
+    ts_start: pd.DatetimeIndex,
+    ts_end: pd.DatetimeIndex,
+    timing: str,
+) -> np.ndarray:
+    """
+    Vectorized version of `Order._get_price()` for intervals `(ts_start,
+    ts_end]`.
+    """
+    if timing == "start":
+        prices = _get_prices_at(df, column, asset_ids, ts_start)
+    elif timing == "end":
+        prices = _get_prices_at(df, column, asset_ids, ts_end)
+    elif timing == "twap":
+        # Compute the mean in (ts_end - 5 mins, ts_end] with a rolling window
+        # closed on the right.
+        hdbg.dassert_is_subset(ts_start, df.index)
+        hdbg.dassert_is_subset(ts_end, df.index)
+        window = ts_end[0] - ts_start[0]
+        hdbg.dassert((ts_end - ts_start == window).all())
+        twap_df = df[column][asset_ids].rolling(window, closed="right").mean()
+        prices = twap_df.reindex(ts_end).to_numpy(dtype=float)
+    else:
+        raise ValueError("Invalid timing='%s'" % timing)
+    return prices
+
+
+def _get_execution_prices(
+    df: pd.DataFrame,
+    type_: str,
+    asset_ids: pd.Index,
+    ts_start: pd.DatetimeIndex,
+    ts_end: pd.DatetimeIndex,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized version of `Order.get_price()`.
+
+    :return: the execution prices of buy and sell orders
+    """
+    # Parse the type.
+    config = type_.split("@")
+    hdbg.dassert_eq(len(config), 2, "Invalid type_='%s'", type_)
+    price_type, timing = config
+    # Get the price depending on the price_type.
+    if price_type in ("price", "midpoint"):
+        column = price_type
+        price = _get_prices(df, column, asset_ids, ts_start, ts_end, timing)
+        buy_price = sell_price = price
+    elif price_type == "full_spread":
+        # Cross the spread depending on buy / sell.
+        buy_price = _get_prices(df, "ask", asset_ids, ts_start, ts_end, timing)
+        sell_price = _get_prices(df, "bid", asset_ids, ts_start, ts_end, timing)
+    elif price_type.startswith("partial_spread"):
+        perc = float(price_type.split("_")[2])
+        hdbg.dassert_lte(0, perc)
+        hdbg.dassert_lte(perc, 1.0)
+        bid_price = _get_prices(df, "bid", asset_ids, ts_start, ts_end, timing)
+        ask_price = _get_prices(df, "ask", asset_ids, ts_start, ts_end, timing)
+        buy_price = perc * ask_price + (1.0 - perc) * bid_price
+        sell_price = (1.0 - perc) * ask_price + perc * bid_price
+    else:
+        raise ValueError("Invalid type='%s'" % type_)
+    return buy_price, sell_price
+
+
+@hnumba.jit
+def _compute_pnl_level2_kernel(
+    preds: np.ndarray,
+    mark_price: np.ndarray,
+    next_mark_price: np.ndarray,
+    buy_price: np.ndarray,
+    sell_price: np.ndarray,
+    initial_wealth: float,
+    future_snoop_allocation: bool,
+) -> Tuple[
+    np.ndarray,
+    np.ndarray,
+    np.ndarray,
+    np.ndarray,
+    np.ndarray,
+    np.ndarray,
+    np.ndarray,
+]:
+    """
+    Simulate the portfolio bar-by-bar, like `_compute_pnl_level2()`.
+
+    :param preds: predictions with a row for each bar and a column for each
+        asset
+    :param mark_price, next_mark_price: prices to mark to market at the
+        beginning and at the end of each bar
+    :param buy_price, sell_price: execution prices of the orders placed at
+        the beginning of each bar
+    :return: per-asset target holdings, holdings, trades and holdings after
+        the trades, and cash, wealth and cash after the trades
+    """
+    num_bars, num_assets = preds.shape
+    target_n_shares = np.full((num_bars, num_assets), np.nan)
+    holdings_out = np.full((num_bars, num_assets), np.nan)
+    diff_n_shares = np.full((num_bars, num_assets), np.nan)
+    holdings_next = np.full((num_bars, num_assets), np.nan)
+    cash_out = np.full(num_bars, np.nan)
+    wealth_out = np.full(num_bars, np.nan)
+    cash_next = np.full(num_bars, np.nan)
+    # Initial balance.
+    holdings = np.zeros(num_assets)
+    cash = initial_wealth
+    for i in range(num_bars):
+        # Mark the portfolio to market.
+        wealth = cash
+        for j in range(num_assets):
+            wealth += holdings[j] * mark_price[i, j]
+        wealth_out[i] = wealth
+        if i == num_bars - 1:
+            # For the last timestamp we only need to mark to market, but not
+            # post any more orders.
+            break
+        # Decide how much to trade.
+        wealth_to_allocate = wealth
+        if future_snoop_allocation:
+            wealth_to_allocate = cash
+            for j in range(num_assets):
+                wealth_to_allocate += holdings[j] * next_mark_price[i, j]
+        cash_out[i] = cash
+        for j in range(num_assets):
+            if future_snoop_allocation:
+                # The direction of the trade is enough to determine the price.
+                if preds[i, j] >= 0:
+                    price_0 = buy_price[i, j]
+                else:
+                    price_0 = sell_price[i, j]
+            else:
+                price_0 = mark_price[i, j]
+            target = wealth_to_allocate / price_0
+            target *= preds[i, j]
+            target_n_shares[i, j] = target
+            holdings_out[i, j] = holdings[j]
+            # Place and execute the order.
+            diff = target - holdings[j]
+            diff_n_shares[i, j] = diff
+            if diff >= 0:
+                executed_price = buy_price[i, j]
+            else:
+                executed_price = sell_price[i, j]
+            holdings[j] += diff
+            holdings_next[i, j] = holdings[j]
+            cash -= executed_price * diff
+        cash_next[i] = cash
+    return (
+        target_n_shares,
+        holdings_out,
+        diff_n_shares,
+        holdings_next,
+        cash_out,
+        wealth_out,
+        cash_next,
+    )
+
+
 use_profiler = False
 # use_profiler = True
 
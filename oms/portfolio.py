@@ -14,6 +14,7 @@ import numpy as np
 import pandas as pd
 from tqdm.autonotebook import tqdm
 
+import core.key_sorted_array_store as cksoarst
 import core.key_sorted_ordered_dict as cksoordi
 import helpers.hasyncio as hasynci
 import helpers.hdbg as hdbg
@@ -69,6 +70,19 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
     # TODO(Paul): Change "value" to "holdings_notional".
     PRICE_COLS = ["price", "value"]
 
+    # Portfolio statistics computed at each mark to market.
+    STATISTICS_COLS = pd.Index(
+        [
+            "gross_volume",
+            "net_volume",
+            "gmv",
+            "nmv",
+            "cash",
+            "net_wealth",
+            "leverage",
+        ]
+    )
+
     def __init__(
         self,
         broker: ombroker.Broker,
@@ -127,32 +141,42 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         # At each call to `mark_to_market()`, we capture `wall_clock_time` and
         # perform a sequence of updates to the following dictionaries.
         self._max_num_bars = max_num_bars
-        # We use `KeySortedOrderedDict` keyed `timestamp` to:
+        # We use `KeySortedArrayStore` keyed `timestamp` to:
         # - enforce that inserted new keys are always increasing according to the
         #   key order (i.e., increasing in time)
         # - simplify extracting the last timestamp
+        # - store the values in arrays with a column per asset, so that the
+        #   historical dfs are not rebuilt from one series per bar
         # We initialize the collection of dictionaries from `holdings_shares_df`.
         # - timestamp to pd.Series of holdings in shares (indexed by asset_id)
         # - this does not include the "cash asset".
-        self._holdings_shares = cksoordi.KeySortedOrderedDict(
+        self._holdings_shares = cksoarst.KeySortedArrayStore(
             pd.Timestamp, self._max_num_bars
         )
         # - timestamp to float value of cash
-        self._cash = cksoordi.KeySortedOrderedDict(
+        self._cash = cksoarst.KeySortedArrayStore(
+            pd.Timestamp, self._max_num_bars
+        )
+        # - timestamp to pd.Series of prices (indexed by asset_id)
+        self._prices = cksoarst.KeySortedArrayStore(
             pd.Timestamp, self._max_num_bars
         )
-        # - timestamp to pd.DataFrame of price, value (indexed by asset_id)
-        self._holdings_notional = cksoordi.KeySortedOrderedDict(
+        # - timestamp to pd.Series of holdings in dollars (indexed by asset_id)
+        self._holdings_notional = cksoarst.KeySortedArrayStore(
             pd.Timestamp, self._max_num_bars
         )
         # - timestamp to pd.Series of notional trades (indexed by asset_id)
-        self._executed_trades_notional = cksoordi.KeySortedOrderedDict(
+        self._executed_trades_notional = cksoarst.KeySortedArrayStore(
             pd.Timestamp, self._max_num_bars
         )
         # - timestamp to pd.Series of statistics
-        self._statistics = cksoordi.KeySortedOrderedDict(
+        self._statistics = cksoarst.KeySortedArrayStore(
             pd.Timestamp, self._max_num_bars
         )
+        # The mark-to-market df and its timestamp, built lazily from the stores
+        # only when a client asks for it.
+        self._cached_mark_to_market_timestamp: Optional[pd.Timestamp] = None
+        self._cached_mark_to_market_df: Optional[pd.DataFrame] = None
         # Validate universe and holdings_shares.
         self._retrieve_initial_holdings_shares_from_db = (
             retrieve_initial_holdings_from_db
@@ -412,16 +436,8 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Return whether the Portfolio contains only cash and no holdings_shares.
         """
-        # Get the dictionary of the last holdings_shares, excluding cash.
-        num_periods = 1
-        holdings_shares_odict = self._holdings_shares.get_ordered_dict(
-            num_periods
-        )
-        _LOG.debug(hprint.to_str("holdings_shares_odict"))
-        # The
-        hdbg.dassert_isinstance(holdings_shares_odict, dict)
-        hdbg.dassert_eq(len(holdings_shares_odict), 1)
-        timestamp, holdings_srs = holdings_shares_odict.popitem()
+        # Get the last holdings_shares, excluding cash.
+        timestamp, holdings_srs = self._holdings_shares.peek()
         _LOG.debug(hprint.to_str("timestamp"))
         hdbg.dassert_isinstance(timestamp, pd.Timestamp)
         hdbg.dassert_isinstance(holdings_srs, pd.Series)
@@ -433,11 +449,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Return the last timestamp of Portfolio internal state.
         """
-        num_periods = 1
-        holdings_shares_odict = self._holdings_shares.get_ordered_dict(
-            num_periods
-        )
-        timestamp, _ = holdings_shares_odict.popitem()
+        timestamp, _ = self._holdings_shares.peek()
         return timestamp
 
     # /////////////////////////////////////////////////////////////////////////////
@@ -458,6 +470,18 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
 
         :return: dataframe with HOLDINGS and PRICE columns
         """
+        self.update_mark_to_market()
+        df = self.get_cached_mark_to_market()
+        return df
+
+    def update_mark_to_market(self) -> None:
+        """
+        Same as `mark_to_market()` but without building the returned df.
+
+        The state is computed on arrays, so this should be preferred when the
+        df is not needed, e.g., when marking to market at every bar in a
+        simulation.
+        """
         _LOG.debug("Marking to market...")
         # The first time this function is called we set the "initial holdings_shares".
         # TODO(Paul): See if `_set_holdings_shares()` can call into `mark_to_market()`
@@ -480,12 +504,15 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
             hdbg.dassert_eq(
                 len(self._holdings_shares), len(self._holdings_notional)
             )
+            hdbg.dassert_eq(len(self._holdings_shares), len(self._prices))
             hdbg.dassert_eq(len(self._holdings_shares), len(self._cash))
             hdbg.dassert_eq(len(self._holdings_shares), len(self._statistics))
         #
-        df = self.get_cached_mark_to_market()
-        _LOG.debug("mark_to_market_df=\n%s", hpandas.df_to_str(df, num_rows=None))
-        return df
+        if _LOG.isEnabledFor(logging.DEBUG):
+            df = self.get_cached_mark_to_market()
+            _LOG.debug(
+                "mark_to_market_df=\n%s", hpandas.df_to_str(df, num_rows=None)
+            )
 
     def get_cached_mark_to_market(self) -> pd.DataFrame:
         """
@@ -498,33 +525,15 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         # TODO(Paul): Gracefully fail instead of assert.
         hdbg.dassert(self._holdings_shares, "No cached information available.")
         # Get latest timestamp available.
-        timestamp, holdings_shares = self._holdings_shares.peek()
+        timestamp, _ = self._holdings_shares.peek()
         _LOG.debug("Retrieving holdings_shares at timestamp=%s", timestamp)
-        # Create a `holdings_df` with assets and cash.
-        holdings_shares_df = holdings_shares.reset_index()
-        cash_df = Portfolio._create_holdings_df_from_cash(
-            self._cash[timestamp], timestamp
-        )
-        holdings_shares_df.columns = Portfolio.HOLDINGS_COLS
-        holdings_shares_df.index = [timestamp] * holdings_shares_df.shape[0]
-        holdings_shares_df = pd.concat([holdings_shares_df, cash_df])
-        holdings_shares_df = holdings_shares_df.convert_dtypes()
-        # Get mark-to-market values.
-        marked_to_market = self._holdings_notional[timestamp]
-        cash_row = pd.DataFrame(
-            index=[Portfolio.CASH_ID],
-            columns=Portfolio.PRICE_COLS,
-            data=[[1.0, self._cash[timestamp]]],
-        )
-        marked_to_market = pd.concat([marked_to_market, cash_row])
-        marked_to_market.index.name = "asset_id"
-        marked_to_market = marked_to_market.reset_index()
-        marked_to_market.index = [timestamp] * marked_to_market.index.shape[0]
-        # Merge holdings_shares and mark-to-market dataframes.
-        df = holdings_shares_df.merge(marked_to_market, on="asset_id")
-        df["wall_clock_timestamp"] = [timestamp] * df.shape[0]
-        df.index = [timestamp] * df.shape[0]
-        df = df.convert_dtypes()
+        if timestamp != self._cached_mark_to_market_timestamp:
+            self._cached_mark_to_market_df = self._get_mark_to_market_df(
+                timestamp
+            )
+            self._cached_mark_to_market_timestamp = timestamp
+        # Return a copy, since the client can modify the df.
+        df = self._cached_mark_to_market_df.copy()
         return df
 
     # /////////////////////////////////////////////////////////////////////////////
@@ -537,8 +546,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Return a dataframe of portfolio statistics over time.
         """
-        stats_odict = self._statistics.get_ordered_dict(num_periods)
-        df = pd.DataFrame(stats_odict).transpose()
+        df = self._statistics.get_df(num_periods)
         # Add `pnl` by diffing the snapshots of `net_wealth`.
         # ```
         # pnl = df["net_wealth"].diff().rename("pnl").to_frame()
@@ -561,12 +569,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Return a dataframe of portfolio holdings_shares in shares over time.
         """
-        asset_holdings_shares_odict = self._holdings_shares.get_ordered_dict(
-            num_periods
-        )
-        asset_holdings_shares = pd.DataFrame(
-            asset_holdings_shares_odict
-        ).transpose()
+        asset_holdings_shares = self._holdings_shares.get_df(num_periods)
         # # TODO(gp): @all there is a little repetition that we would like to remove.
         # # Explicitly cast to float. This makes the string representation of
         # # the dataframe more uniform and better.
@@ -582,17 +585,12 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Return a dataframe of portfolio holdings_shares in dollars over time.
         """
-        holdings_notional = collections.OrderedDict()
-        for k, v in self._holdings_notional.get_ordered_dict(num_periods).items():
-            holdings_notional[k] = v["value"]
-        holdings_notional = pd.DataFrame(holdings_notional).transpose()
-        holdings_notional.columns.name = self._asset_id_col
+        holdings_notional = self._holdings_notional.get_df(num_periods)
         # Explicitly cast to float. This makes the string representation of
-        # the dataframe more uniform and better.
-        # We replace NaNs with numpy NaNs, since numpy NaNs are recognized as
-        # having "float" type.
-        holdings_notional.fillna(np.nan, inplace=True)
+        # the dataframe more uniform and better. This also copies the data,
+        # which is shared with the store.
         holdings_notional = holdings_notional.astype("float")
+        holdings_notional.columns.name = self._asset_id_col
         return holdings_notional
 
     def get_historical_executed_trades_shares(
@@ -622,15 +620,11 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Return a dataframe of notional executed trades over time.
         """
-        executed_trades_notional_odict = (
-            self._executed_trades_notional.get_ordered_dict(num_periods)
+        executed_trades_notional = self._executed_trades_notional.get_df(
+            num_periods
         )
-        executed_trades_notional = pd.DataFrame(
-            executed_trades_notional_odict
-        ).transpose()
-        executed_trades_notional.columns.name = self._asset_id_col
-        executed_trades_notional.fillna(np.nan, inplace=True)
         executed_trades_notional = executed_trades_notional.astype("float")
+        executed_trades_notional.columns.name = self._asset_id_col
         return executed_trades_notional
 
     def get_historical_pnl(self, num_periods: Optional[int] = 10) -> pd.DataFrame:
@@ -845,6 +839,25 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         )
         return holdings_df
 
+    @staticmethod
+    def _float_array_to_nullable_array(
+        values: np.ndarray,
+    ) -> pd.api.extensions.ExtensionArray:
+        """
+        Convert a float array like `pd.Series.convert_dtypes()`.
+
+        :return: an `Int64` array, if all the values are integers, and a
+            `Float64` array otherwise, with NaNs as missing values
+        """
+        values = values.astype(np.float64, copy=False)
+        non_nan_values = values[~np.isnan(values)]
+        is_integer = np.isfinite(non_nan_values).all() and np.array_equal(
+            non_nan_values, np.trunc(non_nan_values)
+        )
+        dtype = "Int64" if is_integer else "Float64"
+        array = pd.array(values, dtype=dtype)
+        return array
+
     @staticmethod
     def _validate_mark_to_market_df(df: pd.DataFrame) -> None:
         """
@@ -962,6 +975,41 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         ...
 
+    def _get_mark_to_market_df(self, timestamp: pd.Timestamp) -> pd.DataFrame:
+        """
+        Build the mark-to-market df with assets and cash at `timestamp`.
+        """
+        asset_ids = self._holdings_shares.get_index(timestamp)
+        # The prices and the values are stored in the same order of the
+        # holdings.
+        hdbg.dassert(
+            self._holdings_notional.get_index(timestamp).equals(asset_ids)
+        )
+        cash = self._cash[timestamp]
+        # Add cash as the last row.
+        asset_ids = np.append(asset_ids.to_numpy(), Portfolio.CASH_ID)
+        holdings_shares = np.append(
+            self._holdings_shares.get_values(timestamp), cash
+        )
+        prices = np.append(self._prices.get_values(timestamp), 1.0)
+        holdings_notional = np.append(
+            self._holdings_notional.get_values(timestamp), cash
+        )
+        # Build the columns with the types assigned by `df.convert_dtypes()`,
+        # which is slow.
+        to_nullable = Portfolio._float_array_to_nullable_array
+        data = {
+            "asset_id": pd.array(asset_ids.astype(np.int64), dtype="Int64"),
+            "curr_num_shares": to_nullable(holdings_shares),
+            "price": to_nullable(prices),
+            "value": to_nullable(holdings_notional),
+        }
+        num_rows = len(asset_ids)
+        index = pd.DatetimeIndex([timestamp] * num_rows)
+        df = pd.DataFrame(data, index=index)
+        df["wall_clock_timestamp"] = index
+        return df
+
     def _price_assets(self, holding_shares: pd.Series) -> None:
         """
         Access the underlying market_data to price assets.
@@ -973,26 +1021,26 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         as_of_timestamp, _ = self._holdings_shares.peek()
         _LOG.debug("as_of_timestamp=%s", as_of_timestamp)
         hdbg.dassert_isinstance(holding_shares, pd.Series)
-        holding_shares_list = holding_shares.index.to_list()
-        if not holding_shares_list:
-            assets_marked_to_market = pd.DataFrame(columns=Portfolio.PRICE_COLS)
+        asset_ids = holding_shares.index
+        hdbg.dassert(not asset_ids.has_duplicates)
+        if asset_ids.empty:
+            prices = np.array([], dtype=float)
         else:
             # TODO(gp): A bit weird that we are calling the public method from the
             #  private.
-            prices = self.price_assets(holding_shares_list)
-            assets_marked_to_market = holding_shares * prices
-            assets_marked_to_market.name = "value"
-            assets_marked_to_market = pd.concat(
-                [prices, assets_marked_to_market], axis=1
-            )
-            assets_marked_to_market.columns = Portfolio.PRICE_COLS
-        hdbg.dassert_isinstance(assets_marked_to_market, pd.DataFrame)
-        hdbg.dassert(not assets_marked_to_market.index.has_duplicates)
-        if Portfolio.CASH_ID in assets_marked_to_market.columns:
-            assets_marked_to_market = assets_marked_to_market.drop(
-                columns=Portfolio.CASH_ID
-            )
-        self._holdings_notional[as_of_timestamp] = assets_marked_to_market
+            prices_srs = self.price_assets(asset_ids.to_list())
+            # Align the prices to the holdings.
+            if not prices_srs.index.equals(asset_ids):
+                prices_srs = prices_srs.reindex(asset_ids)
+            prices = prices_srs.to_numpy(dtype=float, na_value=np.nan)
+        # Compute the values on arrays, storing them in the order of the
+        # holdings.
+        shares = holding_shares.to_numpy(dtype=float, na_value=np.nan)
+        holdings_notional = shares * prices
+        self._prices.set_values(as_of_timestamp, prices, asset_ids)
+        self._holdings_notional.set_values(
+            as_of_timestamp, holdings_notional, asset_ids
+        )
 
     def _compute_statistics(self) -> None:
         """
@@ -1002,48 +1050,52 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         Return asset/cash values, net wealth, exposure, and leverage for
         the portfolio at a given timestamp.
         """
-        cash_timestamp, _ = self._cash.peek()
-        assets_ts, holdings_notional = self._holdings_notional.peek()
+        cash_timestamp, cash = self._cash.peek()
+        assets_ts, _ = self._holdings_shares.peek()
         hdbg.dassert_eq(cash_timestamp, assets_ts)
         hdbg.dassert_not_in(cash_timestamp, self._statistics)
         # Compute value of holdings_shares.
-        holdings_notional = holdings_notional["value"]
-        is_finite = holdings_notional.apply(np.isfinite)
-        net_holdings_notional = holdings_notional[is_finite].sum()
+        holdings_notional = self._holdings_notional.get_values(assets_ts)
+        holdings_notional = holdings_notional[np.isfinite(holdings_notional)]
+        net_holdings_notional = holdings_notional.sum()
         hdbg.dassert(
             np.isfinite(net_holdings_notional),
             "net_holdings_notional=%s",
             net_holdings_notional,
         )
         # Get the cash available.
-        cash = self._cash[cash_timestamp]
         hdbg.dassert(np.isfinite(cash), "cash=%s", cash)
         # Compute the net wealth (AKA "total value" AKA "NAV").
         net_wealth = net_holdings_notional + cash
         hdbg.dassert(np.isfinite(net_wealth), "net_value=%s", net_wealth)
         # Compute the gross exposure.
-        gross_exposure = holdings_notional[is_finite].abs().sum()
+        gross_exposure = np.abs(holdings_notional).sum()
         # Compute the portfolio leverage.
         leverage = gross_exposure / net_wealth
         # Compute the gross and net volume.
         if assets_ts in self._executed_trades_notional:
-            traded_volume = self._executed_trades_notional[assets_ts]
-            gross_volume = traded_volume.abs().sum()
-            net_volume = traded_volume.sum()
+            traded_volume = self._executed_trades_notional.get_values(assets_ts)
+            # Skip the NaNs, like `pd.Series.sum()`.
+            gross_volume = np.nansum(np.abs(traded_volume))
+            net_volume = np.nansum(traded_volume)
         else:
             gross_volume = 0
             net_volume = 0
-        dict_ = {
-            "gross_volume": gross_volume,
-            "net_volume": net_volume,
-            "gmv": gross_exposure,
-            "nmv": net_holdings_notional,
-            "cash": cash,
-            "net_wealth": net_wealth,
-            "leverage": leverage,
-        }
-        statistics = pd.Series(dict_, name=cash_timestamp)
-        self._statistics[cash_timestamp] = statistics
+        # The values are in the order of `STATISTICS_COLS`.
+        statistics = np.array(
+            [
+                gross_volume,
+                net_volume,
+                gross_exposure,
+                net_holdings_notional,
+                cash,
+                net_wealth,
+                leverage,
+            ]
+        )
+        self._statistics.set_values(
+            cash_timestamp, statistics, Portfolio.STATISTICS_COLS
+        )
 
 
 # #############################################################################
@@ -19,6 +19,7 @@ import pandas as pd
 import core.config as cconfig
 import core.plotting as coplotti
 import dataflow.core.dag as dtfcordag
+import dataflow.core.node_profiler as dtfcnoprof
 import helpers.hdbg as hdbg
 import helpers.hgit as hgit
 import helpers.hintrospection as hintros
@@ -1297,11 +1298,17 @@ def get_execution_time_for_all_dag_nodes(dag_data_dir: str) -> pd.DataFrame:
     2023-02-21 03:00:00-05:00    31.296     11.573      2.046         2.880              2.770
     2023-02-21 03:05:00-05:00    32.315     12.397      2.023         2.903              2.808
 
+    The execution time is read from the profiling records of the DAG, if
+    available, and from the profiling text files otherwise.
+
     :param dag_data_dir: a path where nodes data is stored
     :return: exection delays for all DAG nodes and bar timestamps
     """
     # Get a dir that contains DAG data and info.
     dag_dir = dag_data_dir.strip("node_io.data")
+    if dtfcnoprof.has_node_profiling_stats(dag_dir):
+        df_res = _get_execution_time_for_all_dag_nodes_from_records(dag_dir)
+        return df_res
     # Get all the DAG node names.
     dag_node_names = get_dag_node_names(dag_data_dir)
     delays_dict = {}
@@ -1328,6 +1335,30 @@ def get_execution_time_for_all_dag_nodes(dag_data_dir: str) -> pd.DataFrame:
     return df_res
 
 
+def _get_execution_time_for_all_dag_nodes_from_records(
+    dag_dir: str,
+) -> pd.DataFrame:
+    """
+    Get execution time for all DAG nodes and bars from the profiling records.
+
+    See `get_execution_time_for_all_dag_nodes()` for the output format.
+    """
+    df = dtfcnoprof.load_node_profiling_stats_from_dst_dir(dag_dir)
+    # Keep the nodes in topological order.
+    nids = df.sort_values("topological_id")["nid"].unique().tolist()
+    df_res = df.pivot_table(
+        index="bar_timestamp",
+        columns="nid",
+        values="wall_time_in_secs",
+        aggfunc="last",
+    )
+    df_res = df_res[nids]
+    df_res.columns.name = None
+    # Add column with summary nodes delay.
+    df_res.insert(0, "all_nodes", df_res.sum(axis=1))
+    return df_res
+
+
 def plot_dag_execution_stats(
     df_dag_execution_time: pd.DataFrame, *, report_stats: bool = False
 ) -> None:
@@ -252,7 +252,7 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         """
         _LOG.debug("log_state")
         if mark_to_market:
-            self._portfolio.mark_to_market()
+            self._portfolio.update_mark_to_market()
         # Log the state of this object and Portfolio.
         if self._log_dir:
             self._log_state()
@@ -1,9 +1,11 @@
 import asyncio
 import logging
-from typing import List
+from typing import List, Tuple
 
+import numpy as np
 import pandas as pd
 
+import core.finance as cofinanc
 import helpers.hasyncio as hasynci
 import helpers.hpandas as hpandas
 import helpers.hprint as hprint
@@ -295,6 +297,118 @@ class Test_fill_orders1(hunitest.TestCase):
         asset_ids = [101, 102]
         self.helper(asset_ids, order, mode, exp)
 
+    def test_fill_orders_fully_twap2(self) -> None:
+        """
+        Check that the fills of buy and sell orders for multiple assets are the
+        same as filling each child order at once.
+        """
+        asset_ids = [101, 102]
+        start_datetime = pd.Timestamp(
+            "2000-01-01 09:30:00-05:00", tz="America/New_York"
+        )
+        end_datetime = pd.Timestamp(
+            "2000-01-01 09:40:00-05:00", tz="America/New_York"
+        )
+        timestamp_col = "end_datetime"
+        column_remap = None
+        with hasynci.solipsism_context() as event_loop:
+            market_data, _ = mdata.get_ReplayedTimeMarketData_example5(
+                event_loop,
+                start_datetime,
+                end_datetime,
+                asset_ids,
+                replayed_delay_in_mins_or_timestamp=end_datetime,
+                use_midpoint_as_price=True,
+            )
+            for type_ in ["price@twap", "partial_spread_0.25@twap"]:
+                orders = [
+                    omorder.Order(
+                        start_datetime,
+                        asset_id,
+                        type_,
+                        start_datetime,
+                        start_datetime + pd.Timedelta(minutes=5),
+                        0,
+                        diff_num_shares,
+                    )
+                    for asset_id, diff_num_shares in zip(asset_ids, [100, -50])
+                ]
+                # Run.
+                fills = ombroker.fill_orders_fully_twap(
+                    market_data, timestamp_col, column_remap, orders
+                )
+                # Fill each child order separately.
+                child_orders = ombroker._split_in_child_twap_orders(orders, "1T")
+                expected_fills = []
+                for child_order in child_orders:
+                    expected_fills.extend(
+                        ombroker.fill_orders_fully_at_once(
+                            market_data,
+                            timestamp_col,
+                            column_remap,
+                            [child_order],
+                        )
+                    )
+                # Check.
+                self.assertEqual(len(fills), 10)
+                actual = [self._fill_to_tuple(fill) for fill in fills]
+                expected = [self._fill_to_tuple(fill) for fill in expected_fills]
+                self.assertEqual(actual, expected)
+
+    def test_fill_orders_fully_twap3(self) -> None:
+        """
+        Check that a child order without a price is not filled.
+        """
+        asset_ids = [101, 102]
+        start_datetime = pd.Timestamp(
+            "2000-01-01 09:30:00-05:00", tz="America/New_York"
+        )
+        end_datetime = pd.Timestamp(
+            "2000-01-01 09:40:00-05:00", tz="America/New_York"
+        )
+        # Remove the price of asset 102 in the interval (09:32, 09:33].
+        df = cofinanc.generate_random_top_of_book_bars(
+            start_datetime, end_datetime, asset_ids
+        )
+        df["price"] = df["midpoint"]
+        missing_timestamp = pd.Timestamp(
+            "2000-01-01 09:33:00-05:00", tz="America/New_York"
+        )
+        mask = (df["asset_id"] == 102) & (df["end_datetime"] == missing_timestamp)
+        self.assertEqual(mask.sum(), 1)
+        df.loc[mask, "price"] = np.nan
+        timestamp_col = "end_datetime"
+        column_remap = None
+        with hasynci.solipsism_context() as event_loop:
+            market_data, _ = mdata.get_ReplayedTimeMarketData_from_df(
+                event_loop, end_datetime, df
+            )
+            orders = [
+                omorder.Order(
+                    start_datetime,
+                    asset_id,
+                    "price@twap",
+                    start_datetime,
+                    start_datetime + pd.Timedelta(minutes=5),
+                    0,
+                    100,
+                )
+                for asset_id in asset_ids
+            ]
+            # Run.
+            fills = ombroker.fill_orders_fully_twap(
+                market_data, timestamp_col, column_remap, orders
+            )
+        # Check.
+        actual = [(fill.order.asset_id, fill.timestamp) for fill in fills]
+        self.assertEqual(len(actual), 9)
+        self.assertNotIn((102, missing_timestamp), actual)
+        self.assertIn((101, missing_timestamp), actual)
+
+    @staticmethod
+    def _fill_to_tuple(fill: ombroker.Fill) -> Tuple:
+        return (fill.order.asset_id, fill.timestamp, fill.num_shares, fill.price)
+
 
 # #############################################################################
 # TestDataFrameBroker1
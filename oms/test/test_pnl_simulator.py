@@ -1,4 +1,5 @@
 import logging
+import time
 from typing import Any, Dict, List, Optional
 
 import numpy as np
@@ -471,5 +472,184 @@ class TestPnlSimulator2(hunitest.TestCase):
         self.check_string(act)
 
 
+# #############################################################################
+
+
+class TestPnlSimulatorVectorized1(hunitest.TestCase):
+    def test_single_asset1(self) -> None:
+        """
+        Check that the results are the same as `compute_pnl_level2()` on the
+        handcrafted example.
+        """
+        df, df_5mins = opnlsimu.get_example_market_data1()
+        order_types = ["price@start", "price@end", "price@twap"]
+        self._check_single_asset(df, df_5mins, order_types)
+
+    def test_single_asset2(self) -> None:
+        """
+        Check that the results are the same as `compute_pnl_level2()` on a
+        random example.
+        """
+        num_samples = 5 * 30 + 1
+        seed = 45
+        df, df_5mins = opnlsimu.get_example_market_data2(num_samples, seed)
+        order_types = [
+            "price@end",
+            "price@twap",
+            "full_spread@start",
+            "full_spread@twap",
+            "partial_spread_0.3@end",
+            "partial_spread_0.7@twap",
+        ]
+        self._check_single_asset(df, df_5mins, order_types)
+
+    def test_multi_asset1(self) -> None:
+        """
+        Freeze the output of a simulation with multiple assets.
+        """
+        num_samples = 5 * 4 + 1
+        num_assets = 3
+        seed = 42
+        df, preds_df = opnlsimu.get_example_multi_asset_market_data(
+            num_samples, num_assets, seed
+        )
+        config = {
+            "price_column": "price",
+            "future_snoop_allocation": False,
+            "order_type": "partial_spread_0.5@twap",
+        }
+        asset_df, portfolio_df = opnlsimu.compute_pnl_level2_vectorized(
+            df, preds_df, 1000.0, config
+        )
+        act = []
+        act.append(
+            "asset_df=\n%s" % hunitest.convert_df_to_string(asset_df, index=True)
+        )
+        act.append(
+            "portfolio_df=\n%s"
+            % hunitest.convert_df_to_string(portfolio_df, index=True)
+        )
+        act = "\n".join(act)
+        self.check_string(act)
+
+    def test_multi_asset2(self) -> None:
+        """
+        Check that assets without predictions don't change the simulation of
+        the other assets.
+        """
+        num_samples = 5 * 20 + 1
+        num_assets = 4
+        seed = 42
+        df, preds_df = opnlsimu.get_example_multi_asset_market_data(
+            num_samples, num_assets, seed
+        )
+        preds_df.iloc[:, 1:] = 0.0
+        config = {
+            "price_column": "price",
+            "future_snoop_allocation": True,
+            "order_type": "full_spread@twap",
+        }
+        asset_df, portfolio_df = opnlsimu.compute_pnl_level2_vectorized(
+            df, preds_df, 1000.0, config
+        )
+        # Simulate only the first asset.
+        asset_id = preds_df.columns[0]
+        df_1 = df.xs(asset_id, axis=1, level=1, drop_level=False)
+        exp_asset_df, exp_portfolio_df = opnlsimu.compute_pnl_level2_vectorized(
+            df_1, preds_df[[asset_id]], 1000.0, config
+        )
+        asset_df = asset_df.xs(asset_id, axis=1, level=1, drop_level=False)
+        pd.testing.assert_frame_equal(asset_df, exp_asset_df)
+        pd.testing.assert_frame_equal(portfolio_df, exp_portfolio_df)
+
+    @pytest.mark.slow("~10 seconds.")
+    def test_perf1(self) -> None:
+        """
+        Compare the run time with `compute_pnl_level2()`.
+        """
+        num_samples = 5 * 1000 + 1
+        num_assets = 100
+        seed = 43
+        df, preds_df = opnlsimu.get_example_multi_asset_market_data(
+            num_samples, num_assets, seed
+        )
+        config = {
+            "price_column": "price",
+            "future_snoop_allocation": False,
+            "order_type": "price@twap",
+        }
+        initial_wealth = 1e6
+        # Run the reference implementation on the first asset.
+        asset_id = preds_df.columns[0]
+        df_1 = df.xs(asset_id, axis=1, level=1)
+        df_5mins = preds_df[[asset_id]].rename(columns={asset_id: "preds"})
+        mi = opnlsimu.MarketInterface(df_1, True, ["price"])
+        start_time = time.time()
+        opnlsimu.compute_pnl_level2(mi, df_5mins, initial_wealth, config)
+        elapsed_time = time.time() - start_time
+        _LOG.info(
+            "reference: 1 asset, %s bars: %.3f s", len(preds_df), elapsed_time
+        )
+        # Run the vectorized implementation, compiling the kernel first.
+        opnlsimu.compute_pnl_level2_vectorized(
+            df.iloc[:6], preds_df.iloc[:2], initial_wealth, config
+        )
+        start_time = time.time()
+        opnlsimu.compute_pnl_level2_vectorized(
+            df, preds_df, initial_wealth, config
+        )
+        elapsed_time = time.time() - start_time
+        _LOG.info(
+            "vectorized: %s assets, %s bars: %.3f s",
+            num_assets,
+            len(preds_df),
+            elapsed_time,
+        )
+
+    def _check_single_asset(
+        self, df: pd.DataFrame, df_5mins: pd.DataFrame, order_types: List[str]
+    ) -> None:
+        initial_wealth = 1000.0
+        asset_id = 101
+        # Convert the data to the multi-asset format.
+        price_columns = [col for col in ["price", "ask", "bid"] if col in df]
+        df_multi = {
+            col: df[[col]].set_axis([asset_id], axis=1) for col in price_columns
+        }
+        df_multi = pd.concat(df_multi, axis=1)
+        preds_df = df_5mins[["preds"]].set_axis([asset_id], axis=1)
+        for order_type in order_types:
+            for future_snoop_allocation in [False, True]:
+                _LOG.debug(
+                    "order_type=%s future_snoop_allocation=%s",
+                    order_type,
+                    future_snoop_allocation,
+                )
+                config = {
+                    "price_column": "price",
+                    "future_snoop_allocation": future_snoop_allocation,
+                    "order_type": order_type,
+                }
+                mi = opnlsimu.MarketInterface(df, False, None)
+                exp = opnlsimu.compute_pnl_level2(
+                    mi, df_5mins, initial_wealth, config
+                )
+                asset_df, portfolio_df = opnlsimu.compute_pnl_level2_vectorized(
+                    df_multi, preds_df, initial_wealth, config
+                )
+                act = pd.concat(
+                    [asset_df.xs(asset_id, axis=1, level=1), portfolio_df],
+                    axis=1,
+                )
+                for col in act.columns:
+                    np.testing.assert_allclose(
+                        act[col],
+                        exp["sim2." + col],
+                        rtol=1e-10,
+                        atol=1e-8,
+                        err_msg=col,
+                    )
+
+
 # TODO(gp): Add unit tests for computing PnL with level2 sim using midpoint price,
 #  and different spread amount.
@@ -1,9 +1,12 @@
 import asyncio
 import io
 import logging
+import time
+from typing import List, Tuple
 
 import numpy as np
 import pandas as pd
+import pytest
 
 import core.real_time as creatime
 import helpers.hasyncio as hasynci
@@ -599,3 +602,86 @@ class TestDatabasePortfolio3(omtodh.TestOmsDbHelper):
             )
             coroutines = [self.coroutine1(portfolio)]
             hasynci.run(asyncio.gather(*coroutines), event_loop=event_loop)
+
+
+# #############################################################################
+# TestPortfolioMarkToMarketLatency1
+# #############################################################################
+
+
+class _FixedPricesDataFramePortfolio(omportfo.DataFramePortfolio):
+    """
+    Price the assets with fixed prices, so that the latency of marking to market
+    doesn't include the latency of querying `MarketData`.
+    """
+
+    def price_assets(self, asset_ids: List[int]) -> pd.Series:
+        prices = pd.Series(1000.0, index=asset_ids)
+        return prices
+
+
+class TestPortfolioMarkToMarketLatency1(hunitest.TestCase):
+    """
+    Micro-benchmark the per-call latency of marking a portfolio to market.
+    """
+
+    @pytest.mark.slow("~10 seconds.")
+    def test_latency1(self) -> None:
+        num_bars = 50
+        for num_assets in [10, 100, 1000]:
+            for method in ["mark_to_market", "update_mark_to_market"]:
+                latency, portfolio = self._get_latency_in_secs(
+                    num_assets, num_bars, method
+                )
+                _LOG.info(
+                    "num_assets=%s method=%s latency=%.3f ms",
+                    num_assets,
+                    method,
+                    1e3 * latency,
+                )
+                # Check that the state is updated at every bar.
+                statistics = portfolio.get_historical_statistics(None)
+                self.assertEqual(statistics.shape[0], num_bars + 1)
+                net_wealth = 1e6 + 10 * 1000.0 * num_assets
+                self.assertEqual(statistics["net_wealth"].iloc[-1], net_wealth)
+                holdings = portfolio.get_historical_holdings_notional(None)
+                self.assertEqual(holdings.shape[1], num_assets)
+
+    @staticmethod
+    def _get_latency_in_secs(
+        num_assets: int, num_bars: int, method: str
+    ) -> Tuple[float, omportfo.Portfolio]:
+        """
+        Mark a portfolio to market at each bar, timing each call.
+
+        :return: the mean latency of a call and the portfolio
+        """
+        with hasynci.solipsism_context() as event_loop:
+            market_data, _ = mdata.get_ReplayedTimeMarketData_example3(event_loop)
+            broker = obroexam.get_DataFrameBroker_example1(
+                event_loop, market_data=market_data
+            )
+            holdings_dict = {
+                asset_id: 10.0 for asset_id in range(100, 100 + num_assets)
+            }
+            holdings_dict[omportfo.Portfolio.CASH_ID] = 1e6
+            portfolio = _FixedPricesDataFramePortfolio.from_dict(
+                broker,
+                "price",
+                "last",
+                holdings_shares_dict=holdings_dict,
+            )
+            portfolio.mark_to_market()
+            latencies = []
+
+            async def _mark_to_market() -> None:
+                mark_to_market = getattr(portfolio, method)
+                for _ in range(num_bars):
+                    await asyncio.sleep(60)
+                    start_time = time.perf_counter()
+                    mark_to_market()
+                    latencies.append(time.perf_counter() - start_time)
+
+            hasynci.run(_mark_to_market(), event_loop=event_loop)
+        latency = float(np.mean(latencies))
+        return latency, portfolio
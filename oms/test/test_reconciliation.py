@@ -1,7 +1,13 @@
 import logging
+import os
 
+import numpy as np
+import pandas as pd
 import pytest
+
+import dataflow.core as dtfcore
 import helpers.hunit_test as hunitest
+import helpers.hwall_clock_time as hwacltim
 import oms.reconciliation as omreconc
 
 _LOG = logging.getLogger(__name__)
@@ -25,3 +31,42 @@ class TestGetRunDate1(hunitest.TestCase):
         start_timestamp = "20231013_12345678"
         with self.assertRaises(AssertionError):
             omreconc.get_run_date(start_timestamp)
+
+
+class TestGetExecutionTimeForAllDagNodes1(hunitest.TestCase):
+    def tearDown(self) -> None:
+        hwacltim.reset_current_bar_timestamp()
+        super().tearDown()
+
+    def test1(self) -> None:
+        """
+        Test that the execution time of the nodes for each bar is computed from
+        the DAG profiling records.
+        """
+        dst_dir = self.get_scratch_space()
+        dag = dtfcore.DAG()
+        dag.set_debug_mode("", True, dst_dir)
+        idx = pd.date_range(
+            "2022-01-03 09:31", periods=10, freq="T", tz="America/New_York"
+        )
+        df = pd.DataFrame({"a": range(10)}, index=idx)
+        dag.add_node(dtfcore.DfDataSource("read_data", df))
+        node = dtfcore.ColumnTransformer(
+            "abs", transformer_func=lambda df: df.abs(), col_mode="replace_all"
+        )
+        dag.add_node(node)
+        dag.connect("read_data", "abs")
+        bar_timestamps = [
+            pd.Timestamp("2022-01-03 09:35", tz="America/New_York"),
+            pd.Timestamp("2022-01-03 09:40", tz="America/New_York"),
+        ]
+        for bar_timestamp in bar_timestamps:
+            hwacltim.set_current_bar_timestamp(bar_timestamp)
+            dag.run_leq_node("abs", "predict")
+        dag_data_dir = os.path.join(dst_dir, "node_io.data")
+        act = omreconc.get_execution_time_for_all_dag_nodes(dag_data_dir)
+        self.assertEqual(act.index.tolist(), bar_timestamps)
+        self.assertEqual(act.columns.tolist(), ["all_nodes", "read_data", "abs"])
+        np.testing.assert_allclose(
+            act["all_nodes"], act["read_data"] + act["abs"]
+        )